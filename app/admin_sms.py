@@ -9,28 +9,33 @@ integration for complex command parsing and fallback regex-based parsing.
 import re
 import asyncio
 from typing import Dict, Any, Optional, Tuple
-from . import airtable
+from . import airtable, tenants
+from .log import get_logger
+
+logger = get_logger(__name__)
 
 # =============================================================================
 # MCP PARSER INTEGRATION
 # =============================================================================
 
-# Import MCP client for complex parsing
-try:
-    import sys
-    import os
-    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-    from mcp_parser.mcp_sync_client import test_mcp_sync
-    MCP_AVAILABLE = True
-except ImportError:
-    MCP_AVAILABLE = False
-    print("MCP client not available, falling back to regex-only parsing")
+# MCP client for complex parsing, imported on the first admin command
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from .lazy_imports import LazyModule, is_installed
+
+MCP_AVAILABLE = is_installed("mcp_parser")
+if MCP_AVAILABLE:
+    mcp_sync_client = LazyModule("mcp_parser.mcp_sync_client")
+else:
+    logger.info("MCP client not available, falling back to regex-only parsing")
 
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
 
-# Admin phone numbers (add more as needed)
+# Admin phone numbers of the default tenant (add more as needed); other
+# tenants list theirs as admin_numbers in TENANTS_FILE
 ADMIN_NUMBERS = {
     "+19784910236",  # David's number
     "9784910236"     # Also accept without +1
@@ -41,10 +46,12 @@ ADMIN_NUMBERS = {
 # =============================================================================
 
 def is_admin_number(phone: str) -> bool:
-    """Check if a phone number is an admin number"""
-    # Normalize phone number
-    normalized = phone.replace("+1", "") if phone.startswith("+1") else phone
-    return normalized in ADMIN_NUMBERS or phone in ADMIN_NUMBERS
+    """Check if a phone number is an admin number of the current tenant"""
+    admin_numbers = tenants.current().admin_numbers
+    if admin_numbers is None:
+        admin_numbers = ADMIN_NUMBERS
+    normalized = tenants.normalize_number(phone)
+    return any(tenants.normalize_number(number) == normalized for number in admin_numbers)
 
 # =============================================================================
 # COMMAND PARSING
@@ -77,13 +84,13 @@ def parse_admin_command(message: str) -> Optional[Dict[str, Any]]:
     if MCP_AVAILABLE:
         try:
             # Use synchronous MCP client that works within async contexts
-            mcp_result = test_mcp_sync(message)
+            mcp_result = mcp_sync_client.test_mcp_sync(message)
             
             if mcp_result and mcp_result.get("command") and mcp_result.get("confidence", 0) > 0.5:
                 # Convert MCP result to our expected format
                 return _convert_mcp_result(mcp_result)
         except Exception as e:
-            print(f"Error with MCP parsing: {e}")
+            logger.error("Error with MCP parsing: %s", e)
             pass
     
     return None
@@ -275,7 +282,7 @@ def find_person_by_name(name: str) -> Optional[Dict[str, Any]]:
         
         return None
     except Exception as e:
-        print(f"Error finding person by name: {e}")
+        logger.error("Error finding person by name: %s", e)
         return None
 
 # =============================================================================
@@ -403,7 +410,7 @@ def execute_admin_command(command_data: Dict[str, Any]) -> Tuple[bool, str]:
             return False, f"❌ Unknown command: {command}"
             
     except Exception as e:
-        print(f"Error executing admin command: {e}")
+        logger.error("Error executing admin command: %s", e)
         return False, f"❌ Error executing command: {str(e)}"
 
 # =============================================================================
@@ -11,39 +11,28 @@ This module handles all interactions with Airtable databases including:
 
 import os
 import json
+import contextvars
+import threading
+import time
 import httpx
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import quote
+from typing import Callable, Dict, Iterator, List, Optional, Any
 from datetime import datetime, date
-from dotenv import load_dotenv
+from . import call_budget, checkin_cache, coordination, env, tenants
+from .rate_limit import RateLimiter
+from .log import get_logger
 
-# Load environment variables
-load_dotenv(os.path.join(os.path.dirname(__file__), '..', 'config', 'config.env'))
+logger = get_logger(__name__)
 
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
 
-# Airtable configuration
-AIRTABLE_API_KEY = os.getenv("AIRTABLE_API_KEY")
-AIRTABLE_BASE_ID = os.getenv("AIRTABLE_BASE_ID")
-AIRTABLE_PEOPLE_TABLE = os.getenv("AIRTABLE_PEOPLE_TABLE", "People")
-AIRTABLE_CHECKINS_BASE_ID = os.getenv("AIRTABLE_CHECKINS_BASE_ID", AIRTABLE_BASE_ID)
-AIRTABLE_CHECKINS_TABLE = os.getenv("AIRTABLE_CHECKINS_TABLE", "Check-ins")
-AIRTABLE_MESSAGES_TABLE = os.getenv("AIRTABLE_MESSAGES_TABLE", "Messages")
-
-# Add new table configurations
-AIRTABLE_REMINDERS_BASE_ID = os.getenv("AIRTABLE_REMINDERS_BASE_ID", AIRTABLE_BASE_ID)
-AIRTABLE_REMINDERS_MAIN_PEOPLE_TABLE = os.getenv("AIRTABLE_REMINDERS_MAIN_PEOPLE_TABLE", "People")
-AIRTABLE_REMINDERS_TABLE = os.getenv("AIRTABLE_REMINDERS_TABLE", "Reminders")
-AIRTABLE_NOTES_TABLE = os.getenv("AIRTABLE_NOTES_TABLE", "Notes")
-AIRTABLE_NOTES_BASE_ID = os.getenv("AIRTABLE_NOTES_BASE_ID", AIRTABLE_BASE_ID)
-AIRTABLE_NOTES_MAIN_PEOPLE_TABLE = os.getenv("AIRTABLE_NOTES_MAIN_PEOPLE_TABLE", "People")
-AIRTABLE_FOLLOWUPS_TABLE = os.getenv("AIRTABLE_FOLLOWUPS_TABLE", "Followups")
-
-AIRTABLE_BASE_URL = f"https://api.airtable.com/v0/{AIRTABLE_BASE_ID}"
-AIRTABLE_CHECKINS_BASE_URL = f"https://api.airtable.com/v0/{AIRTABLE_CHECKINS_BASE_ID}"
-AIRTABLE_REMINDERS_BASE_URL = f"https://api.airtable.com/v0/{AIRTABLE_REMINDERS_BASE_ID}"
-AIRTABLE_NOTES_BASE_URL = f"https://api.airtable.com/v0/{AIRTABLE_NOTES_BASE_ID}"
+# Base IDs, table names and the API key are per tenant (see tenants.py); the
+# environment configures the default tenant. Every function below reads them
+# from the current tenant at call time.
 
 # =============================================================================
 # EXCEPTIONS
@@ -51,7 +40,39 @@ AIRTABLE_NOTES_BASE_URL = f"https://api.airtable.com/v0/{AIRTABLE_NOTES_BASE_ID}
 
 class AirtableError(Exception):
     """Custom exception for Airtable API errors"""
-    pass
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+# =============================================================================
+# CHANGE LISTENERS
+# =============================================================================
+
+# Listeners called after successful writes through this module, by kind:
+# - "person": (person_id, fields) on create/update
+# - "checkin": (checkin_id, month, status) on create/status change; month is None if unknown
+# - "message": (checkin_id, direction, when) when a message is logged
+_listeners: Dict[str, List[Callable[..., None]]] = {"person": [], "checkin": [], "message": []}
+
+def on_change(kind: str) -> Callable[[Callable[..., None]], Callable[..., None]]:
+    """Decorator registering a write listener (used by local indexes and counters to stay in sync)"""
+    def register(listener: Callable[..., None]) -> Callable[..., None]:
+        _listeners[kind].append(listener)
+        return listener
+    return register
+
+def _notify(kind: str, *args):
+    for listener in _listeners[kind]:
+        try:
+            listener(*args)
+        except Exception as e:
+            logger.error("Error in %s change listener %s: %s", kind, getattr(listener, '__name__', listener), e)
+
+@on_change("person")
+def _broadcast_person_change(person_id: str, fields: Dict[str, Any]):
+    # Other instances apply the write to their people caches and due indexes
+    coordination.broadcast("person", person_id, fields)
 
 # =============================================================================
 # CORE API FUNCTIONS
@@ -60,14 +81,54 @@ class AirtableError(Exception):
 def _get_headers():
     """Get headers for Airtable API requests"""
     return {
-        "Authorization": f"Bearer {AIRTABLE_API_KEY}",
+        "Authorization": f"Bearer {tenants.current().api_key}",
         "Content-Type": "application/json"
     }
 
+# Shared keep-alive client so consecutive requests reuse the TLS connection to Airtable.
+# This is the default tenant's; other tenants keep their own pool in their resources.
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+
+# Outcome of the most recent Airtable request; health checks reuse it instead of making extra calls
+last_response: Dict[str, Any] = {"at": None, "ok": None, "latency_ms": None, "error": None}
+
+def _record_response(started: float, ok: bool, error: Optional[str] = None):
+    last_response.update(at=time.time(), ok=ok, error=error,
+                         latency_ms=round((time.perf_counter() - started) * 1000, 1))
+
+def _new_http_client() -> httpx.Client:
+    return httpx.Client(limits=httpx.Limits(max_keepalive_connections=10))
+
+def _get_http_client() -> httpx.Client:
+    """Get the current tenant's pooled HTTP client, creating it on first use"""
+    global _http_client
+    tenant = tenants.current()
+    if not tenant.is_default:
+        return tenant.resource("airtable_http_client", _new_http_client)
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                _http_client = _new_http_client()
+    return _http_client
+
+def close_http_client():
+    """Close every tenant's pooled Airtable connections (on shutdown)"""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+    for tenant in tenants.all_tenants():
+        client = tenant.pop_resource("airtable_http_client")
+        if client is not None:
+            client.close()
+
 def _make_request(method: str, endpoint: str, data: Optional[Dict] = None, base_url: Optional[str] = None, params: Optional[Dict] = None) -> Dict:
     """Make a request to Airtable API"""
+    tenant = tenants.current()
     if base_url is None:
-        base_url = AIRTABLE_BASE_URL
+        base_url = tenant.base_url
     url = f"{base_url}/{endpoint}"
     
     async def _async_request():
@@ -86,21 +147,235 @@ def _make_request(method: str, endpoint: str, data: Optional[Dict] = None, base_
             
             return response.json()
     
-    # For now, we'll use synchronous requests with httpx
-    with httpx.Client() as client:
-        if method == "GET":
-            response = client.get(url, headers=_get_headers(), params=params)
-        elif method == "POST":
-            response = client.post(url, headers=_get_headers(), json=data)
-        elif method == "PATCH":
-            response = client.patch(url, headers=_get_headers(), json=data)
-        else:
-            raise ValueError(f"Unsupported method: {method}")
-        
-        if response.status_code >= 400:
-            raise AirtableError(f"Airtable API error: {response.status_code} - {response.text}")
-        
-        return response.json()
+    # Synchronous requests over the pooled keep-alive client
+    client = _get_http_client()
+    if _pacing.get():
+        bulk_limiter().acquire()
+    started = time.perf_counter()
+    try:
+        with call_budget.external_call("airtable"):
+            if method == "GET":
+                response = client.get(url, headers=_get_headers(), params=params)
+            elif method == "POST":
+                response = client.post(url, headers=_get_headers(), json=data)
+            elif method == "PATCH":
+                response = client.patch(url, headers=_get_headers(), json=data)
+            else:
+                raise ValueError(f"Unsupported method: {method}")
+    except httpx.HTTPError as e:
+        _record_response(started, False, str(e))
+        raise
+    # Rejected requests (422: bad formula, unknown field) say nothing about Airtable's availability
+    _record_response(started, response.status_code < 400 or response.status_code == 422,
+                     None if response.status_code < 400 else f"HTTP {response.status_code}")
+    
+    if response.status_code >= 400:
+        raise AirtableError(f"Airtable API error: {response.status_code} - {response.text}", response.status_code)
+    
+    return response.json()
+
+def _iter_records(endpoint: str, params: Optional[Dict] = None, base_url: Optional[str] = None) -> Iterator[Dict]:
+    """Yield every record of a table listing page by page, following Airtable's offset cursor"""
+    params = dict(params or {})
+    while True:
+        response = _make_request("GET", endpoint, params=params, base_url=base_url)
+        yield from response.get("records", [])
+        offset = response.get("offset")
+        if not offset:
+            return
+        params["offset"] = offset
+
+def _get_all_records(endpoint: str, params: Optional[Dict] = None, base_url: Optional[str] = None) -> List[Dict]:
+    """GET every page of a table listing, following Airtable's offset cursor"""
+    return list(_iter_records(endpoint, params, base_url))
+
+# =============================================================================
+# BATCH OPERATIONS
+# =============================================================================
+
+# Airtable accepts at most 10 records per create/update request
+AIRTABLE_BATCH_SIZE = 10
+
+# IDs packed into one OR(RECORD_ID()=...) formula: a full chunk matches one page (100 records)
+RECORD_ID_CHUNK_SIZE = 100
+
+# Budget for a chunk's URL-encoded formula; Airtable rejects URLs longer than 16k characters
+RECORD_ID_FORMULA_MAX_CHARS = 15_000
+
+# ID chunks fetched at once by get_records_by_ids; the tenant's bulk bucket still paces them
+AIRTABLE_FETCH_CONCURRENCY = int(os.getenv("AIRTABLE_FETCH_CONCURRENCY", "4"))
+
+# Airtable allows 5 requests per second per base (tenants may set their own)
+AIRTABLE_MAX_RPS = float(os.getenv("AIRTABLE_MAX_RPS") or "5")
+
+def bulk_limiter() -> RateLimiter:
+    """The current tenant's token bucket for bulk writes and batched reads, so tenants never share a rate budget"""
+    tenant = tenants.current()
+    return tenant.resource("airtable_bulk_limiter", lambda: RateLimiter(tenant.max_rps or AIRTABLE_MAX_RPS))
+
+# Set while requests take a token from the tenant's bucket first (see paced)
+_pacing: contextvars.ContextVar[bool] = contextvars.ContextVar("airtable_pacing", default=False)
+
+@contextmanager
+def paced():
+    """
+    Make every request in this context wait for a token from the current tenant's bulk bucket
+
+    Threads started from the context (run_in_threadpool, copied contexts) are
+    paced too. Nesting is harmless: each request still takes a single token.
+    """
+    token = _pacing.set(True)
+    try:
+        yield
+    finally:
+        _pacing.reset(token)
+
+def _chunked(items: List[Any], size: int) -> List[List[Any]]:
+    """Split a list into consecutive chunks of at most `size` items"""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _record_id_formula(record_ids: List[str]) -> str:
+    """Build a filterByFormula expression matching any of the given record IDs"""
+    clauses = ",".join(f"RECORD_ID()='{record_id}'" for record_id in record_ids)
+    return f"OR({clauses})"
+
+def _record_id_chunks(record_ids: List[str]) -> List[List[str]]:
+    """Split IDs into chunks of at most RECORD_ID_CHUNK_SIZE whose formulas fit RECORD_ID_FORMULA_MAX_CHARS"""
+    chunks: List[List[str]] = []
+    chunk: List[str] = []
+    length = len(quote(_record_id_formula([])))
+    for record_id in record_ids:
+        clause = len(quote(f"RECORD_ID()='{record_id}',"))
+        if chunk and (len(chunk) >= RECORD_ID_CHUNK_SIZE or length + clause > RECORD_ID_FORMULA_MAX_CHARS):
+            chunks.append(chunk)
+            chunk, length = [], len(quote(_record_id_formula([])))
+        chunk.append(record_id)
+        length += clause
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+def get_record(table: str, record_id: str, base_url: Optional[str] = None) -> Optional[Dict]:
+    """
+    Fetch one record by ID
+
+    Args:
+        table: Table name or ID
+        record_id: Record ID
+        base_url: Base URL of the base holding the table
+
+    Returns:
+        The record, or None if it does not exist (other errors raise AirtableError)
+    """
+    try:
+        return _make_request("GET", f"{table}/{record_id}", base_url=base_url)
+    except AirtableError as e:
+        if e.status_code == 404:
+            return None
+        raise
+
+def get_records_by_ids(table: str, record_ids: List[str], fields: Optional[List[str]] = None,
+                       base_url: Optional[str] = None) -> List[Dict]:
+    """
+    Fetch records by ID with OR(RECORD_ID()=...) queries instead of one GET per record
+
+    IDs are packed into as few formulas as fit a page and the URL length
+    limit. Several chunks are fetched in parallel (AIRTABLE_FETCH_CONCURRENCY
+    at once), each request taking a token from the tenant's bulk bucket.
+
+    Args:
+        table: Table name or ID
+        record_ids: Record IDs to fetch (duplicates and empty IDs are ignored)
+        fields: Fields to return (all fields if None)
+        base_url: Base URL of the base holding the table
+
+    Returns:
+        The records found, in the order their IDs first appear in `record_ids`;
+        IDs that were not found are skipped
+    """
+    unique_ids = list(dict.fromkeys(record_id for record_id in record_ids if record_id))
+    if not unique_ids:
+        return []
+    projection = {"fields[]": list(fields)} if fields else {}
+
+    def _fetch(chunk: List[str]) -> List[Dict]:
+        params = {**projection, "filterByFormula": _record_id_formula(chunk)}
+        with paced():
+            return _get_all_records(table, params=params, base_url=base_url)
+
+    chunks = _record_id_chunks(unique_ids)
+    if len(chunks) == 1:
+        pages = [_fetch(chunks[0])]
+    else:
+        # Worker threads start without the caller's context (tenant, call ledger); each chunk runs in a copy
+        contexts = [contextvars.copy_context() for _ in chunks]
+        with ThreadPoolExecutor(max_workers=min(AIRTABLE_FETCH_CONCURRENCY, len(chunks))) as executor:
+            pages = list(executor.map(lambda context, chunk: context.run(_fetch, chunk), contexts, chunks))
+
+    records_by_id = {record["id"]: record for page in pages for record in page}
+    return [records_by_id[record_id] for record_id in unique_ids if record_id in records_by_id]
+
+def update_records_batch(table: str, updates: List[Dict[str, Any]], base_url: Optional[str] = None) -> int:
+    """
+    PATCH records in batches of AIRTABLE_BATCH_SIZE
+
+    Args:
+        table: Table name or ID
+        updates: List of {"id": ..., "fields": {...}} dictionaries
+        base_url: Base URL of the base holding the table
+
+    Returns:
+        Number of records successfully updated
+    """
+    return len(updates) - len(update_records_batches(table, updates, base_url))
+
+def update_records_batches(table: str, updates: List[Dict[str, Any]],
+                           base_url: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    PATCH records in batches of AIRTABLE_BATCH_SIZE, reporting the updates that were not written
+
+    Failed batches are logged; callers that must not lose them (e.g. buffered
+    delivery statuses) retry the returned updates.
+
+    Returns:
+        The updates of every batch that failed (empty if all were written)
+    """
+    tenant = tenants.current()
+    failed = []
+    for batch in _chunked(updates, AIRTABLE_BATCH_SIZE):
+        try:
+            _make_request("PATCH", table, {"records": batch}, base_url=base_url)
+            if table == tenant.checkins_table:
+                for record in batch:
+                    if "Status" in record["fields"]:
+                        _notify("checkin", record["id"], None, record["fields"]["Status"])
+        except Exception as e:
+            logger.error("Error updating batch of %s records in %s: %s", len(batch), table, e)
+            failed.extend(batch)
+    return failed
+
+def write_people_batch(records: List[Dict[str, Any]], create: bool = False) -> List[Dict]:
+    """
+    Create or update up to AIRTABLE_BATCH_SIZE People records in one request
+
+    Args:
+        records: [{"id": ..., "fields": {...}}] to update, or [{"fields": {...}}] to create
+        create: POST new records instead of PATCHing existing ones
+
+    Returns:
+        Written records in request order (created records carry their new IDs)
+
+    Raises:
+        AirtableError: If Airtable rejects the request
+    """
+    if len(records) > AIRTABLE_BATCH_SIZE:
+        raise ValueError(f"At most {AIRTABLE_BATCH_SIZE} records per request")
+    response = _make_request("POST" if create else "PATCH", tenants.current().people_table,
+                             {"records": records, "typecast": True})
+    written = response.get("records", [])
+    for submitted, record in zip(records, written):
+        _notify("person", record["id"], submitted["fields"])
+    return written
 
 # =============================================================================
 # PEOPLE MANAGEMENT
@@ -108,18 +383,19 @@ def _make_request(method: str, endpoint: str, data: Optional[Dict] = None, base_
 
 def get_person_by_phone(phone: str, prefer_checkins: bool = False) -> Optional[Dict]:
     """Get a person record by phone number"""
+    tenant = tenants.current()
     try:
         # Normalize the input phone number
         normalized_phone = _normalize_phone(phone)
         
         # If prefer_checkins is True, try check-ins people table first
         if prefer_checkins:
-            checkins_people_table = os.getenv("AIRTABLE_CHECKINS_PEOPLE_TABLE")
+            checkins_people_table = tenant.checkins_people_table
             if checkins_people_table:
-                print(f"🔍 Looking in check-ins people table: {checkins_people_table}")
-                response = _make_request("GET", checkins_people_table, base_url=AIRTABLE_CHECKINS_BASE_URL)
+                logger.debug("Looking in check-ins people table: %s", checkins_people_table)
+                response = _make_request("GET", checkins_people_table, base_url=tenant.checkins_base_url)
                 records = response.get("records", [])
-                print(f"🔍 Found {len(records)} people in check-ins base")
+                logger.debug("Found %s people in check-ins base", len(records))
                 
                 for record in records:
                     record_phone = record.get("fields", {}).get("Phone", "")
@@ -127,52 +403,56 @@ def get_person_by_phone(phone: str, prefer_checkins: bool = False) -> Optional[D
                         # Normalize the phone number from the record
                         normalized_record_phone = _normalize_phone(record_phone)
                         if normalized_phone == normalized_record_phone:
-                            print(f"🔍 Found person in check-ins base: {record.get('id')}")
+                            logger.debug("Found person in check-ins base: %s", record.get('id'))
                             return record
         
-        # Try the main people table
-        response = _make_request("GET", AIRTABLE_PEOPLE_TABLE)
-        records = response.get("records", [])
-        
-        for record in records:
-            record_phone = record.get("fields", {}).get("Phone", "")
-            if record_phone:
-                # Normalize the phone number from the record
-                normalized_record_phone = _normalize_phone(record_phone)
-                if normalized_phone == normalized_record_phone:
-                    # Found in main base - now get the corresponding record from check-ins mirror
-                    person_name = record.get("fields", {}).get("Name", "")
-                    if person_name:
-                        print(f"🔍 Found in main base: {person_name}, looking for mirror in check-ins base")
-                        # Look up the same person in the check-ins people table
-                        checkins_people_table = os.getenv("AIRTABLE_CHECKINS_PEOPLE_TABLE")
-                        if checkins_people_table:
-                            checkins_response = _make_request("GET", checkins_people_table, base_url=AIRTABLE_CHECKINS_BASE_URL)
-                            checkins_records = checkins_response.get("records", [])
-                            
-                            # Handle pagination - get all records
-                            while checkins_response.get('offset'):
-                                next_page_url = f"{checkins_people_table}?offset={checkins_response['offset']}"
-                                checkins_response = _make_request("GET", next_page_url, base_url=AIRTABLE_CHECKINS_BASE_URL)
-                                checkins_records.extend(checkins_response.get("records", []))
-                            
-                            print(f"🔍 Searching through {len(checkins_records)} records in check-ins base")
-                            
-                            for checkins_record in checkins_records:
-                                checkins_name = checkins_record.get("fields", {}).get("Name", "")
-                                if checkins_name and checkins_name.lower() == person_name.lower():
-                                    print(f"🔍 Found mirror in check-ins base: {checkins_record.get('id')}")
-                                    return checkins_record
+        # Try the main people table: the warmed people cache while it is fresh, otherwise
+        # Airtable (also when the cache misses, for people added outside the app)
+        from . import people_cache
+        directory = people_cache.current_cache()
+        record = directory.find_by_phone(phone) if directory.fresh else None
+        if record is None:
+            response = _make_request("GET", tenant.people_table)
+            record = next((
+                candidate for candidate in response.get("records", [])
+                if candidate.get("fields", {}).get("Phone")
+                and _normalize_phone(candidate["fields"]["Phone"]) == normalized_phone
+            ), None)
+        
+        if record is not None:
+            # Found in main base - now get the corresponding record from check-ins mirror
+            person_name = record.get("fields", {}).get("Name", "")
+            if person_name:
+                logger.debug("Found in main base: %s, looking for mirror in check-ins base", person_name)
+                # Look up the same person in the check-ins people table
+                checkins_people_table = tenant.checkins_people_table
+                if checkins_people_table:
+                    checkins_response = _make_request("GET", checkins_people_table, base_url=tenant.checkins_base_url)
+                    checkins_records = checkins_response.get("records", [])
                     
-                    # If no mirror found, return the main base record
-                    print(f"🔍 No mirror found, using main base record: {record.get('id')}")
-                    return record
+                    # Handle pagination - get all records
+                    while checkins_response.get('offset'):
+                        next_page_url = f"{checkins_people_table}?offset={checkins_response['offset']}"
+                        checkins_response = _make_request("GET", next_page_url, base_url=tenant.checkins_base_url)
+                        checkins_records.extend(checkins_response.get("records", []))
+                    
+                    logger.debug("Searching through %s records in check-ins base", len(checkins_records))
+                    
+                    for checkins_record in checkins_records:
+                        checkins_name = checkins_record.get("fields", {}).get("Name", "")
+                        if checkins_name and checkins_name.lower() == person_name.lower():
+                            logger.debug("Found mirror in check-ins base: %s", checkins_record.get('id'))
+                            return checkins_record
+            
+            # If no mirror found, return the main base record
+            logger.debug("No mirror found, using main base record: %s", record.get('id'))
+            return record
         
         # If not found in main table and not already tried, try the check-ins people table
         if not prefer_checkins:
-            checkins_people_table = os.getenv("AIRTABLE_CHECKINS_PEOPLE_TABLE")
+            checkins_people_table = tenant.checkins_people_table
             if checkins_people_table:
-                response = _make_request("GET", checkins_people_table, base_url=AIRTABLE_CHECKINS_BASE_URL)
+                response = _make_request("GET", checkins_people_table, base_url=tenant.checkins_base_url)
                 records = response.get("records", [])
                 
                 for record in records:
@@ -185,7 +465,7 @@ def get_person_by_phone(phone: str, prefer_checkins: bool = False) -> Optional[D
         
         return None
     except Exception as e:
-        print(f"Error getting person by phone {phone}: {e}")
+        logger.error("Error getting person by phone %s: %s", phone, e)
         return None
 
 def _normalize_phone(phone: str) -> str:
@@ -209,6 +489,7 @@ def _normalize_phone(phone: str) -> str:
 
 def update_person(person_id: str, fields: Dict[str, Any]) -> bool:
     """Update a person record with new fields"""
+    tenant = tenants.current()
     try:
         data = {
             "records": [{
@@ -217,14 +498,16 @@ def update_person(person_id: str, fields: Dict[str, Any]) -> bool:
             }]
         }
         
-        _make_request("PATCH", AIRTABLE_PEOPLE_TABLE, data)
+        _make_request("PATCH", tenant.people_table, data)
+        _notify("person", person_id, fields)
         return True
     except Exception as e:
-        print(f"Error updating person {person_id}: {e}")
+        logger.error("Error updating person %s: %s", person_id, e)
         return False
 
 def create_person(fields: Dict[str, Any]) -> Optional[str]:
     """Create a new person record and return the person ID"""
+    tenant = tenants.current()
     try:
         data = {
             "records": [{
@@ -232,101 +515,156 @@ def create_person(fields: Dict[str, Any]) -> Optional[str]:
             }]
         }
         
-        print(f"🔧 Creating person with fields: {fields}")
-        response = _make_request("POST", AIRTABLE_PEOPLE_TABLE, data)
+        logger.debug("Creating person", extra={"fields": fields})
+        response = _make_request("POST", tenant.people_table, data)
         
         if not response or "records" not in response or len(response["records"]) == 0:
-            print(f"❌ Error: Invalid response from Airtable: {response}")
+            logger.error("Error: Invalid response from Airtable: %s", response)
             return None
         
         person_id = response["records"][0]["id"]
-        print(f"✅ Successfully created person with ID: {person_id}")
+        logger.info("Successfully created person with ID: %s", person_id)
+        _notify("person", person_id, fields)
         return person_id
         
     except KeyError as e:
-        print(f"❌ Error: Missing key in response: {e}, Response: {response if 'response' in locals() else 'N/A'}")
+        logger.error("Error: Missing key in response: %s, Response: %s", e, response if 'response' in locals() else 'N/A')
         return None
     except IndexError as e:
-        print(f"❌ Error: No records in response: {e}, Response: {response if 'response' in locals() else 'N/A'}")
+        logger.error("Error: No records in response: %s, Response: %s", e, response if 'response' in locals() else 'N/A')
         return None
     except Exception as e:
-        print(f"❌ Error creating person: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error creating person: %s", e)
         return None
 
 # =============================================================================
 # CHECK-IN MANAGEMENT
 # =============================================================================
 
+# A created check-in's ID is shared with other instances for a month and then some
+CHECKIN_KEY_TTL_SECONDS = 40 * 24 * 3600
+
+def load_checkins(month: str) -> int:
+    """
+    List one month's check-ins into the check-in cache (one projected, paginated GET)
+
+    Check-ins created before Month was written are listed too (blank Month)
+    and matched by creation month.
+
+    Returns:
+        Number of check-ins cached for the month
+    """
+    tenant = tenants.current()
+    records = _get_all_records(
+        tenant.checkins_table,
+        {"filterByFormula": f"OR({{Month}} = '{month}', {{Month}} = '')", "fields[]": ["Person", "Month"]},
+        base_url=tenant.checkins_base_url
+    )
+    checkins = checkin_cache.current_cache()
+    checkins.load(month, records)
+    return sum(1 for record in records if checkin_cache.record_month(record) == month)
+
+def _find_checkin(person_id: str, month: str) -> Optional[str]:
+    """The person's check-in for the month: cached, created by another instance, or in the month's listing"""
+    checkins = checkin_cache.current_cache()
+    checkin_id = checkins.get(person_id, month)
+    if checkin_id is None:
+        checkin_id = coordination.get_value(f"checkin:{person_id}:{month}")
+        if checkin_id is None and not checkins.is_loaded(month):
+            load_checkins(month)
+            checkin_id = checkins.get(person_id, month)
+        if checkin_id is not None:
+            checkins.put(person_id, month, checkin_id)
+    return checkin_id
+
 def upsert_checkin(person_id: str, month: str, status: str = "Sent", 
                    pending_changes: Optional[str] = None, transcript: str = "") -> Optional[str]:
-    """Create or update a check-in record"""
+    """
+    Create or update the person's check-in for the month
+
+    The check-in is resolved through the check-in cache, so a repeat touch
+    is one PATCH. The lookup and create run under a lock per person and
+    month, and created IDs are shared through coordination, so concurrent
+    upserts on any instance create one check-in.
+    """
+    with coordination.lock(f"checkin:{person_id}:{month}") as locked:
+        if not locked:
+            logger.warning("Upserting check-in for person %s, month %s without its lock", person_id, month)
+        return _upsert_checkin(person_id, month, status, pending_changes, transcript)
+
+def _upsert_checkin(person_id: str, month: str, status: str, pending_changes: Optional[str],
+                    transcript: str) -> Optional[str]:
+    tenant = tenants.current()
+    checkins = checkin_cache.current_cache()
     try:
-        print(f"🔧 upsert_checkin: person_id={person_id}, month={month}, status={status}")
-        print(f"🔧 Using checkins base: {AIRTABLE_CHECKINS_BASE_URL}")
-        print(f"🔧 Using checkins table: {AIRTABLE_CHECKINS_TABLE}")
-        
-        # First try to find existing check-in
-        filter_formula = f"{{Person}} = '{person_id}'"
-        endpoint = f"{AIRTABLE_CHECKINS_TABLE}?filterByFormula={filter_formula}"
-        print(f"🔧 Looking for existing checkin with filter: {filter_formula}")
-        
-        response = _make_request("GET", endpoint, base_url=AIRTABLE_CHECKINS_BASE_URL)
-        existing_records = response.get("records", [])
-        print(f"🔧 Found {len(existing_records)} existing checkins")
-        
-        checkin_data = {
-            "Person": [person_id],  # Reference to person in same base
-            "Status": status  # Use the provided status
-        }
-        
-        print(f"🔧 Checkin data: {checkin_data}")
+        logger.debug("upsert_checkin: person_id=%s, month=%s, status=%s", person_id, month, status)
         
         # Note: Pending Changes field may not exist in all tables
         # if pending_changes:
         #     checkin_data["Pending Changes"] = pending_changes
         
-        if existing_records:
-            # Update existing check-in
-            checkin_id = existing_records[0]["id"]
-            print(f"🔧 Updating existing checkin: {checkin_id}")
+        checkin_id = _find_checkin(person_id, month)
+        if checkin_id:
+            # Update existing check-in (Month is written for check-ins created without it)
+            logger.debug("Updating existing checkin: %s", checkin_id)
             data = {
                 "records": [{
                     "id": checkin_id,
-                    "fields": checkin_data
-                }]
-            }
-            _make_request("PATCH", AIRTABLE_CHECKINS_TABLE, data, base_url=AIRTABLE_CHECKINS_BASE_URL)
-            return checkin_id
-        else:
-            # Create new check-in
-            print(f"🔧 Creating new checkin")
-            data = {
-                "records": [{
-                    "fields": checkin_data
+                    "fields": {"Month": month, "Status": status}
                 }]
             }
-            response = _make_request("POST", AIRTABLE_CHECKINS_TABLE, data, base_url=AIRTABLE_CHECKINS_BASE_URL)
-            checkin_id = response["records"][0]["id"]
-            print(f"🔧 Created checkin with ID: {checkin_id}")
-            return checkin_id
-            
+            try:
+                _make_request("PATCH", tenant.checkins_table, data, base_url=tenant.checkins_base_url)
+                _notify("checkin", checkin_id, month, status)
+                return checkin_id
+            except AirtableError as e:
+                if e.status_code != 404:
+                    raise
+                # Deleted in Airtable since it was cached: create a new one
+                logger.warning("Cached check-in %s no longer exists, creating a new one", checkin_id)
+                checkins.discard(person_id, month)
+        
+        # Create new check-in
+        logger.debug("Creating new checkin")
+        data = {
+            "records": [{
+                "fields": {
+                    "Person": [person_id],  # Reference to person in same base
+                    "Month": month,
+                    "Status": status
+                }
+            }]
+        }
+        response = _make_request("POST", tenant.checkins_table, data, base_url=tenant.checkins_base_url)
+        checkin_id = response["records"][0]["id"]
+        logger.debug("Created checkin with ID: %s", checkin_id)
+        checkins.put(person_id, month, checkin_id)
+        coordination.put_value(f"checkin:{person_id}:{month}", checkin_id, CHECKIN_KEY_TTL_SECONDS)
+        _notify("checkin", checkin_id, month, status)
+        return checkin_id
+        
     except Exception as e:
-        print(f"❌ Error upserting checkin for person {person_id}, month {month}: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error upserting checkin for person %s, month %s: %s", person_id, month, e)
         return None
 
 def log_message(checkin_id: str, direction: str, from_number: str, body: str, 
-                twilio_sid: str, parsed_json: Optional[str] = None) -> bool:
-    """Log a message in the Messages table"""
+                twilio_sid: str, parsed_json: Optional[str] = None) -> Optional[str]:
+    """Log a message in the Messages table and return the new record ID"""
+    tenant = tenants.current()
     try:
         message_data = {
             "From": from_number,
-            "Body": body
+            "Body": body,
+            "Direction": direction,
+            "When": datetime.now().isoformat()
         }
         
+        if checkin_id:
+            message_data["Check-in"] = [checkin_id]
+        
+        if twilio_sid:
+            message_data["Twilio SID"] = twilio_sid
+        
         if parsed_json:
             message_data["Parsed JSON"] = parsed_json
         
@@ -336,28 +674,43 @@ def log_message(checkin_id: str, direction: str, from_number: str, body: str,
             }]
         }
         
-        _make_request("POST", AIRTABLE_MESSAGES_TABLE, data, base_url=AIRTABLE_CHECKINS_BASE_URL)
-        return True
+        response = _make_request("POST", tenant.messages_table, data, base_url=tenant.checkins_base_url)
+        _notify("message", checkin_id, direction, message_data["When"])
+        return response["records"][0]["id"]
     except Exception as e:
-        print(f"Error logging message for checkin {checkin_id}: {e}")
-        return False
+        logger.error("Error logging message for checkin %s: %s", checkin_id, e)
+        return None
+
+# Fields needed to schedule and compose a check-in
+CHECKIN_FIELDS = [
+    "Name", "Phone", "Company", "Role", "City", "Tags",
+    "Last Confirmed", "Check-in Frequency", "Consent", "Opt-out", "Timezone"
+]
 
 def get_people_due_for_checkin() -> List[Dict]:
-    """Get people who are due for monthly check-in"""
+    """
+    Get every consented, non-opted-out person on a Monthly or Quarterly schedule
+
+    Only CHECKIN_FIELDS are fetched; the due-date filtering happens in the
+    scheduler's due-date index.
+    """
+    tenant = tenants.current()
     try:
-        # Get people with Monthly frequency who haven't been checked in recently
-        # This is a simplified filter - you might want to make this more sophisticated
-        filter_formula = "AND({Check-in Frequency} = 'Monthly', {Opt-out} != 1, {Consent} = 1)"
-        endpoint = f"{AIRTABLE_PEOPLE_TABLE}?filterByFormula={filter_formula}"
-        
-        response = _make_request("GET", endpoint)
-        return response.get("records", [])
+        filter_formula = (
+            "AND(OR({Check-in Frequency} = 'Monthly', {Check-in Frequency} = 'Quarterly'), "
+            "{Opt-out} != 1, {Consent} = 1)"
+        )
+        return _get_all_records(tenant.people_table, {
+            "filterByFormula": filter_formula,
+            "fields[]": CHECKIN_FIELDS
+        })
     except Exception as e:
-        print(f"Error getting people due for checkin: {e}")
+        logger.error("Error getting people due for checkin: %s", e)
         return []
 
 def update_checkin_status(checkin_id: str, status: str, pending_changes: Optional[str] = None) -> bool:
     """Update check-in status and optionally pending changes"""
+    tenant = tenants.current()
     try:
         fields = {"Status": status}
         if pending_changes is not None:
@@ -370,19 +723,23 @@ def update_checkin_status(checkin_id: str, status: str, pending_changes: Optiona
             }]
         }
         
-        _make_request("PATCH", AIRTABLE_CHECKINS_TABLE, data, base_url=AIRTABLE_CHECKINS_BASE_URL)
+        _make_request("PATCH", tenant.checkins_table, data, base_url=tenant.checkins_base_url)
+        _notify("checkin", checkin_id, None, status)
         return True
     except Exception as e:
-        print(f"Error updating checkin status {checkin_id}: {e}")
+        logger.error("Error updating checkin status %s: %s", checkin_id, e)
         return False
 
 def append_to_transcript(checkin_id: str, message: str) -> bool:
     """Append a message to the check-in transcript"""
+    tenant = tenants.current()
     try:
         # First get current transcript
-        endpoint = f"{AIRTABLE_CHECKINS_TABLE}/{checkin_id}"
-        response = _make_request("GET", endpoint, base_url=AIRTABLE_CHECKINS_BASE_URL)
-        current_transcript = response.get("fields", {}).get("Transcript", "")
+        record = get_record(tenant.checkins_table, checkin_id, base_url=tenant.checkins_base_url)
+        if record is None:
+            logger.warning("Check-in %s not found; transcript not updated", checkin_id)
+            return False
+        current_transcript = record.get("fields", {}).get("Transcript", "")
         
         # Append new message with timestamp
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -396,40 +753,43 @@ def append_to_transcript(checkin_id: str, message: str) -> bool:
             }]
         }
         
-        _make_request("PATCH", AIRTABLE_CHECKINS_TABLE, data, base_url=AIRTABLE_CHECKINS_BASE_URL)
+        _make_request("PATCH", tenant.checkins_table, data, base_url=tenant.checkins_base_url)
         return True
     except Exception as e:
-        print(f"Error appending to transcript for checkin {checkin_id}: {e}")
+        logger.error("Error appending to transcript for checkin %s: %s", checkin_id, e)
         return False
 
 def get_all_people() -> List[Dict]:
     """Get all people from Airtable"""
+    tenant = tenants.current()
     try:
-        endpoint = f"{AIRTABLE_PEOPLE_TABLE}"
+        endpoint = f"{tenant.people_table}"
         response = _make_request("GET", endpoint)
         return response.get("records", [])
     except Exception as e:
-        print(f"Error getting all people: {e}")
+        logger.error("Error getting all people: %s", e)
         return []
 
 def get_all_reminders() -> List[Dict]:
     """Get all reminders from Airtable"""
+    tenant = tenants.current()
     try:
-        endpoint = f"{AIRTABLE_REMINDERS_TABLE}"
-        response = _make_request("GET", endpoint, base_url=AIRTABLE_REMINDERS_BASE_URL)
+        endpoint = f"{tenant.reminders_table}"
+        response = _make_request("GET", endpoint, base_url=tenant.reminders_base_url)
         return response.get("records", [])
     except Exception as e:
-        print(f"Error getting all reminders: {e}")
+        logger.error("Error getting all reminders: %s", e)
         return []
 
 def get_all_checkins() -> List[Dict]:
     """Get all check-ins from Airtable"""
+    tenant = tenants.current()
     try:
-        endpoint = f"{AIRTABLE_CHECKINS_TABLE}"
-        response = _make_request("GET", endpoint, base_url=AIRTABLE_CHECKINS_BASE_URL)
+        endpoint = f"{tenant.checkins_table}"
+        response = _make_request("GET", endpoint, base_url=tenant.checkins_base_url)
         return response.get("records", [])
     except Exception as e:
-        print(f"Error getting all check-ins: {e}")
+        logger.error("Error getting all check-ins: %s", e)
         return []
 
 # =============================================================================
@@ -438,21 +798,24 @@ def get_all_checkins() -> List[Dict]:
 
 def create_reminder(reminder_data: Dict[str, Any]) -> bool:
     """Create a new reminder record in the Reminders table"""
+    tenant = tenants.current()
     try:
-        endpoint = f"{AIRTABLE_REMINDERS_TABLE}"
-        response = _make_request("POST", endpoint, {"fields": reminder_data}, base_url=AIRTABLE_REMINDERS_BASE_URL)
+        endpoint = f"{tenant.reminders_table}"
+        response = _make_request("POST", endpoint, {"fields": reminder_data}, base_url=tenant.reminders_base_url)
         return response is not None
     except Exception as e:
-        print(f"Error creating reminder: {e}")
+        logger.error("Error creating reminder: %s", e)
         return False
 
 def create_reminder_for_person(person_name: str, reminder_text: str, due_date: str = None) -> bool:
     """Create a reminder linked to a specific person"""
+    tenant = tenants.current()
     try:
         # First, find the person in the main people table
         person_record = find_person_in_reminders_base(person_name)
         if not person_record:
-            print(f"Person '{person_name}' not found in reminders base - DEBUG: Base={AIRTABLE_REMINDERS_BASE_ID}, Table={AIRTABLE_REMINDERS_MAIN_PEOPLE_TABLE}")
+            logger.warning("Person '%s' not found in reminders base (base=%s, table=%s)",
+                           person_name, tenant.setting("AIRTABLE_REMINDERS_BASE_ID"), tenant.reminders_people_table)
             return False
         
         # Create the reminder with link to person
@@ -468,80 +831,52 @@ def create_reminder_for_person(person_name: str, reminder_text: str, due_date: s
         return create_reminder(reminder_data)
         
     except Exception as e:
-        print(f"Error creating reminder for person: {e}")
+        logger.error("Error creating reminder for person: %s", e)
         return False
 
 def find_person_in_reminders_base(person_name: str) -> Optional[Dict[str, Any]]:
     """Find a person in the reminders base main people table"""
+    tenant = tenants.current()
     try:
-        endpoint = f"{AIRTABLE_REMINDERS_MAIN_PEOPLE_TABLE}"
-        # Use case-insensitive search with LOWER() function
-        params = {"filterByFormula": f"SEARCH(LOWER('{person_name.lower()}'), LOWER({{Name}}))"}
-        response = _make_request("GET", endpoint, params=params, base_url=AIRTABLE_REMINDERS_BASE_URL)
-        
-        records = response.get("records", [])
-        if records:
-            return records[0]  # Return first match
-        
-        # If no exact match, try partial matching
-        params = {"filterByFormula": f"FIND(LOWER('{person_name.lower()}'), LOWER({{Name}}))"}
-        response = _make_request("GET", endpoint, params=params, base_url=AIRTABLE_REMINDERS_BASE_URL)
+        endpoint = f"{tenant.reminders_people_table}"
+        # Case-insensitive substring match; only the first match is needed
+        params = {"filterByFormula": f"SEARCH(LOWER('{person_name.lower()}'), LOWER({{Name}}))", "maxRecords": 1}
+        response = _make_request("GET", endpoint, params=params, base_url=tenant.reminders_base_url)
         
         records = response.get("records", [])
-        if records:
-            return records[0]  # Return first match
-            
-        return None
+        return records[0] if records else None
         
     except Exception as e:
-        print(f"Error finding person in reminders base: {e}")
+        logger.error("Error finding person in reminders base: %s", e)
         return None
 
 def find_person_in_notes_base(person_name: str) -> Optional[Dict[str, Any]]:
     """Find a person in the Notes base people table by name"""
+    tenant = tenants.current()
     try:
-        endpoint = f"{AIRTABLE_NOTES_MAIN_PEOPLE_TABLE}"
-        # Use case-insensitive search with LOWER() function
-        params = {"filterByFormula": f"SEARCH(LOWER('{person_name.lower()}'), LOWER({{Name}}))"}
-        response = _make_request("GET", endpoint, params=params, base_url=AIRTABLE_NOTES_BASE_URL)
+        endpoint = f"{tenant.notes_people_table}"
+        # Case-insensitive substring match; only the first match is needed
+        params = {"filterByFormula": f"SEARCH(LOWER('{person_name.lower()}'), LOWER({{Name}}))", "maxRecords": 1}
+        response = _make_request("GET", endpoint, params=params, base_url=tenant.notes_base_url)
         
         records = response.get("records", [])
-        if records:
-            return records[0]  # Return first match
-        
-        # If no exact match, try partial matching
-        params = {"filterByFormula": f"FIND(LOWER('{person_name.lower()}'), LOWER({{Name}}))"}
-        response = _make_request("GET", endpoint, params=params, base_url=AIRTABLE_NOTES_BASE_URL)
-        
-        records = response.get("records", [])
-        if records:
-            return records[0]  # Return first match
-            
-        return None
+        return records[0] if records else None
         
     except Exception as e:
-        print(f"Error finding person in notes base: {e}")
+        logger.error("Error finding person in notes base: %s", e)
         return None
 
 def find_people_in_notes_base(person_name: str) -> List[Dict[str, Any]]:
     """Find all people matching the name (returns all matches, not just first)"""
+    tenant = tenants.current()
     try:
-        endpoint = f"{AIRTABLE_NOTES_MAIN_PEOPLE_TABLE}"
+        endpoint = f"{tenant.notes_people_table}"
+        # Case-insensitive substring match (FIND on the lowered values would match the same records)
         params = {"filterByFormula": f"SEARCH(LOWER('{person_name.lower()}'), LOWER({{Name}}))"}
-        response = _make_request("GET", endpoint, params=params, base_url=AIRTABLE_NOTES_BASE_URL)
-        
-        records = response.get("records", [])
-        if records:
-            return records
-        
-        # If no match with SEARCH, try FIND as fallback
-        params = {"filterByFormula": f"FIND(LOWER('{person_name.lower()}'), LOWER({{Name}}))"}
-        response = _make_request("GET", endpoint, params=params, base_url=AIRTABLE_NOTES_BASE_URL)
-        
-        return response.get("records", [])
+        return _get_all_records(endpoint, params=params, base_url=tenant.notes_base_url)
         
     except Exception as e:
-        print(f"Error finding people in notes base: {e}")
+        logger.error("Error finding people in notes base: %s", e)
         return []
 
 def find_person_in_main_base(person_name: str) -> Optional[Dict[str, Any]]:
@@ -559,7 +894,7 @@ def find_person_in_main_base(person_name: str) -> Optional[Dict[str, Any]]:
         
         return None
     except Exception as e:
-        print(f"Error finding person in main base: {e}")
+        logger.error("Error finding person in main base: %s", e)
         return None
 
 # =============================================================================
@@ -568,6 +903,7 @@ def find_person_in_main_base(person_name: str) -> Optional[Dict[str, Any]]:
 
 def create_note(note_data: Dict[str, Any]) -> bool:
     """Create a new note record in the Notes table"""
+    tenant = tenants.current()
     try:
         data = {
             "records": [{
@@ -575,10 +911,10 @@ def create_note(note_data: Dict[str, Any]) -> bool:
             }]
         }
         
-        response = _make_request("POST", AIRTABLE_NOTES_TABLE, data, base_url=AIRTABLE_NOTES_BASE_URL)
+        response = _make_request("POST", tenant.notes_table, data, base_url=tenant.notes_base_url)
         return response is not None
     except Exception as e:
-        print(f"Error creating note: {e}")
+        logger.error("Error creating note: %s", e)
         return False
 
 # =============================================================================
@@ -587,71 +923,77 @@ def create_note(note_data: Dict[str, Any]) -> bool:
 
 def create_followup(followup_data: Dict[str, Any]) -> bool:
     """Create a new follow-up record in the Followups table"""
+    tenant = tenants.current()
     try:
-        endpoint = f"{AIRTABLE_FOLLOWUPS_TABLE}"
+        endpoint = f"{tenant.followups_table}"
         response = _make_request("POST", endpoint, {"fields": followup_data})
         return response is not None
     except Exception as e:
-        print(f"Error creating followup: {e}")
+        logger.error("Error creating followup: %s", e)
         return False
 
 def get_reminders_for_person(person_id: str) -> List[Dict[str, Any]]:
     """Get all reminders for a specific person"""
+    tenant = tenants.current()
     try:
-        endpoint = f"{AIRTABLE_REMINDERS_TABLE}"
+        endpoint = f"{tenant.reminders_table}"
         params = {"filterByFormula": f"{{Person}} = '{person_id}'"}
-        response = _make_request("GET", endpoint, params=params, base_url=AIRTABLE_REMINDERS_BASE_URL)
+        response = _make_request("GET", endpoint, params=params, base_url=tenant.reminders_base_url)
         return response.get("records", [])
     except Exception as e:
-        print(f"Error getting reminders for person: {e}")
+        logger.error("Error getting reminders for person: %s", e)
         return []
 
 def get_notes_for_person(person_id: str) -> List[Dict[str, Any]]:
     """Get all notes for a specific person"""
+    tenant = tenants.current()
     try:
-        endpoint = f"{AIRTABLE_NOTES_TABLE}"
+        endpoint = f"{tenant.notes_table}"
         params = {"filterByFormula": f"{{Person}} = '{person_id}'"}
         response = _make_request("GET", endpoint, params=params)
         return response.get("records", [])
     except Exception as e:
-        print(f"Error getting notes for person: {e}")
+        logger.error("Error getting notes for person: %s", e)
         return []
 
 def get_followups_for_person(person_id: str) -> List[Dict[str, Any]]:
     """Get all follow-ups for a specific person"""
+    tenant = tenants.current()
     try:
-        endpoint = f"{AIRTABLE_FOLLOWUPS_TABLE}"
+        endpoint = f"{tenant.followups_table}"
         params = {"filterByFormula": f"{{Person}} = '{person_id}'"}
         response = _make_request("GET", endpoint, params=params)
         return response.get("records", [])
     except Exception as e:
-        print(f"Error getting followups for person: {e}")
+        logger.error("Error getting followups for person: %s", e)
         return []
 
 def update_reminder_status(reminder_id: str, status: str, completed_at: Optional[str] = None) -> bool:
     """Update the status of a reminder"""
+    tenant = tenants.current()
     try:
         updates = {"Status": status}
         if completed_at:
             updates["Completed At"] = completed_at
         
-        endpoint = f"{AIRTABLE_REMINDERS_TABLE}/{reminder_id}"
-        response = _make_request("PATCH", endpoint, {"fields": updates}, base_url=AIRTABLE_REMINDERS_BASE_URL)
+        endpoint = f"{tenant.reminders_table}/{reminder_id}"
+        response = _make_request("PATCH", endpoint, {"fields": updates}, base_url=tenant.reminders_base_url)
         return response is not None
     except Exception as e:
-        print(f"Error updating reminder status: {e}")
+        logger.error("Error updating reminder status: %s", e)
         return False
 
 def update_followup_status(followup_id: str, status: str, completed_at: Optional[str] = None) -> bool:
     """Update the status of a follow-up"""
+    tenant = tenants.current()
     try:
         updates = {"Status": status}
         if completed_at:
             updates["Completed At"] = completed_at
         
-        endpoint = f"{AIRTABLE_FOLLOWUPS_TABLE}/{followup_id}"
+        endpoint = f"{tenant.followups_table}/{followup_id}"
         response = _make_request("PATCH", endpoint, {"fields": updates})
         return response is not None
     except Exception as e:
-        print(f"Error updating followup status: {e}")
+        logger.error("Error updating followup status: %s", e)
         return False
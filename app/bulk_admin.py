@@ -0,0 +1,313 @@
+"""
+Bulk Admin Module
+
+This module applies admin operations from an uploaded CSV or NDJSON file so
+large contact imports and edits do not cost one table scan and one PATCH per
+change. It includes:
+- Incremental CSV/NDJSON row parsing as the upload streams in
+- Validation using the same commands and formats as admin SMS commands
+- Name resolution against the people cache search index (no table scans)
+- Per-person merging of changes and 10-record batched writes under the Airtable rate limit
+- Per-row results suitable for a streaming NDJSON progress response
+"""
+
+import codecs
+import csv
+import json
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from . import airtable
+from .people_cache import PeopleCache
+from .people_search import MAX_SEARCH_LIMIT
+from .rate_limit import RateLimiter
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Update commands: command -> (row key holding the value, People field)
+BULK_OPERATIONS = {
+    "add_birthday": ("birthday", "Birthday"),
+    "change_role": ("new_role", "Role"),
+    "change_company": ("new_company", "Company"),
+    "add_email": ("email", "Email"),
+    "add_phone": ("phone", "Phone"),
+    "add_linkedin": ("linkedin", "LinkedIn"),
+    "add_tags": ("tags", "Tags"),
+}
+
+# Creates a person; any of the value keys above may be given to fill more fields
+CREATE_COMMAND = "new_friend"
+
+BULK_MAX_ROWS = 50_000
+
+_EMAIL_PATTERN = re.compile(r"^[^\s@<>\"']+@[^\s@<>\"']+\.[^\s@<>\"']+$")
+
+# =============================================================================
+# PARSING
+# =============================================================================
+
+class RowParser:
+    """
+    Incremental parser for CSV (with a header row) or NDJSON uploads
+
+    Feed raw upload chunks as they arrive; complete rows are returned as
+    (row_number, row) pairs. Row numbers count data rows from 1.
+    """
+
+    def __init__(self, fmt: str):
+        if fmt not in ("csv", "ndjson"):
+            raise ValueError(f"Unsupported bulk format: {fmt}")
+        self.fmt = fmt
+        self.rows = 0
+        self._partial = ""
+        self._record = ""
+        self._header: Optional[List[str]] = None
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+
+    def feed(self, data: bytes) -> List[Tuple[int, Any]]:
+        lines = (self._partial + self._decoder.decode(data)).split("\n")
+        self._partial = lines.pop()
+        return [row for row in map(self._line, lines) if row is not None]
+
+    def close(self) -> List[Tuple[int, Any]]:
+        rest = self._partial + self._decoder.decode(b"", final=True)
+        rows = [self._line(line) for line in rest.split("\n")]
+        self._partial = ""
+        if self._record:
+            self.rows += 1
+            rows.append((self.rows, ValueError("Unterminated quoted CSV field")))
+            self._record = ""
+        return [row for row in rows if row is not None]
+
+    def _line(self, line: str) -> Optional[Tuple[int, Any]]:
+        if self.fmt == "ndjson":
+            if not line.strip():
+                return None
+            self.rows += 1
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                return self.rows, ValueError(f"Invalid JSON: {e}")
+            if not isinstance(row, dict):
+                return self.rows, ValueError("Each NDJSON line must be an object")
+            return self.rows, row
+
+        # A CSV record may span lines inside quotes; it is complete once its quotes balance
+        self._record = f"{self._record}\n{line}" if self._record else line
+        if self._record.count('"') % 2:
+            return None
+        record, self._record = self._record, ""
+        if not record.strip():
+            return None
+        values = next(csv.reader([record]))
+        if self._header is None:
+            self._header = [value.strip().lower() for value in values]
+            return None
+        self.rows += 1
+        return self.rows, {key: value for key, value in zip(self._header, values) if value.strip()}
+
+# =============================================================================
+# VALIDATION
+# =============================================================================
+
+def _clean_value(key: str, value: Any) -> Any:
+    """Validate and normalize one field value; raises ValueError with a user-facing reason"""
+    if key == "tags":
+        tags = value if isinstance(value, list) else re.split(r"[;,]", str(value))
+        tags = [str(tag).strip() for tag in tags if str(tag).strip()]
+        if not tags:
+            raise ValueError("No tags given")
+        return tags
+
+    value = str(value).strip()
+    if not value:
+        raise ValueError(f"Missing {key}")
+    if key == "birthday":
+        for fmt in ("%Y-%m-%d", "%m/%d/%Y"):
+            try:
+                return datetime.strptime(value, fmt).strftime("%Y-%m-%d")
+            except ValueError:
+                pass
+        raise ValueError("Birthday must be YYYY-MM-DD or MM/DD/YYYY")
+    if key == "email" and not _EMAIL_PATTERN.match(value):
+        raise ValueError(f"Invalid email: {value}")
+    if key == "phone" and len(airtable._normalize_phone(value)) < 10:
+        raise ValueError(f"Invalid phone: {value}")
+    return value
+
+def normalize_row(row: Dict[str, Any]) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    Turn a raw row into (command, name, People fields)
+
+    Rows use the admin command vocabulary: {"command": "change_role",
+    "name": "Sarah Lee", "new_role": "CTO"}. A generic "value" key may be
+    used instead of the command-specific key.
+
+    Raises:
+        ValueError: If the row is not a valid operation
+    """
+    row = {str(key).strip().lower(): value for key, value in row.items()}
+    command = str(row.get("command", "")).strip().lower().replace(" ", "_")
+    name = str(row.get("name", "")).strip()
+    if not name:
+        raise ValueError("Missing name")
+
+    if command == CREATE_COMMAND:
+        fields = {"Name": name}
+        for key, field in BULK_OPERATIONS.values():
+            if row.get(key) not in (None, ""):
+                fields[field] = _clean_value(key, row[key])
+        return command, name, fields
+
+    if command not in BULK_OPERATIONS:
+        raise ValueError(f"Unknown command: {command or '(none)'}")
+    key, field = BULK_OPERATIONS[command]
+    value = row.get(key, row.get("value"))
+    if value in (None, ""):
+        raise ValueError(f"Missing {key}")
+    return command, name, {field: _clean_value(key, value)}
+
+# =============================================================================
+# BULK IMPORT
+# =============================================================================
+
+class BulkImport:
+    """Collects validated operations, then applies them as batched writes"""
+
+    def __init__(self, cache: PeopleCache, dry_run: bool = False,
+                 rate_limiter: Optional[RateLimiter] = None):
+        self.cache = cache
+        self.dry_run = dry_run
+        # Shared by the tenant's bulk imports so concurrent uploads still respect
+        # Airtable's limit on its base, without slowing other tenants' imports
+        self.rate_limiter = rate_limiter or airtable.bulk_limiter()
+        self._creates: List[Tuple[int, str, Dict[str, Any]]] = []
+        self._create_names: set = set()
+        # person_id -> merged fields and the rows that contributed to them
+        self._updates: Dict[str, Dict[str, Any]] = {}
+        self.rows = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.requests = 0
+        self._started = time.time()
+
+    def _result(self, row_number: int, success: bool, message: str, **extra) -> Dict[str, Any]:
+        if success:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        return {"row": row_number, "success": success, "message": message, **extra}
+
+    def _exact_matches(self, name: str) -> Tuple[List[Dict[str, Any]], int]:
+        """People whose Name equals name (case-insensitive), and how many search hits there were"""
+        _, hits = self.cache.search.search(name, limit=MAX_SEARCH_LIMIT)
+        wanted = name.lower()
+        return [hit for hit in hits if str(hit.get("fields", {}).get("Name", "")).lower() == wanted], len(hits)
+
+    def resolve(self, name: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Resolve a name to a person ID using the search index
+
+        Only an exact (case-insensitive) Name match counts: a prefix hit on
+        another word or field (e.g. a Company) never selects the person to change.
+
+        Returns:
+            (person_id, None) on a unique match, otherwise (None, reason)
+        """
+        exact, hits = self._exact_matches(name)
+        if len(exact) > 1:
+            return None, f"'{name}' is ambiguous ({len(exact)} people with that name)"
+        if exact:
+            return exact[0]["id"], None
+        if hits:
+            return None, f"Person '{name}' not found (no exact name match; use the full name)"
+        return None, f"Person '{name}' not found"
+
+    def add(self, row_number: int, row: Any) -> Optional[Dict[str, Any]]:
+        """
+        Validate and queue one row
+
+        Returns:
+            An error result for rows that cannot be applied, otherwise None
+        """
+        self.rows += 1
+        if isinstance(row, Exception):
+            return self._result(row_number, False, str(row))
+        if self.rows > BULK_MAX_ROWS:
+            return self._result(row_number, False, f"Too many rows (limit {BULK_MAX_ROWS})")
+        try:
+            command, name, fields = normalize_row(row)
+        except ValueError as e:
+            return self._result(row_number, False, str(e))
+
+        if command == CREATE_COMMAND:
+            exact, _ = self._exact_matches(name)
+            if exact or name.lower() in self._create_names:
+                return self._result(row_number, False, f"Person '{name}' already exists", name=name)
+            self._create_names.add(name.lower())
+            self._creates.append((row_number, name, fields))
+            return None
+
+        person_id, error = self.resolve(name)
+        if error:
+            return self._result(row_number, False, error, name=name)
+        pending = self._updates.setdefault(person_id, {"fields": {}, "rows": []})
+        if "Tags" in fields:
+            current = pending["fields"].get("Tags") or self.cache.get(person_id).get("fields", {}).get("Tags") or []
+            fields = {"Tags": list(dict.fromkeys(list(current) + fields["Tags"]))}
+        pending["fields"].update(fields)
+        pending["rows"].append((row_number, name, command))
+        return None
+
+    def _write(self, records: List[Dict[str, Any]], create: bool) -> List[Dict]:
+        if self.dry_run:
+            return [{"id": record.get("id")} for record in records]
+        self.rate_limiter.acquire()
+        self.requests += 1
+        return airtable.write_people_batch(records, create=create)
+
+    def apply(self) -> Iterator[Dict[str, Any]]:
+        """Write queued changes in batches of AIRTABLE_BATCH_SIZE, yielding per-row results"""
+        for batch in airtable._chunked(self._creates, airtable.AIRTABLE_BATCH_SIZE):
+            try:
+                written = self._write([{"fields": fields} for _, _, fields in batch], create=True)
+                for (row_number, name, _), record in zip(batch, written):
+                    message = f"Would add new friend '{name}'" if self.dry_run else f"Added new friend '{name}'"
+                    yield self._result(row_number, True, message,
+                                       name=name, person_id=record.get("id"))
+            except Exception as e:
+                for row_number, name, _ in batch:
+                    yield self._result(row_number, False, f"Failed to create '{name}': {e}", name=name)
+
+        updates = list(self._updates.items())
+        for batch in airtable._chunked(updates, airtable.AIRTABLE_BATCH_SIZE):
+            try:
+                self._write([{"id": person_id, "fields": pending["fields"]} for person_id, pending in batch],
+                            create=False)
+                for person_id, pending in batch:
+                    for row_number, name, command in pending["rows"]:
+                        verb = "Would apply" if self.dry_run else "Applied"
+                        yield self._result(row_number, True, f"{verb} {command} for {name}",
+                                           name=name, person_id=person_id)
+            except Exception as e:
+                for person_id, pending in batch:
+                    for row_number, name, command in pending["rows"]:
+                        yield self._result(row_number, False, f"Failed {command} for {name}: {e}",
+                                           name=name, person_id=person_id)
+
+        self._creates, self._updates = [], {}
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "done": True,
+            "dry_run": self.dry_run,
+            "rows": self.rows,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "airtable_requests": self.requests,
+            "seconds": round(time.time() - self._started, 2)
+        }
@@ -0,0 +1,219 @@
+"""
+Call Budget Module
+
+This module counts and times every outbound call (Airtable, OpenAI, Twilio)
+made while handling one request, and holds each request to a per-intent
+budget. It includes:
+- A per-request call ledger held in a context variable; the Airtable,
+  OpenAI and Twilio wrappers report into it through external_call()
+- Per-intent budgets (calls per service for the whole request), overridable
+  with CALL_BUDGETS
+- Budget modes: "log" warns once per service when a request goes over,
+  "enforce" refuses every call past the budget with CallBudgetExceeded
+  instead of making it, "off" only counts
+- Prometheus counters of budget overruns and per-service call latency for /metrics
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Tuple
+
+from . import tracing
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+CALL_BUDGET_MODE = os.getenv("CALL_BUDGET_MODE", "log").lower()
+
+# Calls per service for a whole inbound request, by intent. Every request
+# past the phone lookup pays 6 Airtable calls (lookup, check-in upsert, inbound
+# log, transcript append) and 1 more to log its reply; classified messages
+# add the classification and a second transcript append (2), so intents differ
+# by what their handler adds. The check-in upsert is 1 call once the texter's
+# check-in is cached and 2 on the month's first touch (the month's listing);
+# budgets allow for the first touch. tests/core/test_call_budgets.py pins these.
+DEFAULT_BUDGET = {"airtable": 11, "openai": 2, "twilio": 1}
+INTENT_BUDGETS: Dict[str, Dict[str, int]] = {
+    "more": {"airtable": 0, "openai": 0, "twilio": 1},
+    "help": {"airtable": 1, "openai": 0, "twilio": 1},
+    "opt_out": {"airtable": 9, "openai": 0, "twilio": 1},
+    "no_change": {"airtable": 9, "openai": 0, "twilio": 1},
+    "confirm_changes": {"airtable": 8, "openai": 0, "twilio": 1},
+    "unclear": {"airtable": 9, "openai": 1, "twilio": 1},
+    "update_person_info": {"airtable": 11, "openai": 1, "twilio": 1},
+    "manage_tags": {"airtable": 11, "openai": 1, "twilio": 1},
+    "create_reminder": {"airtable": 11, "openai": 1, "twilio": 1},
+    "create_note": {"airtable": 11, "openai": 1, "twilio": 1},
+    "schedule_followup": {"airtable": 11, "openai": 1, "twilio": 1},
+    "new_friend": {"airtable": 11, "openai": 1, "twilio": 1},
+    "query_data": {"airtable": 10, "openai": 2, "twilio": 1},
+}
+
+# JSON overrides, e.g. CALL_BUDGETS='{"query_data": {"airtable": 12}}'
+INTENT_BUDGETS.update(json.loads(os.getenv("CALL_BUDGETS", "{}")))
+
+class CallBudgetExceeded(Exception):
+    """Raised in enforce mode instead of making a call past the request's budget"""
+    pass
+
+def budget_for(intent: Optional[str]) -> Dict[str, int]:
+    """The call budget of an intent (DEFAULT_BUDGET for unknown intents)"""
+    return {**DEFAULT_BUDGET, **INTENT_BUDGETS.get(intent or "", {})}
+
+# =============================================================================
+# METRICS
+# =============================================================================
+
+_lock = threading.Lock()
+_call_seconds: Dict[str, tracing.Histogram] = {}
+_exceeded: Dict[Tuple[str, str], int] = {}
+
+def render_metrics() -> str:
+    """Budget overruns and external call latency in the Prometheus text format"""
+    lines = [
+        "# HELP sms_external_call_duration_seconds Duration of outbound calls made while handling requests",
+        "# TYPE sms_external_call_duration_seconds histogram",
+    ]
+    with _lock:
+        for service, histogram in sorted(_call_seconds.items()):
+            tracing._render_histogram(lines, "sms_external_call_duration_seconds",
+                                      tracing._labels(service=service), histogram)
+        lines += [
+            "# HELP sms_call_budget_exceeded_total Requests that went over their call budget",
+            "# TYPE sms_call_budget_exceeded_total counter",
+        ]
+        for (intent, service), count in sorted(_exceeded.items()):
+            lines.append(f"sms_call_budget_exceeded_total{{{tracing._labels(intent=intent, service=service)}}} {count}")
+    return "\n".join(lines) + "\n"
+
+# =============================================================================
+# LEDGER
+# =============================================================================
+
+class CallLedger:
+    """Outbound calls of one request: count and total seconds per service"""
+
+    def __init__(self, name: str, mode: str = CALL_BUDGET_MODE):
+        self.name = name
+        self.mode = mode
+        self.intent: Optional[str] = None
+        self.budget = budget_for(None)
+        self.counts: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+        self.exceeded: Dict[str, int] = {}
+
+    def set_intent(self, intent: str):
+        """Apply the intent's budget; calls already made count against it"""
+        self.intent = intent
+        self.budget = budget_for(intent)
+        for service, count in self.counts.items():
+            if count > self.budget.get(service, count):
+                self._over(service, count)
+
+    def _over(self, service: str, count: int):
+        if service not in self.exceeded:
+            logger.warning("Call budget exceeded: %s intent=%s %s %s > %s", self.name, self.intent, service,
+                           count, self.budget[service], extra={"calls": dict(self.counts)})
+        self.exceeded[service] = count
+
+    def before_call(self, service: str):
+        count = self.counts.get(service, 0) + 1
+        limit = self.budget.get(service)
+        if self.mode != "off" and limit is not None and count > limit:
+            self._over(service, count)
+            if self.mode == "enforce":
+                raise CallBudgetExceeded(f"{service} call {count} exceeds the {self.intent} budget of {limit}")
+        self.counts[service] = count
+
+    def after_call(self, service: str, seconds: float):
+        self.seconds[service] = self.seconds.get(service, 0.0) + seconds
+        with _lock:
+            _call_seconds.setdefault(service, tracing.Histogram()).observe(seconds)
+
+    def summary(self) -> Dict:
+        return {
+            "intent": self.intent,
+            "counts": dict(self.counts),
+            "ms": {service: round(seconds * 1000, 1) for service, seconds in self.seconds.items()},
+            "budget": self.budget,
+            "exceeded": dict(self.exceeded),
+        }
+
+_current_ledger: ContextVar[Optional[CallLedger]] = ContextVar("current_ledger", default=None)
+
+@contextmanager
+def request_ledger(name: str, mode: Optional[str] = None) -> Iterator[CallLedger]:
+    """
+    Give the enclosed code its own call ledger
+
+    Usage:
+        with call_budget.request_ledger("inbound") as ledger:
+            ...
+            ledger.set_intent(intent)
+    """
+    ledger = CallLedger(name, mode or CALL_BUDGET_MODE)
+    token = _current_ledger.set(ledger)
+    try:
+        yield ledger
+    finally:
+        _current_ledger.reset(token)
+        if ledger.exceeded:
+            with _lock:
+                for service in ledger.exceeded:
+                    key = (ledger.intent or "unknown", service)
+                    _exceeded[key] = _exceeded.get(key, 0) + 1
+
+def current_ledger() -> Optional[CallLedger]:
+    return _current_ledger.get()
+
+def set_intent(intent: str):
+    """Apply an intent's budget to the current request, if one is being accounted"""
+    ledger = _current_ledger.get()
+    if ledger is not None:
+        ledger.set_intent(intent)
+
+class _ExternalCall:
+    __slots__ = ("service", "ledger", "started", "seconds")
+
+    def __init__(self, service: str):
+        self.service = service
+        self.ledger = _current_ledger.get()
+        self.seconds: Optional[float] = None
+
+    def add_seconds(self, seconds: float):
+        """Time the call by the given request durations instead of the whole block (e.g. to exclude queue wait)"""
+        self.seconds = (self.seconds or 0.0) + seconds
+
+    def __enter__(self):
+        if self.ledger is not None:
+            self.ledger.before_call(self.service)
+            self.started = time.perf_counter()
+        tracing.record_call(self.service)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.ledger is not None:
+            seconds = self.seconds if self.seconds is not None else time.perf_counter() - self.started
+            self.ledger.after_call(self.service, seconds)
+        return False
+
+def external_call(service: str) -> _ExternalCall:
+    """
+    Wrap one outbound call: checks the budget, then counts and times the call
+
+    Usage:
+        with call_budget.external_call("airtable"):
+            response = client.get(...)
+
+    Raises:
+        CallBudgetExceeded: In enforce mode, before a call past the budget
+    """
+    return _ExternalCall(service)
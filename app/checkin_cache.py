@@ -0,0 +1,95 @@
+"""
+Check-in Cache Module
+
+This module maps (person, month) to the person's record in the Check-ins
+table, so upsert_checkin finds a check-in without a filterByFormula query
+and a repeat touch is a single PATCH. It includes:
+- Bulk loads of one month's check-ins (see airtable.load_checkins), run at
+  the start of a monthly send and on the first touch of a month
+- Entries added as check-ins are created
+- A reload of a month's listing after CHECKIN_CACHE_MAX_AGE_MINUTES, to pick
+  up check-ins created or deleted outside the app
+- One cache per tenant
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import tenants
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+CHECKIN_CACHE_MAX_AGE_MINUTES = float(os.getenv("CHECKIN_CACHE_MAX_AGE_MINUTES", "60"))
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+def record_month(record: Dict[str, Any]) -> str:
+    """A check-in's month: its Month field, or the month it was created (older records have no Month)"""
+    return record.get("fields", {}).get("Month") or record.get("createdTime", "")[:7]
+
+class CheckinCache:
+    """(person ID, month) -> check-in record ID, loaded a month at a time"""
+
+    def __init__(self, max_age_minutes: float = CHECKIN_CACHE_MAX_AGE_MINUTES):
+        self.max_age_seconds = max_age_minutes * 60
+        self._lock = threading.Lock()
+        self._ids: Dict[Tuple[str, str], str] = {}
+        self._loaded_at: Dict[str, float] = {}
+
+    def load(self, month: str, records: List[Dict[str, Any]]):
+        """
+        Replace a month's entries with a listing of its check-ins
+
+        Records of other months are ignored. If a person has several
+        check-ins for the month, the earliest created one is kept.
+        """
+        entries: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        for record in records:
+            if record_month(record) != month:
+                continue
+            created = record.get("createdTime", "")
+            for person_id in record.get("fields", {}).get("Person") or []:
+                key = (person_id, month)
+                if key not in entries or created < entries[key][0]:
+                    entries[key] = (created, record["id"])
+        with self._lock:
+            self._ids = {key: checkin_id for key, checkin_id in self._ids.items() if key[1] != month}
+            self._ids.update({key: checkin_id for key, (_, checkin_id) in entries.items()})
+            self._loaded_at[month] = time.time()
+
+    def is_loaded(self, month: str) -> bool:
+        """True if the month was listed within the max age"""
+        loaded_at = self._loaded_at.get(month)
+        return loaded_at is not None and time.time() - loaded_at <= self.max_age_seconds
+
+    def get(self, person_id: str, month: str) -> Optional[str]:
+        return self._ids.get((person_id, month))
+
+    def put(self, person_id: str, month: str, checkin_id: str):
+        with self._lock:
+            self._ids[(person_id, month)] = checkin_id
+
+    def discard(self, person_id: str, month: str):
+        with self._lock:
+            self._ids.pop((person_id, month), None)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+# =============================================================================
+# SHARED CACHE
+# =============================================================================
+
+# The default tenant's cache; other tenants keep theirs in their resources
+cache = CheckinCache()
+
+def current_cache() -> CheckinCache:
+    """The current tenant's check-in cache"""
+    tenant = tenants.current()
+    return cache if tenant.is_default else tenant.resource("checkin_cache", CheckinCache)
@@ -0,0 +1,246 @@
+"""
+Cohort Scheduler Module
+
+This module evaluates check-in schedules for the whole People directory at
+once using NumPy columns instead of one record at a time. It includes:
+- Columnar loading of People (dates as int64 days, frequency codes, flag bitmasks)
+- Vectorized due masks, next-due dates and overdue counts
+- Day-based (30/90 days, as in due_index) or calendar-month schedule arithmetic
+- Staggered send windows that spread each month's sends evenly across its first days
+"""
+
+import os
+import zlib
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+from . import airtable, due_index, tenants
+from .lazy_imports import LazyModule, is_installed
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+# NumPy for columnar scheduling, imported when the first cohort is built
+NUMPY_AVAILABLE = is_installed("numpy")
+if NUMPY_AVAILABLE:
+    np = LazyModule("numpy")
+else:
+    np = None
+    logger.info("NumPy not available, cohort scheduling disabled")
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Use calendar months (Jan 31 + 1 month = Feb 28) instead of 30/90-day periods
+SCHEDULE_CALENDAR_MONTHS = os.getenv("SCHEDULE_CALENDAR_MONTHS", "false").lower() == "true"
+
+# Number of days at the start of each month over which check-in sends are spread
+SEND_WINDOW_DAYS = int(os.getenv("SEND_WINDOW_DAYS", "20"))
+
+# Frequency codes
+FREQ_NONE = 0
+FREQ_MONTHLY = 1
+FREQ_QUARTERLY = 2
+
+FREQUENCY_CODES = {"Monthly": FREQ_MONTHLY, "Quarterly": FREQ_QUARTERLY}
+FREQUENCY_MONTHS = {FREQ_MONTHLY: 1, FREQ_QUARTERLY: 3}
+
+# Flag bits
+FLAG_CONSENT = 1
+FLAG_OPT_OUT = 2
+FLAG_PHONE = 4
+
+# Day number used for people who have never confirmed
+NEVER = -1
+
+# Fields needed to build a cohort
+COHORT_FIELDS = ["Phone", "Last Confirmed", "Check-in Frequency", "Consent", "Opt-out"]
+
+# =============================================================================
+# DATE ARITHMETIC
+# =============================================================================
+
+def add_months(days: "np.ndarray", months: "np.ndarray") -> "np.ndarray":
+    """
+    Add calendar months to day numbers, clamping to the end of shorter months
+
+    Args:
+        days: int64 days since 1970-01-01
+        months: int64 months to add (per element or scalar)
+
+    Returns:
+        int64 days since 1970-01-01
+    """
+    dates = days.astype("datetime64[D]")
+    month_start = dates.astype("datetime64[M]")
+    day_of_month = (dates - month_start.astype("datetime64[D]")).astype(np.int64)
+    target = month_start + np.asarray(months, dtype=np.int64).astype("timedelta64[M]")
+    target_start = target.astype("datetime64[D]")
+    target_length = ((target + 1).astype("datetime64[D]") - target_start).astype(np.int64)
+    return target_start.astype(np.int64) + np.minimum(day_of_month, target_length - 1)
+
+def _month_start(days: "np.ndarray") -> "np.ndarray":
+    return days.astype("datetime64[D]").astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+
+# =============================================================================
+# COHORT TABLE
+# =============================================================================
+
+class Cohort:
+    """Columnar view of the People directory for vectorized scheduling"""
+
+    def __init__(self, ids: List[str], last_confirmed: "np.ndarray", frequency: "np.ndarray",
+                 flags: "np.ndarray", calendar_months: bool = SCHEDULE_CALENDAR_MONTHS,
+                 window_days: int = SEND_WINDOW_DAYS):
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("NumPy is required for cohort scheduling")
+        self.ids = ids
+        self.last_confirmed = last_confirmed
+        self.frequency = frequency
+        self.flags = flags
+        self.calendar_months = calendar_months
+        self.window_days = max(1, min(window_days, 28))
+        # Stable per-person slot in the send window, independent of directory order
+        self.slot = np.fromiter((zlib.crc32(i.encode()) % self.window_days for i in ids),
+                                dtype=np.int64, count=len(ids))
+        self._next_due = self._compute_next_due()
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]], **kwargs) -> "Cohort":
+        """Build a cohort from Airtable People records"""
+        n = len(records)
+        ids = [record["id"] for record in records]
+        last_confirmed = np.full(n, NEVER, dtype=np.int64)
+        frequency = np.zeros(n, dtype=np.int8)
+        flags = np.zeros(n, dtype=np.uint8)
+        for i, record in enumerate(records):
+            fields = record.get("fields", {})
+            parsed = due_index.parse_last_confirmed(fields.get("Last Confirmed"))
+            if parsed is not None:
+                last_confirmed[i] = parsed.toordinal() - _EPOCH_ORDINAL
+            frequency[i] = FREQUENCY_CODES.get(fields.get("Check-in Frequency", "Monthly"), FREQ_NONE)
+            flags[i] = ((FLAG_CONSENT if fields.get("Consent") else 0)
+                        | (FLAG_OPT_OUT if fields.get("Opt-out") else 0)
+                        | (FLAG_PHONE if fields.get("Phone") else 0))
+        return cls(ids, last_confirmed, frequency, flags, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # -------------------------------------------------------------------------
+    # Vectorized schedule
+    # -------------------------------------------------------------------------
+
+    @property
+    def eligible(self) -> "np.ndarray":
+        """Consented, not opted out, on a Monthly or Quarterly schedule"""
+        return (((self.flags & (FLAG_CONSENT | FLAG_OPT_OUT)) == FLAG_CONSENT)
+                & (self.frequency != FREQ_NONE))
+
+    @property
+    def never_confirmed(self) -> "np.ndarray":
+        return self.last_confirmed == NEVER
+
+    def _compute_next_due(self) -> "np.ndarray":
+        months = np.zeros(len(self.ids), dtype=np.int64)
+        for code, count in FREQUENCY_MONTHS.items():
+            months[self.frequency == code] = count
+        if self.calendar_months:
+            next_due = add_months(self.last_confirmed, months)
+        else:
+            # Same periods as due_index: 30 days per month of frequency
+            next_due = self.last_confirmed + months * due_index.FREQUENCY_DAYS["Monthly"]
+        next_due[self.never_confirmed] = NEVER
+        return next_due
+
+    def next_due(self, as_of: Optional[date] = None) -> "np.ndarray":
+        """Next-due dates as datetime64[D]; never-confirmed people are due as_of"""
+        today = _day(as_of)
+        return np.where(self.never_confirmed, today, self._next_due).astype("datetime64[D]")
+
+    def due_mask(self, as_of: Optional[date] = None) -> "np.ndarray":
+        """Eligible people whose next check-in is on or before as_of"""
+        return self.eligible & (self._next_due <= _day(as_of))
+
+    def overdue_mask(self, as_of: Optional[date] = None) -> "np.ndarray":
+        """Eligible people past their due date (never-confirmed people are not overdue)"""
+        return self.eligible & ~self.never_confirmed & (self._next_due < _day(as_of))
+
+    def overdue_count(self, as_of: Optional[date] = None) -> int:
+        return int(np.count_nonzero(self.overdue_mask(as_of)))
+
+    # -------------------------------------------------------------------------
+    # Staggered send windows
+    # -------------------------------------------------------------------------
+
+    def send_dates(self, as_of: Optional[date] = None) -> "np.ndarray":
+        """
+        Staggered send date per person, as int64 days since 1970-01-01
+
+        Each person has a fixed slot (day offset) in the first window_days of
+        every month. They are sent on the first slot day on or after their due
+        date, so a month's due cohort is spread evenly across the window instead
+        of all going out on the 1st.
+        """
+        due = np.where(self.never_confirmed, _day(as_of), self._next_due)
+        month_start = _month_start(due)
+        candidate = month_start + self.slot
+        next_month = add_months(month_start, np.ones_like(month_start)) + self.slot
+        return np.where(candidate >= due, candidate, next_month)
+
+    def send_date_list(self, as_of: Optional[date] = None) -> List[date]:
+        """Staggered send dates as Python dates, in record order"""
+        return [date.fromordinal(day + _EPOCH_ORDINAL) for day in self.send_dates(as_of).tolist()]
+
+    def scheduled_mask(self, as_of: Optional[date] = None) -> "np.ndarray":
+        """Eligible people whose staggered send date has arrived"""
+        return self.eligible & (self.send_dates(as_of) <= _day(as_of))
+
+    def daily_load(self, start: date, days: int) -> Dict[str, int]:
+        """Number of eligible people whose staggered send date falls on each day from start"""
+        first = _day(start)
+        offsets = self.send_dates(start)[self.eligible] - first
+        offsets = offsets[(offsets >= 0) & (offsets < days)]
+        counts = np.bincount(offsets, minlength=days)
+        return {str(np.datetime64(first + i, "D")): int(count) for i, count in enumerate(counts)}
+
+    def select(self, mask: "np.ndarray") -> List[int]:
+        """Row positions for a boolean mask (same order as the records the cohort was built from)"""
+        return np.flatnonzero(mask).tolist()
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+def _day(as_of: Optional[date]) -> int:
+    return (as_of or date.today()).toordinal() - _EPOCH_ORDINAL
+
+# =============================================================================
+# LOADING
+# =============================================================================
+
+def load_cohort(**kwargs) -> Optional[Cohort]:
+    """
+    Fetch the whole People directory (scheduling fields only) into a Cohort
+
+    Returns:
+        Cohort, or None if NumPy is not installed
+    """
+    if not NUMPY_AVAILABLE:
+        return None
+    records = airtable._get_all_records(tenants.current().people_table, {"fields[]": COHORT_FIELDS})
+    return Cohort.from_records(records, **kwargs)
+
+def cohort_stats(cohort: Cohort, as_of: Optional[date] = None) -> Dict[str, Any]:
+    """Directory-wide scheduling counts"""
+    as_of = as_of or date.today()
+    month_end = (as_of.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    return {
+        "total_people": len(cohort),
+        "eligible": int(np.count_nonzero(cohort.eligible)),
+        "opted_out": int(np.count_nonzero(cohort.flags & FLAG_OPT_OUT)),
+        "due_today": int(np.count_nonzero(cohort.due_mask(as_of))),
+        "due_by_month_end": int(np.count_nonzero(cohort.due_mask(month_end))),
+        "overdue": cohort.overdue_count(as_of),
+        "never_confirmed": int(np.count_nonzero(cohort.eligible & cohort.never_confirmed)),
+        "scheduled_today": int(np.count_nonzero(cohort.scheduled_mask(as_of)))
+    }
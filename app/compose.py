@@ -2,32 +2,234 @@
 Message Composition Module
 
 This module handles composing SMS messages for check-ins and other communications.
-It provides utilities for formatting person data and creating outbound messages.
+It provides utilities for formatting person data and creating outbound messages
+(rendered from compiled templates, see message_templates), and keeps replies
+within a segment budget:
+- GSM-7 vs UCS-2 segment counting (any emoji forces UCS-2)
+- Adaptive truncation of the check-in snapshot to fit a target segment count
+- Paging of long replies with a MORE continuation per phone number, kept
+  in the coordination backend so any instance can serve the MORE
 """
 
-from typing import Sequence
+import json
+import math
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from . import coordination, message_templates
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# README guidance: split or offer MORE past ~420 characters (3 GSM-7 segments)
+DEFAULT_MAX_SEGMENTS = 3
+
+# Conversational replies carry emoji (UCS-2, 67 chars per segment), so allow one more
+REPLY_MAX_SEGMENTS = int(os.getenv("REPLY_MAX_SEGMENTS", "4"))
+
+# How long a MORE continuation stays available
+MORE_TTL_SECONDS = 30 * 60
+
+MORE_KEYWORD = "MORE"
+
+# GSM 03.38 basic character set (1 septet each)
+GSM7_BASIC = set(
+    "@£$¥èéùìòÇ\nØø\rÅåΔ_ΦΓΛΩΠΨΣΘΞÆæßÉ !\"#¤%&'()*+,-./0123456789:;<=>?"
+    "¡ABCDEFGHIJKLMNOPQRSTUVWXYZÄÖÑÜ§¿abcdefghijklmnopqrstuvwxyzäöñüà"
+)
+# GSM 03.38 extension table (escape + char = 2 septets each)
+GSM7_EXTENDED = set("^{}\\[~]|€\f")
+
+# Typographic characters that silently force UCS-2, with GSM-7 equivalents
+GSM7_REPLACEMENTS = {
+    "’": "'", "‘": "'", "“": '"', "”": '"',
+    "—": "-", "–": "-", "…": "...", "•": "-", " ": " ",
+}
+
+# =============================================================================
+# SEGMENT CALCULATION
+# =============================================================================
+
+GSM7_ALPHABET = frozenset(GSM7_BASIC | GSM7_EXTENDED)
+
+def is_gsm7(text: str) -> bool:
+    """True if every character can be sent in the GSM-7 alphabet"""
+    return GSM7_ALPHABET.issuperset(text)
+
+def segment_info(text: str) -> Dict[str, object]:
+    """
+    Calculate how Twilio will encode and bill a message
+
+    Returns:
+        Dictionary with encoding ("GSM-7" or "UCS-2"), units (septets or
+        UTF-16 code units) and segments
+    """
+    if is_gsm7(text):
+        units = len(text)
+        if not GSM7_EXTENDED.isdisjoint(text):
+            units += sum(text.count(ch) for ch in GSM7_EXTENDED)
+        single, multi = 160, 153
+        encoding = "GSM-7"
+    else:
+        units = len(text.encode("utf-16-le")) // 2
+        single, multi = 70, 67
+        encoding = "UCS-2"
+    segments = 1 if units <= single else math.ceil(units / multi)
+    return {"encoding": encoding, "units": units, "segments": segments}
+
+def count_segments(text: str) -> int:
+    return segment_info(text)["segments"]
+
+def to_gsm7(text: str) -> str:
+    """Replace typographic punctuation with GSM-7 equivalents (emoji are left alone)"""
+    for original, replacement in GSM7_REPLACEMENTS.items():
+        if original in text:
+            text = text.replace(original, replacement)
+    return text
+
+def _longest_prefix(text: str, suffix: str, max_segments: int) -> int:
+    """Length of the longest prefix of text that still fits with suffix appended"""
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count_segments(text[:mid].rstrip() + suffix) <= max_segments:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+def fit_to_segments(text: str, max_segments: int) -> str:
+    """Truncate text (with an ellipsis) so it fits within max_segments"""
+    if count_segments(text) <= max_segments:
+        return text
+    ellipsis = "..." if is_gsm7(text) else "…"
+    return text[:_longest_prefix(text, ellipsis, max_segments)].rstrip() + ellipsis
 
 # =============================================================================
 # MESSAGE COMPOSITION FUNCTIONS
 # =============================================================================
 
-def _fmt(value, max_len: int = 40):
-    if value is None or value == "":
-        return "—"
-    if isinstance(value, (list, tuple)):
-        value = ", ".join(map(str, value))
-    s = str(value).strip()
-    return (s[:max_len] + "…") if len(s) > max_len else s
+# Snapshot value lengths tried, longest first, until the check-in fits its segment budget
+SNAPSHOT_MAX_LENS = (40, 30, 24, 18, 12)
 
-def compose_snapshot(person_fields: dict, fields: Sequence[str] = ("Company","Role","City","Tags")) -> str:
-    lines = [f"• {k}: {_fmt(person_fields.get(k))}" for k in fields]
-    return "\n".join(lines)
+def compose_snapshot(person_fields: dict, fields: Sequence[str] = ("Company","Role","City","Tags"),
+                     max_len: int = 40) -> str:
+    return message_templates.snapshot_template(fields).render(person_fields, max_len)
 
 def compose_outbound(name: str, snapshot: str, last_confirmed: str | None) -> str:
-    last = last_confirmed or "last month"
-    return (
-        f"Hi {name}! Monthly check-in. Here’s what I have:\n"
-        f"{snapshot}\n"
-        f"Anything changed since {last}?\n"
-        "Reply with updates or 'No change'. Reply STOP to opt out."
+    return message_templates.get_template("checkin").render(
+        {"Name": name, "Snapshot": snapshot, "Last Confirmed": last_confirmed}
     )
+
+def _render_snapshots(records: Sequence[Tuple[Optional[str], dict]], max_len: int) -> List[str]:
+    template = message_templates.get_template("snapshot")
+    if all(person_id for person_id, _ in records):
+        return message_templates.snapshot_cache.get_many(template, records, max_len)
+    return template.render_many([fields for _, fields in records], max_len)
+
+def compose_checkin_messages(records: Sequence[Tuple[Optional[str], dict]],
+                             max_segments: int = DEFAULT_MAX_SEGMENTS,
+                             template: str = "checkin") -> List[str]:
+    """
+    Compose monthly check-in SMS for many people in one pass
+
+    Every message is rendered at the longest snapshot value length first; only
+    the messages still over budget are re-rendered with shorter values.
+
+    Args:
+        records: (person_id, person_fields) pairs; snapshots are cached per person_id
+        max_segments: Segment budget per message
+        template: Check-in template name (see message_templates)
+
+    Returns:
+        Messages in the same order as records
+    """
+    checkin_template = message_templates.get_template(template)
+    messages = [""] * len(records)
+    remaining = list(range(len(records)))
+    for max_len in SNAPSHOT_MAX_LENS:
+        if not remaining:
+            break
+        subset = [records[i] for i in remaining]
+        snapshots = _render_snapshots(subset, max_len)
+        rendered = checkin_template.render_many(
+            [dict(fields, Snapshot=snapshot) for (_, fields), snapshot in zip(subset, snapshots)]
+        )
+        over_budget = []
+        for i, message in zip(remaining, rendered):
+            messages[i] = to_gsm7(message)
+            if count_segments(messages[i]) > max_segments:
+                over_budget.append(i)
+        remaining = over_budget
+    for i in remaining:
+        messages[i] = fit_to_segments(messages[i], max_segments)
+    return messages
+
+def compose_checkin_message(person_fields: dict, max_segments: int = DEFAULT_MAX_SEGMENTS,
+                            person_id: Optional[str] = None, template: str = "checkin") -> str:
+    """
+    Compose the monthly check-in SMS, shrinking snapshot values until it fits
+
+    The message is normalized to GSM-7 when possible, then snapshot values are
+    truncated progressively (40 → 12 characters) to stay within max_segments.
+    """
+    return compose_checkin_messages([(person_id, person_fields)], max_segments, template)[0]
+
+# =============================================================================
+# PAGING AND MORE CONTINUATIONS
+# =============================================================================
+
+def paginate(text: str, max_segments: int = DEFAULT_MAX_SEGMENTS) -> List[str]:
+    """
+    Split a long reply into pages of at most max_segments each
+
+    Pages break on line boundaries where possible; every page except the last
+    ends with a "Reply MORE" hint that is counted in its budget.
+    """
+    if count_segments(text) <= max_segments:
+        return [text]
+
+    hint = f"\n(Reply {MORE_KEYWORD} for more)"
+    pages: List[str] = []
+    current = ""
+    for line in text.split("\n"):
+        candidate = f"{current}\n{line}" if current else line
+        if count_segments(candidate + hint) <= max_segments:
+            current = candidate
+            continue
+        if current:
+            pages.append(current)
+            current = ""
+        # A single line longer than a page is hard-split
+        while count_segments(line + hint) > max_segments:
+            cut = max(1, _longest_prefix(line, hint, max_segments))
+            pages.append(line[:cut])
+            line = line[cut:].lstrip()
+        current = line
+    if current:
+        pages.append(current)
+    return [page + hint for page in pages[:-1]] + [pages[-1]]
+
+def compose_reply(phone: str, text: str, max_segments: int = REPLY_MAX_SEGMENTS) -> str:
+    """Return the first page of a reply and cache the rest for a MORE request"""
+    pages = paginate(text, max_segments)
+    if len(pages) > 1:
+        coordination.put_value(f"more:{phone}", json.dumps(pages[1:]), MORE_TTL_SECONDS)
+    elif coordination.get_value(f"more:{phone}") is not None:
+        coordination.delete_value(f"more:{phone}")
+    return pages[0]
+
+def next_page(phone: str) -> Optional[str]:
+    """Pop the next cached page for a phone number, or None if nothing is pending"""
+    with coordination.lock(f"more:{phone}"):
+        entry = coordination.get_value(f"more:{phone}")
+        if entry is None:
+            return None
+        pages = json.loads(entry)
+        page = pages.pop(0)
+        if pages:
+            coordination.put_value(f"more:{phone}", json.dumps(pages), MORE_TTL_SECONDS)
+        else:
+            coordination.delete_value(f"more:{phone}")
+        return page
@@ -0,0 +1,355 @@
+"""
+Coordination Module
+
+This module holds the state that must be shared when the app runs as several
+workers or instances, so any of them can serve any request. It includes:
+- Idempotency claims (e.g. processed inbound MessageSids)
+- Locks (e.g. per person and month around check-in upserts) and
+  single-flight job runs
+- Leader election for long-running workers (lease renewed by the leader)
+- Short-lived shared values (e.g. MORE continuations)
+- Broadcasts to every other instance, used to keep in-memory caches in sync
+
+Two backends implement it:
+- "sqlite" (default): a SQLite file shared by the processes of one host
+  (COORDINATION_PATH); broadcasts are polled every COORDINATION_POLL_SECONDS
+- "redis": any Redis-protocol server (COORDINATION_REDIS_URL), for instances
+  on several hosts; needs the optional `redis` package
+
+Names are scoped to the current tenant.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from . import tenants
+from .local_store import LocalStore
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+COORDINATION_BACKEND = os.getenv("COORDINATION_BACKEND", "sqlite").lower()
+
+DEFAULT_COORDINATION_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'coordination.db')
+COORDINATION_PATH = os.getenv("COORDINATION_PATH", DEFAULT_COORDINATION_PATH)
+
+COORDINATION_REDIS_URL = os.getenv("COORDINATION_REDIS_URL", "redis://localhost:6379/0")
+COORDINATION_PREFIX = os.getenv("COORDINATION_PREFIX", "checkins:")
+
+# How often the sqlite backend looks for broadcasts from other processes
+COORDINATION_POLL_SECONDS = float(os.getenv("COORDINATION_POLL_SECONDS", "1"))
+
+# A lock outlives a crashed holder by at most its TTL
+LOCK_TTL_SECONDS = 30
+LOCK_WAIT_SECONDS = 10
+JOB_LOCK_TTL_SECONDS = int(os.getenv("JOB_LOCK_TTL_SECONDS", "3600"))
+
+# Broadcasts older than this are pruned (sqlite backend)
+BROADCAST_RETENTION_SECONDS = 600
+
+# Identifies this process in leases and broadcasts
+INSTANCE_ID = os.getenv("INSTANCE_ID") or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+# =============================================================================
+# BACKENDS
+# =============================================================================
+
+class SQLiteBackend:
+    """Leases, values and broadcasts in a SQLite file shared by the processes of one host"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS coordination_leases (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS coordination_broadcasts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        message TEXT NOT NULL,
+        created_at REAL NOT NULL
+    );
+    """
+
+    def __init__(self, path: str = COORDINATION_PATH):
+        self.store = LocalStore(path)
+        self.store.ensure_schema("coordination", self.SCHEMA)
+        self._subscriber: Optional[threading.Thread] = None
+
+    def acquire(self, key: str, value: str, ttl_seconds: float) -> bool:
+        """Set key to value unless another unexpired value holds it; the holder renews"""
+        now = time.time()
+        return self.store.execute(
+            "INSERT INTO coordination_leases (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+            "WHERE coordination_leases.value = excluded.value OR coordination_leases.expires_at <= ?",
+            (key, value, now + ttl_seconds, now)) == 1
+
+    def release(self, key: str, value: str):
+        self.store.execute("DELETE FROM coordination_leases WHERE key = ? AND value = ?", (key, value))
+
+    def get(self, key: str) -> Optional[str]:
+        row = self.store.query_one("SELECT value FROM coordination_leases WHERE key = ? AND expires_at > ?",
+                                   (key, time.time()))
+        return row["value"] if row else None
+
+    def put(self, key: str, value: str, ttl_seconds: float):
+        self.store.execute("INSERT OR REPLACE INTO coordination_leases (key, value, expires_at) VALUES (?, ?, ?)",
+                           (key, value, time.time() + ttl_seconds))
+
+    def delete(self, key: str):
+        self.store.execute("DELETE FROM coordination_leases WHERE key = ?", (key,))
+
+    def publish(self, message: str):
+        self.store.execute("INSERT INTO coordination_broadcasts (message, created_at) VALUES (?, ?)",
+                           (message, time.time()))
+
+    def subscribe(self, callback: Callable[[str], None]):
+        """Poll for broadcasts published after this call, in a daemon thread"""
+        if self._subscriber is not None:
+            return
+        row = self.store.query_one("SELECT COALESCE(MAX(id), 0) AS last_id FROM coordination_broadcasts")
+        self._subscriber = threading.Thread(target=self._poll, args=(callback, row["last_id"]),
+                                            name="coordination-poll", daemon=True)
+        self._subscriber.start()
+
+    def _poll(self, callback: Callable[[str], None], last_id: int):
+        pruned_at = time.time()
+        while True:
+            time.sleep(COORDINATION_POLL_SECONDS)
+            try:
+                rows = self.store.query("SELECT id, message FROM coordination_broadcasts WHERE id > ? ORDER BY id",
+                                        (last_id,))
+                for row in rows:
+                    last_id = row["id"]
+                    callback(row["message"])
+                if time.time() - pruned_at > BROADCAST_RETENTION_SECONDS:
+                    self.prune()
+                    pruned_at = time.time()
+            except Exception as e:
+                logger.error("Error polling coordination broadcasts: %s", e)
+
+    def prune(self):
+        """Drop expired leases and old broadcasts"""
+        now = time.time()
+        self.store.execute("DELETE FROM coordination_leases WHERE expires_at <= ?", (now,))
+        self.store.execute("DELETE FROM coordination_broadcasts WHERE created_at < ?",
+                           (now - BROADCAST_RETENTION_SECONDS,))
+
+    def reset(self):
+        """Forget every lease, value and broadcast (tests and benchmarks)"""
+        self.store.execute("DELETE FROM coordination_leases")
+        self.store.execute("DELETE FROM coordination_broadcasts")
+
+# Set key to ARGV[1] for ARGV[2] ms unless another value holds it; the holder renews
+_ACQUIRE_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if current and current ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+return 1
+"""
+
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+class RedisBackend:
+    """Leases, values and broadcasts (pub/sub) on a Redis-protocol server"""
+
+    def __init__(self, url: str = COORDINATION_REDIS_URL, prefix: str = COORDINATION_PREFIX):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("COORDINATION_BACKEND=redis needs the redis package: pip install redis")
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self.channel = prefix + "broadcasts"
+        self._acquire = self.client.register_script(_ACQUIRE_SCRIPT)
+        self._release = self.client.register_script(_RELEASE_SCRIPT)
+        self._subscriber = None
+
+    def acquire(self, key: str, value: str, ttl_seconds: float) -> bool:
+        return bool(self._acquire(keys=[self.prefix + key], args=[value, max(1, int(ttl_seconds * 1000))]))
+
+    def release(self, key: str, value: str):
+        self._release(keys=[self.prefix + key], args=[value])
+
+    def get(self, key: str) -> Optional[str]:
+        return self.client.get(self.prefix + key)
+
+    def put(self, key: str, value: str, ttl_seconds: float):
+        self.client.set(self.prefix + key, value, px=max(1, int(ttl_seconds * 1000)))
+
+    def delete(self, key: str):
+        self.client.delete(self.prefix + key)
+
+    def publish(self, message: str):
+        self.client.publish(self.channel, message)
+
+    def subscribe(self, callback: Callable[[str], None]):
+        """Receive broadcasts in the client's pub/sub thread"""
+        if self._subscriber is not None:
+            return
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{self.channel: lambda message: callback(message["data"])})
+        self._subscriber = pubsub.run_in_thread(sleep_time=COORDINATION_POLL_SECONDS, daemon=True)
+
+    def prune(self):
+        """Keys expire on their own"""
+
+    def reset(self):
+        """Forget every key under the prefix (tests and benchmarks)"""
+        for key in self.client.scan_iter(self.prefix + "*"):
+            self.client.delete(key)
+
+BACKENDS = {"sqlite": SQLiteBackend, "redis": RedisBackend}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def get_backend():
+    """Get the configured coordination backend"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if COORDINATION_BACKEND not in BACKENDS:
+                    raise ValueError(f"Unknown COORDINATION_BACKEND: {COORDINATION_BACKEND}")
+                _backend = BACKENDS[COORDINATION_BACKEND]()
+    return _backend
+
+def _key(name: str) -> str:
+    return f"{tenants.current().tenant_id}:{name}"
+
+# =============================================================================
+# IDEMPOTENCY AND SHARED VALUES
+# =============================================================================
+
+def claim(name: str, ttl_seconds: float) -> bool:
+    """Claim a name for ttl_seconds; False if any instance already claimed it"""
+    return get_backend().acquire(_key(name), uuid.uuid4().hex, ttl_seconds)
+
+def is_claimed(name: str) -> bool:
+    return get_backend().get(_key(name)) is not None
+
+def get_value(name: str) -> Optional[str]:
+    return get_backend().get(_key(name))
+
+def put_value(name: str, value: str, ttl_seconds: float):
+    get_backend().put(_key(name), value, ttl_seconds)
+
+def delete_value(name: str):
+    get_backend().delete(_key(name))
+
+# =============================================================================
+# LOCKS AND LEADER ELECTION
+# =============================================================================
+
+@contextmanager
+def lock(name: str, ttl_seconds: float = LOCK_TTL_SECONDS, wait_seconds: float = LOCK_WAIT_SECONDS) -> Iterator[bool]:
+    """
+    Hold a lock shared by every instance for the duration of the block
+
+    Waiting blocks the calling thread; async code enters it (or the function
+    taking it) through run_in_threadpool so the event loop keeps serving.
+
+    Args:
+        name: Lock name (scoped to the current tenant)
+        ttl_seconds: Expiry, so a crashed holder cannot block others forever
+        wait_seconds: How long to wait for another holder; 0 tries once
+
+    Yields:
+        True if the lock is held, False if it could not be taken in time;
+        callers decide whether to go ahead unlocked or skip
+    """
+    backend = get_backend()
+    key, owner = _key(f"lock:{name}"), uuid.uuid4().hex
+    deadline = time.monotonic() + wait_seconds
+    delay = 0.005
+    acquired = backend.acquire(key, owner, ttl_seconds)
+    while not acquired and time.monotonic() < deadline:
+        time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+        delay = min(delay * 2, 0.25)
+        acquired = backend.acquire(key, owner, ttl_seconds)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            backend.release(key, owner)
+
+class Leadership:
+    """
+    Lease-based leader election: one instance at a time holds the role
+
+    The leader keeps the role by calling is_leader() more often than the
+    lease TTL; if it stops (crash, shutdown), another instance takes over
+    once the lease expires.
+    """
+
+    def __init__(self, role: str, ttl_seconds: float):
+        self.role = role
+        self.ttl_seconds = ttl_seconds
+
+    def is_leader(self) -> bool:
+        """Take or renew the role's lease; True while this instance holds it"""
+        return get_backend().acquire(f"leader:{self.role}", INSTANCE_ID, self.ttl_seconds)
+
+    def resign(self):
+        get_backend().release(f"leader:{self.role}", INSTANCE_ID)
+
+# =============================================================================
+# BROADCASTS
+# =============================================================================
+
+# Handlers of broadcasts from other instances, by channel
+_handlers: Dict[str, List[Callable[..., None]]] = {}
+
+def on_broadcast(channel: str) -> Callable[[Callable[..., None]], Callable[..., None]]:
+    """Decorator registering a handler of another instance's broadcasts (run under their tenant)"""
+    def register(handler: Callable[..., None]) -> Callable[..., None]:
+        _handlers.setdefault(channel, []).append(handler)
+        return handler
+    return register
+
+def broadcast(channel: str, *args: Any):
+    """Send JSON-serializable args to the channel's handlers on every other instance"""
+    message = json.dumps({"channel": channel, "tenant": tenants.current().tenant_id,
+                          "origin": INSTANCE_ID, "args": args})
+    try:
+        get_backend().publish(message)
+    except Exception as e:
+        logger.error("Error broadcasting %s: %s", channel, e)
+
+def _deliver(raw: str):
+    message = json.loads(raw)
+    if message["origin"] == INSTANCE_ID:
+        return
+    tenant = tenants.get_registry().get(message["tenant"])
+    if tenant is None:
+        logger.warning("Dropping %s broadcast for unknown tenant %s", message["channel"], message["tenant"])
+        return
+    with tenants.use(tenant):
+        for handler in _handlers.get(message["channel"], []):
+            try:
+                handler(*message["args"])
+            except Exception as e:
+                logger.error("Error in %s broadcast handler %s: %s", message["channel"],
+                             getattr(handler, '__name__', handler), e)
+
+def start():
+    """Start receiving other instances' broadcasts (on app startup)"""
+    get_backend().subscribe(_deliver)
@@ -0,0 +1,382 @@
+"""
+Delivery Status Module
+
+This module turns Twilio status callbacks into Airtable updates. It includes:
+- A SID index mapping MessageSid to Message and Check-in records and the tenant
+  whose bases hold them, kept in the local store and shared through the
+  coordination backend so a callback can reach any instance
+- A buffered ingest queue that coalesces callbacks so only the latest status per SID is written
+- Batched flushes to the Messages and Check-ins tables
+- Delivery-rate aggregates
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import airtable, coordination, tenants
+from .local_store import get_store
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DELIVERY_FLUSH_SECONDS = float(os.getenv("DELIVERY_FLUSH_SECONDS", "5"))
+DELIVERY_FLUSH_MAX_BUFFER = int(os.getenv("DELIVERY_FLUSH_MAX_BUFFER", "500"))
+
+# Callbacks for SIDs not yet indexed are retried until they are this old
+UNINDEXED_RETRY_SECONDS = 300
+
+# How long the coordination backend keeps a SID's index entry for callbacks that
+# reach another instance (Twilio reports delivery within hours, rarely days)
+SID_INDEX_SHARED_TTL_HOURS = float(os.getenv("SID_INDEX_SHARED_TTL_HOURS", "72"))
+
+# Statuses whose Airtable write failed are retried on later flushes until they are this old
+FAILED_WRITE_RETRY_SECONDS = 3600
+
+# Field written on the Messages table
+MESSAGE_STATUS_FIELD = "Delivery Status"
+
+# Twilio status progression; a callback never moves a SID backwards
+STATUS_RANK = {
+    "accepted": 0,
+    "queued": 1,
+    "sending": 2,
+    "sent": 3,
+    "receiving": 3,
+    "received": 4,
+    "delivered": 5,
+    "undelivered": 5,
+    "failed": 5,
+    "read": 6,
+}
+
+FAILED_STATUSES = {"failed", "undelivered"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sid_index (
+    sid TEXT PRIMARY KEY,
+    message_id TEXT,
+    checkin_id TEXT,
+    kind TEXT,
+    to_number TEXT,
+    created_at REAL NOT NULL,
+    status TEXT,
+    status_at REAL,
+    error_code TEXT,
+    tenant TEXT
+);
+CREATE INDEX IF NOT EXISTS sid_index_created ON sid_index (created_at);
+"""
+
+_tenant_column_checked = False
+
+def _store():
+    global _tenant_column_checked
+    store = get_store()
+    store.ensure_schema("sid_index", _SCHEMA)
+    if not _tenant_column_checked:
+        # Indexes created before tenants lack the column; their rows belong to the default tenant
+        if "tenant" not in {row["name"] for row in store.query("PRAGMA table_info(sid_index)")}:
+            store.execute("ALTER TABLE sid_index ADD COLUMN tenant TEXT")
+        _tenant_column_checked = True
+    return store
+
+# =============================================================================
+# SID INDEX
+# =============================================================================
+
+def index_message(sid: str, message_id: Optional[str], checkin_id: Optional[str],
+                  to_number: str = "", kind: str = "reply") -> bool:
+    """
+    Record which Message and Check-in (of the current tenant) an outbound SID belongs to
+
+    The entry goes to this host's local store and to the coordination backend,
+    where the instance receiving the status callback finds it.
+
+    Args:
+        sid: Twilio MessageSid returned by send_sms
+        message_id: Messages table record ID from log_message
+        checkin_id: Check-ins table record ID
+        to_number: Recipient phone number
+        kind: "checkin" for monthly check-in sends, "reply" for conversational replies
+    """
+    if not sid:
+        return False
+    entry = {"message_id": message_id, "checkin_id": checkin_id, "kind": kind,
+             "to_number": to_number, "created_at": time.time()}
+    try:
+        coordination.put_value(f"sid:{sid}", json.dumps(entry), SID_INDEX_SHARED_TTL_HOURS * 3600)
+        _store().execute(
+            "INSERT INTO sid_index (sid, message_id, checkin_id, kind, to_number, created_at, tenant) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(sid) DO UPDATE SET message_id=excluded.message_id, "
+            "checkin_id=excluded.checkin_id, kind=excluded.kind, tenant=excluded.tenant",
+            (sid, message_id, checkin_id, kind, to_number, entry["created_at"], tenants.current().tenant_id)
+        )
+        return True
+    except Exception as e:
+        logger.error("Error indexing SID %s: %s", sid, e)
+        return False
+
+def lookup_sid(sid: str) -> Optional[Dict[str, Any]]:
+    """Get the SID index entry for a message, if any"""
+    row = _store().query_one("SELECT * FROM sid_index WHERE sid = ?", (sid,))
+    return dict(row) if row else None
+
+def _lookup_shared(sids_by_tenant: Dict[str, List[str]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Read index entries that another instance wrote to the coordination backend
+
+    Args:
+        sids_by_tenant: SIDs missing from the local index, by the tenant whose callback reported them
+
+    Returns:
+        Index rows (shaped like sid_index rows, status unset) by SID, for the SIDs found
+    """
+    rows = {}
+    registry = tenants.get_registry()
+    for tenant_id, sids in sids_by_tenant.items():
+        tenant = registry.get(tenant_id)
+        if tenant is None:
+            continue
+        with tenants.use(tenant):
+            for sid in sids:
+                try:
+                    value = coordination.get_value(f"sid:{sid}")
+                except Exception as e:
+                    logger.error("Error reading shared SID index for %s: %s", sid, e)
+                    continue
+                if value is not None:
+                    rows[sid] = {**json.loads(value), "sid": sid, "status": None, "tenant": tenant_id}
+    return rows
+
+# =============================================================================
+# STATUS PIPELINE
+# =============================================================================
+
+class DeliveryStatusPipeline:
+    """Buffers status callbacks and applies the latest status per SID in batches"""
+
+    def __init__(self, flush_seconds: float = DELIVERY_FLUSH_SECONDS,
+                 max_buffer: int = DELIVERY_FLUSH_MAX_BUFFER):
+        self.flush_seconds = flush_seconds
+        self.max_buffer = max_buffer
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._buffer: Dict[str, Tuple[str, str, float, str]] = {}  # sid -> (status, error_code, first_seen, tenant ID)
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"ingested": 0, "coalesced": 0, "written": 0, "unindexed_dropped": 0,
+                      "write_retried": 0, "write_failed_dropped": 0}
+
+    def ingest(self, sid: str, status: str, error_code: str = "") -> bool:
+        """
+        Queue a status callback for the current tenant (the one whose number sent
+        the message); O(1) and never touches Airtable
+
+        Returns:
+            True if the callback was buffered, False if it was stale or invalid
+        """
+        status = (status or "").lower()
+        if not sid or status not in STATUS_RANK:
+            return False
+        with self._lock:
+            self.stats["ingested"] += 1
+            current = self._buffer.get(sid)
+            if current:
+                self.stats["coalesced"] += 1
+                if STATUS_RANK[status] < STATUS_RANK[current[0]]:
+                    return False
+                first_seen = current[2]
+            else:
+                first_seen = time.time()
+            self._buffer[sid] = (status, error_code or "", first_seen, tenants.current().tenant_id)
+            if len(self._buffer) >= self.max_buffer:
+                self._wakeup.set()
+        return True
+
+    def buffered(self) -> int:
+        return len(self._buffer)
+
+    def flush(self) -> int:
+        """Apply buffered statuses to the local index, Messages and Check-ins; returns SIDs applied"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._buffer = self._buffer, {}
+            if not pending:
+                return 0
+
+            store = _store()
+            rows = {}
+            sids = list(pending)
+            for i in range(0, len(sids), 500):
+                chunk = sids[i:i + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                for row in store.query(
+                    f"SELECT sid, message_id, checkin_id, kind, status, tenant FROM sid_index WHERE sid IN ({placeholders})",
+                    chunk
+                ):
+                    rows[row["sid"]] = dict(row)
+            # SIDs sent from another instance are only in the shared index
+            missing: Dict[str, List[str]] = {}
+            for sid, (_, _, _, tenant_id) in pending.items():
+                if sid not in rows:
+                    missing.setdefault(tenant_id, []).append(sid)
+            shared = _lookup_shared(missing) if missing else {}
+            rows.update(shared)
+
+            now = time.time()
+            # Airtable updates per tenant ID: (message updates, check-in updates)
+            updates: Dict[str, Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]] = {}
+            # Airtable record ID -> SIDs whose status the record's update carries
+            record_sids: Dict[str, List[str]] = {}
+            to_apply = {}
+            retry = {}
+
+            for sid, (status, error_code, first_seen, tenant_id) in pending.items():
+                row = rows.get(sid)
+                if row is None:
+                    # Callback raced ahead of log_message; try again on a later flush
+                    if now - first_seen < UNINDEXED_RETRY_SECONDS:
+                        retry[sid] = (status, error_code, first_seen, tenant_id)
+                    else:
+                        self.stats["unindexed_dropped"] += 1
+                    continue
+                if row["status"] and STATUS_RANK.get(row["status"], -1) >= STATUS_RANK[status]:
+                    continue
+                to_apply[sid] = (status, error_code, first_seen, tenant_id)
+                message_updates, checkin_updates = updates.setdefault(
+                    row["tenant"] or tenants.DEFAULT_TENANT_ID, ([], []))
+                if row["message_id"]:
+                    message_updates.append({"id": row["message_id"], "fields": {MESSAGE_STATUS_FIELD: status}})
+                    record_sids.setdefault(row["message_id"], []).append(sid)
+                if row["checkin_id"] and row["kind"] == "checkin" and status in FAILED_STATUSES:
+                    checkin_updates.append({"id": row["checkin_id"], "fields": {"Status": "Failed"}})
+                    record_sids.setdefault(row["checkin_id"], []).append(sid)
+
+            failed_sids = set()
+            registry = tenants.get_registry()
+            for tenant_id, (message_updates, checkin_updates) in updates.items():
+                tenant = registry.get(tenant_id)
+                if tenant is None:
+                    logger.warning("Dropping %s delivery statuses of unknown tenant %s",
+                                   len(message_updates), tenant_id)
+                    continue
+                with tenants.use(tenant):
+                    failed = []
+                    if message_updates:
+                        failed += airtable.update_records_batches(
+                            tenant.messages_table, message_updates,
+                            base_url=tenant.checkins_base_url
+                        )
+                    if checkin_updates:
+                        failed += airtable.update_records_batches(
+                            tenant.checkins_table, checkin_updates,
+                            base_url=tenant.checkins_base_url
+                        )
+                for update in failed:
+                    failed_sids.update(record_sids.get(update["id"], ()))
+
+            # Statuses in failed batches stay buffered for the next flush; the index
+            # only records what reached Airtable, so a retry is not skipped as already applied
+            for sid in failed_sids:
+                if now - to_apply[sid][2] < FAILED_WRITE_RETRY_SECONDS:
+                    retry[sid] = to_apply.pop(sid)
+                    self.stats["write_retried"] += 1
+                else:
+                    self.stats["write_failed_dropped"] += 1
+
+            if retry:
+                with self._lock:
+                    for sid, value in retry.items():
+                        current = self._buffer.get(sid)
+                        if current is None or STATUS_RANK[current[0]] < STATUS_RANK[value[0]]:
+                            self._buffer[sid] = value
+
+            # Entries read from the shared index join the local one, which records what this host applied
+            copied = [(sid, row["message_id"], row["checkin_id"], row["kind"], row["to_number"],
+                       row["created_at"], row["tenant"]) for sid, row in shared.items() if sid in to_apply]
+            if copied:
+                store.executemany(
+                    "INSERT OR IGNORE INTO sid_index (sid, message_id, checkin_id, kind, to_number, created_at, tenant) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    copied
+                )
+            index_updates = [(status, now, error_code, sid) for sid, (status, error_code, _, _) in to_apply.items()]
+            if index_updates:
+                store.executemany(
+                    "UPDATE sid_index SET status = ?, status_at = ?, error_code = ? WHERE sid = ?",
+                    index_updates
+                )
+            self.stats["written"] += len(index_updates)
+            return len(index_updates)
+
+    # -------------------------------------------------------------------------
+    # Background flushing
+    # -------------------------------------------------------------------------
+
+    def start(self):
+        """Start the background flush thread (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="delivery-status-flush", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_seconds)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("Error flushing delivery statuses: %s", e)
+
+# =============================================================================
+# AGGREGATES
+# =============================================================================
+
+def delivery_stats(since_hours: float = 24 * 30) -> Dict[str, Any]:
+    """
+    Summarize delivery outcomes for outbound messages sent in the window
+
+    Args:
+        since_hours: Look-back window in hours
+
+    Returns:
+        Counts per status and the delivery rate over messages with a final status
+    """
+    cutoff = time.time() - since_hours * 3600
+    rows = _store().query(
+        "SELECT kind, COALESCE(status, 'pending') AS status, COUNT(*) AS n "
+        "FROM sid_index WHERE created_at >= ? GROUP BY kind, status",
+        (cutoff,)
+    )
+    by_status: Dict[str, int] = {}
+    by_kind: Dict[str, Dict[str, int]] = {}
+    for row in rows:
+        by_status[row["status"]] = by_status.get(row["status"], 0) + row["n"]
+        by_kind.setdefault(row["kind"], {})[row["status"]] = row["n"]
+
+    delivered = by_status.get("delivered", 0) + by_status.get("read", 0)
+    failed = sum(by_status.get(status, 0) for status in FAILED_STATUSES)
+    final = delivered + failed
+    return {
+        "since": (datetime.now() - timedelta(hours=since_hours)).isoformat(),
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "by_kind": by_kind,
+        "delivery_rate": round(delivered / final, 4) if final else None
+    }
+
+# =============================================================================
+# SHARED PIPELINE
+# =============================================================================
+
+pipeline = DeliveryStatusPipeline()
@@ -0,0 +1,241 @@
+"""
+Due-Date Index Module
+
+This module keeps an in-memory index of when each person is next due for a
+check-in, so "who is due today" and "who is overdue" are range queries
+instead of a full fetch-and-parse of the People table. It includes:
+- Next-due computation for Monthly and Quarterly frequencies
+- A sorted (next_due, person_id) index built from one projected People fetch
+- Incremental updates when a person's Last Confirmed, frequency, consent or opt-out changes,
+  including writes made by other instances (coordination broadcasts)
+- One index per tenant
+"""
+
+import bisect
+import os
+import threading
+import time
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import airtable, coordination, tenants
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Rebuild from Airtable after this long, to pick up edits made outside the app
+DUE_INDEX_MAX_AGE_MINUTES = float(os.getenv("DUE_INDEX_MAX_AGE_MINUTES", "60"))
+
+FREQUENCY_DAYS = {"Monthly": 30, "Quarterly": 90}
+
+# Sort key for people who have never confirmed: due before everyone else
+NEVER_CONFIRMED = 0
+
+# Fields that change whether or when a person is due
+SCHEDULING_FIELDS = ("Last Confirmed", "Check-in Frequency", "Consent", "Opt-out")
+
+# =============================================================================
+# DUE-DATE COMPUTATION
+# =============================================================================
+
+def parse_last_confirmed(value: Any) -> Optional[date]:
+    """Parse a Last Confirmed value (ISO date string or date); None if empty or invalid"""
+    if not value:
+        return None
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+def next_due_ordinal(fields: Dict[str, Any]) -> Optional[int]:
+    """
+    Compute the next check-in date for a person as a date ordinal
+
+    Returns:
+        NEVER_CONFIRMED if the person has never confirmed (or the date is
+        unparseable), the due date's ordinal otherwise, or None if the person
+        should not be checked in at all (opted out, no consent, other frequency)
+    """
+    if fields.get("Opt-out") or not fields.get("Consent"):
+        return None
+    days = FREQUENCY_DAYS.get(fields.get("Check-in Frequency", "Monthly"))
+    if days is None:
+        return None
+    last_confirmed = parse_last_confirmed(fields.get("Last Confirmed"))
+    if last_confirmed is None:
+        return NEVER_CONFIRMED
+    return last_confirmed.toordinal() + days
+
+def indexed_due_ordinal(fields: Dict[str, Any]) -> Optional[int]:
+    """
+    next_due_ordinal for the index, which only holds people with an explicit
+    Monthly or Quarterly frequency: the people refresh() fetches, whether
+    records come from Airtable, the warm-up's people cache or updates
+    """
+    if fields.get("Check-in Frequency") not in FREQUENCY_DAYS:
+        return None
+    return next_due_ordinal(fields)
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+class DueIndex:
+    """Sorted (next_due, person_id) index over schedulable people"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys: List[Tuple[int, str]] = []
+        self._records: List[Dict[str, Any]] = []  # parallel to _keys, so range queries are slices
+        self._people: Dict[str, Tuple[int, Dict[str, Any]]] = {}  # person_id -> (next_due, record)
+        self._stale = True
+        self.built_at = 0.0
+
+    # -------------------------------------------------------------------------
+    # Building
+    # -------------------------------------------------------------------------
+
+    def load(self, records: List[Dict[str, Any]]):
+        """Replace the index contents with the given People records"""
+        people = {}
+        for record in records:
+            due = indexed_due_ordinal(record.get("fields", {}))
+            if due is not None:
+                people[record["id"]] = (due, record)
+        keys = sorted((due, person_id) for person_id, (due, _) in people.items())
+        records = [people[person_id][1] for _, person_id in keys]
+        with self._lock:
+            self._people = people
+            self._keys = keys
+            self._records = records
+            self._stale = False
+            self.built_at = time.time()
+
+    def refresh(self):
+        """Rebuild from a single projected, paginated People fetch"""
+        self.load(airtable.get_people_due_for_checkin())
+
+    def ensure_fresh(self):
+        """Rebuild if the index was never built, was invalidated, or is older than the max age"""
+        if self._stale or time.time() - self.built_at > DUE_INDEX_MAX_AGE_MINUTES * 60:
+            self.refresh()
+
+    def invalidate(self):
+        self._stale = True
+
+    @property
+    def stale(self) -> bool:
+        return self._stale
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    # -------------------------------------------------------------------------
+    # Incremental updates
+    # -------------------------------------------------------------------------
+
+    def apply_update(self, person_id: str, fields: Dict[str, Any]):
+        """
+        Merge updated fields into an indexed person and re-key them if their due date moved
+
+        A person not in the index is inserted if the fields are complete enough to
+        schedule them (e.g. a newly created person); otherwise, if scheduling
+        fields changed, the index is invalidated and rebuilt on the next query.
+        """
+        with self._lock:
+            entry = self._people.get(person_id)
+            if entry is None:
+                due = indexed_due_ordinal(fields)
+                if due is not None:
+                    self._insert(due, {"id": person_id, "fields": dict(fields)})
+                elif any(field in fields for field in SCHEDULING_FIELDS):
+                    self._stale = True
+                return
+
+            old_due, record = entry
+            record["fields"].update(fields)
+            if not any(field in fields for field in SCHEDULING_FIELDS):
+                return
+
+            new_due = indexed_due_ordinal(record["fields"])
+            if new_due == old_due:
+                return
+            position = bisect.bisect_left(self._keys, (old_due, person_id))
+            if position < len(self._keys) and self._keys[position] == (old_due, person_id):
+                del self._keys[position]
+                del self._records[position]
+            if new_due is None:
+                del self._people[person_id]
+            else:
+                self._insert(new_due, record)
+
+    def _insert(self, due: int, record: Dict[str, Any]):
+        key = (due, record["id"])
+        position = bisect.bisect_left(self._keys, key)
+        self._keys.insert(position, key)
+        self._records.insert(position, record)
+        self._people[record["id"]] = (due, record)
+
+    # -------------------------------------------------------------------------
+    # Range queries
+    # -------------------------------------------------------------------------
+
+    def _range(self, start: int, stop: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            lo = bisect.bisect_left(self._keys, (start, ""))
+            hi = bisect.bisect_left(self._keys, (stop, ""))
+            return self._records[lo:hi]
+
+    def due(self, as_of: Optional[date] = None) -> List[Dict[str, Any]]:
+        """People whose next check-in is on or before as_of (including never confirmed)"""
+        as_of = as_of or date.today()
+        return self._range(NEVER_CONFIRMED, as_of.toordinal() + 1)
+
+    def due_count(self, as_of: Optional[date] = None) -> int:
+        """Number of people due on or before as_of, without materializing them"""
+        as_of = as_of or date.today()
+        with self._lock:
+            return (bisect.bisect_left(self._keys, (as_of.toordinal() + 1, ""))
+                    - bisect.bisect_left(self._keys, (NEVER_CONFIRMED, "")))
+
+    def overdue(self, as_of: Optional[date] = None) -> List[Dict[str, Any]]:
+        """People past their due date; never-confirmed people are not counted as overdue"""
+        as_of = as_of or date.today()
+        return self._range(NEVER_CONFIRMED + 1, as_of.toordinal())
+
+    def due_between(self, start: date, end: date) -> List[Dict[str, Any]]:
+        """People whose next check-in falls in [start, end]"""
+        return self._range(start.toordinal(), end.toordinal() + 1)
+
+    def next_due(self, person_id: str) -> Optional[date]:
+        """Next due date for an indexed person (today for never confirmed)"""
+        entry = self._people.get(person_id)
+        if entry is None:
+            return None
+        return date.today() if entry[0] == NEVER_CONFIRMED else date.fromordinal(entry[0])
+
+# =============================================================================
+# SHARED INDEX
+# =============================================================================
+
+# The default tenant's index; other tenants keep theirs in their resources
+index = DueIndex()
+
+def current_index() -> DueIndex:
+    """The current tenant's due-date index, as is"""
+    tenant = tenants.current()
+    return index if tenant.is_default else tenant.resource("due_index", DueIndex)
+
+@airtable.on_change("person")
+@coordination.on_broadcast("person")
+def _on_person_changed(person_id: str, fields: Dict[str, Any]):
+    current_index().apply_update(person_id, fields)
+
+def get_index() -> DueIndex:
+    """Get the current tenant's due-date index, rebuilding it if stale"""
+    tenant_index = current_index()
+    tenant_index.ensure_fresh()
+    return tenant_index
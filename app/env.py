@@ -0,0 +1,14 @@
+"""
+Environment Module
+
+This module loads config/config.env into the process environment exactly
+once. Modules that read settings at import time import it first.
+"""
+
+import os
+from dotenv import load_dotenv
+
+CONFIG_ENV_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'config.env')
+
+# Variables already set in the environment (e.g. on Render) take precedence
+load_dotenv(CONFIG_ENV_PATH)
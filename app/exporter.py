@@ -0,0 +1,236 @@
+"""
+Exporter Module
+
+This module streams whole tables out of Airtable (or the local People cache)
+for /export/{table} without holding them in memory. It includes:
+- Table definitions for People, Check-ins and Messages with default columns
+- Record sources: Airtable's paginated iterator (with field projection and a
+  modified-since formula) or the in-memory People cache
+- NDJSON, CSV and Parquet encoders that yield bytes chunk by chunk
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from . import airtable, people_cache, tenants
+
+# Import pyarrow for Parquet exports
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    PYARROW_AVAILABLE = False
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Export name -> (tenant table attribute, tenant base URL attribute, default columns)
+EXPORT_TABLES = {
+    "people": ("people_table", "base_url", [
+        "Name", "Phone", "Email", "Company", "Role", "City", "Tags", "Birthday", "LinkedIn",
+        "Last Confirmed", "Check-in Frequency", "Consent", "Opt-out", "Timezone"
+    ]),
+    "checkins": ("checkins_table", "checkins_base_url", [
+        "Person", "Month", "Status", "Pending Changes", "Transcript", "Message SID", "Last Message At"
+    ]),
+    "messages": ("messages_table", "checkins_base_url", [
+        "Check-in", "When", "Direction", "From", "Body", "Twilio SID", "Delivery Status", "Parsed JSON"
+    ]),
+}
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Records buffered per yielded chunk (CSV/NDJSON) or per row group (Parquet)
+EXPORT_CHUNK_RECORDS = 500
+
+# Columns every export starts with
+RECORD_COLUMNS = ["id", "createdTime"]
+
+def parse_modified_since(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp (a trailing Z is accepted); raises ValueError"""
+    return datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+
+# =============================================================================
+# RECORD SOURCES
+# =============================================================================
+
+def iter_table(name: str, fields: Optional[List[str]] = None,
+               modified_since: Optional[datetime] = None, source: str = "airtable") -> Iterator[Dict]:
+    """
+    Yield the records of an export table one at a time
+
+    Args:
+        name: Export name (a key of EXPORT_TABLES)
+        fields: Fields to fetch; None fetches every field
+        modified_since: Only records modified after this time (Airtable source only)
+        source: "airtable" (paginated API) or "cache" (People cache, no API calls)
+    """
+    if source == "cache":
+        for record in people_cache.get_cache().all():
+            record_fields = record.get("fields", {})
+            if fields is not None:
+                record_fields = {field: record_fields[field] for field in fields if field in record_fields}
+            yield {"id": record["id"], "fields": record_fields}
+        return
+
+    params: Dict[str, Any] = {"pageSize": 100}
+    if fields is not None:
+        params["fields[]"] = fields
+    if modified_since is not None:
+        params["filterByFormula"] = (
+            f"IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE('{modified_since.isoformat()}'))"
+        )
+    table, base_url, _ = EXPORT_TABLES[name]
+    tenant = tenants.current()
+    yield from airtable._iter_records(getattr(tenant, table), params, base_url=getattr(tenant, base_url))
+
+# =============================================================================
+# ENCODERS
+# =============================================================================
+
+def _cell(value: Any) -> Optional[str]:
+    """Flatten an Airtable value into one text cell (lists joined, objects as JSON)"""
+    if value is None:
+        return None
+    if isinstance(value, list):
+        if all(isinstance(item, (str, int, float)) for item in value):
+            return "; ".join(str(item) for item in value)
+        return json.dumps(value)
+    if isinstance(value, dict):
+        return json.dumps(value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+def _row(record: Dict, columns: List[str]) -> List[Optional[str]]:
+    fields = record.get("fields", {})
+    return [record.get("id"), record.get("createdTime")] + [_cell(fields.get(column)) for column in columns]
+
+def encode_ndjson(records: Iterable[Dict]) -> Iterator[bytes]:
+    lines = []
+    for record in records:
+        lines.append(json.dumps(record, ensure_ascii=False))
+        if len(lines) >= EXPORT_CHUNK_RECORDS:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+def encode_csv(records: Iterable[Dict], columns: List[str]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(RECORD_COLUMNS + columns)
+    pending = 0
+    for record in records:
+        writer.writerow(_row(record, columns))
+        pending += 1
+        if pending >= EXPORT_CHUNK_RECORDS:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+    yield buffer.getvalue().encode()
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back out in chunks"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+def encode_parquet(records: Iterable[Dict], columns: List[str]) -> Iterator[bytes]:
+    """Parquet with all-text columns, one row group per EXPORT_CHUNK_RECORDS records"""
+    names = RECORD_COLUMNS + columns
+    schema = pa.schema([(name, pa.string()) for name in names])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema)
+
+    def flush(rows):
+        table = pa.Table.from_arrays([pa.array(column, type=pa.string()) for column in zip(*rows)], schema=schema)
+        writer.write_table(table)
+
+    rows = []
+    for record in records:
+        rows.append(_row(record, columns))
+        if len(rows) >= EXPORT_CHUNK_RECORDS:
+            flush(rows)
+            rows = []
+            yield sink.drain()
+    if rows:
+        flush(rows)
+    writer.close()
+    yield sink.drain()
+
+def export(name: str, fmt: str, fields: Optional[List[str]] = None,
+           modified_since: Optional[datetime] = None, source: str = "airtable") -> Iterator[bytes]:
+    """
+    Stream one table in the requested format
+
+    Args:
+        name: Export name (a key of EXPORT_TABLES)
+        fmt: "ndjson", "csv" or "parquet"
+        fields: Fields to include; defaults to every field (NDJSON) or the
+            table's default columns (CSV, Parquet)
+        modified_since: Only records modified after this time
+        source: "airtable" or "cache"
+
+    Returns:
+        Iterator of encoded byte chunks
+
+    Raises:
+        ValueError: Unknown table or format, or options the source does not support
+        RuntimeError: Parquet requested without pyarrow installed
+    """
+    if name not in EXPORT_TABLES:
+        raise ValueError(f"Unknown export table: {name}")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == "parquet" and not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow is required for Parquet exports")
+    if source not in ("airtable", "cache"):
+        raise ValueError(f"Unknown export source: {source}")
+    if source == "cache" and (name != "people" or modified_since is not None):
+        raise ValueError("The cache source only exports people, without modified_since")
+
+    records = iter_table(name, fields, modified_since, source)
+    if fmt == "ndjson":
+        return encode_ndjson(records)
+    columns = fields or EXPORT_TABLES[name][2]
+    if fmt == "csv":
+        return encode_csv(records, columns)
+    return encode_parquet(records, columns)
@@ -0,0 +1,211 @@
+"""
+Health Module
+
+This module backs /health/live and /health/ready. It includes:
+- Dependency probes for Airtable, Twilio and OpenAI with cached results
+- Probe rate limiting: a dependency is probed at most once per
+  HEALTH_PROBE_INTERVAL_SECONDS, in the background, and never when real
+  Airtable traffic within the interval already shows its latency
+- Readiness: warm-up state, cache and index state, connection pools and queue depths
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+
+from . import (airtable, delivery_status, due_index, intent_classifier, log, people_cache,
+               sms_queue, tenants, twilio_utils, warmup)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+HEALTH_PROBE_INTERVAL_SECONDS = float(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", "300"))
+HEALTH_PROBE_TIMEOUT_SECONDS = 5.0
+
+# Dependencies whose failure makes the instance not ready (Twilio/OpenAI outages only degrade it)
+REQUIRED_DEPENDENCIES = ("airtable",)
+
+_started_at = time.time()
+
+# =============================================================================
+# PROBES
+# =============================================================================
+
+def _probe_airtable() -> Optional[Tuple[bool, Optional[str]]]:
+    # Probes run in the background, so this is the default tenant's base
+    airtable._make_request("GET", tenants.current().people_table,
+                           params={"pageSize": 1, "fields[]": ["Name"]})
+    return True, None
+
+def _probe_twilio() -> Optional[Tuple[bool, Optional[str]]]:
+    sid, token = os.getenv("TWILIO_ACCOUNT_SID"), os.getenv("TWILIO_AUTH_TOKEN")
+    if not sid or not token:
+        return None
+    response = httpx.get(f"https://api.twilio.com/2010-04-01/Accounts/{sid}.json",
+                         auth=(sid, token), timeout=HEALTH_PROBE_TIMEOUT_SECONDS)
+    return response.status_code < 400, None if response.status_code < 400 else f"HTTP {response.status_code}"
+
+def _probe_openai() -> Optional[Tuple[bool, Optional[str]]]:
+    if not intent_classifier.OPENAI_API_KEY:
+        return None
+    response = httpx.get(f"https://api.openai.com/v1/models/{intent_classifier.OPENAI_MODEL}",
+                         headers={"Authorization": f"Bearer {intent_classifier.OPENAI_API_KEY}"},
+                         timeout=HEALTH_PROBE_TIMEOUT_SECONDS)
+    return response.status_code < 400, None if response.status_code < 400 else f"HTTP {response.status_code}"
+
+class DependencyProbes:
+    """Cached, rate-limited dependency probes refreshed in the background"""
+
+    def __init__(self, probes: Dict[str, Callable[[], Optional[Tuple[bool, Optional[str]]]]],
+                 interval_seconds: float = HEALTH_PROBE_INTERVAL_SECONDS):
+        self.probes = probes
+        self.interval_seconds = interval_seconds
+        self.results: Dict[str, Dict[str, Any]] = {name: {"status": "unknown"} for name in probes}
+        self._lock = threading.Lock()
+        self._running = False
+
+    def _passive(self, name: str) -> Optional[Dict[str, Any]]:
+        """Use the latest real Airtable request as the probe result when it is recent"""
+        if name != "airtable":
+            return None
+        last = dict(airtable.last_response)
+        if last["at"] is None or time.time() - last["at"] > self.interval_seconds:
+            return None
+        return {"status": "ok" if last["ok"] else "failing", "latency_ms": last["latency_ms"],
+                "checked_at": last["at"], "error": last["error"], "source": "traffic"}
+
+    def _stale(self) -> bool:
+        now = time.time()
+        return any(
+            self._passive(name) is None
+            and now - (result.get("checked_at") or 0) > self.interval_seconds
+            for name, result in self.results.items()
+        )
+
+    def run(self):
+        """Probe every dependency whose cached result is older than the interval"""
+        for name, probe in self.probes.items():
+            if self._passive(name) is not None:
+                continue
+            if time.time() - (self.results[name].get("checked_at") or 0) <= self.interval_seconds:
+                continue
+            started = time.perf_counter()
+            try:
+                outcome = probe()
+                if outcome is None:
+                    result = {"status": "not_configured"}
+                else:
+                    ok, error = outcome
+                    result = {"status": "ok" if ok else "failing", "error": error}
+            except Exception as e:
+                result = {"status": "failing", "error": str(e)}
+            result.update(latency_ms=round((time.perf_counter() - started) * 1000, 1),
+                          checked_at=time.time(), source="probe")
+            self.results[name] = result
+
+    def refresh_in_background(self):
+        """Start one background probe run if results are stale and none is running"""
+        with self._lock:
+            if self._running or not self._stale():
+                return
+            self._running = True
+
+        def _run():
+            try:
+                self.run()
+            finally:
+                self._running = False
+
+        threading.Thread(target=_run, name="health-probes", daemon=True).start()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        snapshot = {}
+        for name, result in self.results.items():
+            passive = self._passive(name)
+            if passive is not None and passive["checked_at"] >= (result.get("checked_at") or 0):
+                result = passive
+            snapshot[name] = dict(result)
+            if snapshot[name].get("checked_at"):
+                snapshot[name]["age_seconds"] = round(time.time() - snapshot[name]["checked_at"], 1)
+        return snapshot
+
+probes = DependencyProbes({
+    "airtable": _probe_airtable,
+    "twilio": _probe_twilio,
+    "openai": _probe_openai,
+})
+
+# =============================================================================
+# LIVENESS AND READINESS
+# =============================================================================
+
+def liveness() -> Dict[str, Any]:
+    """The process is up and serving; never touches dependencies"""
+    return {"ok": True, "status": "alive", "uptime_seconds": round(time.time() - _started_at, 1)}
+
+def _pool_state() -> Dict[str, Any]:
+    client = airtable._http_client
+    state: Dict[str, Any] = {"airtable": {"open": client is not None}}
+    if client is not None:
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is not None:
+            state["airtable"]["connections"] = len(connections)
+    queue = sms_queue._queue
+    state["twilio_sms_queue"] = {"open": queue is not None and queue._client is not None}
+    state["twilio_sdk_client"] = {"open": twilio_utils.twilio_client is not None}
+    return state
+
+def readiness() -> Tuple[bool, Dict[str, Any]]:
+    """
+    Report whether the instance is warm and its required dependencies are reachable
+
+    Never blocks on a dependency: probe results are cached and refreshed in
+    the background at most once per HEALTH_PROBE_INTERVAL_SECONDS.
+
+    Returns:
+        (ready, report)
+    """
+    probes.refresh_in_background()
+    dependencies = probes.snapshot()
+
+    cache = people_cache.cache
+    index = due_index.index
+    indexes = {
+        "people_cache": {"loaded": bool(cache.loaded_at), "people": len(cache), "version": cache.version,
+                         "age_seconds": round(time.time() - cache.loaded_at, 1) if cache.loaded_at else None},
+        "due_index": {"built": bool(index.built_at) and not index.stale, "people": len(index),
+                      "age_seconds": round(time.time() - index.built_at, 1) if index.built_at else None},
+    }
+    queue = sms_queue._queue
+    queues = {
+        "sms_send": queue.pending() if queue is not None else 0,
+        "delivery_status_buffered": delivery_status.pipeline.buffered(),
+        "log_pending": log.pending(),
+        "log_dropped": log.dropped(),
+    }
+
+    failing = [name for name, result in dependencies.items() if result["status"] == "failing"]
+    reasons = []
+    if not warmup.warmup.ready:
+        reasons.append("warming_up")
+    reasons += [f"{name}_failing" for name in failing if name in REQUIRED_DEPENDENCIES]
+    ready = not reasons
+
+    report = {
+        "ok": ready,
+        "status": "ready" if ready and not failing else ("degraded" if ready else "not_ready"),
+        "reasons": reasons,
+        "degraded": [name for name in failing if name not in REQUIRED_DEPENDENCIES],
+        "warmup": warmup.warmup.status(),
+        "indexes": indexes,
+        "pools": _pool_state(),
+        "queues": queues,
+        "dependencies": dependencies,
+        "timestamp": time.time()
+    }
+    return ready, report
@@ -7,11 +7,14 @@ This module classifies SMS messages into different intents using OpenAI's API.
 import os
 import json
 from typing import Dict, Any, Optional
-import openai
-from dotenv import load_dotenv
+from . import call_budget, env
+from .lazy_imports import LazyModule
+from .log import get_logger
 
-# Load environment variables from config file
-load_dotenv('config/config.env')
+logger = get_logger(__name__)
+
+# The OpenAI SDK is imported on first classification rather than at startup
+openai = LazyModule("openai")
 
 # =============================================================================
 # CONFIGURATION
@@ -133,13 +136,14 @@ Extract relevant data based on the intent:
 
 Return a JSON object with the intent, confidence (0-1), target_table, and extracted_data."""
 
-        response = client.chat.completions.create(
-            model=OPENAI_MODEL,
-            messages=[{"role": "system", "content": system_prompt}],
-            response_format={"type": "json_object"},
-            temperature=0.1,
-            max_tokens=500
-        )
+        with call_budget.external_call("openai"):
+            response = client.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=[{"role": "system", "content": system_prompt}],
+                response_format={"type": "json_object"},
+                temperature=0.1,
+                max_tokens=500
+            )
         
         content = response.choices[0].message.content
         result = json.loads(content)
@@ -158,7 +162,7 @@ Return a JSON object with the intent, confidence (0-1), target_table, and extrac
         return result
         
     except Exception as e:
-        print(f"Error in intent classification: {e}")
+        logger.error("Error in intent classification: %s", e)
         return {
             "intent": "unclear",
             "confidence": 0.0,
@@ -211,13 +215,14 @@ Return a JSON object with:
 - "confidence": 0.0 to 1.0
 - "reason": brief explanation of why this match was chosen"""
         
-        response = client.chat.completions.create(
-            model=OPENAI_MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"},
-            temperature=0.1,
-            max_tokens=200
-        )
+        with call_budget.external_call("openai"):
+            response = client.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"},
+                temperature=0.1,
+                max_tokens=200
+            )
         
         content = response.choices[0].message.content
         result = json.loads(content)
@@ -231,5 +236,5 @@ Return a JSON object with:
             return None
             
     except Exception as e:
-        print(f"Error in AI name matching: {e}")
+        logger.error("Error in AI name matching: %s", e)
         return None
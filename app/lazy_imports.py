@@ -0,0 +1,51 @@
+"""
+Lazy Imports Module
+
+This module defers heavy SDK imports (openai, twilio, numpy) until they are
+first used, so the web process starts serving sooner after a cold start.
+It includes:
+- LazyModule, a module stand-in that imports the real module on first attribute access
+- is_installed, for optional-dependency flags that must not import the dependency
+"""
+
+import importlib
+import importlib.util
+import threading
+from typing import Any
+
+# =============================================================================
+# LAZY MODULES
+# =============================================================================
+
+class LazyModule:
+    """Stand-in for a module that is imported on first attribute access"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+def is_installed(name: str) -> bool:
+    """Whether a top-level module can be imported, without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
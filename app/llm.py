@@ -1,7 +1,14 @@
 import os
 import json
 from typing import Dict, Any, Optional
-import openai
+from . import call_budget
+from .lazy_imports import LazyModule
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+# The OpenAI SDK is imported on first extraction rather than at startup
+openai = LazyModule("openai")
 
 # OpenAI configuration
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -35,7 +42,7 @@ def call_extract(snapshot: str, inbound_text: str) -> Optional[Dict[str, Any]]:
         Dictionary with extracted updates and confidence, or None if failed
     """
     if not OPENAI_API_KEY:
-        print("OpenAI API key not configured")
+        logger.warning("OpenAI API key not configured")
         return None
     
     try:
@@ -69,15 +76,16 @@ Example responses:
 - For "moved to NYC": {{"city": "NYC", "confirmation_text": "I understand you moved to NYC.", "confidence": 0.8}}"""
 
         # Make the API call
-        response = client.chat.completions.create(
-            model=OPENAI_MODEL,
-            messages=[
-                {"role": "system", "content": system_prompt}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.1,  # Low temperature for consistent parsing
-            max_tokens=500
-        )
+        with call_budget.external_call("openai"):
+            response = client.chat.completions.create(
+                model=OPENAI_MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.1,  # Low temperature for consistent parsing
+                max_tokens=500
+            )
         
         # Extract the response content
         content = response.choices[0].message.content
@@ -88,7 +96,7 @@ Example responses:
             
             # Validate required fields
             if "confirmation_text" not in result or "confidence" not in result:
-                print("LLM response missing required fields")
+                logger.warning("LLM response missing required fields")
                 return None
             
             # Ensure confidence is a number
@@ -102,19 +110,19 @@ Example responses:
             if "no_change" not in result:
                 result["no_change"] = False
             
-            print(f"LLM extraction successful: {result}")
+            logger.debug("LLM extraction successful: %s", result)
             return result
             
         except json.JSONDecodeError as e:
-            print(f"Failed to parse LLM response as JSON: {e}")
-            print(f"Raw response: {content}")
+            logger.error("Failed to parse LLM response as JSON: %s", e)
+            logger.debug("Raw LLM response", extra={"raw_response": content})
             return None
             
     except openai.APIError as e:
-        print(f"OpenAI API error: {e}")
+        logger.error("OpenAI API error: %s", e)
         return None
     except Exception as e:
-        print(f"Unexpected error in LLM extraction: {e}")
+        logger.error("Unexpected error in LLM extraction: %s", e)
         return None
 
 def extract_with_fallback(snapshot: str, inbound_text: str) -> Dict[str, Any]:
@@ -0,0 +1,118 @@
+"""
+Local Store Module
+
+This module provides a small SQLite-backed store for state the app needs to
+look up quickly without an Airtable round trip (e.g. the Twilio SID index).
+Feature modules register their own tables with `ensure_schema`.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DEFAULT_LOCAL_STORE_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'local_store.db')
+LOCAL_STORE_PATH = os.getenv("LOCAL_STORE_PATH", DEFAULT_LOCAL_STORE_PATH)
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+class LocalStore:
+    """Thread-safe wrapper around a single SQLite connection"""
+
+    def __init__(self, path: str = LOCAL_STORE_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._schemas = set()
+
+    def ensure_schema(self, name: str, ddl: str, migrations: Sequence[Tuple[str, str, str]] = ()):
+        """
+        Run a feature's CREATE TABLE/INDEX script once per process
+
+        Args:
+            name: Feature name (the script runs once per name)
+            ddl: CREATE ... IF NOT EXISTS script
+            migrations: (table, column, script) upgrades, each run before the
+                DDL when the table exists without the column
+        """
+        if name in self._schemas:
+            return
+        with self._lock:
+            for table, column, script in migrations:
+                columns = {row["name"] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+                if columns and column not in columns:
+                    self._conn.executescript(script)
+            self._conn.executescript(ddl)
+            self._schemas.add(name)
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> int:
+        """Run a write statement and return the number of affected rows"""
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    def executemany(self, sql: str, rows: Iterable[Sequence[Any]]) -> int:
+        """Run a write statement for many rows in one transaction"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                count = self._conn.executemany(sql, rows).rowcount
+                self._conn.execute("COMMIT")
+                return count
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Hold the store lock and run several statements atomically on the yielded connection"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                yield self._conn
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        """Run a read statement and return all rows"""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def query_one(self, sql: str, params: Sequence[Any] = ()) -> Optional[sqlite3.Row]:
+        """Run a read statement and return the first row, if any"""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+# =============================================================================
+# SHARED STORE
+# =============================================================================
+
+_store: Optional[LocalStore] = None
+_store_lock = threading.Lock()
+
+def get_store() -> LocalStore:
+    """Get the process-wide local store"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = LocalStore()
+    return _store
@@ -0,0 +1,223 @@
+"""
+Logging Module
+
+This module sets up the application's structured logging. Callers log through
+a standard `logging` logger (get_logger(__name__)); records are handed to a
+background thread, so a log line costs the request an enqueue rather than
+synchronous stdout I/O. It includes:
+- A non-blocking queue handler (records are dropped and counted when the
+  queue is full instead of stalling a request) and its writer thread
+- JSON (default) or plain-text output on stdout
+- Per-logger sampling of debug lines (LOG_SAMPLE_RATES)
+- PII redaction: phone numbers are masked to their last 4 digits and message
+  bodies, transcripts and field dicts passed as extras are reduced to their
+  size or field names
+
+Pass structured values as extras rather than formatting them into the message:
+    logger.debug("Creating person", extra={"fields": fields})
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_REDACT = os.getenv("LOG_REDACT", "true").lower() == "true"
+
+# Set to false to write log lines synchronously on the calling thread (debugging)
+LOG_ASYNC = os.getenv("LOG_ASYNC", "true").lower() == "true"
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+def _parse_sample_rates(value: str) -> Dict[str, float]:
+    """Parse "app.airtable=0.1,app.main=0.5" into {logger prefix: rate}"""
+    rates = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, rate = item.split("=", 1)
+            rates[name.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+# Fraction of debug lines kept per logger (longest matching prefix wins; default 1.0)
+LOG_SAMPLE_RATES = _parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", ""))
+
+# =============================================================================
+# REDACTION
+# =============================================================================
+
+# US numbers with or without +1 and separators, and any E.164 number
+_PHONE_PATTERN = re.compile(
+    r"(?<![\w+])(?:\+?1[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}(?!\w|\.\d)"
+    r"|(?<![\w+])\+\d{10,15}(?!\w|\.\d)"
+)
+
+# Extras whose values are never logged, only their size
+BODY_FIELDS = {"body", "message_body", "transcript", "content", "raw_response"}
+# Extras holding phone numbers
+PHONE_FIELDS = {"phone", "to", "from_number", "from_phone"}
+
+def _mask_phone(match: re.Match) -> str:
+    digits = re.sub(r"\D", "", match.group(0))
+    return f"***{digits[-4:]}"
+
+def redact_text(text: str) -> str:
+    """Mask every phone number in a string"""
+    return _PHONE_PATTERN.sub(_mask_phone, text)
+
+def redact_value(key: str, value: Any) -> Any:
+    """Redact one structured field by name: bodies -> size, field dicts -> names, phones masked"""
+    if key in BODY_FIELDS:
+        return f"<{len(str(value))} chars>"
+    if key in PHONE_FIELDS and value:
+        return f"***{re.sub(r'[^0-9]', '', str(value))[-4:]}"
+    if key == "fields" and isinstance(value, dict):
+        return sorted(value)
+    if isinstance(value, str):
+        return redact_text(value)
+    return value
+
+# =============================================================================
+# FORMATTERS
+# =============================================================================
+
+# Attributes every LogRecord has; anything else came in through `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+def _extras(record: logging.LogRecord) -> Dict[str, Any]:
+    extras = {key: value for key, value in record.__dict__.items() if key not in _RECORD_ATTRS}
+    if LOG_REDACT:
+        extras = {key: redact_value(key, value) for key, value in extras.items()}
+    return extras
+
+def _message(record: logging.LogRecord) -> str:
+    message = record.getMessage()
+    return redact_text(message) if LOG_REDACT else message
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, extras and exc"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": _message(record),
+        }
+        payload.update(_extras(record))
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+class TextFormatter(logging.Formatter):
+    """`time LEVEL logger: message key=value ...` for local development"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = f"{self.formatTime(record)} {record.levelname} {record.name}: {_message(record)}"
+        extras = _extras(record)
+        if extras:
+            line += " " + " ".join(f"{key}={value}" for key, value in extras.items())
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+# =============================================================================
+# SAMPLING AND QUEUE
+# =============================================================================
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of debug records per logger, before they are queued"""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._by_logger: Dict[str, float] = {}
+
+    def rate_for(self, name: str) -> float:
+        rate = self._by_logger.get(name)
+        if rate is None:
+            matches = [prefix for prefix in self.rates if name == prefix or name.startswith(prefix + ".")]
+            rate = self.rates[max(matches, key=len)] if matches else 1.0
+            self._by_logger[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or not self.rates:
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Queue records untouched (formatting happens on the writer thread); drop them when full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_configure_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+
+def configure():
+    """Attach the stdout pipeline to the "app" logger (idempotent)"""
+    global _listener, _queue_handler
+    app_logger = logging.getLogger("app")
+    with _configure_lock:
+        if getattr(app_logger, "_structured", False):
+            return
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(TextFormatter() if LOG_FORMAT == "text" else JsonFormatter())
+        if LOG_ASYNC:
+            _queue_handler = NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+            _listener = logging.handlers.QueueListener(_queue_handler.queue, output)
+            _listener.start()
+            atexit.register(flush)
+            handler: logging.Handler = _queue_handler
+        else:
+            handler = output
+        handler.addFilter(SamplingFilter(LOG_SAMPLE_RATES))
+        app_logger.addHandler(handler)
+        app_logger.setLevel(LOG_LEVEL)
+        app_logger.propagate = False
+        app_logger._structured = True
+
+def flush():
+    """Write out every queued record and stop the writer thread (shutdown and tests)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def pending() -> int:
+    """Records queued but not yet written"""
+    return _queue_handler.queue.qsize() if _queue_handler is not None else 0
+
+def dropped() -> int:
+    """Records dropped because the queue was full"""
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+def get_logger(name: str) -> logging.Logger:
+    """The logger for a module; pass __name__ (app.*) so it uses the structured pipeline"""
+    configure()
+    return logging.getLogger(name)
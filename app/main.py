@@ -1,36 +1,77 @@
 import os
 import json
+import asyncio
+import hashlib
+import hmac
+import anyio
+import anyio.from_thread
+import anyio.to_thread
 import httpx
-from datetime import datetime, date, timedelta
-from typing import Dict, Any, Optional
-from fastapi import FastAPI, Form, Request, HTTPException
-from fastapi.responses import HTMLResponse
-from . import compose, airtable, twilio_utils, scheduler, admin_sms, intent_classifier, intent_handlers
+from datetime import datetime, date, timedelta, timezone
+from functools import partial
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from fastapi import Depends, FastAPI, Form, Header, Request, HTTPException
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from . import env, compose, airtable, coordination, tenants, twilio_utils, scheduler, admin_sms, intent_classifier, intent_handlers, reminder_engine, sms_queue, delivery_status, message_templates, send_planner, people_cache, bulk_admin, exporter, warmup, health, tracing, call_budget, webhooks
+from .log import get_logger
+
+logger = get_logger(__name__)
 
 app = FastAPI()
 
-# =============================================================================
-# IDEMPOTENCY TRACKING
-# =============================================================================
+# Forged and replayed Twilio webhooks are answered before routing (see app/webhooks.py)
+app.add_middleware(webhooks.TwilioWebhookMiddleware)
+
+# Jobs, admin and stats routes act for the tenant named by X-Tenant or ?tenant=
+app.add_middleware(tenants.TenantMiddleware)
 
-# Track processed MessageSids to prevent duplicate processing
-# Store as set of (message_sid, timestamp) tuples, cleaned up periodically
-_processed_messages: Dict[str, datetime] = {}
+@app.on_event("startup")
+def start_delivery_pipeline():
+    """Start the background flush of buffered Twilio status callbacks"""
+    delivery_status.pipeline.start()
 
-def _is_message_processed(message_sid: str) -> bool:
-    """Check if a message has already been processed"""
-    return message_sid in _processed_messages
+@app.on_event("startup")
+def start_coordination():
+    """Receive cache updates broadcast by other instances"""
+    coordination.start()
 
-def _mark_message_processed(message_sid: str):
-    """Mark a message as processed"""
-    _processed_messages[message_sid] = datetime.now()
+@app.on_event("startup")
+def start_warmup():
+    """Preload caches, indexes, connections and SDKs in the background"""
+    warmup.warmup.start()
 
-def _cleanup_old_messages():
-    """Remove messages older than 24 hours to prevent memory leak"""
-    cutoff = datetime.now() - timedelta(hours=24)
-    to_remove = [sid for sid, timestamp in _processed_messages.items() if timestamp < cutoff]
-    for sid in to_remove:
-        del _processed_messages[sid]
+@app.on_event("shutdown")
+async def close_sms_queue():
+    """Flush pooled Twilio connections and buffered delivery statuses on shutdown"""
+    await sms_queue.close_queue()
+    delivery_status.pipeline.flush()
+    airtable.close_http_client()
+
+# =============================================================================
+# TRACING
+# =============================================================================
+
+# Registered only when enabled, so untraced deployments pay nothing per request
+if tracing.TRACING_ENABLED:
+    @app.middleware("http")
+    async def trace_requests(request: Request, call_next):
+        """Trace the stages of requests to TRACED_PATHS and export them on /metrics"""
+        name = tracing.TRACED_PATHS.get(request.url.path)
+        if name is None:
+            return await call_next(request)
+        trace = tracing.start_trace(name)
+        response = await call_next(request)
+        trace.finish()
+        if tracing.TRACE_TIMING_HEADER:
+            response.headers["Server-Timing"] = trace.server_timing()
+        return response
+
+@app.get("/metrics")
+def metrics():
+    """Prometheus metrics: per-stage latency histograms and external call counts of traced requests"""
+    return Response(tracing.render_metrics() + call_budget.render_metrics() + webhooks.render_metrics(),
+                    media_type="text/plain; version=0.0.4")
 
 # =============================================================================
 # HELPER FUNCTIONS
@@ -54,27 +95,119 @@ def get_help_message() -> str:
 
 💡 All commands work on OTHER PEOPLE'S data, not your own!"""
 
+# Threadpool threads one tenant's inbound work may hold at once; the rest of the
+# pool stays free for other tenants while one of them takes a burst
+INBOUND_THREADS_PER_TENANT = int(os.getenv("INBOUND_THREADS_PER_TENANT", "10"))
+
+async def _inbound_call(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking step of inbound processing (Airtable, OpenAI, locks) in the threadpool
+
+    The step waits for one of the current tenant's INBOUND_THREADS_PER_TENANT
+    threads, and its Airtable requests are paced by the tenant's own bucket
+    (inbound runs under airtable.paced()), so one tenant's burst queues behind
+    itself instead of starving the other tenants.
+
+    Args:
+        func: Blocking callable to run
+        *args, **kwargs: Arguments passed to func
+
+    Returns:
+        The callable's return value
+    """
+    limiter = tenants.current().resource("inbound_thread_limiter",
+                                         lambda: anyio.CapacityLimiter(INBOUND_THREADS_PER_TENANT))
+    return await anyio.to_thread.run_sync(partial(func, *args, **kwargs), limiter=limiter)
+
+def _log_reply(to: str, body: str, checkin_id: str, twilio_sid: Optional[str]):
+    """Log a sent reply as an Outbound message and index its SID for status callbacks"""
+    message_id = airtable.log_message(
+        checkin_id=checkin_id,
+        direction="Outbound",
+        from_number=tenants.current().twilio_phone_number or "",
+        body=body,
+        twilio_sid=twilio_sid or ""
+    )
+    if twilio_sid:
+        delivery_status.index_message(twilio_sid, message_id, checkin_id, to_number=to, kind="reply")
+
+async def _send_and_log_reply(to: str, body: str, checkin_id: str) -> Optional[str]:
+    """Send a reply, log it as an Outbound message and index its SID for status callbacks"""
+    # Long replies are paged; the rest is cached for a MORE request
+    body = await _inbound_call(compose.compose_reply, to, body)
+    
+    with tracing.span("send_reply"):
+        twilio_sid = await twilio_utils.send_sms_async(
+            to=to,
+            body=body,
+            status_callback_url=twilio_utils.status_callback_url(),
+            priority=True
+        )
+    
+    with tracing.span("log_message"):
+        await _inbound_call(_log_reply, to, body, checkin_id, twilio_sid)
+    return twilio_sid
+
 # =============================================================================
 # SCHEDULED JOBS
 # =============================================================================
 
 @app.post("/jobs/send-monthly")
-def send_monthly():
-    """Send monthly check-in SMS to people who are due"""
+def send_monthly(template: str = "checkin", staggered: bool = False, planned: bool = False):
+    """
+    Send monthly check-in SMS to people who are due, using the given message template
+    
+    With staggered=true, only people whose send-window day has arrived and who
+    have no check-in this month are sent, so a daily trigger spreads the
+    month's check-ins evenly and texts each person once. With planned=true,
+    people are sent at their planned time (quiet hours, hourly cap), so an
+    hourly trigger keeps reply load within inbound capacity. Messages go
+    through the tenant's SMS send queue, behind any inbound replies.
+    """
+    try:
+        message_templates.get_template(template)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=e.args[0])
+
+    # One run at a time across instances; overlapping triggers are skipped
+    with coordination.lock("job:send-monthly", ttl_seconds=coordination.JOB_LOCK_TTL_SECONDS,
+                           wait_seconds=0) as acquired:
+        if not acquired:
+            return {"ok": True, "skipped": True, "message": "Monthly check-in job is already running"}
+        return _run_send_monthly(template, staggered, planned)
+
+def _run_send_monthly(template: str, staggered: bool, planned: bool):
+    """Send the monthly check-ins (see send_monthly)"""
     try:
         # Get current month in YYYY-MM format
         current_month = datetime.now().strftime("%Y-%m")
         
+        # List this month's check-ins once: each upsert below is a single write, and the
+        # staggered selection skips people who already have one
+        airtable.load_checkins(current_month)
+        
         # Get people due for check-in using scheduler
-        people_due = scheduler.get_people_due_for_checkin()
+        if planned:
+            people_due = scheduler.get_people_planned_for_checkin()
+        elif staggered:
+            people_due = scheduler.get_people_scheduled_for_checkin()
+        else:
+            people_due = scheduler.get_people_due_for_checkin()
         
         if not people_due:
             return {"ok": True, "message": "No people due for check-in this month", "count": 0}
         
         sent_count = 0
         failed_count = 0
+        sends = []
         
-        for person_record in people_due:
+        # Render every check-in in one pass (snapshots are cached per person)
+        outbound_messages = compose.compose_checkin_messages(
+            [(person_record["id"], person_record["fields"]) for person_record in people_due],
+            template=template
+        )
+        
+        for person_record, outbound_message in zip(people_due, outbound_messages):
             try:
                 person_id = person_record["id"]
                 person_fields = person_record["fields"]
@@ -82,7 +215,7 @@ def send_monthly():
                 # Skip if no phone number
                 phone = person_fields.get("Phone")
                 if not phone:
-                    print(f"No phone number for person {person_id}")
+                    logger.warning("No phone number for person %s", person_id)
                     failed_count += 1
                     continue
                 
@@ -94,50 +227,23 @@ def send_monthly():
                 )
                 
                 if not checkin_id:
-                    print(f"Failed to create check-in for person {person_id}")
+                    logger.error("Failed to create check-in for person %s", person_id)
                     failed_count += 1
                     continue
                 
-                # Compose snapshot and outbound message
-                snapshot = compose.compose_snapshot(person_fields)
-                last_confirmed = person_fields.get("Last Confirmed")
-                name = person_fields.get("Name", "there")
-                
-                outbound_message = compose.compose_outbound(name, snapshot, last_confirmed)
-                
-                # Send SMS via Twilio
-                twilio_sid = twilio_utils.send_sms(
-                    to=phone,
-                    body=outbound_message,
-                    status_callback_url=f"{os.getenv('APP_BASE_URL', 'http://localhost:8000')}/twilio/status"
-                )
-                
-                if twilio_sid:
-                    # Log outbound message
-                    airtable.log_message(
-                        checkin_id=checkin_id,
-                        direction="Outbound",
-                        from_number=os.getenv("TWILIO_PHONE_NUMBER", ""),
-                        body=outbound_message,
-                        twilio_sid=twilio_sid
-                    )
-                    
-                    # Append to transcript
-                    airtable.append_to_transcript(
-                        checkin_id=checkin_id,
-                        message=f"Sent monthly check-in SMS to {phone}"
-                    )
-                    
-                    sent_count += 1
-                else:
-                    # Update check-in status to failed
-                    airtable.update_checkin_status(checkin_id, "Failed")
-                    failed_count += 1
+                sends.append({"person_id": person_id, "phone": phone, "body": outbound_message,
+                              "checkin_id": checkin_id})
                     
             except Exception as e:
-                print(f"Error processing person {person_record.get('id', 'unknown')}: {e}")
+                logger.error("Error processing person %s: %s", person_record.get('id', 'unknown'), e)
                 failed_count += 1
         
+        # Send through the tenant's SMS queue (rate limit, retries, backpressure) from this worker thread
+        if sends:
+            delivered = anyio.from_thread.run(_send_checkins, sends)
+            sent_count += delivered
+            failed_count += len(sends) - delivered
+        
         return {
             "ok": True, 
             "message": f"Monthly check-in job completed. Sent: {sent_count}, Failed: {failed_count}",
@@ -146,59 +252,168 @@ def send_monthly():
         }
         
     except Exception as e:
-        print(f"Error in send_monthly job: {e}")
+        logger.error("Error in send_monthly job: %s", e)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+async def _send_checkins(sends: List[Dict[str, Any]]) -> int:
+    """
+    Queue check-in SMS on the current tenant's send queue and record each one as its send finishes
+    
+    Messages are submitted while earlier ones are recorded, so SIDs are indexed
+    for delivery callbacks even while later messages wait for a pending slot.
+    
+    Args:
+        sends: Dicts with person_id, phone, body and checkin_id
+        
+    Returns:
+        Number of check-ins sent
+    """
+    finished: asyncio.Queue = asyncio.Queue()
+    
+    def _on_done(send: Dict[str, Any], future: asyncio.Future):
+        finished.put_nowait((send, None if future.cancelled() else future.result()))
+    
+    async def _submit_all():
+        for send in sends:
+            try:
+                future = await twilio_utils.submit_sms_async(send["phone"], send["body"],
+                                                             twilio_utils.status_callback_url())
+            except Exception as e:
+                logger.error("Error queueing check-in SMS for person %s: %s", send["person_id"], e)
+                finished.put_nowait((send, None))
+                continue
+            future.add_done_callback(lambda future, send=send: _on_done(send, future))
+    
+    submitting = asyncio.create_task(_submit_all())
+    sent = 0
+    try:
+        for _ in sends:
+            send, twilio_sid = await finished.get()
+            if await run_in_threadpool(_record_checkin_send, send, twilio_sid):
+                sent += 1
+    finally:
+        submitting.cancel()
+    return sent
+
+def _record_checkin_send(send: Dict[str, Any], twilio_sid: Optional[str]) -> bool:
+    """Log a sent check-in and index its SID for delivery callbacks, or mark the check-in failed"""
+    checkin_id, phone = send["checkin_id"], send["phone"]
+    try:
+        if not twilio_sid:
+            airtable.update_checkin_status(checkin_id, "Failed")
+            return False
+        
+        message_id = airtable.log_message(
+            checkin_id=checkin_id,
+            direction="Outbound",
+            from_number=tenants.current().twilio_phone_number or "",
+            body=send["body"],
+            twilio_sid=twilio_sid
+        )
+        delivery_status.index_message(twilio_sid, message_id, checkin_id, to_number=phone, kind="checkin")
+        
+        # Append to transcript
+        airtable.append_to_transcript(
+            checkin_id=checkin_id,
+            message=f"Sent monthly check-in SMS to {phone}"
+        )
+        return True
+    except Exception as e:
+        logger.error("Error recording check-in SMS for person %s: %s", send["person_id"], e)
+        return bool(twilio_sid)
+
 # =============================================================================
 # SMS PROCESSING
 # =============================================================================
 
+def _handle_intent(intent: str, extracted_data: Dict[str, Any], person_id: str,
+                   person_fields: Dict[str, Any]) -> Tuple[bool, str]:
+    """Route a classified free-text message to its intent handler (blocking; see _inbound_call)"""
+    if intent == "update_person_info":
+        return intent_handlers.IntentHandlers.handle_update_person_info(extracted_data, person_id, person_fields)
+    elif intent == "manage_tags":
+        return intent_handlers.IntentHandlers.handle_manage_tags(extracted_data, person_id, person_fields)
+    elif intent == "create_reminder":
+        return intent_handlers.IntentHandlers.handle_create_reminder(extracted_data, person_id, person_fields)
+    elif intent == "create_note":
+        return intent_handlers.IntentHandlers.handle_create_note(extracted_data, person_id, person_fields)
+    elif intent == "schedule_followup":
+        return intent_handlers.IntentHandlers.handle_schedule_followup(extracted_data, person_id, person_fields)
+    elif intent == "new_friend":
+        return intent_handlers.IntentHandlers.handle_new_friend(extracted_data, person_id, person_fields)
+    elif intent == "query_data":
+        return intent_handlers.IntentHandlers.handle_query_data(extracted_data, person_id, person_fields)
+    elif intent == "unclear":
+        # Check if there's a custom error message from the intent classifier
+        error_message = extracted_data.get("error_message", "")
+        if error_message:
+            return False, error_message
+        return False, "I received your message but couldn't understand what you'd like me to do. Please try rephrasing with specific actions like 'remind me to...', 'update my...', or 'add a note...'"
+    return False, "I'm not sure how to help with that. Please try rephrasing your message with specific actions like 'remind me to...', 'update my...', or 'add a note...'"
+
 @app.post("/twilio/inbound")
 async def inbound(request: Request, From: str = Form(...), Body: str = Form(...), MessageSid: str = Form(...)):
-    """Handle inbound SMS from Twilio"""
+    """Handle inbound SMS from Twilio, accounting its outbound calls against the intent's call budget"""
+    # Blocking steps run in the tenant's share of the threadpool, Airtable requests in its bucket (see _inbound_call)
+    with call_budget.request_ledger("inbound"), airtable.paced():
+        return await _process_inbound(From, Body, MessageSid)
+
+async def _process_inbound(From: str, Body: str, MessageSid: str):
+    """Process one inbound SMS (see inbound)"""
     try:
-        # Clean up old messages periodically
-        _cleanup_old_messages()
-        
-        # Check if this message has already been processed (idempotency)
-        if _is_message_processed(MessageSid):
-            print(f"⚠️ Duplicate message detected, skipping: {MessageSid}")
+        # Mark the message as processed (idempotency); the webhook middleware answers
+        # most redeliveries, the atomic claim catches concurrent ones on any instance
+        if not await _inbound_call(webhooks.claim_message, MessageSid):
+            logger.warning("Duplicate message detected, skipping: %s", MessageSid)
             return {"ok": True, "message": "Message already processed"}
         
-        # Mark message as processed
-        _mark_message_processed(MessageSid)
-        
         # Clean phone number (remove +1 prefix if present)
         from_phone = From.replace("+1", "") if From.startswith("+1") else From
         
         # Process the message body early for special commands
         body_lower = Body.strip().lower()
         
+        # Continue a paged reply without touching Airtable (off the event loop: it may wait for the page lock)
+        if body_lower == compose.MORE_KEYWORD.lower():
+            next_page = await _inbound_call(compose.next_page, from_phone)
+            if next_page:
+                call_budget.set_intent("more")
+                with tracing.span("send_reply"):
+                    await twilio_utils.send_sms_async(
+                        to=from_phone,
+                        body=next_page,
+                        status_callback_url=twilio_utils.status_callback_url(),
+                        priority=True
+                    )
+                return {"ok": True, "message": "Sent next page"}
+        
         # Find person by phone number (check main table first, then check-ins)
-        print(f"🔍 Looking up person by phone: {from_phone}")
-        person_record = airtable.get_person_by_phone(from_phone, prefer_checkins=False)
-        print(f"🔍 Person lookup result: {person_record is not None}")
+        logger.debug("Looking up person by phone: %s", from_phone)
+        with tracing.span("phone_lookup"):
+            person_record = await _inbound_call(airtable.get_person_by_phone, from_phone, prefer_checkins=False)
+        logger.debug("Person lookup result: %s", person_record is not None)
         
-        print(f"🔍 Phone lookup: {from_phone} -> {person_record is not None}")
         if person_record:
-            print(f"🔍 Person found: {person_record.get('fields', {}).get('Name', 'Unknown')}")
+            logger.debug("Person found: %s", person_record.get('fields', {}).get('Name', 'Unknown'))
         else:
-            print(f"🔍 No person found for phone: {from_phone}")
+            logger.debug("No person found for phone: %s", from_phone)
         
         if not person_record:
             # Unknown phone number - could log this for review
-            print(f"❌ Unknown phone number: {from_phone}")
-            print(f"❌ Phone lookup failed for: {from_phone}")
+            logger.warning("Unknown phone number: %s", from_phone)
             # For now, let's allow the controls command to work even without a person record
             if body_lower in ["help", "controls"]:
                 # Send help message even without person record
-                help_message = get_help_message()
+                call_budget.set_intent("help")
+                help_message = await _inbound_call(compose.compose_reply, from_phone, get_help_message())
                 
-                twilio_utils.send_sms(
-                    to=from_phone,
-                    body=help_message,
-                    status_callback_url=f"{os.getenv('APP_BASE_URL', 'http://localhost:8000')}/twilio/status"
-                )
+                with tracing.span("send_reply"):
+                    await twilio_utils.send_sms_async(
+                        to=from_phone,
+                        body=help_message,
+                        status_callback_url=twilio_utils.status_callback_url(),
+                        priority=True
+                    )
                 
                 return {"ok": True, "message": "Help message sent to unknown number"}
             
@@ -207,21 +422,24 @@ async def inbound(request: Request, From: str = Form(...), Body: str = Form(...)
         # Handle controls command early to avoid check-in creation issues
         if body_lower in ["help", "controls"]:
             # Send help message with available commands
-            help_message = get_help_message()
+            call_budget.set_intent("help")
+            help_message = await _inbound_call(compose.compose_reply, from_phone, get_help_message())
             
-            twilio_utils.send_sms(
-                to=from_phone,
-                body=help_message,
-                status_callback_url=f"{os.getenv('APP_BASE_URL', 'http://localhost:8000')}/twilio/status"
-            )
+            with tracing.span("send_reply"):
+                await twilio_utils.send_sms_async(
+                    to=from_phone,
+                    body=help_message,
+                    status_callback_url=twilio_utils.status_callback_url(),
+                    priority=True
+                )
             
             return {"ok": True, "message": "Help message sent"}
         
         person_id = person_record["id"]
         person_fields = person_record["fields"]
         
-        print(f"🔍 Found person: {person_fields.get('Name', 'Unknown')} with ID: {person_id}")
-        print(f"🔍 Person record base: {person_record.get('base_id', 'unknown')}")
+        logger.debug("Found person: %s with ID: %s", person_fields.get('Name', 'Unknown'), person_id)
+        logger.debug("Person record base: %s", person_record.get('base_id', 'unknown'))
         
         # Check if person has opted out
         if person_fields.get("Opt-out"):
@@ -231,122 +449,99 @@ async def inbound(request: Request, From: str = Form(...), Body: str = Form(...)
         current_month = datetime.now().strftime("%Y-%m")
         
         # Create or update check-in record
-        print(f"🔧 Creating check-in for person_id: {person_id}, month: {current_month}")
-        checkin_id = airtable.upsert_checkin(
-            person_id=person_id,
-            month=current_month,
-            status="Sent"
-        )
+        logger.debug("Creating check-in for person_id: %s, month: %s", person_id, current_month)
+        # Off the event loop: the upsert may wait up to LOCK_WAIT_SECONDS for another instance's lock
+        with tracing.span("upsert_checkin"):
+            checkin_id = await _inbound_call(
+                airtable.upsert_checkin,
+                person_id=person_id,
+                month=current_month,
+                status="Sent"
+            )
         
-        print(f"🔧 Check-in ID: {checkin_id}")
+        logger.debug("Check-in ID: %s", checkin_id)
         
         if not checkin_id:
-            print(f"❌ Failed to create check-in record for person_id: {person_id}")
+            logger.error("Failed to create check-in record for person_id: %s", person_id)
             # Try to get more specific error information
             try:
                 # Test if we can at least get the person record
-                test_person = airtable.get_person_by_phone(from_phone, prefer_checkins=False)
+                test_person = await _inbound_call(airtable.get_person_by_phone, from_phone, prefer_checkins=False)
                 if test_person:
-                    print(f"❌ Person found but check-in creation failed. Person ID: {test_person.get('id')}")
+                    logger.error("Person found but check-in creation failed. Person ID: %s", test_person.get('id'))
                 else:
-                    print(f"❌ Person not found for phone: {from_phone}")
+                    logger.error("Person not found for phone: %s", from_phone)
             except Exception as test_e:
-                print(f"❌ Error testing person lookup: {test_e}")
+                logger.error("Error testing person lookup: %s", test_e)
             
             # Return a more specific error message
             error_detail = f"Failed to create check-in record for person_id: {person_id}. Check application logs for details."
-            print(f"❌ Returning error: {error_detail}")
+            logger.error("Returning error: %s", error_detail)
             raise HTTPException(status_code=500, detail=error_detail)
         
         # Log inbound message
-        airtable.log_message(
-            checkin_id=checkin_id,
-            direction="Inbound",
-            from_number=from_phone,
-            body=Body,
-            twilio_sid=MessageSid
-        )
+        with tracing.span("log_message"):
+            await _inbound_call(
+                airtable.log_message,
+                checkin_id=checkin_id,
+                direction="Inbound",
+                from_number=from_phone,
+                body=Body,
+                twilio_sid=MessageSid
+            )
         
         # Append to transcript
-        airtable.append_to_transcript(
-            checkin_id=checkin_id,
-            message=f"Received SMS: {Body}"
-        )
+        with tracing.span("append_transcript"):
+            await _inbound_call(
+                airtable.append_to_transcript,
+                checkin_id=checkin_id,
+                message=f"Received SMS: {Body}"
+            )
         
         
         if body_lower == "stop":
             # Handle opt-out
-            airtable.update_person(person_id, {"Opt-out": True})
-            airtable.update_checkin_status(checkin_id, "Opted-out")
+            call_budget.set_intent("opt_out")
+            with tracing.span("handler"):
+                await _inbound_call(airtable.update_person, person_id, {"Opt-out": True})
+                await _inbound_call(airtable.update_checkin_status, checkin_id, "Opted-out")
             
             # Send confirmation
             optout_message = "You have been unsubscribed from monthly check-ins. Reply START to resubscribe."
-            twilio_utils.send_sms(
-                to=from_phone,
-                body=optout_message,
-                status_callback_url=f"{os.getenv('APP_BASE_URL', 'http://localhost:8000')}/twilio/status"
-            )
-            
-            # Log outbound message
-            airtable.log_message(
-                checkin_id=checkin_id,
-                direction="Outbound",
-                from_number=os.getenv("TWILIO_PHONE_NUMBER", ""),
-                body=optout_message,
-                twilio_sid=""
-            )
+            # Send and log outbound message
+            await _send_and_log_reply(from_phone, optout_message, checkin_id)
             
             return {"ok": True, "message": "Person opted out"}
             
         elif body_lower in ["no change", "no changes", "nothing changed", "same"]:
             # Handle no change response
-            airtable.update_person(person_id, {"Last Confirmed": date.today().isoformat()})
-            airtable.update_checkin_status(checkin_id, "Completed")
+            call_budget.set_intent("no_change")
+            with tracing.span("handler"):
+                await _inbound_call(airtable.update_person, person_id, {"Last Confirmed": date.today().isoformat()})
+                await _inbound_call(airtable.update_checkin_status, checkin_id, "Completed")
             
             # Send confirmation
             confirmation_message = "👍 Thanks for confirming! No changes needed."
-            twilio_utils.send_sms(
-                to=from_phone,
-                body=confirmation_message,
-                status_callback_url=f"{os.getenv('APP_BASE_URL', 'http://localhost:8000')}/twilio/status"
-            )
-            
-            # Log outbound message
-            airtable.log_message(
-                checkin_id=checkin_id,
-                direction="Outbound",
-                from_number=os.getenv("TWILIO_PHONE_NUMBER", ""),
-                body=confirmation_message,
-                twilio_sid=""
-            )
+            # Send and log outbound message
+            await _send_and_log_reply(from_phone, confirmation_message, checkin_id)
             
             return {"ok": True, "message": "No changes confirmed"}
             
         elif body_lower == "yes":
             # Handle confirmation of pending changes
+            call_budget.set_intent("confirm_changes")
             # Get the check-in record to see if there are pending changes
             # This would require a function to get check-in by ID
             # For now, we'll assume there are pending changes
             
             # Update person with pending changes (this would need to be implemented)
             # For now, just mark as completed
-            airtable.update_checkin_status(checkin_id, "Completed")
+            with tracing.span("handler"):
+                await _inbound_call(airtable.update_checkin_status, checkin_id, "Completed")
             
             confirmation_message = "✅ Changes applied! Thanks for the update."
-            twilio_utils.send_sms(
-                to=from_phone,
-                body=confirmation_message,
-                status_callback_url=f"{os.getenv('APP_BASE_URL', 'http://localhost:8000')}/twilio/status"
-            )
-            
-            # Log outbound message
-            airtable.log_message(
-                checkin_id=checkin_id,
-                direction="Outbound",
-                from_number=os.getenv("TWILIO_PHONE_NUMBER", ""),
-                body=confirmation_message,
-                twilio_sid=""
-            )
+            # Send and log outbound message
+            await _send_and_log_reply(from_phone, confirmation_message, checkin_id)
             
             return {"ok": True, "message": "Changes confirmed and applied"}
             
@@ -360,89 +555,48 @@ async def inbound(request: Request, From: str = Form(...), Body: str = Form(...)
             
             try:
                 # Classify the intent
-                classification = intent_classifier.classify_intent(Body, person_fields)
+                with tracing.span("classify_intent"):
+                    classification = await _inbound_call(intent_classifier.classify_intent, Body, person_fields)
                 
                 intent = classification.get("intent")
                 confidence = classification.get("confidence", 0)
                 target_table = classification.get("target_table", "None")
                 extracted_data = classification.get("extracted_data", {})
                 
-                print(f"🎯 Intent: {intent}, Confidence: {confidence}, Target: {target_table}")
+                logger.info("Intent: %s, Confidence: %s, Target: %s", intent, confidence, target_table)
+                call_budget.set_intent(intent)
                 
                 if confidence < 0.6:
                     # Low confidence - ask for clarification
                     response_message = "I'm not sure I understood your message. Could you please rephrase or provide more details?"
                 else:
                     # Route to appropriate handler based on intent
-                    if intent == "update_person_info":
-                        success, response_message = intent_handlers.IntentHandlers.handle_update_person_info(
-                            extracted_data, person_id, person_fields
-                        )
-                    elif intent == "manage_tags":
-                        success, response_message = intent_handlers.IntentHandlers.handle_manage_tags(
-                            extracted_data, person_id, person_fields
-                        )
-                    elif intent == "create_reminder":
-                        success, response_message = intent_handlers.IntentHandlers.handle_create_reminder(
-                            extracted_data, person_id, person_fields
+                    with tracing.span("handler"):
+                        success, response_message = await _inbound_call(
+                            _handle_intent, intent, extracted_data, person_id, person_fields
                         )
-                    elif intent == "create_note":
-                        success, response_message = intent_handlers.IntentHandlers.handle_create_note(
-                            extracted_data, person_id, person_fields
-                        )
-                    elif intent == "schedule_followup":
-                        success, response_message = intent_handlers.IntentHandlers.handle_schedule_followup(
-                            extracted_data, person_id, person_fields
-                        )
-                    elif intent == "new_friend":
-                        success, response_message = intent_handlers.IntentHandlers.handle_new_friend(
-                            extracted_data, person_id, person_fields
-                        )
-                    elif intent == "query_data":
-                        success, response_message = intent_handlers.IntentHandlers.handle_query_data(
-                            extracted_data, person_id, person_fields
-                        )
-                    elif intent == "unclear":
-                        # Check if there's a custom error message from the intent classifier
-                        error_message = extracted_data.get("error_message", "")
-                        if error_message:
-                            response_message = error_message
-                        else:
-                            response_message = "I received your message but couldn't understand what you'd like me to do. Please try rephrasing with specific actions like 'remind me to...', 'update my...', or 'add a note...'"
-                    else:
-                        response_message = "I'm not sure how to help with that. Please try rephrasing your message with specific actions like 'remind me to...', 'update my...', or 'add a note...'"
                 
             except Exception as e:
-                print(f"Error in intent classification: {e}")
+                logger.error("Error in intent classification: %s", e)
                 response_message = "I received your message but had trouble processing it. Please try again or reply 'No change' if nothing has changed."
             
             # Always send response (guaranteed to have a message at this point)
             if response_message:
-                twilio_utils.send_sms(
-                    to=from_phone,
-                    body=response_message,
-                    status_callback_url=f"{os.getenv('APP_BASE_URL', 'http://localhost:8000')}/twilio/status"
-                )
-                
-                # Log outbound message
-                airtable.log_message(
-                    checkin_id=checkin_id,
-                    direction="Outbound",
-                    from_number=os.getenv("TWILIO_PHONE_NUMBER", ""),
-                    body=response_message,
-                    twilio_sid=""
-                )
+                # Send and log outbound message
+                await _send_and_log_reply(from_phone, response_message, checkin_id)
                 
                 # Append to transcript
-                airtable.append_to_transcript(
-                    checkin_id=checkin_id,
-                    message=f"Intent: {intent}, Target: {target_table}, Success: {success}"
-                )
+                with tracing.span("append_transcript"):
+                    await _inbound_call(
+                        airtable.append_to_transcript,
+                        checkin_id=checkin_id,
+                        message=f"Intent: {intent}, Target: {target_table}, Success: {success}"
+                    )
             
             return {"ok": True, "message": f"Intent {intent} handled: {response_message}"}
         
     except Exception as e:
-        print(f"Error in inbound SMS handler: {e}")
+        logger.error("Error in inbound SMS handler: %s", e)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.post("/twilio/status")
@@ -457,12 +611,8 @@ async def status(request: Request):
         error_code = data.get("ErrorCode", "")
         error_message = data.get("ErrorMessage", "")
         
-        # Find the check-in by message SID (this would require a function to search messages)
-        # For now, we'll just log the status data
-        
-        # Log system message about delivery status
-        # This would require finding the check-in ID from the message SID
-        # For now, we'll just return the data
+        # Buffer the callback; the pipeline coalesces by SID and writes in batches
+        accepted = delivery_status.pipeline.ingest(message_sid, message_status, error_code)
         
         return {
             "ok": True, 
@@ -471,28 +621,128 @@ async def status(request: Request):
                 "message_sid": message_sid,
                 "status": message_status,
                 "error_code": error_code,
-                "error_message": error_message
+                "error_message": error_message,
+                "buffered": accepted
             }
         }
         
     except Exception as e:
-        print(f"Error in status callback handler: {e}")
+        logger.error("Error in status callback handler: %s", e)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+@app.get("/stats/delivery")
+def get_delivery_stats(hours: float = 24 * 30):
+    """Get delivery-rate aggregates for outbound messages"""
+    try:
+        stats = delivery_status.delivery_stats(since_hours=hours)
+        stats["pipeline"] = {**delivery_status.pipeline.stats, "buffered": delivery_status.pipeline.buffered()}
+        return {"ok": True, "stats": stats}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting delivery stats: {str(e)}")
+
 @app.get("/health")
 def health_check():
-    """Health check endpoint"""
-    return {"ok": True, "status": "healthy", "timestamp": datetime.now().isoformat()}
+    """Health check endpoint; "ready" turns true once the startup warm-up has finished"""
+    ready = warmup.warmup.ready
+    return {
+        "ok": True,
+        "status": "healthy" if ready else "warming_up",
+        "ready": ready,
+        "warmup": warmup.warmup.status(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/health/live")
+def health_live():
+    """Liveness: the process is serving (no dependency calls; use for keep-alive pings)"""
+    return health.liveness()
+
+@app.get("/health/ready")
+def health_ready():
+    """Readiness: warm caches and reachable Airtable (503 otherwise), with cached dependency latencies"""
+    ready, report = health.readiness()
+    return JSONResponse(report, status_code=200 if ready else 503)
 
 @app.get("/stats/monthly")
-def get_monthly_stats():
-    """Get monthly check-in statistics"""
+def get_monthly_stats(month: Optional[str] = None):
+    """Get monthly check-in statistics (month in YYYY-MM format, default current)"""
     try:
-        stats = scheduler.get_monthly_checkin_stats()
+        stats = scheduler.get_monthly_checkin_stats(month)
         return {"ok": True, "stats": stats}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error getting stats: {str(e)}")
 
+@app.get("/stats/send-plan")
+def get_send_plan_stats(month: Optional[str] = None):
+    """Get this month's planned sends per day and the predicted reply load"""
+    try:
+        month = month or datetime.now().strftime("%Y-%m")
+        return {"ok": True, "plan": send_planner.planner.summary(month)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting send plan: {str(e)}")
+
+@app.get("/stats/schedule")
+def get_schedule_stats():
+    """Get directory-wide scheduling counts from the cohort scheduler"""
+    try:
+        return {"ok": True, "stats": scheduler.get_schedule_stats()}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error getting schedule stats: {str(e)}")
+
+def require_admin_token(authorization: Optional[str] = Header(None)):
+    """
+    Dependency for routes that export or bulk-edit data: requires the tenant's ADMIN_API_TOKEN as a bearer token
+
+    Raises:
+        HTTPException: 403 while the tenant has no token configured, 401 for a missing or wrong token
+    """
+    expected = tenants.current().admin_api_token
+    if not expected:
+        raise HTTPException(status_code=403, detail="Set ADMIN_API_TOKEN to enable this endpoint")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(token.strip().encode(), expected.encode()):
+        raise HTTPException(status_code=401, detail="Invalid or missing admin token",
+                            headers={"WWW-Authenticate": "Bearer"})
+
+@app.get("/export/{table}", dependencies=[Depends(require_admin_token)])
+async def export_table(table: str, format: str = "ndjson", fields: Optional[str] = None,
+                       modified_since: Optional[str] = None, source: str = "airtable"):
+    """
+    Stream a whole table (people, checkins or messages) as NDJSON, CSV or Parquet
+    
+    Requires `Authorization: Bearer <ADMIN_API_TOKEN>` (see require_admin_token).
+    
+    Args:
+        fields: Comma-separated field names (default: all fields for NDJSON, standard columns otherwise)
+        modified_since: ISO timestamp; only records modified after it (for incremental exports)
+        source: "airtable", or "cache" to export people from the in-memory directory
+    """
+    field_list = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+    try:
+        since = exporter.parse_modified_since(modified_since) if modified_since else None
+        chunks = exporter.export(table, format, field_list, since, source)
+    except (ValueError, RuntimeError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Fetch the first chunk before responding so Airtable errors (e.g. unknown fields) are not sent as a 200
+    started_at = datetime.now(timezone.utc).isoformat()
+    try:
+        first = await run_in_threadpool(next, chunks, b"")
+    except airtable.AirtableError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+    
+    async def stream():
+        yield first
+        async for chunk in iterate_in_threadpool(chunks):
+            yield chunk
+    
+    filename = f"{table}.{format}"
+    return StreamingResponse(stream(), media_type=exporter.EXPORT_FORMATS[format], headers={
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        # Pass this back as modified_since for the next incremental export
+        "X-Export-Started-At": started_at
+    })
+
 @app.get("/people/due")
 def get_due_people():
     """Get people due for check-in this month"""
@@ -568,29 +818,74 @@ async def admin_change_company(name: str = Form(...), new_company: str = Form(..
     success, message = admin_sms.execute_admin_command(command_data)
     return {"success": success, "message": message}
 
+@app.post("/admin/bulk", dependencies=[Depends(require_admin_token)])
+async def admin_bulk(request: Request, format: Optional[str] = None, dry_run: bool = False):
+    """
+    Apply admin operations from a CSV (with header) or NDJSON upload
+    
+    Each row is an admin command, e.g. {"command": "change_role", "name": "Sarah Lee", "new_role": "CTO"}.
+    The response streams one NDJSON result per row, then a summary line.
+    
+    Requires `Authorization: Bearer <ADMIN_API_TOKEN>` (see require_admin_token).
+    """
+    content_type = request.headers.get("content-type", "")
+    fmt = format or ("csv" if "csv" in content_type else "ndjson")
+    try:
+        parser = bulk_admin.RowParser(fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Loading a stale directory and validating rows both block, so they run off the event loop
+    bulk = bulk_admin.BulkImport(await run_in_threadpool(people_cache.get_cache), dry_run=dry_run)
+    
+    # Rows are parsed and validated as the upload streams in; rejected rows are reported first
+    rejected = []
+    
+    def add_rows(parse, *data: bytes):
+        for row_number, row in parse(*data):
+            error = bulk.add(row_number, row)
+            if error:
+                rejected.append(error)
+    
+    async for chunk in request.stream():
+        await run_in_threadpool(add_rows, parser.feed, chunk)
+    await run_in_threadpool(add_rows, parser.close)
+    
+    async def progress():
+        for result in rejected:
+            yield json.dumps(result) + "\n"
+        async for result in iterate_in_threadpool(bulk.apply()):
+            yield json.dumps(result) + "\n"
+        yield json.dumps(bulk.summary()) + "\n"
+    
+    return StreamingResponse(progress(), media_type="application/x-ndjson")
+
 @app.get("/admin/search")
-async def search_people(query: str):
-    """Search for people by name"""
+async def search_people(request: Request, query: str, limit: int = 20, offset: int = 0):
+    """Search people by Name, Company, Role or Email word prefixes (ranked, paginated)"""
     try:
-        # Get all people from Airtable
-        people = airtable.get_all_people()
+        # A stale directory is reloaded from Airtable off the event loop; the search itself is an index lookup
+        cache = await run_in_threadpool(people_cache.get_cache)
         
-        # Search for people by name (case-insensitive)
-        query_lower = query.lower()
-        matches = []
-        
-        for person in people:
-            name = person.get('fields', {}).get('Name', '')
-            if query_lower in name.lower():
-                matches.append({
-                    'id': person['id'],
-                    'name': name,
-                    'phone': person.get('fields', {}).get('Phone', ''),
-                    'company': person.get('fields', {}).get('Company', ''),
-                    'role': person.get('fields', {}).get('Role', '')
-                })
+        # Repeated queries against an unchanged directory get a 304
+        etag = '"%s"' % hashlib.sha1(f"{cache.version}|{query}|{limit}|{offset}".encode()).hexdigest()
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        
+        total, people = cache.search.search(query, limit=limit, offset=offset)
+        matches = [{
+            'id': person['id'],
+            'name': person.get('fields', {}).get('Name', ''),
+            'phone': person.get('fields', {}).get('Phone', ''),
+            'company': person.get('fields', {}).get('Company', ''),
+            'role': person.get('fields', {}).get('Role', '')
+        } for person in people]
         
-        return {"success": True, "matches": matches, "count": len(matches)}
+        return JSONResponse(
+            {"success": True, "matches": matches, "count": len(matches), "total": total,
+             "offset": offset, "limit": limit},
+            headers={"ETag": etag, "Cache-Control": "no-cache"}
+        )
         
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -637,6 +932,19 @@ async def admin_dashboard():
                 <div id="searchResults" class="search-results"></div>
             </div>
             
+            <div class="form-section">
+                <h2>📥 Bulk Import</h2>
+                <div class="form-group">
+                    <label>CSV (command,name,value,...) or NDJSON file:</label>
+                    <input type="file" id="bulkFile" accept=".csv,.ndjson,.jsonl,.json">
+                </div>
+                <div class="form-group">
+                    <label><input type="checkbox" id="bulkDryRun" style="width: auto;"> Dry run (validate only)</label>
+                </div>
+                <button type="button" onclick="runBulk()">Upload</button>
+                <div id="bulkProgress"></div>
+            </div>
+            
             <div class="form-section">
                 <h2>�� Add Birthday</h2>
                 <form action="/admin/add-birthday" method="post" onsubmit="return submitForm(this, event)">
@@ -687,45 +995,104 @@ async def admin_dashboard():
             // Search functionality
             const searchInput = document.getElementById('searchInput');
             const searchResults = document.getElementById('searchResults');
+            const SEARCH_DEBOUNCE_MS = 200;
+            let searchTimer = null;
+            let searchController = null;
             
-            searchInput.addEventListener('input', async function() {
+            searchInput.addEventListener('input', function() {
                 const query = this.value.trim();
+                clearTimeout(searchTimer);
                 
                 if (query.length < 2) {
+                    if (searchController) searchController.abort();
                     searchResults.innerHTML = '';
                     return;
                 }
                 
+                // Wait for typing to pause, then cancel any request still in flight
+                searchTimer = setTimeout(() => runSearch(query), SEARCH_DEBOUNCE_MS);
+            });
+            
+            async function runSearch(query) {
+                if (searchController) searchController.abort();
+                searchController = new AbortController();
+                
                 try {
-                    const response = await fetch(`/admin/search?query=${encodeURIComponent(query)}`);
+                    const response = await fetch(`/admin/search?query=${encodeURIComponent(query)}&limit=20`,
+                                                 { signal: searchController.signal });
                     const data = await response.json();
                     
                     if (data.success) {
-                        displaySearchResults(data.matches);
+                        displaySearchResults(data.matches, data.total);
                     } else {
-                        searchResults.innerHTML = '<div class="error">❌ Search error: ' + data.error + '</div>';
+                        searchResults.innerHTML = '<div class="error">❌ Search error: ' + escapeHtml(data.error) + '</div>';
                     }
                 } catch (error) {
-                    searchResults.innerHTML = '<div class="error">❌ Search failed: ' + error.message + '</div>';
+                    if (error.name === 'AbortError') return;
+                    searchResults.innerHTML = '<div class="error">❌ Search failed: ' + escapeHtml(error.message) + '</div>';
                 }
-            });
+            }
             
-            function displaySearchResults(matches) {
+            async function runBulk() {
+                const file = document.getElementById('bulkFile').files[0];
+                const progress = document.getElementById('bulkProgress');
+                if (!file) return;
+                
+                const format = file.name.toLowerCase().endsWith('.csv') ? 'csv' : 'ndjson';
+                const dryRun = document.getElementById('bulkDryRun').checked;
+                progress.innerHTML = '<div class="result">Uploading...</div>';
+                
+                // Read the NDJSON progress stream line by line as rows complete
+                const response = await fetch(`/admin/bulk?format=${format}&dry_run=${dryRun}`, { method: 'POST', body: file });
+                const reader = response.body.getReader();
+                const decoder = new TextDecoder();
+                let buffer = '', done = 0, failures = [];
+                while (true) {
+                    const { value, done: finished } = await reader.read();
+                    if (finished) break;
+                    buffer += decoder.decode(value, { stream: true });
+                    const lines = buffer.split('\\n');
+                    buffer = lines.pop();
+                    for (const line of lines) {
+                        if (!line) continue;
+                        const result = JSON.parse(line);
+                        if (result.done) {
+                            progress.innerHTML = `<div class="result ${result.failed ? 'error' : 'success'}">`
+                                + `${result.succeeded} succeeded, ${result.failed} failed (${result.seconds}s)</div>`
+                                + failures.map(f => `<div class="error">Row ${f.row}: ${escapeHtml(f.message)}</div>`).join('');
+                            continue;
+                        }
+                        done += 1;
+                        if (!result.success) failures.push(result);
+                        progress.innerHTML = `<div class="result">Processed ${done} rows...</div>`;
+                    }
+                }
+            }
+            
+            function escapeHtml(value) {
+                const div = document.createElement('div');
+                div.textContent = value == null ? '' : String(value);
+                return div.innerHTML;
+            }
+            
+            function displaySearchResults(matches, total) {
                 if (matches.length === 0) {
                     searchResults.innerHTML = '<div class="result">No people found matching your search.</div>';
                     return;
                 }
                 
-                let html = `<div class="result success">Found ${matches.length} person(s):</div>`;
+                let html = total > matches.length
+                    ? `<div class="result success">Showing ${matches.length} of ${total} people:</div>`
+                    : `<div class="result success">Found ${matches.length} person(s):</div>`;
                 
                 matches.forEach(person => {
                     html += `
                         <div class="person-card">
-                            <div class="person-name">${person.name}</div>
+                            <div class="person-name">${escapeHtml(person.name)}</div>
                             <div class="person-details">
-                                ${person.phone ? '📞 ' + person.phone + '<br>' : ''}
-                                ${person.company ? '🏢 ' + person.company + '<br>' : ''}
-                                ${person.role ? '💼 ' + person.role : ''}
+                                ${person.phone ? '📞 ' + escapeHtml(person.phone) + '<br>' : ''}
+                                ${person.company ? '🏢 ' + escapeHtml(person.company) + '<br>' : ''}
+                                ${person.role ? '💼 ' + escapeHtml(person.role) : ''}
                             </div>
                         </div>
                     `;
@@ -788,13 +1155,15 @@ async def debug_airtable():
         people = airtable.get_all_people()
         
         # Get basic info about what we found
+        tenant = tenants.current()
         debug_info = {
-            "table_name": os.getenv("AIRTABLE_PEOPLE_TABLE", "People"),
-            "base_id": os.getenv("AIRTABLE_BASE_ID", "unknown"),
-            "checkins_base_id": os.getenv("AIRTABLE_CHECKINS_BASE_ID", "unknown"),
-            "checkins_base_url": os.getenv("AIRTABLE_CHECKINS_BASE_URL", "unknown"),
-            "checkins_table": os.getenv("AIRTABLE_CHECKINS_TABLE", "unknown"),
-            "checkins_people_table": os.getenv("AIRTABLE_CHECKINS_PEOPLE_TABLE", "unknown"),
+            "tenant": tenant.tenant_id,
+            "table_name": tenant.people_table,
+            "base_id": tenant.base_id or "unknown",
+            "checkins_base_id": tenant.setting("AIRTABLE_CHECKINS_BASE_ID") or "unknown",
+            "checkins_base_url": tenant.checkins_base_url,
+            "checkins_table": tenant.checkins_table,
+            "checkins_people_table": tenant.checkins_people_table or "unknown",
             "total_records": len(people),
             "sample_records": []
         }
@@ -823,61 +1192,20 @@ async def debug_airtable():
 def check_reminders():
     """Check for due reminders and send notifications"""
     try:
-        # Simple reminder check - get reminders due in the next 5 minutes
-        from datetime import datetime, timedelta
-        
-        now = datetime.now()
-        buffer_time = now + timedelta(minutes=5)
-        
-        # Get reminders from Airtable
-        endpoint = f"{os.getenv('AIRTABLE_REMINDERS_TABLE')}"
-        base_url = f"https://api.airtable.com/v0/{os.getenv('AIRTABLE_REMINDERS_BASE_ID')}"
-        
-        filter_formula = f"AND({{Due date}} <= '{buffer_time.isoformat()}', {{Status}} != 'Sent', {{Status}} != 'Completed')"
-        
-        response = airtable._make_request("GET", endpoint, params={"filterByFormula": filter_formula}, base_url=base_url)
-        reminders = response.get("records", [])
-        
-        sent_count = 0
-        for reminder in reminders:
-            try:
-                fields = reminder.get("fields", {})
-                reminder_text = fields.get("Reminder", "")
-                
-                # Send notification
-                notification_message = f"🔔 Reminder: {reminder_text}"
-                
-                twilio_sid = twilio_utils.send_sms(
-                    to=os.getenv("TWILIO_PHONE_NUMBER", "+16469177351"),
-                    body=notification_message,
-                    status_callback_url=f"{os.getenv('APP_BASE_URL', 'http://localhost:8000')}/twilio/status"
-                )
-                
-                if twilio_sid:
-                    # Mark as sent
-                    reminder_id = reminder.get("id")
-                    update_data = {
-                        "fields": {
-                            "Status": "Sent",
-                            "Sent At": datetime.now().isoformat()
-                        }
-                    }
-                    airtable._make_request("PATCH", f"{endpoint}/{reminder_id}", update_data, base_url=base_url)
-                    sent_count += 1
-                    print(f"✅ Sent reminder: {reminder_text}")
-                    
-            except Exception as e:
-                print(f"Error processing reminder: {e}")
+        with coordination.lock("job:check-reminders", ttl_seconds=coordination.JOB_LOCK_TTL_SECONDS,
+                               wait_seconds=0) as acquired:
+            if not acquired:
+                return {"ok": True, "skipped": True, "message": "Reminder dispatch is already running"}
+            result = reminder_engine.get_engine().dispatch_due()
         
         return {
             "ok": True,
-            "message": f"Processed {len(reminders)} reminders. Sent: {sent_count}",
-            "total": len(reminders),
-            "sent": sent_count
+            "message": f"Processed {result['total']} reminders. Sent: {result['sent']}",
+            **result
         }
         
     except Exception as e:
-        print(f"Error in check_reminders: {e}")
+        logger.error("Error in check_reminders: %s", e)
         return {"ok": False, "error": str(e)}
 
 @app.get("/test-reminders")
@@ -889,8 +1217,9 @@ def test_reminders():
 def get_twilio_logs(limit: int = 20):
     """Get recent Twilio message logs"""
     try:
-        account_sid = os.getenv("TWILIO_ACCOUNT_SID")
-        auth_token = os.getenv("TWILIO_AUTH_TOKEN")
+        tenant = tenants.current()
+        account_sid = tenant.twilio_account_sid
+        auth_token = tenant.twilio_auth_token
         
         if not account_sid or not auth_token:
             return {"error": "Twilio credentials not configured"}
@@ -899,7 +1228,7 @@ def get_twilio_logs(limit: int = 20):
         url = f"https://api.twilio.com/2010-04-01/Accounts/{account_sid}/Messages.json"
         params = {
             "PageSize": limit,
-            "To": os.getenv("TWILIO_PHONE_NUMBER", ""),
+            "To": tenant.twilio_phone_number or "",
             "From": "9784910236"  # Your admin number
         }
         
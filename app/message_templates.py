@@ -0,0 +1,227 @@
+"""
+Message Templates Module
+
+This module renders outbound SMS from templates instead of hard-coded f-strings.
+It includes:
+- A small template syntax: `{Field}` and `{Field|default}` (see README "Outbound SMS Template")
+- Templates compiled once into a format string plus field slots
+- A registry of named templates, overridable per campaign from a templates directory
+- Bulk rendering that formats each slot as a column across all recipients
+- A per-person snapshot cache keyed on a hash of the snapshot fields
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+DEFAULT_TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), '..', 'config', 'templates')
+MESSAGE_TEMPLATES_DIR = os.getenv("MESSAGE_TEMPLATES_DIR", DEFAULT_TEMPLATES_DIR)
+
+SNAPSHOT_CACHE_SIZE = int(os.getenv("SNAPSHOT_CACHE_SIZE", "50000"))
+
+# Default value for an empty slot with no explicit `|default`
+EMPTY_VALUE = "—"
+
+SNAPSHOT_FIELDS = ("Company", "Role", "City", "Tags")
+
+# Built-in templates; a campaign overrides one by dropping <name>.txt in the templates directory
+BUILTIN_TEMPLATES = {
+    "snapshot": "\n".join(f"• {field}: {{{field}|{EMPTY_VALUE}}}" for field in SNAPSHOT_FIELDS),
+    "checkin": (
+        "Hi {Name|there}! Monthly check-in. Here’s what I have:\n"
+        "{Snapshot}\n"
+        "Anything changed since {Last Confirmed|last month}?\n"
+        "Reply with updates or 'No change'. Reply STOP to opt out."
+    ),
+}
+
+_SLOT_PATTERN = re.compile(r"\{([^{}|]+)(?:\|([^{}]*))?\}")
+
+# Template names are file stems in MESSAGE_TEMPLATES_DIR; anything else (paths, "..") is rejected
+_NAME_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+
+# =============================================================================
+# COMPILED TEMPLATES
+# =============================================================================
+
+def format_value(value: Any, default: str = EMPTY_VALUE, max_len: Optional[int] = None) -> str:
+    """Format a field value for SMS: lists are comma-joined, long values truncated with an ellipsis"""
+    if value is None or value == "" or value == []:
+        return default
+    if isinstance(value, (list, tuple)):
+        value = ", ".join(map(str, value))
+    s = str(value).strip()
+    return (s[:max_len] + "…") if max_len and len(s) > max_len else s
+
+class CompiledTemplate:
+    """A template parsed once into literal text and (field, default) slots"""
+
+    def __init__(self, name: str, source: str):
+        self.name = name
+        self.source = source
+        self.slots: List[Tuple[str, str]] = []
+
+        parts = []
+        position = 0
+        for match in _SLOT_PATTERN.finditer(source):
+            parts.append(_escape(source[position:match.start()]))
+            parts.append("{}")
+            field = match.group(1).strip()
+            default = match.group(2) if match.group(2) is not None else EMPTY_VALUE
+            self.slots.append((field, default))
+            position = match.end()
+        parts.append(_escape(source[position:]))
+        self._format = "".join(parts).format
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return tuple(field for field, _ in self.slots)
+
+    def render(self, fields: Dict[str, Any], max_len: Optional[int] = None) -> str:
+        """Render the template for one set of fields"""
+        return self._format(*[
+            format_value(_lookup(fields, field), default, max_len) for field, default in self.slots
+        ])
+
+    def render_many(self, rows: Sequence[Dict[str, Any]], max_len: Optional[int] = None) -> List[str]:
+        """
+        Render the template for many sets of fields in one pass
+
+        Each slot is formatted as a column across all rows, then the columns are
+        zipped through the compiled format string.
+        """
+        if not rows:
+            return []
+        if not self.slots:
+            return [self._format()] * len(rows)
+        columns = [
+            [format_value(_lookup(row, field), default, max_len) for row in rows]
+            for field, default in self.slots
+        ]
+        return list(map(self._format, *columns))
+
+def _escape(literal: str) -> str:
+    return literal.replace("{", "{{").replace("}", "}}")
+
+def _lookup(fields: Dict[str, Any], field: str) -> Any:
+    # README templates write {LastConfirmed}; Airtable field is "Last Confirmed"
+    value = fields.get(field)
+    if value is None and " " not in field:
+        value = fields.get(_SPACED_NAMES.get(field, field))
+    return value
+
+_SPACED_NAMES = {"LastConfirmed": "Last Confirmed"}
+
+# =============================================================================
+# TEMPLATE REGISTRY
+# =============================================================================
+
+@lru_cache(maxsize=256)
+def compile_template(source: str, name: str = "inline") -> CompiledTemplate:
+    """Compile a template source (cached by source text)"""
+    return CompiledTemplate(name, source)
+
+@lru_cache(maxsize=64)
+def _template_source(name: str) -> Optional[str]:
+    path = os.path.join(MESSAGE_TEMPLATES_DIR, f"{name}.txt")
+    if os.path.isfile(path):
+        with open(path, encoding="utf-8") as f:
+            return f.read().rstrip("\n")
+    return BUILTIN_TEMPLATES.get(name)
+
+def get_template(name: str) -> CompiledTemplate:
+    """
+    Get a compiled template by name
+
+    Args:
+        name: Template name, e.g. "checkin" or a campaign template in MESSAGE_TEMPLATES_DIR
+
+    Raises:
+        KeyError: If the name is not a plain template name or no template with that name exists
+    """
+    if not _NAME_PATTERN.fullmatch(name):
+        raise KeyError(f"Invalid message template name: {name!r}")
+    source = _template_source(name)
+    if source is None:
+        raise KeyError(f"Unknown message template: {name}")
+    return compile_template(source, name)
+
+def reload_templates():
+    """Forget cached template sources so edited campaign templates are picked up"""
+    _template_source.cache_clear()
+    compile_template.cache_clear()
+
+def snapshot_template(fields: Sequence[str] = SNAPSHOT_FIELDS) -> CompiledTemplate:
+    """Get the snapshot template, or an ad-hoc one for a custom field list"""
+    if tuple(fields) == SNAPSHOT_FIELDS:
+        return get_template("snapshot")
+    source = "\n".join(f"• {field}: {{{field}|{EMPTY_VALUE}}}" for field in fields)
+    return compile_template(source, "snapshot")
+
+# =============================================================================
+# SNAPSHOT CACHE
+# =============================================================================
+
+def _freeze(value: Any) -> Any:
+    return tuple(value) if isinstance(value, list) else value
+
+class SnapshotCache:
+    """LRU cache of rendered snapshots per person, invalidated when snapshot fields change"""
+
+    def __init__(self, max_size: int = SNAPSHOT_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, str, Optional[int]], Tuple[int, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def _digest(self, template: CompiledTemplate, fields: Dict[str, Any]) -> int:
+        return hash(tuple(_freeze(_lookup(fields, field)) for field in template.fields))
+
+    def get_many(self, template: CompiledTemplate, records: Sequence[Tuple[str, Dict[str, Any]]],
+                 max_len: Optional[int] = None) -> List[str]:
+        """
+        Get rendered snapshots for (person_id, fields) pairs, rendering misses in bulk
+
+        Returns:
+            Snapshots in the same order as records
+        """
+        results: List[Optional[str]] = [None] * len(records)
+        misses = []
+        with self._lock:
+            for i, (person_id, fields) in enumerate(records):
+                digest = self._digest(template, fields)
+                entry = self._entries.get((person_id, template.source, max_len))
+                if entry and entry[0] == digest:
+                    self._entries.move_to_end((person_id, template.source, max_len))
+                    results[i] = entry[1]
+                else:
+                    misses.append((i, person_id, digest))
+            self.stats["hits"] += len(records) - len(misses)
+            self.stats["misses"] += len(misses)
+
+        if misses:
+            rendered = template.render_many([records[i][1] for i, _, _ in misses], max_len)
+            with self._lock:
+                for (i, person_id, digest), text in zip(misses, rendered):
+                    results[i] = text
+                    self._entries[(person_id, template.source, max_len)] = (digest, text)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return results
+
+    def get(self, template: CompiledTemplate, person_id: str, fields: Dict[str, Any],
+            max_len: Optional[int] = None) -> str:
+        return self.get_many(template, [(person_id, fields)], max_len)[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+snapshot_cache = SnapshotCache()
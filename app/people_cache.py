@@ -0,0 +1,127 @@
+"""
+People Cache Module
+
+This module keeps an in-memory copy of the People table so admin lookups and
+search do not fetch the whole table per request. It includes:
+- One paginated load of every person, refreshed after PEOPLE_CACHE_TTL_MINUTES
+- Incremental updates from airtable person writes, on this instance and
+  (broadcast through coordination) on every other one
+- A version counter that changes whenever the cached directory changes
+- A prefix search index over Name, Company, Role and Email (see people_search)
+- A phone index serving inbound phone lookups while the cache is fresh
+- One cache per tenant
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from . import airtable, coordination, tenants
+from .people_search import PeopleSearchIndex
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+PEOPLE_CACHE_TTL_MINUTES = float(os.getenv("PEOPLE_CACHE_TTL_MINUTES", "10"))
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+class PeopleCache:
+    """In-memory People directory with a search index kept in sync"""
+
+    def __init__(self, ttl_minutes: float = PEOPLE_CACHE_TTL_MINUTES):
+        self.ttl_seconds = ttl_minutes * 60
+        self._lock = threading.RLock()
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._by_phone: Dict[str, str] = {}  # normalized phone -> first person with it
+        self.search = PeopleSearchIndex()
+        self.version = 0
+        self.loaded_at = 0.0
+
+    def load(self, records: List[Dict[str, Any]]):
+        """Replace the cached directory and rebuild the search index"""
+        with self._lock:
+            self._records = {record["id"]: record for record in records}
+            self._by_phone = {}
+            for record in records:
+                self._index_phone(record)
+            self.search.build(records)
+            self.version += 1
+            self.loaded_at = time.time()
+
+    def refresh(self):
+        """Reload every person with a single paginated fetch"""
+        self.load(airtable._get_all_records(tenants.current().people_table))
+
+    @property
+    def fresh(self) -> bool:
+        """True once loaded and younger than the TTL"""
+        return bool(self.loaded_at) and time.time() - self.loaded_at <= self.ttl_seconds
+
+    def ensure_fresh(self):
+        if not self.fresh:
+            self.refresh()
+
+    def _index_phone(self, record: Dict[str, Any]):
+        phone = airtable._normalize_phone(record.get("fields", {}).get("Phone", ""))
+        if phone:
+            self._by_phone.setdefault(phone, record["id"])
+
+    def apply_update(self, person_id: str, fields: Dict[str, Any]):
+        """Merge written fields into the cached person (or add a newly created person)"""
+        with self._lock:
+            record = self._records.get(person_id)
+            if record is None:
+                if not self.loaded_at:
+                    return
+                record = self._records[person_id] = {"id": person_id, "fields": {}}
+            if "Phone" in fields:
+                old_phone = airtable._normalize_phone(record["fields"].get("Phone", ""))
+                if self._by_phone.get(old_phone) == person_id:
+                    del self._by_phone[old_phone]
+            record["fields"].update(fields)
+            self._index_phone(record)
+            self.search.update(record)
+            self.version += 1
+
+    def get(self, person_id: str) -> Optional[Dict[str, Any]]:
+        return self._records.get(person_id)
+
+    def find_by_phone(self, phone: str) -> Optional[Dict[str, Any]]:
+        """A copy of the cached person with this phone number (any format), if any"""
+        with self._lock:
+            record = self._records.get(self._by_phone.get(airtable._normalize_phone(phone), ""))
+            return {**record, "fields": dict(record.get("fields", {}))} if record else None
+
+    def all(self) -> List[Dict[str, Any]]:
+        return list(self._records.values())
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+# =============================================================================
+# SHARED CACHE
+# =============================================================================
+
+# The default tenant's cache; other tenants keep theirs in their resources
+cache = PeopleCache()
+
+def current_cache() -> PeopleCache:
+    """The current tenant's people cache, as is"""
+    tenant = tenants.current()
+    return cache if tenant.is_default else tenant.resource("people_cache", PeopleCache)
+
+@airtable.on_change("person")
+@coordination.on_broadcast("person")
+def _on_person_changed(person_id: str, fields: Dict[str, Any]):
+    current_cache().apply_update(person_id, fields)
+
+def get_cache() -> PeopleCache:
+    """Get the current tenant's people cache, reloading it if stale"""
+    tenant_cache = current_cache()
+    tenant_cache.ensure_fresh()
+    return tenant_cache
@@ -0,0 +1,221 @@
+"""
+People Search Module
+
+This module provides the prefix index behind /admin/search. It includes:
+- Per-field sorted token lists with posting sets (Name, Company, Role, Email)
+- Prefix lookups by bisect, unioned with set operations
+- Ranking tiers (exact name word, name prefix, company, role, email), each
+  ordered by name through precomputed numeric ranks
+- Incremental re-indexing of a single person
+"""
+
+import bisect
+import heapq
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Indexed fields, in ranking order
+SEARCH_FIELDS = ("Name", "Company", "Role", "Email")
+
+MAX_SEARCH_LIMIT = 100
+
+# Number of prefix lookups kept between directory changes
+PREFIX_CACHE_SIZE = 1024
+
+_TOKEN_PATTERN = re.compile(r"[0-9a-z]+")
+
+def tokenize(value: Any) -> List[str]:
+    """Lower-case alphanumeric words of a field value (emails split at @ and dots)"""
+    if not value:
+        return []
+    if isinstance(value, (list, tuple)):
+        value = " ".join(map(str, value))
+    return _TOKEN_PATTERN.findall(str(value).lower())
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+class PeopleSearchIndex:
+    """Prefix index over people records"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[str, Set[str]]] = {field: {} for field in SEARCH_FIELDS}
+        self._tokens: Dict[str, List[str]] = {field: [] for field in SEARCH_FIELDS}
+        self._indexed: Dict[str, Dict[str, List[str]]] = {}  # person_id -> field -> tokens
+        self._records: Dict[str, Dict[str, Any]] = {}
+        # Name order: sorted (name, id) list, and a numeric rank per person that follows it
+        self._order: List[Tuple[str, str]] = []
+        self._names: Dict[str, str] = {}
+        self._rank: Dict[str, float] = {}
+        self._by_rank: Dict[float, str] = {}
+        self._prefix_cache: "OrderedDict[Tuple[str, str], Set[str]]" = OrderedDict()
+
+    def build(self, records: List[Dict[str, Any]]):
+        """Index every record from scratch"""
+        with self._lock:
+            self._postings = {field: {} for field in SEARCH_FIELDS}
+            self._indexed = {}
+            self._records = {}
+            for record in records:
+                self._add(record)
+            self._tokens = {field: sorted(postings) for field, postings in self._postings.items()}
+            self._order = sorted((_sort_name(record), record["id"]) for record in self._records.values())
+            self._renumber()
+            self._prefix_cache.clear()
+
+    def update(self, record: Dict[str, Any]):
+        """Re-index one person after their fields changed"""
+        with self._lock:
+            person_id = record["id"]
+            self._remove(person_id)
+            for field, tokens in self._add(record).items():
+                token_list = self._tokens[field]
+                for token in tokens:
+                    position = bisect.bisect_left(token_list, token)
+                    if position == len(token_list) or token_list[position] != token:
+                        token_list.insert(position, token)
+            if self._names.get(person_id) != _sort_name(record):
+                self._reorder(person_id, _sort_name(record))
+            self._prefix_cache.clear()
+
+    def _add(self, record: Dict[str, Any]) -> Dict[str, List[str]]:
+        person_id = record["id"]
+        fields = record.get("fields", {})
+        indexed = {}
+        for field in SEARCH_FIELDS:
+            tokens = list(dict.fromkeys(tokenize(fields.get(field))))
+            for token in tokens:
+                self._postings[field].setdefault(token, set()).add(person_id)
+            indexed[field] = tokens
+        self._indexed[person_id] = indexed
+        self._records[person_id] = record
+        return indexed
+
+    def _remove(self, person_id: str):
+        # Emptied tokens stay in the sorted lists; their posting sets are simply gone
+        for field, tokens in self._indexed.pop(person_id, {}).items():
+            postings = self._postings[field]
+            for token in tokens:
+                ids = postings.get(token)
+                if ids is not None:
+                    ids.discard(person_id)
+                    if not ids:
+                        del postings[token]
+        self._records.pop(person_id, None)
+
+    def _renumber(self):
+        self._names = {person_id: name for name, person_id in self._order}
+        self._rank = {person_id: float(i) for i, (_, person_id) in enumerate(self._order)}
+        self._by_rank = {rank: person_id for person_id, rank in self._rank.items()}
+
+    def _reorder(self, person_id: str, name: str):
+        """Move one person to their new place in name order without renumbering everyone"""
+        old_name = self._names.get(person_id)
+        if old_name is not None:
+            position = bisect.bisect_left(self._order, (old_name, person_id))
+            if position < len(self._order) and self._order[position] == (old_name, person_id):
+                del self._order[position]
+            del self._by_rank[self._rank.pop(person_id)]
+        self._names[person_id] = name
+        position = bisect.bisect_left(self._order, (name, person_id))
+        self._order.insert(position, (name, person_id))
+        before = self._rank[self._order[position - 1][1]] if position > 0 else -1.0
+        after = self._rank[self._order[position + 1][1]] if position + 1 < len(self._order) else before + 2.0
+        rank = (before + after) / 2
+        if not before < rank < after:
+            # Float gap exhausted after many inserts at the same spot
+            self._renumber()
+            return
+        self._rank[person_id] = rank
+        self._by_rank[rank] = person_id
+
+    # -------------------------------------------------------------------------
+    # Lookup
+    # -------------------------------------------------------------------------
+
+    def _prefix(self, field: str, prefix: str) -> Set[str]:
+        """IDs with a word in field starting with prefix (field "*" means any indexed field)"""
+        key = (field, prefix)
+        cached = self._prefix_cache.get(key)
+        if cached is not None:
+            self._prefix_cache.move_to_end(key)
+            return cached
+        if field == "*":
+            matches = set().union(*(self._prefix(name, prefix) for name in SEARCH_FIELDS))
+            return self._remember(key, matches)
+        tokens = self._tokens[field]
+        postings = self._postings[field]
+        lo = bisect.bisect_left(tokens, prefix)
+        hi = bisect.bisect_left(tokens, prefix + "\uffff")
+        matches: Set[str] = set()
+        for token in tokens[lo:hi]:
+            ids = postings.get(token)
+            if ids:
+                matches |= ids
+        return self._remember(key, matches)
+
+    def _remember(self, key: Tuple[str, str], matches: Set[str]) -> Set[str]:
+        self._prefix_cache[key] = matches
+        if len(self._prefix_cache) > PREFIX_CACHE_SIZE:
+            self._prefix_cache.popitem(last=False)
+        return matches
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Find people whose Name, Company, Role or Email words start with every query word
+
+        Args:
+            query: Free text; each word must prefix-match some indexed word
+            limit: Page size (capped at MAX_SEARCH_LIMIT)
+            offset: Number of ranked results to skip
+
+        Returns:
+            (total number of matches, ranked records for the requested page)
+        """
+        words = tokenize(query)
+        if not words:
+            return 0, []
+        limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+        offset = max(0, offset)
+
+        with self._lock:
+            candidates: Optional[Set[str]] = None
+            for word in words:
+                matched = self._prefix("*", word)
+                candidates = matched if candidates is None else candidates & matched
+                if not candidates:
+                    return 0, []
+
+            # Rank tiers by the first word: exact name word, name prefix, then other fields
+            first = words[0]
+            tiers = [self._postings["Name"].get(first, set())] + [self._prefix(field, first) for field in SEARCH_FIELDS]
+            needed = offset + limit
+            ranked: List[str] = []
+            seen: Set[str] = set()
+            for tier in tiers:
+                members = tier if len(words) == 1 else tier & candidates
+                if not members:
+                    continue
+                # Earlier tiers may already hold some of this tier's best; take enough to skip them
+                for rank in heapq.nsmallest(needed + len(seen), map(self._rank.__getitem__, members)):
+                    person_id = self._by_rank[rank]
+                    if person_id not in seen:
+                        seen.add(person_id)
+                        ranked.append(person_id)
+                        if len(ranked) >= needed:
+                            break
+                if len(ranked) >= needed:
+                    break
+            page = [self._records[person_id] for person_id in ranked[offset:needed]]
+            return len(candidates), page
+
+def _sort_name(record: Dict[str, Any]) -> str:
+    return str(record.get("fields", {}).get("Name", "")).lower()
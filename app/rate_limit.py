@@ -0,0 +1,55 @@
+"""
+Rate Limiting Module
+
+This module provides a small thread-safe token bucket used to keep outbound
+calls (Airtable, Twilio) under the provider's published request rates.
+"""
+
+import threading
+import time
+from typing import Optional
+
+# =============================================================================
+# TOKEN BUCKET
+# =============================================================================
+
+class RateLimiter:
+    """Token bucket allowing `rate` operations per second with bursts up to `burst`"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def try_acquire(self) -> float:
+        """
+        Take a token if one is available
+
+        Returns:
+            0.0 if a token was taken, otherwise the seconds to wait before retrying
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """Block until a token is available"""
+        while True:
+            wait = self.try_acquire()
+            if wait == 0.0:
+                return
+            time.sleep(wait)
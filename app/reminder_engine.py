@@ -0,0 +1,351 @@
+"""
+Reminder Engine Module
+
+This module holds the single implementation of reminder dispatch used by both
+the `/jobs/check-reminders` HTTP job and the long-running reminder worker in
+`reminder_scheduler.py`. It includes:
+- Pluggable reminder stores (Airtable, local in-memory replica)
+- Due-reminder query with one shared time format and buffer
+- Concurrent, rate-limited notification sending
+- Batched sent-marking and dispatch lag reporting
+"""
+
+import bisect
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from . import airtable, tenants
+from .rate_limit import RateLimiter
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Due date format used in filterByFormula comparisons
+DUE_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+REMINDER_BUFFER_MINUTES = int(os.getenv("REMINDER_BUFFER_MINUTES", "5"))
+REMINDER_SEND_CONCURRENCY = int(os.getenv("REMINDER_SEND_CONCURRENCY", "4"))
+TWILIO_MAX_MPS = float(os.getenv("TWILIO_MAX_MPS", "1"))
+
+# Field names in the Reminders table
+REMINDER_TEXT_FIELD = "Reminder"
+REMINDER_DUE_FIELD = "Due date"
+REMINDER_PERSON_FIELD = "Reminders Main View"
+
+def parse_due_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse an Airtable due date into a naive local datetime"""
+    if not value:
+        return None
+    try:
+        due = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, AttributeError):
+        return None
+    if due.tzinfo is not None:
+        due = due.astimezone().replace(tzinfo=None)
+    return due
+
+# =============================================================================
+# REMINDER STORES
+# =============================================================================
+
+class ReminderStore:
+    """Interface for where reminders and their linked people live"""
+
+    def get_due(self, cutoff: datetime) -> List[Dict[str, Any]]:
+        """Return unsent reminders due at or before `cutoff`"""
+        raise NotImplementedError
+
+    def get_people(self, person_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Return linked person records keyed by record ID"""
+        raise NotImplementedError
+
+    def mark_sent(self, reminder_ids: List[str], sent_at: datetime) -> int:
+        """Mark reminders as sent and return how many were updated"""
+        raise NotImplementedError
+
+class AirtableReminderStore(ReminderStore):
+    """Reminders read from and written to the Airtable Reminders base"""
+
+    def get_due(self, cutoff: datetime) -> List[Dict[str, Any]]:
+        tenant = tenants.current()
+        filter_formula = (
+            f"AND({{{REMINDER_DUE_FIELD}}} <= '{cutoff.strftime(DUE_DATE_FORMAT)}', "
+            "{Status} != 'Sent', {Status} != 'Completed')"
+        )
+        return airtable._get_all_records(
+            tenant.reminders_table,
+            params={"filterByFormula": filter_formula},
+            base_url=tenant.reminders_base_url
+        )
+
+    def get_people(self, person_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        tenant = tenants.current()
+        # compose_notification only reads the person's name
+        records = airtable.get_records_by_ids(
+            tenant.reminders_people_table,
+            person_ids,
+            fields=["Name"],
+            base_url=tenant.reminders_base_url
+        )
+        return {record["id"]: record for record in records}
+
+    def mark_sent(self, reminder_ids: List[str], sent_at: datetime) -> int:
+        tenant = tenants.current()
+        updates = [
+            {"id": reminder_id, "fields": {"Status": "Sent", "Sent At": sent_at.isoformat()}}
+            for reminder_id in reminder_ids
+        ]
+        return airtable.update_records_batch(
+            tenant.reminders_table,
+            updates,
+            base_url=tenant.reminders_base_url
+        )
+
+class LocalReminderStore(ReminderStore):
+    """
+    In-memory replica of the Reminders and people tables
+
+    Pending reminders are kept sorted by due date so the due query is a
+    bisect rather than a scan.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reminders: Dict[str, Dict[str, Any]] = {}
+        self._people: Dict[str, Dict[str, Any]] = {}
+        self._due_keys: List[tuple] = []  # sorted (due datetime, reminder id)
+
+    def load(self, reminders: List[Dict[str, Any]], people: Optional[List[Dict[str, Any]]] = None):
+        """Add or replace reminder and person records in the replica"""
+        with self._lock:
+            for person in people or []:
+                self._people[person["id"]] = person
+            keys = []
+            for reminder in reminders:
+                fields = reminder.get("fields", {})
+                if fields.get("Status") in ("Sent", "Completed"):
+                    continue
+                due = parse_due_date(fields.get(REMINDER_DUE_FIELD))
+                if due is None:
+                    continue
+                self._reminders[reminder["id"]] = reminder
+                keys.append((due, reminder["id"]))
+            # Keys of reminders marked sent since the last load are dropped here
+            self._due_keys = sorted([key for key in self._due_keys if key[1] in self._reminders] + keys)
+
+    @classmethod
+    def from_airtable(cls) -> "LocalReminderStore":
+        """Build a replica from every pending reminder and reminders-base person"""
+        tenant = tenants.current()
+        store = cls()
+        reminders = airtable._get_all_records(
+            tenant.reminders_table,
+            params={"filterByFormula": "AND({Status} != 'Sent', {Status} != 'Completed')"},
+            base_url=tenant.reminders_base_url
+        )
+        people = airtable._get_all_records(
+            tenant.reminders_people_table,
+            base_url=tenant.reminders_base_url
+        )
+        store.load(reminders, people)
+        return store
+
+    def pending_count(self) -> int:
+        return len(self._reminders)
+
+    def get_due(self, cutoff: datetime) -> List[Dict[str, Any]]:
+        with self._lock:
+            end = bisect.bisect_right(self._due_keys, (cutoff, "￿"))
+            return [self._reminders[reminder_id] for _, reminder_id in self._due_keys[:end]
+                    if reminder_id in self._reminders]
+
+    def get_people(self, person_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        return {person_id: self._people[person_id] for person_id in person_ids if person_id in self._people}
+
+    def mark_sent(self, reminder_ids: List[str], sent_at: datetime) -> int:
+        with self._lock:
+            # get_due skips keys whose reminder is gone, so the sorted keys are left as they are
+            return sum(1 for reminder_id in reminder_ids if self._reminders.pop(reminder_id, None))
+
+# =============================================================================
+# REMINDER ENGINE
+# =============================================================================
+
+class ReminderEngine:
+    """Finds due reminders in a store and sends their notifications"""
+
+    def __init__(
+        self,
+        store: ReminderStore,
+        sender: Optional[Callable[..., Optional[str]]] = None,
+        concurrency: int = REMINDER_SEND_CONCURRENCY,
+        rate_limiter: Optional[RateLimiter] = None,
+        buffer_minutes: int = REMINDER_BUFFER_MINUTES
+    ):
+        self.store = store
+        self.sender = sender
+        self.concurrency = max(1, concurrency)
+        self.rate_limiter = rate_limiter
+        self.buffer_minutes = buffer_minutes
+
+    def _send(self, to: str, body: str) -> Optional[str]:
+        from . import twilio_utils
+        sender = self.sender or twilio_utils.send_sms
+        return sender(
+            to=to,
+            body=body,
+            status_callback_url=twilio_utils.status_callback_url()
+        )
+
+    def compose_notification(self, reminder: Dict[str, Any], person: Optional[Dict[str, Any]]) -> str:
+        """Build the SMS body for a reminder"""
+        fields = reminder.get("fields", {})
+        reminder_text = fields.get(REMINDER_TEXT_FIELD, "")
+        message = f"🔔 Reminder: {reminder_text}"
+
+        person_name = (person or {}).get("fields", {}).get("Name")
+        if person_name and person_name.lower() not in reminder_text.lower():
+            message += f" ({person_name})"
+
+        due = parse_due_date(fields.get(REMINDER_DUE_FIELD))
+        if due:
+            message += f" (due at {due.strftime('%I:%M %p')})"
+        return message
+
+    def dispatch_due(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Send every reminder due within the buffer window and mark them sent
+
+        Accepted reminders are marked sent in batches of AIRTABLE_BATCH_SIZE as
+        the pass goes (one PATCH per batch), with a final flush when the pass
+        ends or fails, so a pass that crashes partway only repeats the
+        reminders whose sends were in flight or not yet flushed.
+
+        Args:
+            now: Reference time (defaults to the current local time)
+
+        Returns:
+            Dictionary with total/sent/failed counts and dispatch lag in seconds.
+            Lag is measured from when this pass started (or the due time, if
+            later) to when the SMS was accepted, so it excludes the poll interval.
+        """
+        started = datetime.now()
+        now = now or started
+        cutoff = now + timedelta(minutes=self.buffer_minutes)
+        reminders = self.store.get_due(cutoff)
+        if not reminders:
+            return {"total": 0, "sent": 0, "failed": 0, "lag_seconds": {}}
+
+        person_ids = []
+        for reminder in reminders:
+            links = reminder.get("fields", {}).get(REMINDER_PERSON_FIELD, [])
+            if links:
+                person_ids.append(links[0])
+        people = self.store.get_people(person_ids) if person_ids else {}
+
+        # Reminders are texted to the operator's number until creators are tracked
+        tenant = tenants.current()
+        recipient = tenant.twilio_phone_number or "+16469177351"
+
+        accepted: List[str] = []
+        accepted_lock = threading.Lock()
+
+        def _mark_sent(reminder_ids: List[str]):
+            try:
+                self.store.mark_sent(reminder_ids, datetime.now())
+            except Exception as e:
+                # The SMS went out; the next pass will send them again
+                logger.error("Error marking %s reminders sent: %s", len(reminder_ids), e)
+
+        def _accept(reminder_id: str):
+            with accepted_lock:
+                accepted.append(reminder_id)
+                if len(accepted) < airtable.AIRTABLE_BATCH_SIZE:
+                    return
+                batch = accepted[:]
+                accepted.clear()
+            _mark_sent(batch)
+
+        def _dispatch(reminder: Dict[str, Any]) -> Optional[float]:
+            # Worker threads start without the caller's context; send as its tenant
+            with tenants.use(tenant):
+                return _dispatch_one(reminder)
+
+        def _dispatch_one(reminder: Dict[str, Any]) -> Optional[float]:
+            fields = reminder.get("fields", {})
+            links = fields.get(REMINDER_PERSON_FIELD, [])
+            person = people.get(links[0]) if links else None
+            body = self.compose_notification(reminder, person)
+            try:
+                if self.rate_limiter:
+                    self.rate_limiter.acquire()
+                sid = self._send(recipient, body)
+            except Exception as e:
+                logger.error("Error sending reminder %s: %s", reminder.get('id'), e)
+                return None
+            if not sid:
+                return None
+            sent_wall = datetime.now()
+            _accept(reminder["id"])
+            due = parse_due_date(fields.get(REMINDER_DUE_FIELD))
+            visible_at = max(due, started) if due else started
+            return max(0.0, (sent_wall - visible_at).total_seconds())
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                lags = list(executor.map(_dispatch, reminders))
+        finally:
+            with accepted_lock:
+                batch = accepted[:]
+                accepted.clear()
+            if batch:
+                _mark_sent(batch)
+
+        sent = sum(1 for lag in lags if lag is not None)
+        return {
+            "total": len(reminders),
+            "sent": sent,
+            "failed": len(reminders) - sent,
+            "lag_seconds": summarize_lag([lag for lag in lags if lag is not None])
+        }
+
+def summarize_lag(lags: List[float]) -> Dict[str, float]:
+    """Summarize dispatch lag samples as p50/p95/p99/max seconds"""
+    if not lags:
+        return {}
+    ordered = sorted(lags)
+
+    def _pct(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 3)
+
+    return {"p50": _pct(0.50), "p95": _pct(0.95), "p99": _pct(0.99), "max": round(ordered[-1], 3)}
+
+# =============================================================================
+# SHARED ENGINE
+# =============================================================================
+
+# The default tenant's engine; other tenants keep theirs in their resources
+_engine: Optional[ReminderEngine] = None
+
+def _new_engine() -> ReminderEngine:
+    return ReminderEngine(
+        AirtableReminderStore(),
+        rate_limiter=RateLimiter(TWILIO_MAX_MPS)
+    )
+
+def get_engine() -> ReminderEngine:
+    """Get the current tenant's engine backed by Airtable"""
+    global _engine
+    tenant = tenants.current()
+    if not tenant.is_default:
+        return tenant.resource("reminder_engine", _new_engine)
+    if _engine is None:
+        _engine = _new_engine()
+    return _engine
@@ -1,146 +1,59 @@
+"""
+Reminder Scheduler Module
+
+This module runs reminder dispatch as a long-running worker. The due query,
+sending and sent-marking live in `reminder_engine.py`, which the
+`/jobs/check-reminders` HTTP job uses as well. Each pass dispatches every
+tenant's reminders in turn. Any number of workers can run: they elect a
+leader through the coordination backend and only the leader dispatches.
+
+Run with: python -m app.reminder_scheduler
+"""
+
 import os
-import httpx
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
-import airtable
-import twilio_utils
-from dotenv import load_dotenv
+import time
+from typing import Dict, Any, Optional
+from . import coordination, reminder_engine, tenants
+from .log import get_logger
 
-# Load environment variables
-load_dotenv('config/config.env')
+logger = get_logger(__name__)
 
 class ReminderScheduler:
-    """Handles checking and sending reminder notifications"""
+    """Handles checking and sending reminder notifications on an interval"""
     
-    def __init__(self):
-        self.check_interval_minutes = 5  # Check every 5 minutes
-        self.reminder_buffer_minutes = 2  # Send reminders 2 minutes before due time
+    def __init__(self, engine: Optional[reminder_engine.ReminderEngine] = None):
+        self.check_interval_minutes = int(os.getenv("REMINDER_CHECK_INTERVAL_MINUTES", "5"))
+        self.engine = engine
+        # The lease outlives a pass, so a live leader keeps the role between passes
+        self.leadership = coordination.Leadership("reminder-dispatch", self.check_interval_minutes * 60 * 2 + 60)
     
-    def get_due_reminders(self) -> List[Dict[str, Any]]:
-        """Get reminders that are due to be sent"""
-        try:
-            # Get all reminders from the reminders table
-            endpoint = f"{os.getenv('AIRTABLE_REMINDERS_TABLE')}"
-            base_url = f"https://api.airtable.com/v0/{os.getenv('AIRTABLE_REMINDERS_BASE_ID')}"
-            
-            # Get reminders that are due within the next few minutes
-            now = datetime.now()
-            buffer_time = now + timedelta(minutes=self.reminder_buffer_minutes)
-            
-            # Filter for reminders due soon
-            filter_formula = f"AND({{Due date}} <= '{buffer_time.strftime('%Y-%m-%dT%H:%M:%S')}', {{Status}} != 'Sent', {{Status}} != 'Completed')"
-            
-            response = airtable._make_request("GET", endpoint, params={"filterByFormula": filter_formula}, base_url=base_url)
-            return response.get("records", [])
-            
-        except Exception as e:
-            print(f"Error getting due reminders: {e}")
-            return []
+    def _get_engine(self) -> reminder_engine.ReminderEngine:
+        return self.engine or reminder_engine.get_engine()
     
-    def send_reminder_notification(self, reminder: Dict[str, Any]) -> bool:
-        """Send SMS notification for a reminder"""
-        try:
-            fields = reminder.get("fields", {})
-            reminder_text = fields.get("Reminder", "")
-            due_date = fields.get("Due date", "")
-            
-            # Get the person's phone number from the linked person record
-            person_links = fields.get("Reminders Main View", [])
-            if not person_links:
-                print(f"No person linked to reminder: {reminder.get('id')}")
-                return False
-            
-            # Get person details
-            person_id = person_links[0]  # Get first linked person
-            person_endpoint = f"{os.getenv('AIRTABLE_REMINDERS_MAIN_PEOPLE_TABLE')}/{person_id}"
-            base_url = f"https://api.airtable.com/v0/{os.getenv('AIRTABLE_REMINDERS_BASE_ID')}"
-            
-            person_response = airtable._make_request("GET", person_endpoint, base_url=base_url)
-            person_fields = person_response.get("fields", {})
-            person_name = person_fields.get("Name", "Unknown")
-            phone = person_fields.get("Phone", "")
-            
-            if not phone:
-                print(f"No phone number for {person_name}")
-                return False
-            
-            # Format phone number
-            phone = phone.replace("(", "").replace(")", "").replace("-", "").replace(" ", "")
-            if not phone.startswith("+1"):
-                phone = f"+1{phone}"
-            
-            # Create notification message
-            notification_message = f"🔔 Reminder: {reminder_text}"
-            if due_date:
-                try:
-                    due_dt = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-                    time_str = due_dt.strftime('%I:%M %p')
-                    notification_message += f" (due at {time_str})"
-                except:
-                    pass
-            
-            # Send SMS to the person who created the reminder
-            # For now, we'll use a default number since we don't track who created the reminder
-            # In a real system, you'd store the creator's phone number with the reminder
-            reminder_phone = os.getenv("TWILIO_PHONE_NUMBER", "+16469177351")  # Use the main number for now
-            
-            twilio_sid = twilio_utils.send_sms(
-                to=reminder_phone,
-                body=notification_message,
-                status_callback_url=f"{os.getenv('APP_BASE_URL', 'http://localhost:8000')}/twilio/status"
-            )
-            
-            if twilio_sid:
-                # Mark reminder as sent
-                self.mark_reminder_sent(reminder.get("id"))
-                print(f"✅ Sent reminder notification: {reminder_text}")
-                return True
-            else:
-                print(f"❌ Failed to send reminder notification: {reminder_text}")
-                return False
-                
-        except Exception as e:
-            print(f"Error sending reminder notification: {e}")
-            return False
+    def process_due_reminders(self) -> Dict[str, Any]:
+        """Process all due reminders of the current tenant and send notifications"""
+        return self._get_engine().dispatch_due()
     
-    def mark_reminder_sent(self, reminder_id: str) -> bool:
-        """Mark a reminder as sent"""
-        try:
-            endpoint = f"{os.getenv('AIRTABLE_REMINDERS_TABLE')}/{reminder_id}"
-            base_url = f"https://api.airtable.com/v0/{os.getenv('AIRTABLE_REMINDERS_BASE_ID')}"
-            
-            update_data = {
-                "fields": {
-                    "Status": "Sent",
-                    "Sent At": datetime.now().isoformat()
-                }
-            }
-            
-            airtable._make_request("PATCH", endpoint, update_data, base_url=base_url)
-            return True
-            
-        except Exception as e:
-            print(f"Error marking reminder as sent: {e}")
-            return False
-    
-    def process_due_reminders(self) -> Dict[str, int]:
-        """Process all due reminders and send notifications"""
-        due_reminders = self.get_due_reminders()
-        
-        sent_count = 0
-        failed_count = 0
-        
-        for reminder in due_reminders:
-            if self.send_reminder_notification(reminder):
-                sent_count += 1
-            else:
-                failed_count += 1
-        
-        return {
-            "total": len(due_reminders),
-            "sent": sent_count,
-            "failed": failed_count
-        }
+    def run_forever(self):
+        """Dispatch due reminders every check interval until interrupted"""
+        logger.info("Reminder worker started (every %s min)", self.check_interval_minutes)
+        while True:
+            if not self.leadership.is_leader():
+                logger.debug("Another worker leads reminder dispatch; standing by")
+                time.sleep(self.check_interval_minutes * 60)
+                continue
+            for tenant in tenants.all_tenants():
+                try:
+                    with tenants.use(tenant):
+                        result = self.process_due_reminders()
+                    if result.get("total"):
+                        logger.info("Reminders processed for tenant %s: %s", tenant.tenant_id, result)
+                except Exception as e:
+                    logger.error("Error processing due reminders for tenant %s: %s", tenant.tenant_id, e)
+            time.sleep(self.check_interval_minutes * 60)
 
 # Global scheduler instance
 scheduler = ReminderScheduler()
+
+if __name__ == "__main__":
+    scheduler.run_forever()
@@ -3,12 +3,16 @@ Scheduler Module
 
 This module handles scheduling logic for determining when people are due
 for check-ins based on their frequency settings and last confirmed dates.
+Due and overdue lookups are range queries on the due-date index (see due_index).
 """
 
 import os
 from datetime import datetime, date, timedelta
-from typing import List, Dict, Any
-from . import airtable
+from typing import List, Dict, Any, Optional
+from . import airtable, checkin_cache, due_index, cohort_scheduler, stats_engine, send_planner
+from .log import get_logger
+
+logger = get_logger(__name__)
 
 # =============================================================================
 # SCHEDULING FUNCTIONS
@@ -16,32 +20,71 @@ from . import airtable
 
 def get_people_due_for_checkin() -> List[Dict[str, Any]]:
     """
-    Get people who are due for monthly check-in based on frequency and last confirmed date
+    Get people who are due for a Monthly or Quarterly check-in based on last confirmed date
     
     Returns:
         List of person records that need check-ins
     """
     try:
-        # Get all people with monthly frequency who haven't opted out
-        people = airtable.get_people_due_for_checkin()
-        
-        if not people:
-            return []
-        
-        # Filter by actual due date logic
-        today = date.today()
-        due_people = []
-        
-        for person in people:
-            if is_due_for_checkin(person, today):
-                due_people.append(person)
-        
-        return due_people
+        return due_index.get_index().due(date.today())
         
     except Exception as e:
-        print(f"Error getting people due for checkin: {e}")
+        logger.error("Error getting people due for checkin: %s", e)
         return []
 
+def get_people_scheduled_for_checkin(today: Optional[date] = None) -> List[Dict[str, Any]]:
+    """
+    Get due people whose staggered send day has arrived and who have no check-in this month
+    
+    Spreads each month's check-ins across SEND_WINDOW_DAYS instead of sending
+    to everyone due on the same day. Falls back to all due people without NumPy.
+    A send day stays in the past until the person confirms, so people who
+    already have a check-in for the month are dropped: running this daily
+    selects each person once.
+    
+    Args:
+        today: Day to schedule for (defaults to today)
+    
+    Returns:
+        List of person records to check in today
+    """
+    today = today or date.today()
+    due_people = due_index.get_index().due(today)
+    if due_people and cohort_scheduler.NUMPY_AVAILABLE:
+        cohort = cohort_scheduler.Cohort.from_records(due_people)
+        due_people = [due_people[i] for i in cohort.select(cohort.scheduled_mask(today))]
+    if not due_people:
+        return due_people
+    
+    month = today.strftime("%Y-%m")
+    checkins = checkin_cache.current_cache()
+    if not checkins.is_loaded(month):
+        airtable.load_checkins(month)
+    return [person for person in due_people if checkins.get(person["id"], month) is None]
+
+def get_people_planned_for_checkin() -> List[Dict[str, Any]]:
+    """
+    Get due people whose planned send time has arrived
+    
+    Newly due people are added to this month's send plan (quiet hours, hourly
+    cap, staggered send day when NumPy is available); people returned here are
+    marked dispatched so they are not returned again this month.
+    
+    Returns:
+        List of person records to check in now
+    """
+    due_people = get_people_due_for_checkin()
+    month = datetime.now().strftime("%Y-%m")
+    
+    earliest = None
+    if due_people and cohort_scheduler.NUMPY_AVAILABLE:
+        cohort = cohort_scheduler.Cohort.from_records(due_people)
+        earliest = dict(zip(cohort.ids, cohort.send_date_list(date.today())))
+    
+    send_planner.planner.extend_plan(due_people, month, earliest)
+    ready = set(send_planner.planner.claim_due(month))
+    return [person for person in due_people if person["id"] in ready]
+
 def is_due_for_checkin(person: Dict[str, Any], current_date: date) -> bool:
     """
     Determine if a person is due for a check-in
@@ -64,76 +107,69 @@ def is_due_for_checkin(person: Dict[str, Any], current_date: date) -> bool:
         if not fields.get("Consent"):
             return False
         
-        # Get check-in frequency
-        frequency = fields.get("Check-in Frequency", "Monthly")
-        
-        if frequency not in ["Monthly", "Quarterly"]:
+        # Never-confirmed (or unparseable) dates sort as due immediately
+        due = due_index.next_due_ordinal(fields)
+        if due is None:
             return False
         
-        # Get last confirmed date
-        last_confirmed_str = fields.get("Last Confirmed")
-        
-        if not last_confirmed_str:
-            # Never confirmed, so they're due
-            return True
-        
-        try:
-            # Parse the last confirmed date
-            if isinstance(last_confirmed_str, str):
-                last_confirmed = datetime.strptime(last_confirmed_str, "%Y-%m-%d").date()
-            else:
-                # Assume it's already a date object
-                last_confirmed = last_confirmed_str
-            
-            # Calculate due date based on frequency
-            if frequency == "Monthly":
-                due_date = last_confirmed + timedelta(days=30)
-            else:  # Quarterly
-                due_date = last_confirmed + timedelta(days=90)
-            
-            # Check if current date is past due date
-            return current_date >= due_date
-            
-        except (ValueError, TypeError) as e:
-            print(f"Error parsing last confirmed date for person {person.get('id')}: {e}")
-            # If we can't parse the date, assume they're due
-            return True
+        return current_date.toordinal() >= due
             
     except Exception as e:
-        print(f"Error checking if person is due for checkin: {e}")
+        logger.error("Error checking if person is due for checkin: %s", e)
         return False
 
-def get_monthly_checkin_stats() -> Dict[str, Any]:
+def get_monthly_checkin_stats(month: Optional[str] = None) -> Dict[str, Any]:
     """
     Get statistics about monthly check-ins
     
+    Counts come from the incremental rollups in stats_engine and the in-memory
+    due-date index, so no table is downloaded.
+    
+    Args:
+        month: Month in YYYY-MM format (defaults to the current month)
+    
     Returns:
         Dictionary with check-in statistics
     """
     try:
-        current_month = datetime.now().strftime("%Y-%m")
+        current_month = month or datetime.now().strftime("%Y-%m")
+        rollup = stats_engine.monthly_stats(current_month)
+        index = due_index.get_index()
         
-        # This would require additional Airtable functions to get comprehensive stats
-        # For now, return basic info
         stats = {
             "current_month": current_month,
-            "total_people": 0,
-            "due_this_month": 0,
-            "sent_this_month": 0,
-            "completed_this_month": 0,
-            "opted_out": 0
+            "total_people": len(index),
+            "due_this_month": index.due_count(date.today()),
+            "sent_this_month": rollup["checkins"],
+            "completed_this_month": rollup["by_status"]["Completed"],
+            "opted_out": rollup["opt_outs"],
+            "by_status": rollup["by_status"],
+            "messages_inbound": rollup["messages_inbound"],
+            "messages_outbound": rollup["messages_outbound"],
+            "completion_rate": rollup["completion_rate"]
         }
         
-        # Get people due for check-in
-        due_people = get_people_due_for_checkin()
-        stats["due_this_month"] = len(due_people)
-        
         return stats
         
     except Exception as e:
-        print(f"Error getting monthly checkin stats: {e}")
+        logger.error("Error getting monthly checkin stats: %s", e)
         return {}
 
+def get_schedule_stats() -> Dict[str, Any]:
+    """
+    Get directory-wide scheduling counts (due, overdue, never confirmed, staggered)
+    
+    Downloads the People scheduling fields once, so this is for reports rather
+    than dashboards that poll.
+    
+    Returns:
+        Dictionary with schedule counts, or an error if NumPy is not installed
+    """
+    cohort = cohort_scheduler.load_cohort()
+    if cohort is None:
+        return {"error": "NumPy not installed"}
+    return cohort_scheduler.cohort_stats(cohort)
+
 def should_skip_person(person: Dict[str, Any]) -> tuple[bool, str]:
     """
     Determine if a person should be skipped for check-in and why
@@ -188,22 +224,15 @@ def get_next_checkin_date(person: Dict[str, Any]) -> date:
             # If never confirmed, next check-in is today
             return date.today()
         
-        # Parse last confirmed date
-        if isinstance(last_confirmed_str, str):
-            last_confirmed = datetime.strptime(last_confirmed_str, "%Y-%m-%d").date()
-        else:
-            last_confirmed = last_confirmed_str
+        last_confirmed = due_index.parse_last_confirmed(last_confirmed_str)
+        if last_confirmed is None:
+            raise ValueError(f"Invalid Last Confirmed date: {last_confirmed_str}")
         
         # Calculate next check-in date
-        if frequency == "Monthly":
-            next_date = last_confirmed + timedelta(days=30)
-        else:  # Quarterly
-            next_date = last_confirmed + timedelta(days=90)
-        
-        return next_date
+        return last_confirmed + timedelta(days=due_index.FREQUENCY_DAYS.get(frequency, 90))
         
     except Exception as e:
-        print(f"Error calculating next checkin date: {e}")
+        logger.error("Error calculating next checkin date: %s", e)
         # Fallback: return today + 30 days
         return date.today() + timedelta(days=30)
 
@@ -215,34 +244,8 @@ def get_overdue_people() -> List[Dict[str, Any]]:
         List of overdue person records
     """
     try:
-        all_people = airtable.get_people_due_for_checkin()
-        overdue_people = []
-        today = date.today()
-        
-        for person in all_people:
-            fields = person.get("fields", {})
-            last_confirmed_str = fields.get("Last Confirmed")
-            
-            if not last_confirmed_str:
-                continue
-            
-            try:
-                if isinstance(last_confirmed_str, str):
-                    last_confirmed = datetime.strptime(last_confirmed_str, "%Y-%m-%d").date()
-                else:
-                    last_confirmed = last_confirmed_str
-                
-                frequency = fields.get("Check-in Frequency", "Monthly")
-                due_date = last_confirmed + timedelta(days=30 if frequency == "Monthly" else 90)
-                
-                if today > due_date:
-                    overdue_people.append(person)
-                    
-            except (ValueError, TypeError):
-                continue
-        
-        return overdue_people
+        return due_index.get_index().overdue(date.today())
         
     except Exception as e:
-        print(f"Error getting overdue people: {e}")
+        logger.error("Error getting overdue people: %s", e)
         return []
@@ -0,0 +1,294 @@
+"""
+Send Planner Module
+
+This module spreads each month's check-in sends across days and hours so the
+replies never arrive faster than the inbound path (LLM + Airtable) can handle.
+It includes:
+- Quiet hours evaluated in each recipient's timezone
+- An hourly send cap derived from measured inbound processing capacity
+- A persistent per-tenant, per-month plan in the local store, extended as people become due
+- Reply-load prediction from the plan and a reply-delay distribution
+"""
+
+import bisect
+import os
+import time
+import zlib
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from . import tenants
+from .local_store import get_store
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Local hours during which check-ins may be sent: [SEND_HOURS_START, SEND_HOURS_END)
+SEND_HOURS_START = int(os.getenv("SEND_HOURS_START", "9"))
+SEND_HOURS_END = int(os.getenv("SEND_HOURS_END", "20"))
+
+# Timezone used when a person has no valid "Timezone" field
+SEND_DEFAULT_TIMEZONE = os.getenv("SEND_DEFAULT_TIMEZONE", "America/New_York")
+
+# Inbound messages per hour the reply path can process, and the share of check-ins that get a reply
+INBOUND_CAPACITY_PER_HOUR = float(os.getenv("INBOUND_CAPACITY_PER_HOUR", "120"))
+REPLY_RATE = float(os.getenv("REPLY_RATE", "0.4"))
+
+# How far ahead a month's plan may extend
+PLAN_HORIZON_DAYS = 31
+
+# Reply delay distribution: (min minutes, max minutes, share of replies)
+REPLY_DELAY_BUCKETS = [
+    (0, 5, 0.35),
+    (5, 15, 0.20),
+    (15, 60, 0.20),
+    (60, 240, 0.15),
+    (240, 1440, 0.10),
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS send_plan (
+    tenant_id TEXT NOT NULL,
+    person_id TEXT NOT NULL,
+    month TEXT NOT NULL,
+    send_at REAL NOT NULL,
+    dispatched_at REAL,
+    PRIMARY KEY (tenant_id, person_id, month)
+);
+DROP INDEX IF EXISTS send_plan_due;
+CREATE INDEX IF NOT EXISTS send_plan_tenant_due ON send_plan (tenant_id, month, send_at);
+"""
+
+# Plans written before tenants were tracked belonged to the default tenant
+_MIGRATIONS = [("send_plan", "tenant_id", f"""
+ALTER TABLE send_plan RENAME TO send_plan_unscoped;
+{_SCHEMA}
+INSERT INTO send_plan (tenant_id, person_id, month, send_at, dispatched_at)
+    SELECT '{tenants.DEFAULT_TENANT_ID}', person_id, month, send_at, dispatched_at FROM send_plan_unscoped;
+DROP TABLE send_plan_unscoped;
+""")]
+
+def _store():
+    store = get_store()
+    store.ensure_schema("send_plan", _SCHEMA, _MIGRATIONS)
+    return store
+
+def max_sends_per_hour(inbound_capacity_per_hour: float = INBOUND_CAPACITY_PER_HOUR,
+                       reply_rate: float = REPLY_RATE) -> int:
+    """Hourly send cap that keeps the steady-state reply rate within inbound capacity"""
+    return max(1, int(inbound_capacity_per_hour / max(reply_rate, 0.01)))
+
+@lru_cache(maxsize=128)
+def _zone(name: Optional[str]) -> ZoneInfo:
+    try:
+        return ZoneInfo(name or SEND_DEFAULT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(SEND_DEFAULT_TIMEZONE)
+
+def person_timezone(fields: Dict[str, Any]) -> ZoneInfo:
+    """Recipient timezone from the person's "Timezone" field (IANA name), or the default"""
+    return _zone(fields.get("Timezone"))
+
+# =============================================================================
+# REPLY LOAD PREDICTION
+# =============================================================================
+
+@lru_cache(maxsize=1)
+def _reply_kernel() -> Tuple[float, ...]:
+    """Share of a send hour's replies that land 0, 1, 2, ... hours later"""
+    kernel: Counter = Counter()
+    for low, high, share in REPLY_DELAY_BUCKETS:
+        weight = share / ((high - low) * 60)
+        for send_minute in range(60):
+            for delay in range(low, high):
+                kernel[(send_minute + delay) // 60] += weight
+    return tuple(kernel[k] for k in range(max(kernel) + 1))
+
+def predict_reply_load(send_times: Sequence[float], reply_rate: float = REPLY_RATE) -> Dict[str, Any]:
+    """
+    Predict inbound replies per hour for a set of send times
+
+    Args:
+        send_times: Unix timestamps of planned sends
+        reply_rate: Share of check-ins expected to get a reply
+
+    Returns:
+        Dictionary with expected replies, the peak hourly inbound rate and when it occurs
+    """
+    if not send_times:
+        return {"expected_replies": 0, "peak_per_hour": 0, "peak_hour": None}
+    sends = Counter(int(t // 3600) for t in send_times)
+    kernel = _reply_kernel()
+    load: Counter = Counter()
+    for hour, count in sends.items():
+        for offset, share in enumerate(kernel):
+            load[hour + offset] += count * reply_rate * share
+    peak_hour, peak = max(load.items(), key=lambda item: item[1])
+    return {
+        "expected_replies": round(sum(load.values()), 1),
+        "peak_per_hour": round(peak, 1),
+        "peak_hour": datetime.fromtimestamp(peak_hour * 3600, tz=timezone.utc).isoformat()
+    }
+
+# =============================================================================
+# PLANNER
+# =============================================================================
+
+class SendPlanner:
+    """Assigns send times under quiet hours and an hourly cap"""
+
+    def __init__(self, max_per_hour: Optional[int] = None,
+                 send_hours: Tuple[int, int] = (SEND_HOURS_START, SEND_HOURS_END),
+                 horizon_days: int = PLAN_HORIZON_DAYS):
+        self.max_per_hour = max_per_hour or max_sends_per_hour()
+        self.send_hours = send_hours
+        self.horizon_days = horizon_days
+
+    def _allowed_hours(self, zone: ZoneInfo, start_hour: int) -> List[int]:
+        """Absolute hour numbers (hours since the epoch) inside the send window for a timezone"""
+        start, end = self.send_hours
+        hours = []
+        for hour in range(start_hour, start_hour + self.horizon_days * 24):
+            local = datetime.fromtimestamp(hour * 3600, tz=zone)
+            if start <= local.hour < end:
+                hours.append(hour)
+        return hours
+
+    def plan(self, people: Sequence[Dict[str, Any]], start: float,
+             earliest: Optional[Dict[str, date]] = None,
+             booked: Optional[Counter] = None) -> Tuple[List[Tuple[str, float]], List[str]]:
+        """
+        Assign a send time to each person
+
+        People are placed in the earliest allowed hour (local send window, hour
+        not yet at the cap) on or after their earliest day, in order of earliest
+        day. Sends within an hour are spaced evenly.
+
+        Args:
+            people: Person records
+            start: Unix timestamp before which nothing is sent
+            earliest: Optional person_id -> earliest send date (e.g. staggered send day)
+            booked: Sends already planned per absolute hour
+
+        Returns:
+            ([(person_id, send_at)], [person_ids that did not fit in the horizon])
+        """
+        booked = Counter(booked or {})
+        start_hour = int(start // 3600)
+        earliest = earliest or {}
+        allowed_by_zone: Dict[str, List[int]] = {}
+        first_open: Dict[str, int] = {}
+
+        def earliest_hour(person: Dict[str, Any]) -> int:
+            day = earliest.get(person["id"])
+            if day is None:
+                return start_hour
+            return max(start_hour, int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp() // 3600))
+
+        ordered = sorted(people, key=lambda p: (earliest_hour(p), zlib.crc32(p["id"].encode())))
+        assignments, unplaced = [], []
+        for person in ordered:
+            zone = person_timezone(person.get("fields", {}))
+            allowed = allowed_by_zone.get(zone.key)
+            if allowed is None:
+                allowed = allowed_by_zone[zone.key] = self._allowed_hours(zone, start_hour)
+                first_open[zone.key] = 0
+
+            i = max(first_open[zone.key], bisect.bisect_left(allowed, earliest_hour(person)))
+            while i < len(allowed) and booked[allowed[i]] >= self.max_per_hour:
+                i += 1
+            if i == len(allowed):
+                unplaced.append(person["id"])
+                continue
+            while first_open[zone.key] < len(allowed) and booked[allowed[first_open[zone.key]]] >= self.max_per_hour:
+                first_open[zone.key] += 1
+
+            hour = allowed[i]
+            send_at = max(start, hour * 3600 + booked[hour] * 3600 / self.max_per_hour)
+            booked[hour] += 1
+            assignments.append((person["id"], send_at))
+        return assignments, unplaced
+
+    # -------------------------------------------------------------------------
+    # Persistent monthly plan
+    # -------------------------------------------------------------------------
+
+    def extend_plan(self, people: Sequence[Dict[str, Any]], month: str,
+                    earliest: Optional[Dict[str, date]] = None, now: Optional[float] = None) -> int:
+        """
+        Add people who are not yet planned for the month, keeping existing assignments
+
+        Plans, and the hourly cap they fill, belong to the current tenant.
+
+        Returns:
+            Number of people newly planned
+        """
+        now = now or time.time()
+        tenant_id = tenants.current().tenant_id
+        store = _store()
+        planned = {row["person_id"] for row in store.query(
+            "SELECT person_id FROM send_plan WHERE tenant_id = ? AND month = ?", (tenant_id, month)
+        )}
+        new_people = [person for person in people if person["id"] not in planned]
+        if not new_people:
+            return 0
+
+        booked = Counter()
+        for row in store.query(
+            "SELECT CAST(send_at / 3600 AS INTEGER) AS hour, COUNT(*) AS n FROM send_plan "
+            "WHERE tenant_id = ? AND send_at >= ? GROUP BY hour", (tenant_id, now)
+        ):
+            booked[row["hour"]] = row["n"]
+
+        assignments, unplaced = self.plan(new_people, now, earliest, booked)
+        if unplaced:
+            logger.info("Send plan for %s: %s people did not fit in the send horizon", month, len(unplaced))
+        store.executemany(
+            "INSERT OR IGNORE INTO send_plan (tenant_id, person_id, month, send_at) VALUES (?, ?, ?, ?)",
+            [(tenant_id, person_id, month, send_at) for person_id, send_at in assignments]
+        )
+        return len(assignments)
+
+    def claim_due(self, month: str, now: Optional[float] = None) -> List[str]:
+        """Return the current tenant's person IDs whose planned send time has arrived and mark them dispatched"""
+        now = now or time.time()
+        tenant_id = tenants.current().tenant_id
+        with _store().transaction() as conn:
+            rows = conn.execute(
+                "SELECT person_id FROM send_plan "
+                "WHERE tenant_id = ? AND month = ? AND send_at <= ? AND dispatched_at IS NULL",
+                (tenant_id, month, now)
+            ).fetchall()
+            person_ids = [row["person_id"] for row in rows]
+            conn.executemany(
+                "UPDATE send_plan SET dispatched_at = ? WHERE tenant_id = ? AND person_id = ? AND month = ?",
+                [(now, tenant_id, person_id, month) for person_id in person_ids]
+            )
+        return person_ids
+
+    def summary(self, month: str) -> Dict[str, Any]:
+        """The current tenant's planned sends per day and predicted reply load for a month"""
+        rows = _store().query(
+            "SELECT send_at, dispatched_at FROM send_plan WHERE tenant_id = ? AND month = ? ORDER BY send_at",
+            (tenants.current().tenant_id, month)
+        )
+        per_day = Counter(
+            datetime.fromtimestamp(row["send_at"], tz=timezone.utc).date().isoformat() for row in rows
+        )
+        return {
+            "month": month,
+            "planned": len(rows),
+            "dispatched": sum(1 for row in rows if row["dispatched_at"]),
+            "max_per_hour": self.max_per_hour,
+            "per_day": dict(per_day),
+            "predicted_replies": predict_reply_load([row["send_at"] for row in rows])
+        }
+
+planner = SendPlanner()
@@ -0,0 +1,326 @@
+"""
+SMS Send Queue Module
+
+This module sends SMS through the Twilio REST API from async code without
+blocking the event loop. It provides:
+- A pooled HTTP client reused across sends
+- A configurable messages-per-second limit matching Messaging Service throughput
+- Retries with backoff on 429 and 5xx responses
+- Per-recipient ordering (one in-flight message per phone number)
+- Priority sends (inbound replies) on their own workers, ahead of bulk sends
+  for rate-limit tokens and exempt from backpressure
+- Backpressure through a bounded number of pending messages
+- Message SIDs returned through futures
+- One queue per tenant, sending from the tenant's number or messaging service
+"""
+
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+import httpx
+
+from . import call_budget, tenants
+from .rate_limit import RateLimiter
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+TWILIO_API_BASE_URL = os.getenv("TWILIO_API_BASE_URL", "https://api.twilio.com")
+TWILIO_MAX_MPS = float(os.getenv("TWILIO_MAX_MPS", "1"))
+SMS_QUEUE_MAX_PENDING = int(os.getenv("SMS_QUEUE_MAX_PENDING", "1000"))
+SMS_QUEUE_WORKERS = int(os.getenv("SMS_QUEUE_WORKERS", "4"))
+SMS_QUEUE_PRIORITY_WORKERS = int(os.getenv("SMS_QUEUE_PRIORITY_WORKERS", "2"))
+SMS_QUEUE_MAX_RETRIES = int(os.getenv("SMS_QUEUE_MAX_RETRIES", "3"))
+
+# Status codes worth retrying; everything else >= 400 fails immediately
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# How often a bulk send waiting behind priority sends checks for a rate-limit token again
+PRIORITY_YIELD_SECONDS = 0.05
+
+# =============================================================================
+# SEND QUEUE
+# =============================================================================
+
+class _OutboundSms:
+    __slots__ = ("to", "body", "status_callback_url", "future", "priority", "call")
+
+    def __init__(self, to: str, body: str, status_callback_url: Optional[str], future: asyncio.Future,
+                 priority: bool = False, call: Optional[call_budget._ExternalCall] = None):
+        self.to = to
+        self.body = body
+        self.status_callback_url = status_callback_url
+        self.future = future
+        self.priority = priority
+        self.call = call
+
+class SmsSendQueue:
+    """Async, rate-limited queue that delivers SMS via the Twilio Messages API"""
+
+    def __init__(
+        self,
+        account_sid: Optional[str] = None,
+        auth_token: Optional[str] = None,
+        messaging_service_sid: Optional[str] = None,
+        from_number: Optional[str] = None,
+        messages_per_second: float = TWILIO_MAX_MPS,
+        max_pending: int = SMS_QUEUE_MAX_PENDING,
+        workers: int = SMS_QUEUE_WORKERS,
+        priority_workers: int = SMS_QUEUE_PRIORITY_WORKERS,
+        max_retries: int = SMS_QUEUE_MAX_RETRIES,
+        base_url: str = TWILIO_API_BASE_URL
+    ):
+        # Settings left as None come from the environment; pass "" for none
+        self.account_sid = account_sid if account_sid is not None else os.getenv("TWILIO_ACCOUNT_SID")
+        self.auth_token = auth_token if auth_token is not None else os.getenv("TWILIO_AUTH_TOKEN")
+        self.messaging_service_sid = (messaging_service_sid if messaging_service_sid is not None
+                                      else os.getenv("TWILIO_MESSAGING_SERVICE_SID"))
+        self.from_number = from_number if from_number is not None else os.getenv("TWILIO_PHONE_NUMBER")
+        self.base_url = base_url.rstrip("/")
+        self.max_pending = max_pending
+        self.workers = max(1, workers)
+        self.priority_workers = max(1, priority_workers)
+        self.max_retries = max_retries
+        self.rate_limiter = RateLimiter(messages_per_second)
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._ready: Optional[asyncio.Queue] = None
+        self._priority_ready: Optional[asyncio.Queue] = None
+        # Priority messages at the head of their lane, waiting or being delivered
+        self._priority_active = 0
+        self._lanes: Dict[str, Deque[_OutboundSms]] = {}
+        self._tasks = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {"sent": 0, "failed": 0, "retries": 0}
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks:
+            return
+        self._loop = loop
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            auth=(self.account_sid or "", self.auth_token or ""),
+            timeout=httpx.Timeout(15.0),
+            limits=httpx.Limits(max_connections=self.workers + self.priority_workers,
+                                max_keepalive_connections=self.workers + self.priority_workers)
+        )
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._ready = asyncio.Queue()
+        self._priority_ready = asyncio.Queue()
+        self._priority_active = 0
+        self._lanes = {}
+        self._tasks = [loop.create_task(self._worker(self._ready)) for _ in range(self.workers)]
+        self._tasks += [loop.create_task(self._worker(self._priority_ready)) for _ in range(self.priority_workers)]
+
+    async def close(self):
+        """Stop the workers and close pooled connections"""
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def pending(self) -> int:
+        """Number of messages accepted but not yet finished"""
+        return sum(len(lane) for lane in self._lanes.values())
+
+    # -------------------------------------------------------------------------
+    # Submission
+    # -------------------------------------------------------------------------
+
+    async def submit(self, to: str, body: str, status_callback_url: Optional[str] = None, priority: bool = False,
+                     call: Optional[call_budget._ExternalCall] = None) -> asyncio.Future:
+        """
+        Queue an SMS, waiting if too many messages are already pending
+
+        Args:
+            to: Phone number to send to
+            body: Message body
+            status_callback_url: Optional webhook URL for delivery status
+            priority: Deliver on the priority workers, ahead of bulk sends for
+                rate-limit tokens and without waiting for a pending slot (for
+                replies a webhook is waiting on)
+            call: External call to time with the Twilio request alone (queue wait excluded)
+
+        Returns:
+            Future resolving to the message SID, or None if the send failed
+        """
+        self._ensure_started()
+        if not priority:
+            await self._slots.acquire()
+        future = self._loop.create_future()
+        item = _OutboundSms(to, body, status_callback_url, future, priority, call)
+
+        lane = self._lanes.get(to)
+        if lane is None:
+            # Recipient has nothing queued: start a new lane
+            self._lanes[to] = deque([item])
+            self._make_ready(to)
+        else:
+            lane.append(item)
+        return future
+
+    async def send(self, to: str, body: str, status_callback_url: Optional[str] = None, priority: bool = False,
+                   call: Optional[call_budget._ExternalCall] = None) -> Optional[str]:
+        """Queue an SMS and wait for its SID"""
+        future = await self.submit(to, body, status_callback_url, priority, call)
+        return await future
+
+    # -------------------------------------------------------------------------
+    # Delivery
+    # -------------------------------------------------------------------------
+
+    def _make_ready(self, to: str):
+        """Hand a lane to the workers matching the priority of its next message"""
+        if self._lanes[to][0].priority:
+            self._priority_active += 1
+            self._priority_ready.put_nowait(to)
+        else:
+            self._ready.put_nowait(to)
+
+    async def _worker(self, ready: asyncio.Queue):
+        while True:
+            to = await ready.get()
+            lane = self._lanes[to]
+            item = lane[0]
+            try:
+                sid = await self._deliver(item)
+                if not item.future.done():
+                    item.future.set_result(sid)
+            except Exception as e:
+                logger.error("Unexpected error sending SMS to %s: %s", item.to, e)
+                if not item.future.done():
+                    item.future.set_result(None)
+            finally:
+                lane.popleft()
+                if item.priority:
+                    self._priority_active -= 1
+                else:
+                    self._slots.release()
+                if lane:
+                    # Next message for this recipient only starts after this one finished
+                    self._make_ready(to)
+                else:
+                    del self._lanes[to]
+
+    def _form(self, item: _OutboundSms) -> Optional[Dict[str, str]]:
+        form = {"To": item.to, "Body": item.body}
+        if self.messaging_service_sid:
+            form["MessagingServiceSid"] = self.messaging_service_sid
+        elif self.from_number:
+            form["From"] = self.from_number
+        else:
+            logger.warning("No Twilio phone number or messaging service configured")
+            return None
+        if item.status_callback_url:
+            form["StatusCallback"] = item.status_callback_url
+        return form
+
+    async def _throttle(self, priority: bool):
+        while True:
+            # Bulk sends leave rate-limit tokens to priority sends that are ready
+            if not priority and self._priority_active:
+                await asyncio.sleep(PRIORITY_YIELD_SECONDS)
+                continue
+            wait = self.rate_limiter.try_acquire()
+            if wait == 0.0:
+                return
+            await asyncio.sleep(wait)
+
+    async def _deliver(self, item: _OutboundSms) -> Optional[str]:
+        form = self._form(item)
+        if form is None:
+            self.stats["failed"] += 1
+            return None
+
+        endpoint = f"/2010-04-01/Accounts/{self.account_sid}/Messages.json"
+        for attempt in range(self.max_retries + 1):
+            await self._throttle(item.priority)
+            retry_after = None
+            try:
+                started = time.perf_counter()
+                try:
+                    response = await self._client.post(endpoint, data=form)
+                finally:
+                    if item.call is not None:
+                        item.call.add_seconds(time.perf_counter() - started)
+                if response.status_code < 400:
+                    self.stats["sent"] += 1
+                    sid = response.json().get("sid")
+                    logger.info("SMS sent successfully to %s, SID: %s", item.to, sid)
+                    return sid
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    logger.error("Twilio error sending SMS to %s: %s - %s", item.to, response.status_code, response.text)
+                    break
+                retry_after = response.headers.get("Retry-After")
+            except httpx.TransportError as e:
+                logger.error("Transport error sending SMS to %s: %s", item.to, e)
+
+            if attempt < self.max_retries:
+                self.stats["retries"] += 1
+                await asyncio.sleep(_backoff_seconds(attempt, retry_after))
+
+        self.stats["failed"] += 1
+        return None
+
+def _backoff_seconds(attempt: int, retry_after: Optional[str]) -> float:
+    """Exponential backoff with jitter, honouring Retry-After when present"""
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+    return min(10.0, 0.25 * (2 ** attempt)) * (0.5 + random.random() / 2)
+
+# =============================================================================
+# SHARED QUEUE
+# =============================================================================
+
+# The default tenant's queue; other tenants keep theirs in their resources
+_queue: Optional[SmsSendQueue] = None
+
+def _tenant_queue(tenant: tenants.Tenant) -> SmsSendQueue:
+    return SmsSendQueue(
+        account_sid=tenant.twilio_account_sid or "",
+        auth_token=tenant.twilio_auth_token or "",
+        messaging_service_sid=tenant.twilio_messaging_service_sid or "",
+        from_number=tenant.twilio_phone_number or ""
+    )
+
+def get_queue() -> SmsSendQueue:
+    """Get the current tenant's send queue"""
+    global _queue
+    tenant = tenants.current()
+    if not tenant.is_default:
+        return tenant.resource("sms_queue", lambda: _tenant_queue(tenant))
+    if _queue is None:
+        _queue = SmsSendQueue()
+    return _queue
+
+async def close_queue():
+    """Close every tenant's send queue that was started"""
+    global _queue
+    if _queue is not None:
+        await _queue.close()
+        _queue = None
+    for tenant in tenants.all_tenants():
+        queue = tenant.pop_resource("sms_queue")
+        if queue is not None:
+            await queue.close()
@@ -0,0 +1,270 @@
+"""
+Stats Engine Module
+
+This module keeps per-month check-in statistics up to date incrementally so
+/stats/monthly never has to download whole tables. It includes:
+- Per-tenant, per-month rollup counters in the local store (check-ins by status, messages, opt-outs)
+- Listeners on Airtable writes that apply each status transition, message and opt-out
+- A backfill command that streams historical Check-ins once into a staging
+  table and swaps it in atomically
+
+Run the backfill with: python -m app.stats_engine backfill [tenant_id]
+"""
+
+import sys
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional, Set
+
+from . import airtable, log, tenants
+from .local_store import get_store
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+CHECKIN_STATUSES = ["Sent", "In progress", "Completed", "Failed", "Opted-out"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stats_checkins (
+    tenant_id TEXT NOT NULL,
+    checkin_id TEXT NOT NULL,
+    month TEXT NOT NULL,
+    status TEXT,
+    PRIMARY KEY (tenant_id, checkin_id)
+);
+CREATE TABLE IF NOT EXISTS stats_checkins_backfill (
+    tenant_id TEXT NOT NULL,
+    checkin_id TEXT NOT NULL,
+    month TEXT NOT NULL,
+    status TEXT,
+    PRIMARY KEY (tenant_id, checkin_id)
+);
+CREATE TABLE IF NOT EXISTS stats_monthly (
+    tenant_id TEXT NOT NULL,
+    month TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (tenant_id, month, metric)
+);
+"""
+
+# Rollups kept before tenants were tracked belonged to the default tenant
+_MIGRATIONS = [
+    ("stats_checkins", "tenant_id", f"""
+ALTER TABLE stats_checkins RENAME TO stats_checkins_unscoped;
+{_SCHEMA}
+INSERT INTO stats_checkins (tenant_id, checkin_id, month, status)
+    SELECT '{tenants.DEFAULT_TENANT_ID}', checkin_id, month, status FROM stats_checkins_unscoped;
+DROP TABLE stats_checkins_unscoped;
+"""),
+    ("stats_checkins_backfill", "tenant_id", "DROP TABLE stats_checkins_backfill;"),
+    ("stats_monthly", "tenant_id", f"""
+ALTER TABLE stats_monthly RENAME TO stats_monthly_unscoped;
+{_SCHEMA}
+INSERT INTO stats_monthly (tenant_id, month, metric, value)
+    SELECT '{tenants.DEFAULT_TENANT_ID}', month, metric, value FROM stats_monthly_unscoped;
+DROP TABLE stats_monthly_unscoped;
+"""),
+]
+
+def _store():
+    store = get_store()
+    store.ensure_schema("stats_engine", _SCHEMA, _MIGRATIONS)
+    return store
+
+def _current_month() -> str:
+    return datetime.now().strftime("%Y-%m")
+
+def _bump(conn, tenant_id: str, month: str, metric: str, delta: int = 1):
+    conn.execute(
+        "INSERT INTO stats_monthly (tenant_id, month, metric, value) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(tenant_id, month, metric) DO UPDATE SET value = value + excluded.value",
+        (tenant_id, month, metric, delta)
+    )
+
+# =============================================================================
+# INCREMENTAL UPDATES
+# =============================================================================
+
+def record_checkin_status(checkin_id: str, status: str, month: Optional[str] = None):
+    """
+    Apply a check-in creation or status transition to the current tenant's monthly rollups
+
+    Args:
+        checkin_id: Check-ins table record ID
+        status: New status
+        month: Check-in month (YYYY-MM); defaults to the month the check-in was
+            first seen, or the current month for a new check-in
+    """
+    if not checkin_id or not status:
+        return
+    tenant_id = tenants.current().tenant_id
+    # Noted before writing, so a running backfill's swap keeps this write
+    touched = _touched_during_backfill.get(tenant_id)
+    if touched is not None:
+        touched.add(checkin_id)
+    with _store().transaction() as conn:
+        row = conn.execute(
+            "SELECT month, status FROM stats_checkins WHERE tenant_id = ? AND checkin_id = ?",
+            (tenant_id, checkin_id)
+        ).fetchone()
+        if row is None:
+            month = month or _current_month()
+            conn.execute(
+                "INSERT INTO stats_checkins (tenant_id, checkin_id, month, status) VALUES (?, ?, ?, ?)",
+                (tenant_id, checkin_id, month, status)
+            )
+            _bump(conn, tenant_id, month, "checkins")
+        else:
+            if row["status"] == status:
+                return
+            month = row["month"]
+            if row["status"]:
+                _bump(conn, tenant_id, month, f"status:{row['status']}", -1)
+            conn.execute("UPDATE stats_checkins SET status = ? WHERE tenant_id = ? AND checkin_id = ?",
+                         (status, tenant_id, checkin_id))
+        _bump(conn, tenant_id, month, f"status:{status}")
+
+def record_message(direction: str, when: Optional[str] = None):
+    """Count a logged message in the month it was sent or received"""
+    month = (when or "")[:7] or _current_month()
+    with _store().transaction() as conn:
+        _bump(conn, tenants.current().tenant_id, month, f"messages:{(direction or 'unknown').lower()}")
+
+def record_opt_out(when: Optional[str] = None):
+    month = (when or "")[:7] or _current_month()
+    with _store().transaction() as conn:
+        _bump(conn, tenants.current().tenant_id, month, "opt_outs")
+
+@airtable.on_change("checkin")
+def _on_checkin_changed(checkin_id: str, month: Optional[str], status: str):
+    record_checkin_status(checkin_id, status, month)
+
+@airtable.on_change("message")
+def _on_message_logged(checkin_id: Optional[str], direction: str, when: str):
+    record_message(direction, when)
+
+@airtable.on_change("person")
+def _on_person_changed(person_id: str, fields: Dict[str, Any]):
+    if fields.get("Opt-out") is True:
+        record_opt_out()
+
+# =============================================================================
+# QUERIES
+# =============================================================================
+
+def monthly_stats(month: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Read the current tenant's rollups for one month (a single primary-key range lookup)
+
+    Returns:
+        Dictionary with check-in counts by status, message counts, opt-outs and
+        the completion rate
+    """
+    month = month or _current_month()
+    rows = _store().query("SELECT metric, value FROM stats_monthly WHERE tenant_id = ? AND month = ?",
+                          (tenants.current().tenant_id, month))
+    metrics = {row["metric"]: row["value"] for row in rows}
+
+    by_status = {status: metrics.get(f"status:{status}", 0) for status in CHECKIN_STATUSES}
+    checkins = metrics.get("checkins", 0)
+    return {
+        "month": month,
+        "checkins": checkins,
+        "by_status": by_status,
+        "messages_inbound": metrics.get("messages:inbound", 0),
+        "messages_outbound": metrics.get("messages:outbound", 0),
+        "opt_outs": metrics.get("opt_outs", 0),
+        "completion_rate": round(by_status["Completed"] / checkins, 4) if checkins else None
+    }
+
+# =============================================================================
+# BACKFILL
+# =============================================================================
+
+# One backfill at a time; while it runs, check-ins live listeners write for its tenant are noted here
+_backfill_lock = threading.Lock()
+_touched_during_backfill: Dict[str, Set[str]] = {}
+
+def backfill(page_size: int = 100) -> Dict[str, int]:
+    """
+    Rebuild the current tenant's check-in rollups by streaming every historical Check-in once
+
+    Pages are written to a staging table as they arrive, so memory stays
+    bounded by one page. Only once the stream finishes are the staged rows
+    and the rollups recomputed from them swapped in, in one transaction: an
+    Airtable error midway leaves the current stats untouched. Check-ins that
+    live listeners wrote during the stream keep their live rows. Message and
+    opt-out counters, and other tenants' rows, are left untouched.
+    """
+    store = _store()
+    tenant = tenants.current()
+    tenant_id = tenant.tenant_id
+    insert_staged = ("INSERT OR REPLACE INTO stats_checkins_backfill (tenant_id, checkin_id, month, status) "
+                     "VALUES (?, ?, ?, ?)")
+    with _backfill_lock:
+        store.execute("DELETE FROM stats_checkins_backfill")
+        touched: Set[str] = set()
+        _touched_during_backfill[tenant_id] = touched
+        try:
+            processed = 0
+            records = airtable._iter_records(
+                tenant.checkins_table,
+                {"fields[]": ["Month", "Status"], "pageSize": page_size},
+                base_url=tenant.checkins_base_url
+            )
+            page = []
+            for record in records:
+                fields = record.get("fields", {})
+                month = fields.get("Month") or record.get("createdTime", "")[:7] or _current_month()
+                page.append((tenant_id, record["id"], month, fields.get("Status")))
+                if len(page) >= page_size:
+                    store.executemany(insert_staged, page)
+                    processed += len(page)
+                    page = []
+            if page:
+                store.executemany(insert_staged, page)
+                processed += len(page)
+
+            with store.transaction() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO stats_checkins_backfill (tenant_id, checkin_id, month, status) "
+                    "SELECT tenant_id, checkin_id, month, status FROM stats_checkins "
+                    "WHERE tenant_id = ? AND checkin_id = ?",
+                    [(tenant_id, checkin_id) for checkin_id in touched]
+                )
+                conn.execute("DELETE FROM stats_checkins WHERE tenant_id = ?", (tenant_id,))
+                conn.execute("INSERT INTO stats_checkins (tenant_id, checkin_id, month, status) "
+                             "SELECT tenant_id, checkin_id, month, status FROM stats_checkins_backfill")
+                conn.execute("DELETE FROM stats_monthly "
+                             "WHERE tenant_id = ? AND (metric = 'checkins' OR metric LIKE 'status:%')", (tenant_id,))
+                conn.execute("INSERT INTO stats_monthly (tenant_id, month, metric, value) "
+                             "SELECT tenant_id, month, 'checkins', COUNT(*) FROM stats_checkins "
+                             "WHERE tenant_id = ? GROUP BY month", (tenant_id,))
+                conn.execute("INSERT INTO stats_monthly (tenant_id, month, metric, value) "
+                             "SELECT tenant_id, month, 'status:' || status, COUNT(*) FROM stats_checkins "
+                             "WHERE tenant_id = ? AND status IS NOT NULL AND status != '' "
+                             "GROUP BY month, status", (tenant_id,))
+                months = conn.execute("SELECT COUNT(DISTINCT month) FROM stats_checkins WHERE tenant_id = ?",
+                                      (tenant_id,)).fetchone()[0]
+        finally:
+            _touched_during_backfill.pop(tenant_id, None)
+            store.execute("DELETE FROM stats_checkins_backfill")
+    return {"checkins": processed, "months": months}
+
+if __name__ == "__main__":
+    if len(sys.argv) in (2, 3) and sys.argv[1] == "backfill":
+        tenant_id = sys.argv[2] if len(sys.argv) == 3 else tenants.DEFAULT_TENANT_ID
+        tenant = tenants.get_registry().get(tenant_id)
+        if tenant is None:
+            sys.stdout.write(f"Unknown tenant: {tenant_id}\n")
+            sys.exit(1)
+        with tenants.use(tenant):
+            logger.info("Backfill complete for %s: %s", tenant_id, backfill())
+        log.flush()
+    else:
+        sys.stdout.write("Usage: python -m app.stats_engine backfill [tenant_id]\n")
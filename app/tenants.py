@@ -0,0 +1,386 @@
+"""
+Tenants Module
+
+This module lets one deployment serve several operators, each with their own
+Airtable bases, Twilio numbers and admins. It includes:
+- Tenant configuration: the default tenant from the environment, others from
+  the JSON file at TENANTS_FILE, with settings named like the environment
+  variables they replace
+- Resolution of a webhook's tenant from the Twilio number it concerns
+- The current tenant of a request or job, held in a context variable
+- Per-tenant resources (Airtable connection pool, write rate-limit bucket,
+  People cache, due index, send queue), created on first use so one tenant's
+  burst, rebuild or backlog never waits on another tenant's
+- An ASGI middleware selecting the tenant of non-Twilio routes (jobs, admin,
+  stats) from the X-Tenant header or the tenant query parameter
+
+TENANTS_FILE holds a list of tenants:
+
+    [{"id": "acme", "numbers": ["+15551230000"], "admin_numbers": ["+15551239999"],
+      "settings": {"AIRTABLE_BASE_ID": "appAcme", "AIRTABLE_API_KEY": "..."}}]
+
+A tenant's base IDs, sender (TWILIO_PHONE_NUMBER, which defaults to its
+first number, and TWILIO_MESSAGING_SERVICE_SID) and ADMIN_API_TOKEN are never
+taken from the environment, so a missing setting cannot read or send through
+another tenant's base or number, or export or bulk-edit its data. Every other setting falls back to the environment.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import parse_qsl
+
+from . import env
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+TENANTS_FILE = os.getenv("TENANTS_FILE")
+
+DEFAULT_TENANT_ID = "default"
+
+TENANT_HEADER = b"x-tenant"
+TENANT_QUERY_PARAM = "tenant"
+
+# Settings a tenant inherits from the environment unless it overrides them
+INHERITED_SETTINGS = {
+    "AIRTABLE_API_KEY": None,
+    "AIRTABLE_PEOPLE_TABLE": "People",
+    "AIRTABLE_CHECKINS_TABLE": "Check-ins",
+    "AIRTABLE_MESSAGES_TABLE": "Messages",
+    "AIRTABLE_CHECKINS_PEOPLE_TABLE": None,
+    "AIRTABLE_REMINDERS_MAIN_PEOPLE_TABLE": "People",
+    "AIRTABLE_REMINDERS_TABLE": "Reminders",
+    "AIRTABLE_NOTES_TABLE": "Notes",
+    "AIRTABLE_NOTES_MAIN_PEOPLE_TABLE": "People",
+    "AIRTABLE_FOLLOWUPS_TABLE": "Followups",
+    "AIRTABLE_MAX_RPS": "5",
+    "TWILIO_ACCOUNT_SID": None,
+    "TWILIO_AUTH_TOKEN": None,
+}
+
+# Settings naming a tenant's own data and sender; never inherited
+OWN_SETTINGS = (
+    "AIRTABLE_BASE_ID",
+    "AIRTABLE_CHECKINS_BASE_ID",
+    "AIRTABLE_REMINDERS_BASE_ID",
+    "AIRTABLE_NOTES_BASE_ID",
+    "TWILIO_PHONE_NUMBER",
+    "TWILIO_MESSAGING_SERVICE_SID",
+    "ADMIN_API_TOKEN",
+)
+
+def normalize_number(phone: str) -> str:
+    """Digits of a phone number with the US country code, for comparing numbers"""
+    digits = "".join(filter(str.isdigit, phone or ""))
+    return f"1{digits}" if len(digits) == 10 else digits
+
+# =============================================================================
+# TENANT
+# =============================================================================
+
+class Tenant:
+    """One operator's configuration and the resources built from it"""
+
+    def __init__(self, tenant_id: str, settings: Dict[str, Optional[str]],
+                 numbers: Iterable[str] = (), admin_numbers: Optional[Iterable[str]] = None):
+        self.tenant_id = tenant_id
+        self.settings = settings
+        self.numbers = {normalize_number(number) for number in numbers if number}
+        # None means admin_sms.ADMIN_NUMBERS (the default tenant only)
+        self.admin_numbers = set(admin_numbers) if admin_numbers is not None else None
+        self._resources: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def is_default(self) -> bool:
+        return self.tenant_id == DEFAULT_TENANT_ID
+
+    def setting(self, name: str) -> Optional[str]:
+        return self.settings.get(name)
+
+    # -------------------------------------------------------------------------
+    # Airtable
+    # -------------------------------------------------------------------------
+
+    @property
+    def api_key(self) -> Optional[str]:
+        return self.settings["AIRTABLE_API_KEY"]
+
+    @property
+    def base_id(self) -> Optional[str]:
+        return self.settings["AIRTABLE_BASE_ID"]
+
+    @property
+    def base_url(self) -> str:
+        return f"https://api.airtable.com/v0/{self.base_id}"
+
+    @property
+    def checkins_base_url(self) -> str:
+        return f"https://api.airtable.com/v0/{self.settings['AIRTABLE_CHECKINS_BASE_ID']}"
+
+    @property
+    def reminders_base_url(self) -> str:
+        return f"https://api.airtable.com/v0/{self.settings['AIRTABLE_REMINDERS_BASE_ID']}"
+
+    @property
+    def notes_base_url(self) -> str:
+        return f"https://api.airtable.com/v0/{self.settings['AIRTABLE_NOTES_BASE_ID']}"
+
+    @property
+    def people_table(self) -> str:
+        return self.settings["AIRTABLE_PEOPLE_TABLE"]
+
+    @property
+    def checkins_table(self) -> str:
+        return self.settings["AIRTABLE_CHECKINS_TABLE"]
+
+    @property
+    def messages_table(self) -> str:
+        return self.settings["AIRTABLE_MESSAGES_TABLE"]
+
+    @property
+    def checkins_people_table(self) -> Optional[str]:
+        return self.settings["AIRTABLE_CHECKINS_PEOPLE_TABLE"]
+
+    @property
+    def reminders_table(self) -> str:
+        return self.settings["AIRTABLE_REMINDERS_TABLE"]
+
+    @property
+    def reminders_people_table(self) -> str:
+        return self.settings["AIRTABLE_REMINDERS_MAIN_PEOPLE_TABLE"]
+
+    @property
+    def notes_table(self) -> str:
+        return self.settings["AIRTABLE_NOTES_TABLE"]
+
+    @property
+    def notes_people_table(self) -> str:
+        return self.settings["AIRTABLE_NOTES_MAIN_PEOPLE_TABLE"]
+
+    @property
+    def followups_table(self) -> str:
+        return self.settings["AIRTABLE_FOLLOWUPS_TABLE"]
+
+    @property
+    def max_rps(self) -> Optional[float]:
+        """AIRTABLE_MAX_RPS, or None if unset (callers fall back to airtable.AIRTABLE_MAX_RPS)"""
+        return _positive_rps(self.settings["AIRTABLE_MAX_RPS"])
+
+    @property
+    def admin_api_token(self) -> Optional[str]:
+        """Bearer token for routes that export or bulk-edit the tenant's data (None disables them)"""
+        return self.settings.get("ADMIN_API_TOKEN")
+
+    # -------------------------------------------------------------------------
+    # Twilio
+    # -------------------------------------------------------------------------
+
+    @property
+    def twilio_account_sid(self) -> Optional[str]:
+        return self.settings["TWILIO_ACCOUNT_SID"]
+
+    @property
+    def twilio_auth_token(self) -> Optional[str]:
+        return self.settings["TWILIO_AUTH_TOKEN"]
+
+    @property
+    def twilio_phone_number(self) -> Optional[str]:
+        return self.settings["TWILIO_PHONE_NUMBER"]
+
+    @property
+    def twilio_messaging_service_sid(self) -> Optional[str]:
+        return self.settings["TWILIO_MESSAGING_SERVICE_SID"]
+
+    # -------------------------------------------------------------------------
+    # Resources
+    # -------------------------------------------------------------------------
+
+    def resource(self, name: str, factory: Callable[[], Any]) -> Any:
+        """Get this tenant's instance of a resource, creating it on first use"""
+        resource = self._resources.get(name)
+        if resource is None:
+            with self._lock:
+                resource = self._resources.get(name)
+                if resource is None:
+                    resource = self._resources[name] = factory()
+        return resource
+
+    def pop_resource(self, name: str) -> Any:
+        """Remove and return this tenant's instance of a resource (None if never created)"""
+        with self._lock:
+            return self._resources.pop(name, None)
+
+    def __repr__(self) -> str:
+        return f"Tenant({self.tenant_id!r})"
+
+def _inherited_settings() -> Dict[str, Optional[str]]:
+    return {name: os.getenv(name, default) for name, default in INHERITED_SETTINGS.items()}
+
+def _fill_base_ids(settings: Dict[str, Optional[str]]):
+    """The check-ins, reminders and notes bases default to the tenant's main base"""
+    for name in ("AIRTABLE_CHECKINS_BASE_ID", "AIRTABLE_REMINDERS_BASE_ID", "AIRTABLE_NOTES_BASE_ID"):
+        settings[name] = settings[name] or settings["AIRTABLE_BASE_ID"]
+
+def _positive_rps(value: Any) -> Optional[float]:
+    """A requests-per-second setting as a positive number; None if unset, zero, negative or not a number"""
+    try:
+        rps = float(value)
+    except (TypeError, ValueError):
+        return None
+    return rps if rps > 0 else None
+
+def _check_settings(tenant_id: str, settings: Dict[str, Any]):
+    """Reject settings that would fail on first use rather than at startup"""
+    value = settings.get("AIRTABLE_MAX_RPS")
+    if value not in (None, "") and _positive_rps(value) is None:
+        raise ValueError(f"Tenant {tenant_id!r}: AIRTABLE_MAX_RPS must be a positive number, got {value!r}")
+
+def _default_settings() -> Dict[str, Optional[str]]:
+    settings = _inherited_settings()
+    settings.update({name: os.getenv(name) for name in OWN_SETTINGS})
+    _fill_base_ids(settings)
+    return settings
+
+def tenant_from_config(config: Dict[str, Any]) -> Tenant:
+    """
+    Build a tenant from one TENANTS_FILE entry
+
+    Raises:
+        ValueError: If the entry has no id, no numbers or no AIRTABLE_BASE_ID, or an invalid AIRTABLE_MAX_RPS
+    """
+    tenant_id = config.get("id")
+    numbers = config.get("numbers") or []
+    overrides = config.get("settings") or {}
+    if not tenant_id or not numbers or not overrides.get("AIRTABLE_BASE_ID"):
+        raise ValueError(f"Tenant {tenant_id!r} needs an id, numbers and settings.AIRTABLE_BASE_ID")
+    settings = _inherited_settings()
+    settings.update({name: None for name in OWN_SETTINGS})
+    settings.update(overrides)
+    _check_settings(tenant_id, settings)
+    _fill_base_ids(settings)
+    if not settings["TWILIO_PHONE_NUMBER"] and not settings["TWILIO_MESSAGING_SERVICE_SID"]:
+        settings["TWILIO_PHONE_NUMBER"] = numbers[0]
+    return Tenant(tenant_id, settings, numbers, config.get("admin_numbers") or [])
+
+# =============================================================================
+# REGISTRY
+# =============================================================================
+
+class TenantRegistry:
+    """Tenants by ID and by Twilio number"""
+
+    def __init__(self, tenants: List[Tenant]):
+        self.default = next((tenant for tenant in tenants if tenant.is_default), None)
+        if self.default is None:
+            raise ValueError("A registry needs the default tenant")
+        self._by_id = {tenant.tenant_id: tenant for tenant in tenants}
+        self._by_number: Dict[str, Tenant] = {}
+        # Configured tenants claim their numbers before the default tenant
+        for tenant in sorted(tenants, key=lambda tenant: tenant.is_default):
+            for number in tenant.numbers:
+                self._by_number.setdefault(number, tenant)
+
+    def get(self, tenant_id: str) -> Optional[Tenant]:
+        return self._by_id.get(tenant_id)
+
+    def resolve(self, number: str) -> Tenant:
+        """The tenant owning a Twilio number; the default tenant for numbers nobody claims"""
+        return self._by_number.get(normalize_number(number), self.default)
+
+    def all(self) -> List[Tenant]:
+        return list(self._by_id.values())
+
+def load_registry(path: Optional[str] = TENANTS_FILE) -> TenantRegistry:
+    """Build the registry from the environment and, if given, the TENANTS_FILE JSON"""
+    default_settings = _default_settings()
+    _check_settings(DEFAULT_TENANT_ID, default_settings)
+    tenants = [Tenant(DEFAULT_TENANT_ID, default_settings, [default_settings["TWILIO_PHONE_NUMBER"] or ""])]
+    if path:
+        with open(path) as f:
+            for config in json.load(f):
+                tenants.append(tenant_from_config(config))
+        logger.info("Loaded %s tenants from %s", len(tenants) - 1, path)
+    return TenantRegistry(tenants)
+
+_registry: Optional[TenantRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_registry() -> TenantRegistry:
+    """Get the process-wide registry, loading it on first use"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = load_registry()
+    return _registry
+
+def all_tenants() -> List[Tenant]:
+    return get_registry().all()
+
+def resolve(number: str) -> Tenant:
+    """The tenant owning a Twilio number (see TenantRegistry.resolve)"""
+    return get_registry().resolve(number)
+
+# =============================================================================
+# CURRENT TENANT
+# =============================================================================
+
+_current_tenant: ContextVar[Optional[Tenant]] = ContextVar("current_tenant", default=None)
+
+def current() -> Tenant:
+    """The tenant of the running request or job (the default tenant outside one)"""
+    return _current_tenant.get() or get_registry().default
+
+@contextmanager
+def use(tenant: Tenant) -> Iterator[Tenant]:
+    """Make `tenant` the current tenant for the duration of the block"""
+    token = _current_tenant.set(tenant)
+    try:
+        yield tenant
+    finally:
+        _current_tenant.reset(token)
+
+# =============================================================================
+# MIDDLEWARE
+# =============================================================================
+
+class TenantMiddleware:
+    """
+    Select the tenant of a non-Twilio request from X-Tenant or ?tenant=
+
+    Twilio webhooks are resolved from their numbers by the webhook middleware.
+    Requests naming an unknown tenant are answered with 404.
+
+    Usage:
+        app.add_middleware(tenants.TenantMiddleware)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        tenant_id = dict(scope["headers"]).get(TENANT_HEADER, b"").decode("latin-1")
+        if not tenant_id and scope.get("query_string"):
+            tenant_id = dict(parse_qsl(scope["query_string"].decode("latin-1"))).get(TENANT_QUERY_PARAM, "")
+        if not tenant_id:
+            return await self.app(scope, receive, send)
+        tenant = get_registry().get(tenant_id)
+        if tenant is None:
+            body = json.dumps({"detail": f"Unknown tenant: {tenant_id}"}).encode()
+            await send({"type": "http.response.start", "status": 404,
+                        "headers": [(b"content-type", b"application/json"),
+                                    (b"content-length", str(len(body)).encode())]})
+            return await send({"type": "http.response.body", "body": body})
+        with use(tenant):
+            await self.app(scope, receive, send)
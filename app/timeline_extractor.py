@@ -7,11 +7,9 @@ Handles natural language time expressions and converts them to specific datetime
 import re
 from datetime import datetime, timedelta, time
 from typing import Optional, Tuple, Dict, Any
-import logging
+from .log import get_logger
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+logger = get_logger(__name__)
 
 class TimelineExtractor:
     """
@@ -247,7 +245,7 @@ class TimelineExtractor:
                 return datetime.combine(target_date, time(hour, minute))
             
         except (ValueError, IndexError) as e:
-            logger.warning(f"Error parsing specific time: {e}")
+            logger.warning("Error parsing specific time: %s", e)
             return None
         
         return None
@@ -0,0 +1,218 @@
+"""
+Tracing Module
+
+This module times the stages of a request (phone lookup, check-in upsert,
+message logging, intent classification, handler, reply send) and counts the
+external calls made inside each one. It includes:
+- A per-request trace held in a context variable, so nested code records into
+  the request it runs for without passing anything around
+- Spans with a duration and per-service call counts (airtable, twilio, openai)
+- Prometheus text-format histograms and counters for /metrics
+- A Server-Timing header value for the optional per-request timing header
+
+With TRACING_ENABLED off no trace is ever started: span() returns a shared
+no-op context manager and record_call() returns after one context lookup.
+"""
+
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+
+# Also return the stage timings of each traced request in a Server-Timing header
+TRACE_TIMING_HEADER = os.getenv("TRACE_TIMING_HEADER", "false").lower() == "true"
+
+# Request path -> trace name
+TRACED_PATHS = {
+    "/twilio/inbound": "inbound",
+}
+
+# Histogram bucket upper bounds in seconds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# =============================================================================
+# METRICS
+# =============================================================================
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DURATION_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[int]:
+        total, result = 0, []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+_lock = threading.Lock()
+_request_seconds: Dict[str, Histogram] = {}
+_stage_seconds: Dict[Tuple[str, str], Histogram] = {}
+_stage_calls: Dict[Tuple[str, str, str], int] = {}
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{key}="{value}"' for key, value in labels.items())
+
+def _render_histogram(lines: List[str], name: str, labels: str, histogram: Histogram):
+    prefix = f"{labels}," if labels else ""
+    for bound, count in zip(histogram.buckets, histogram.cumulative()):
+        lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {count}')
+    lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {histogram.count}')
+    lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.6f}")
+    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+def render_metrics() -> str:
+    """All recorded metrics in the Prometheus text exposition format"""
+    lines = [
+        "# HELP sms_request_duration_seconds Traced request duration",
+        "# TYPE sms_request_duration_seconds histogram",
+    ]
+    with _lock:
+        for trace, histogram in sorted(_request_seconds.items()):
+            _render_histogram(lines, "sms_request_duration_seconds", _labels(trace=trace), histogram)
+        lines += [
+            "# HELP sms_stage_duration_seconds Duration of one stage of a traced request",
+            "# TYPE sms_stage_duration_seconds histogram",
+        ]
+        for (trace, stage), histogram in sorted(_stage_seconds.items()):
+            _render_histogram(lines, "sms_stage_duration_seconds", _labels(trace=trace, stage=stage), histogram)
+        lines += [
+            "# HELP sms_stage_external_calls_total External calls made during a stage",
+            "# TYPE sms_stage_external_calls_total counter",
+        ]
+        for (trace, stage, service), count in sorted(_stage_calls.items()):
+            lines.append(f"sms_stage_external_calls_total{{{_labels(trace=trace, stage=stage, service=service)}}} {count}")
+    return "\n".join(lines) + "\n"
+
+def reset_metrics():
+    """Drop every recorded metric (benchmarks and tests)"""
+    with _lock:
+        _request_seconds.clear()
+        _stage_seconds.clear()
+        _stage_calls.clear()
+
+# =============================================================================
+# TRACES AND SPANS
+# =============================================================================
+
+class Trace:
+    """The spans of one request, in the order they finished"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = time.perf_counter()
+        self.seconds: Optional[float] = None
+        self.spans: List[Dict] = []
+        self._open: List[Dict] = []
+
+    def finish(self):
+        """Stop the clock and fold the trace into the /metrics histograms"""
+        self.seconds = time.perf_counter() - self.started
+        with _lock:
+            _request_seconds.setdefault(self.name, Histogram()).observe(self.seconds)
+            for span in self.spans:
+                _stage_seconds.setdefault((self.name, span["stage"]), Histogram()).observe(span["seconds"])
+                for service, count in span["calls"].items():
+                    key = (self.name, span["stage"], service)
+                    _stage_calls[key] = _stage_calls.get(key, 0) + count
+
+    def server_timing(self) -> str:
+        """Server-Timing header value: total time per stage with its external calls"""
+        stages: Dict[str, List] = {}
+        for span in self.spans:
+            seconds, calls = stages.setdefault(span["stage"], [0.0, {}])
+            stages[span["stage"]][0] = seconds + span["seconds"]
+            for service, count in span["calls"].items():
+                calls[service] = calls.get(service, 0) + count
+        entries = []
+        for stage, (seconds, calls) in stages.items():
+            entry = f"{stage};dur={seconds * 1000:.1f}"
+            if calls:
+                entry += ';desc="' + " ".join(f"{service}={count}" for service, count in sorted(calls.items())) + '"'
+            entries.append(entry)
+        if self.seconds is not None:
+            entries.append(f"total;dur={self.seconds * 1000:.1f}")
+        return ", ".join(entries)
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+
+def start_trace(name: str) -> Trace:
+    """Start a trace for the current request (and every task it spawns from here on)"""
+    trace = Trace(name)
+    _current_trace.set(trace)
+    return trace
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+class _Span:
+    __slots__ = ("trace", "record")
+
+    def __init__(self, trace: Trace, stage: str):
+        self.trace = trace
+        self.record = {"stage": stage, "seconds": 0.0, "calls": {}}
+
+    def __enter__(self):
+        self.record["seconds"] = time.perf_counter()
+        self.trace._open.append(self.record)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.record["seconds"] = time.perf_counter() - self.record["seconds"]
+        self.trace._open.pop()
+        self.trace.spans.append(self.record)
+        return False
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NOOP_SPAN = _NoopSpan()
+
+def span(stage: str):
+    """
+    Time a stage of the current request
+
+    Args:
+        stage: Stage name, used as the `stage` label
+
+    Returns:
+        Context manager; a shared no-op when no trace is active
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP_SPAN
+    return _Span(trace, stage)
+
+def record_call(service: str):
+    """Count one external call against the innermost open span of the current request"""
+    trace = _current_trace.get()
+    if trace is None or not trace._open:
+        return
+    calls = trace._open[-1]["calls"]
+    calls[service] = calls.get(service, 0) + 1
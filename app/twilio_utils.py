@@ -2,13 +2,22 @@
 Twilio Utilities Module
 
 This module handles all Twilio SMS operations including sending messages,
-logging message status, and managing Twilio client connections.
+logging message status, and managing Twilio client connections. Sends and
+signature checks use the current tenant's account and number.
 """
 
+import asyncio
 import os
-from typing import Optional
-from twilio.rest import Client
-from twilio.base.exceptions import TwilioException
+from typing import Dict, Optional, Union
+from . import call_budget, env, tenants
+from .lazy_imports import LazyModule
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+# The Twilio SDK is imported on first use rather than at startup
+twilio_rest = LazyModule("twilio.rest")
+twilio_exceptions = LazyModule("twilio.base.exceptions")
 
 # =============================================================================
 # CONFIGURATION
@@ -20,7 +29,7 @@ TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN")
 TWILIO_PHONE_NUMBER = os.getenv("TWILIO_PHONE_NUMBER")
 TWILIO_MESSAGING_SERVICE_SID = os.getenv("TWILIO_MESSAGING_SERVICE_SID")
 
-# Initialize Twilio client
+# Initialize Twilio client (the default tenant's; other tenants keep theirs in their resources)
 twilio_client = None
 
 # =============================================================================
@@ -28,19 +37,34 @@ twilio_client = None
 # =============================================================================
 
 def _get_twilio_client():
-    """Get or initialize Twilio client"""
+    """Get or initialize the current tenant's Twilio client"""
     global twilio_client
+    tenant = tenants.current()
+    if not tenant.is_default:
+        if not (tenant.twilio_account_sid and tenant.twilio_auth_token):
+            logger.warning("Twilio credentials not available for tenant %s", tenant.tenant_id)
+            return None
+        return tenant.resource("twilio_client", lambda: twilio_rest.Client(tenant.twilio_account_sid,
+                                                                            tenant.twilio_auth_token))
     if twilio_client is None:
         # Get current environment variables (they might have been loaded after module import)
         account_sid = os.getenv("TWILIO_ACCOUNT_SID")
         auth_token = os.getenv("TWILIO_AUTH_TOKEN")
         
         if account_sid and auth_token:
-            twilio_client = Client(account_sid, auth_token)
+            twilio_client = twilio_rest.Client(account_sid, auth_token)
         else:
-            print("Twilio credentials not available")
+            logger.warning("Twilio credentials not available")
     return twilio_client
 
+def status_callback_url() -> str:
+    """
+    Webhook URL for delivery status callbacks
+
+    Every send shares this URL; the callback's From number selects the tenant.
+    """
+    return f"{os.getenv('APP_BASE_URL', 'http://localhost:8000').rstrip('/')}/twilio/status"
+
 # =============================================================================
 # SMS OPERATIONS
 # =============================================================================
@@ -59,7 +83,7 @@ def send_sms(to: str, body: str, status_callback_url: Optional[str] = None) -> O
     """
     client = _get_twilio_client()
     if not client:
-        print("Twilio client not initialized - check environment variables")
+        logger.warning("Twilio client not initialized - check environment variables")
         return None
     
     try:
@@ -70,15 +94,16 @@ def send_sms(to: str, body: str, status_callback_url: Optional[str] = None) -> O
         }
         
         # Use messaging service if available, otherwise use phone number
-        messaging_service_sid = os.getenv("TWILIO_MESSAGING_SERVICE_SID")
-        phone_number = os.getenv("TWILIO_PHONE_NUMBER")
+        tenant = tenants.current()
+        messaging_service_sid = tenant.twilio_messaging_service_sid
+        phone_number = tenant.twilio_phone_number
         
         if messaging_service_sid:
             message_params["messaging_service_sid"] = messaging_service_sid
         elif phone_number:
             message_params["from_"] = phone_number
         else:
-            print("No Twilio phone number or messaging service configured")
+            logger.warning("No Twilio phone number or messaging service configured")
             return None
         
         # Add status callback if provided
@@ -86,28 +111,91 @@ def send_sms(to: str, body: str, status_callback_url: Optional[str] = None) -> O
             message_params["status_callback"] = status_callback_url
         
         # Send the message
-        message = client.messages.create(**message_params)
+        with call_budget.external_call("twilio"):
+            message = client.messages.create(**message_params)
         
-        print(f"SMS sent successfully to {to}, SID: {message.sid}")
+        logger.info("SMS sent successfully to %s, SID: %s", to, message.sid)
         return message.sid
         
-    except TwilioException as e:
-        print(f"Twilio error sending SMS to {to}: {e}")
+    except twilio_exceptions.TwilioException as e:
+        logger.error("Twilio error sending SMS to %s: %s", to, e)
         return None
     except Exception as e:
-        print(f"Unexpected error sending SMS to {to}: {e}")
+        logger.error("Unexpected error sending SMS to %s: %s", to, e)
         return None
 
+async def send_sms_async(to: str, body: str, status_callback_url: Optional[str] = None,
+                         priority: bool = False) -> Optional[str]:
+    """
+    Send SMS from async code through the rate-limited send queue
+    
+    Args:
+        to: Phone number to send to (E.164 format)
+        body: Message body
+        status_callback_url: Optional webhook URL for delivery status
+        priority: Send ahead of queued bulk messages (replies to an inbound webhook,
+            which Twilio retries if it takes longer than 15 seconds)
+        
+    Returns:
+        Message SID if successful, None if failed
+    """
+    from .sms_queue import get_queue
+    with call_budget.external_call("twilio") as call:
+        # Only the Twilio request is timed (the queue adds it), not the wait in the queue
+        call.add_seconds(0.0)
+        return await get_queue().send(to, body, status_callback_url, priority=priority, call=call)
+
+async def submit_sms_async(to: str, body: str, status_callback_url: Optional[str] = None) -> "asyncio.Future":
+    """
+    Queue a bulk SMS from async code without waiting for it to be sent
+    
+    Waits only while the queue is full (backpressure). Bulk sends get the
+    queue's rate limit and retries, and yield to priority sends.
+    
+    Args:
+        to: Phone number to send to (E.164 format)
+        body: Message body
+        status_callback_url: Optional webhook URL for delivery status
+        
+    Returns:
+        Future resolving to the message SID, or None if the send failed
+    """
+    from .sms_queue import get_queue
+    with call_budget.external_call("twilio"):
+        return await get_queue().submit(to, body, status_callback_url)
+
 # =============================================================================
 # WEBHOOK UTILITIES
 # =============================================================================
 
-def validate_webhook_signature(request_body: str, signature: str, url: str) -> bool:
+# One validator per auth token (tenants on one Twilio account share it)
+_request_validators: Dict[str, object] = {}
+
+def _get_request_validator():
+    """Get or create the current tenant's RequestValidator (None without an auth token)"""
+    auth_token = tenants.current().twilio_auth_token
+    if not auth_token:
+        return None
+    validator = _request_validators.get(auth_token)
+    if validator is None:
+        from twilio.request_validator import RequestValidator
+
+        class FormRequestValidator(RequestValidator):
+            """Reads plain dict params directly instead of probing for MultiDict/QueryDict per key"""
+
+            def get_values(self, param_dict, param_name):
+                return [param_dict[param_name]]
+
+        validator = _request_validators[auth_token] = FormRequestValidator(auth_token)
+    return validator
+
+def validate_webhook_signature(request_params: Union[Dict[str, str], str], signature: str, url: str) -> bool:
     """
-    Validate Twilio webhook signature for security
+    Validate Twilio webhook signature for security with the current tenant's auth token
     
     Args:
-        request_body: Raw request body
+        request_params: Form parameters of the request as a plain dict (or the
+            raw body of a JSON webhook whose URL carries bodySHA256)
         signature: X-Twilio-Signature header value
         url: Full webhook URL
         
@@ -115,20 +203,18 @@ def validate_webhook_signature(request_body: str, signature: str, url: str) -> b
         True if signature is valid, False otherwise
     """
     try:
-        from twilio.request_validator import RequestValidator
-        
-        if not TWILIO_AUTH_TOKEN:
-            print("No Twilio auth token available for signature validation")
+        validator = _get_request_validator()
+        if validator is None:
+            logger.warning("No Twilio auth token available for signature validation")
             return False
         
-        validator = RequestValidator(TWILIO_AUTH_TOKEN)
-        return validator.validate(url, request_body, signature)
+        return validator.validate(url, request_params, signature)
         
     except ImportError:
-        print("twilio package not available for signature validation")
+        logger.warning("twilio package not available for signature validation")
         return False
     except Exception as e:
-        print(f"Error validating Twilio signature: {e}")
+        logger.error("Error validating Twilio signature: %s", e)
         return False
 
 # =============================================================================
@@ -190,9 +276,9 @@ def get_message_status(message_sid: str) -> Optional[dict]:
             "error_code": message.error_code,
             "error_message": message.error_message
         }
-    except TwilioException as e:
-        print(f"Error fetching message status for {message_sid}: {e}")
+    except twilio_exceptions.TwilioException as e:
+        logger.error("Error fetching message status for %s: %s", message_sid, e)
         return None
     except Exception as e:
-        print(f"Unexpected error fetching message status for {message_sid}: {e}")
+        logger.error("Unexpected error fetching message status for %s: %s", message_sid, e)
         return None
@@ -0,0 +1,117 @@
+"""
+Warm-up Module
+
+This module prepares the process in the background right after startup so
+the first SMS and admin requests after a cold start do not pay for loading
+indexes, opening connections and importing SDKs. It includes:
+- Warm-up steps: pooled Airtable connection and People cache (with its phone
+  index for inbound lookups), due-date index (built from the cached directory),
+  Twilio client, OpenAI SDK import
+- Per-step timings and errors
+- A readiness flag reported by /health once every step has finished
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import airtable, due_index, intent_classifier, people_cache, twilio_utils
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Set to false to skip warm-up (e.g. in scripts and tests)
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+
+# =============================================================================
+# WARM-UP STEPS
+# =============================================================================
+
+def _warm_people():
+    """Open the pooled Airtable connection and load the People cache, search and phone indexes"""
+    people_cache.cache.refresh()
+
+def _warm_due_index():
+    """Build the due-date index from the cached directory instead of a second People fetch"""
+    if not people_cache.cache.loaded_at:
+        due_index.index.refresh()
+        return
+    due_index.index.load([
+        {"id": record["id"], "fields": dict(record.get("fields", {}))}
+        for record in people_cache.cache.all()
+    ])
+
+def _warm_twilio():
+    twilio_utils._get_twilio_client()
+
+def _warm_openai():
+    intent_classifier.openai._load()
+
+WARMUP_STEPS: List[Tuple[str, Callable[[], Any]]] = [
+    ("people_cache", _warm_people),
+    ("due_index", _warm_due_index),
+    ("twilio", _warm_twilio),
+    ("openai", _warm_openai),
+]
+
+# =============================================================================
+# STATE
+# =============================================================================
+
+class Warmup:
+    """Runs the warm-up steps once and records how each went"""
+
+    def __init__(self, steps: List[Tuple[str, Callable[[], Any]]] = WARMUP_STEPS):
+        self.steps = steps
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        """True once every step has finished (failed steps fall back to on-demand loading)"""
+        return self._done.is_set()
+
+    def run(self):
+        self.started_at = time.time()
+        for name, step in self.steps:
+            start = time.perf_counter()
+            try:
+                step()
+                self.results[name] = {"ok": True}
+            except Exception as e:
+                logger.warning("Warm-up step %s failed: %s", name, e)
+                self.results[name] = {"ok": False, "error": str(e)}
+            self.results[name]["seconds"] = round(time.perf_counter() - start, 3)
+        self.finished_at = time.time()
+        logger.info("Warm-up finished in %.2fs", self.finished_at - self.started_at)
+        self._done.set()
+
+    def start(self):
+        """Run the steps on a background thread so the server accepts requests immediately"""
+        if self._thread is not None:
+            return
+        if not WARMUP_ENABLED:
+            self._done.set()
+            return
+        self._thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "seconds": round(self.finished_at - self.started_at, 3) if self.finished_at else None,
+            "steps": self.results
+        }
+
+warmup = Warmup()
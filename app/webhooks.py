@@ -0,0 +1,157 @@
+"""
+Webhooks Module
+
+This module guards the Twilio webhooks (/twilio/*) before any request reaches
+a route handler. It includes:
+- Idempotency of processed inbound MessageSids (24 hours), shared by every
+  instance through the coordination backend
+- An ASGI middleware that resolves the webhook's tenant from its Twilio
+  number, checks X-Twilio-Signature with the tenant's shared validator and
+  answers forged requests with 403, and answers redelivered inbound
+  MessageSids as duplicates, both without parsing the form into a Request,
+  looking anyone up in Airtable or calling the LLM
+- Prometheus counters of rejected webhooks for /metrics
+
+Twilio signs the public URL it calls: APP_BASE_URL when set, otherwise the
+URL is rebuilt from the Host and X-Forwarded-Proto headers.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List
+from urllib.parse import parse_qsl
+
+from . import coordination, env, tenants, twilio_utils
+from .log import get_logger
+
+logger = get_logger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Set to false for local testing with unsigned requests (curl, debug scripts)
+TWILIO_VALIDATE_SIGNATURES = os.getenv("TWILIO_VALIDATE_SIGNATURES", "true").lower() == "true"
+
+TWILIO_WEBHOOK_PREFIX = "/twilio/"
+INBOUND_PATH = "/twilio/inbound"
+
+PROCESSED_MESSAGE_TTL_HOURS = 24
+
+# =============================================================================
+# IDEMPOTENCY
+# =============================================================================
+
+def is_message_processed(message_sid: str) -> bool:
+    """Check if any instance has already processed a message"""
+    return coordination.is_claimed(f"message:{message_sid}")
+
+def claim_message(message_sid: str) -> bool:
+    """Mark a message as processed; False if another request (on any instance) got there first"""
+    return coordination.claim(f"message:{message_sid}", PROCESSED_MESSAGE_TTL_HOURS * 3600)
+
+# =============================================================================
+# METRICS
+# =============================================================================
+
+_lock = threading.Lock()
+_rejected: Dict[str, int] = {}
+
+def _count_rejection(reason: str):
+    with _lock:
+        _rejected[reason] = _rejected.get(reason, 0) + 1
+
+def render_metrics() -> str:
+    """Rejected webhooks in the Prometheus text format"""
+    lines = [
+        "# HELP sms_webhook_rejected_total Twilio webhooks answered by the middleware before routing",
+        "# TYPE sms_webhook_rejected_total counter",
+    ]
+    with _lock:
+        for reason, count in sorted(_rejected.items()):
+            lines.append(f'sms_webhook_rejected_total{{reason="{reason}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+# =============================================================================
+# MIDDLEWARE
+# =============================================================================
+
+def webhook_url(scope: Dict) -> str:
+    """The URL Twilio signed for this request"""
+    base_url = os.getenv("APP_BASE_URL")
+    if not base_url:
+        headers = dict(scope.get("headers") or [])
+        scheme = headers.get(b"x-forwarded-proto", scope.get("scheme", "http").encode()).decode().split(",")[0]
+        host = headers.get(b"host", b"localhost").decode()
+        base_url = f"{scheme}://{host}"
+    url = base_url.rstrip("/") + scope.get("root_path", "") + scope["path"]
+    if scope.get("query_string"):
+        url += "?" + scope["query_string"].decode("latin-1")
+    return url
+
+def tenant_number(path: str, params: Dict[str, str]) -> str:
+    """The tenant's Twilio number: inbound messages are sent To it, status callbacks report messages From it"""
+    return params.get("To", "") if path == INBOUND_PATH else params.get("From", "")
+
+async def _respond(send, status: int, body: bytes, content_type: bytes):
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode())]})
+    await send({"type": "http.response.body", "body": body})
+
+class TwilioWebhookMiddleware:
+    """
+    Resolve the tenant of Twilio webhooks and reject forged and replayed ones before routing
+
+    Usage:
+        app.add_middleware(webhooks.TwilioWebhookMiddleware)
+    """
+
+    def __init__(self, app, validate_signatures: bool = TWILIO_VALIDATE_SIGNATURES):
+        self.app = app
+        self.validate_signatures = validate_signatures
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(TWILIO_WEBHOOK_PREFIX) \
+                or scope["method"] != "POST":
+            return await self.app(scope, receive, send)
+
+        chunks: List[bytes] = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+        body = b"".join(chunks)
+        params = dict(parse_qsl(body.decode("utf-8", "replace"), keep_blank_values=True))
+
+        with tenants.use(tenants.resolve(tenant_number(scope["path"], params))):
+            await self._dispatch(scope, receive, send, body, params)
+
+    async def _dispatch(self, scope, receive, send, body: bytes, params: Dict[str, str]):
+        if self.validate_signatures:
+            signature = dict(scope["headers"]).get(b"x-twilio-signature", b"").decode("latin-1")
+            if not signature or not twilio_utils.validate_webhook_signature(params, signature, webhook_url(scope)):
+                _count_rejection("invalid_signature")
+                logger.warning("Rejected Twilio webhook with an invalid signature: %s", scope["path"])
+                return await _respond(send, 403, b"Invalid Twilio signature", b"text/plain")
+
+        if scope["path"] == INBOUND_PATH and is_message_processed(params.get("MessageSid", "")):
+            _count_rejection("duplicate")
+            logger.warning("Duplicate message detected, skipping: %s", params["MessageSid"])
+            payload = json.dumps({"ok": True, "message": "Message already processed"}).encode()
+            return await _respond(send, 200, payload, b"application/json")
+
+        # Hand the already-read body to the route
+        delivered = False
+
+        async def replay():
+            nonlocal delivered
+            if delivered:
+                return await receive()
+            delivered = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await self.app(scope, replay, send)
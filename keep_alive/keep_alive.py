@@ -13,7 +13,7 @@ from datetime import datetime
 def ping_health():
     """Ping the health endpoint to keep service awake"""
     try:
-        response = requests.get("https://kobro-admin.onrender.com/health", timeout=30)
+        response = requests.get("https://kobro-admin.onrender.com/health/ready", timeout=30)
         if response.status_code == 200:
             print(f"✅ {datetime.now().strftime('%H:%M:%S')} - Health check successful")
         else:
@@ -29,7 +29,7 @@ def run_scheduler():
 
 if __name__ == "__main__":
     print("🔄 Starting keep-alive service for Render...")
-    print("📍 Pinging: https://kobro-admin.onrender.com/health")
+    print("📍 Pinging: https://kobro-admin.onrender.com/health/ready")
     print("⏰ Interval: Every 10 minutes")
     print("🛑 Press Ctrl+C to stop")
     
@@ -15,7 +15,7 @@ from datetime import datetime
 class KeepAliveService:
     def __init__(self):
         self.running = True
-        self.url = "https://kobro-admin.onrender.com/health"
+        self.url = "https://kobro-admin.onrender.com/health/ready"
         self.ping_count = 0
         self.error_count = 0
         self.max_errors = 5
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bulk admin import vs one admin command per row
+
+Imports N rows (new contacts plus role/company/tag edits of existing people)
+through /admin/bulk's parser and BulkImport against a fake Airtable with
+per-request latency, under the real 5 requests/second limiter. The
+per-row path (admin_sms.execute_admin_command: full People scan of
+ceil(directory/100) pages plus one PATCH per row, at the same rate limit)
+is projected from its request count.
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app import airtable, bulk_admin
+from app.people_cache import PeopleCache
+from app.rate_limit import RateLimiter
+from bench_people_search import synthetic_people
+
+def synthetic_upload(people, rows: int) -> bytes:
+    rng = random.Random(3)
+    lines = ["command,name,value"]
+    for i in range(rows):
+        if i % 2 == 0:
+            lines.append(f"new_friend,Imported Contact {i},")
+        else:
+            person = rng.choice(people)["fields"]["Name"]
+            command, value = rng.choice([("change_role", "CTO"), ("change_company", "Acme"),
+                                         ("add_tags", "investor;mentor")])
+            lines.append(f"{command},{person},\"{value}\"")
+    return ("\n".join(lines) + "\n").encode()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--people", type=int, default=5_000)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--rps", type=float, default=airtable.AIRTABLE_MAX_RPS)
+    args = parser.parse_args()
+
+    people = synthetic_people(args.people)
+    cache = PeopleCache()
+    cache.load(people)
+
+    counter = [0]
+    def fake_request(method, endpoint, data=None, base_url=None, params=None):
+        time.sleep(args.latency_ms / 1000)
+        written = []
+        for record in data["records"]:
+            counter[0] += 1
+            written.append({"id": record.get("id") or f"recNew{counter[0]}", "fields": record["fields"]})
+        return {"records": written}
+    airtable._make_request = fake_request
+
+    upload = synthetic_upload(people, args.rows)
+    start = time.perf_counter()
+    row_parser = bulk_admin.RowParser("csv")
+    bulk = bulk_admin.BulkImport(cache, rate_limiter=RateLimiter(args.rps))
+    rejected = 0
+    for offset in range(0, len(upload), 64 * 1024):
+        for row_number, row in row_parser.feed(upload[offset:offset + 64 * 1024]):
+            rejected += bulk.add(row_number, row) is not None
+    for row_number, row in row_parser.close():
+        rejected += bulk.add(row_number, row) is not None
+    validate_s = time.perf_counter() - start
+    results = list(bulk.apply())
+    total_s = time.perf_counter() - start
+
+    per_row_requests = args.rows * (math.ceil(args.people / 100) + 1)
+    per_row_s = per_row_requests / args.rps
+
+    print(json.dumps({
+        "people": args.people,
+        "rows": args.rows,
+        "rejected": rejected,
+        "applied": sum(1 for r in results if r["success"]),
+        "bulk": {
+            "airtable_requests": bulk.requests,
+            "validate_ms": round(validate_s * 1000, 1),
+            "total_s": round(total_s, 2),
+        },
+        "per_row_projected": {
+            "airtable_requests": per_row_requests,
+            "total_s": round(per_row_s, 1),
+        },
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vectorized cohort scheduler over a synthetic People directory
+
+Loads N synthetic People records into a Cohort and times due masks, next-due
+dates and overdue counts against the per-record scheduler functions. Also
+reports how evenly the staggered send windows spread next month's sends.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.dirname(__file__))
+
+from app import cohort_scheduler, scheduler
+from bench_due_index import synthetic_directory
+
+def _ms(fn, repeat=3):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, round(best * 1000, 3)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--people", type=int, default=100_000)
+    parser.add_argument("--window-days", type=int, default=cohort_scheduler.SEND_WINDOW_DAYS)
+    args = parser.parse_args()
+
+    if not cohort_scheduler.NUMPY_AVAILABLE:
+        print(json.dumps({"error": "numpy not installed"}))
+        return
+
+    people = synthetic_directory(args.people)
+    today = date.today()
+
+    cohort, load_ms = _ms(lambda: cohort_scheduler.Cohort.from_records(people, window_days=args.window_days), 1)
+    due, due_ms = _ms(lambda: cohort.due_mask(today))
+    _, next_due_ms = _ms(lambda: cohort.next_due(today))
+    overdue, overdue_ms = _ms(lambda: cohort.overdue_count(today))
+    scheduled, scheduled_ms = _ms(lambda: cohort.scheduled_mask(today))
+
+    per_record, per_record_ms = _ms(lambda: [scheduler.is_due_for_checkin(p, today) for p in people], 1)
+    _, per_record_next_ms = _ms(lambda: [scheduler.get_next_checkin_date(p) for p in people], 1)
+    assert int(due.sum()) == sum(per_record)
+
+    calendar = cohort_scheduler.Cohort.from_records(people, calendar_months=True, window_days=args.window_days)
+    next_month = (today.replace(day=28).toordinal() + 4)
+    next_month = date.fromordinal(next_month).replace(day=1)
+    load = list(calendar.daily_load(next_month, args.window_days).values())
+
+    print(json.dumps({
+        "people": args.people,
+        "load_ms": load_ms,
+        "due_mask_ms": due_ms,
+        "next_due_ms": next_due_ms,
+        "overdue_count_ms": overdue_ms,
+        "scheduled_mask_ms": scheduled_ms,
+        "per_record_due_ms": per_record_ms,
+        "per_record_next_due_ms": per_record_next_ms,
+        "due_today": int(due.sum()),
+        "overdue": overdue,
+        "scheduled_today": int(scheduled.sum()),
+        "calendar_due_today": int(calendar.due_mask(today).sum()),
+        "next_month_window_load": {"min": min(load), "max": max(load), "mean": round(sum(load) / len(load), 1)}
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
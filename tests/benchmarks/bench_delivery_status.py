@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark: delivery-status pipeline under a monthly-send callback storm
+
+Indexes N outbound SIDs, then ingests the queued/sent/delivered (or failed)
+callbacks for each in shuffled order, as Twilio delivers them during a large
+monthly send. Airtable writes are counted rather than performed. Reports
+ingest throughput, flush time and how many PATCH requests were needed.
+With --patch-failure-rate, that share of PATCH batches fails on the first
+flush; a second flush must apply the statuses they carried.
+With --other-instance-share, that share of SIDs is indexed as if another
+instance had sent them (only in the coordination backend, not this host's
+local store); their statuses must still be applied.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+os.environ.setdefault("LOCAL_STORE_PATH", os.path.join(tempfile.mkdtemp(), "bench_store.db"))
+os.environ.setdefault("COORDINATION_PATH", os.path.join(tempfile.mkdtemp(), "bench_coordination.db"))
+
+from app import airtable, delivery_status
+from app.local_store import get_store
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=25_000)
+    parser.add_argument("--failure-rate", type=float, default=0.03)
+    parser.add_argument("--patch-failure-rate", type=float, default=0.0,
+                        help="Share of PATCH batches that fail on the first flush")
+    parser.add_argument("--other-instance-share", type=float, default=0.0,
+                        help="Share of SIDs indexed by another instance (shared index only)")
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    patch_requests = {"count": 0, "records": 0, "failed": 0}
+    failing = {"rate": args.patch_failure_rate}
+
+    def counting_batches(table, updates, base_url=None):
+        failed = []
+        for i in range(0, len(updates), airtable.AIRTABLE_BATCH_SIZE):
+            patch_requests["count"] += 1
+            if rng.random() < failing["rate"]:
+                patch_requests["failed"] += 1
+                failed.extend(updates[i:i + airtable.AIRTABLE_BATCH_SIZE])
+        patch_requests["records"] += len(updates) - len(failed)
+        return failed
+
+    airtable.update_records_batches = counting_batches
+
+    sids = [f"SM{i:032x}" for i in range(args.messages)]
+    for i, sid in enumerate(sids):
+        delivery_status.index_message(sid, f"recM{i:07d}", f"recC{i:07d}", kind="checkin")
+    remote = [sid for sid in sids if rng.random() < args.other_instance_share]
+    get_store().executemany("DELETE FROM sid_index WHERE sid = ?", [(sid,) for sid in remote])
+
+    callbacks = []
+    for sid in sids:
+        final = "failed" if rng.random() < args.failure_rate else "delivered"
+        callbacks.extend((sid, status) for status in ("queued", "sent", final))
+    rng.shuffle(callbacks)
+
+    pipeline = delivery_status.DeliveryStatusPipeline(max_buffer=10**9)
+    start = time.perf_counter()
+    for sid, status in callbacks:
+        pipeline.ingest(sid, status)
+    ingest_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    applied = pipeline.flush()
+    flush_seconds = time.perf_counter() - start
+    failing["rate"] = 0.0
+    retried = pipeline.flush() if pipeline.buffered() else 0
+
+    print(json.dumps({
+        "benchmark": "delivery_status",
+        "callbacks": len(callbacks),
+        "sids_from_other_instance": len(remote),
+        "ingest_per_second": round(len(callbacks) / ingest_seconds),
+        "ingest_us_per_callback": round(ingest_seconds / len(callbacks) * 1e6, 2),
+        "flush_seconds": round(flush_seconds, 3),
+        "sids_applied": applied,
+        "sids_applied_on_retry": retried,
+        "sids_unapplied": args.messages - applied - retried,
+        "airtable_patch_requests": patch_requests["count"],
+        "airtable_patch_failed": patch_requests["failed"],
+        "unbatched_patch_requests": len(callbacks),
+        "stats": delivery_status.delivery_stats()
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
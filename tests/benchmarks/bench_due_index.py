@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark: due-date index over a synthetic People directory
+
+Builds the due-date index from N synthetic People records (Monthly and
+Quarterly, some never confirmed, some opted out) and reports build time,
+"due today" and "overdue" query times, and incremental Last Confirmed
+updates. The previous approach (parse every record with strptime on every
+call) is timed for comparison.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app import due_index
+
+def synthetic_directory(count: int):
+    rng = random.Random(17)
+    today = date.today()
+    people = []
+    for i in range(count):
+        fields = {
+            "Name": f"Person {i}",
+            "Phone": f"+1555{i:07d}",
+            "Consent": rng.random() < 0.95,
+            "Opt-out": rng.random() < 0.03,
+            "Check-in Frequency": "Quarterly" if rng.random() < 0.3 else "Monthly",
+        }
+        if rng.random() < 0.9:
+            fields["Last Confirmed"] = (today - timedelta(days=rng.randint(0, 200))).isoformat()
+        people.append({"id": f"rec{i:08d}", "fields": fields})
+    return people
+
+def linear_scan(people, today):
+    due, overdue = [], []
+    for person in people:
+        fields = person["fields"]
+        if fields.get("Opt-out") or not fields.get("Consent"):
+            continue
+        last = fields.get("Last Confirmed")
+        if not last:
+            due.append(person)
+            continue
+        last = datetime.strptime(last, "%Y-%m-%d").date()
+        due_date = last + timedelta(days=30 if fields["Check-in Frequency"] == "Monthly" else 90)
+        if today >= due_date:
+            due.append(person)
+        if today > due_date:
+            overdue.append(person)
+    return due, overdue
+
+def _ms(fn, repeat=5):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, round(best * 1000, 3)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--people", type=int, default=100_000)
+    parser.add_argument("--updates", type=int, default=5_000)
+    args = parser.parse_args()
+
+    people = synthetic_directory(args.people)
+    today = date.today()
+    index = due_index.DueIndex()
+
+    _, build_ms = _ms(lambda: index.load(people), repeat=1)
+    due, due_ms = _ms(lambda: index.due(today))
+    overdue, overdue_ms = _ms(lambda: index.overdue(today))
+    (scan_due, scan_overdue), scan_ms = _ms(lambda: linear_scan(people, today))
+    assert len(due) == len(scan_due)
+    assert len(overdue) == len([p for p in scan_overdue if p["fields"].get("Last Confirmed")])
+
+    rng = random.Random(23)
+    targets = rng.sample(due, min(args.updates, len(due)))
+    start = time.perf_counter()
+    for person in targets:
+        index.apply_update(person["id"], {"Last Confirmed": today.isoformat()})
+    update_us = (time.perf_counter() - start) / max(1, len(targets)) * 1e6
+
+    print(json.dumps({
+        "people": args.people,
+        "indexed": len(index),
+        "build_ms": build_ms,
+        "due_today": len(due),
+        "due_query_ms": due_ms,
+        "overdue": len(overdue),
+        "overdue_query_ms": overdue_ms,
+        "linear_scan_ms": scan_ms,
+        "update_us": round(update_us, 2),
+        "due_after_updates": len(index.due(today))
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark: logging overhead per inbound request
+
+Runs the /twilio/inbound pipeline against the offline fakes of
+tests/core/test_call_budgets.py (no network), each mode in a fresh
+interpreter whose stdout is a pipe drained by this process, and reports
+the mean and p95 time per request and the log lines written:
+- print: every debug line written synchronously on the request thread, as
+  the print-based logging did (LOG_ASYNC=false, LOG_LEVEL=DEBUG, text)
+- structured: the defaults (queue handler, INFO, JSON, redaction)
+- structured_debug: queue handler at DEBUG with 10% sampling of the
+  chatty app.main and app.airtable lines
+Logging overhead is each mode's mean minus that of a run with logging off
+(LOG_LEVEL=CRITICAL); modes are run --rounds times, interleaved, and the
+round with the lowest mean is kept.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+MODES = {
+    "off": {"LOG_LEVEL": "CRITICAL"},
+    "print": {"LOG_ASYNC": "false", "LOG_LEVEL": "DEBUG", "LOG_FORMAT": "text", "LOG_REDACT": "false"},
+    "structured": {},
+    "structured_debug": {"LOG_LEVEL": "DEBUG", "LOG_SAMPLE_RATES": "app.main=0.1,app.airtable=0.1"},
+}
+
+SNIPPET = """
+import json, sys, time
+sys.path.insert(0, "tests/core")
+import test_call_budgets as fakes
+from app import log
+
+fakes.install_fakes()
+cases = [("no change", None), ("gibberish", ("unclear", {{}})),
+         ("update", ("update_person_info", {{"target_person_name": "Jane", "field_updates": {{"company": "Acme"}}}}))]
+times = []
+for i in range({requests}):
+    message, classification = cases[i % len(cases)]
+    if classification:
+        fakes.classify_as(*classification)
+    start = time.perf_counter()
+    fakes.run_inbound(message)
+    times.append(time.perf_counter() - start)
+log.flush()
+sys.stderr.write("RESULT " + json.dumps({{"times": times, "dropped": log.dropped()}}) + "\\n")
+"""
+
+def run_mode(env_overrides, requests: int):
+    env = {key: value for key, value in os.environ.items() if not key.startswith("LOG_")}
+    env.update(env_overrides)
+    process = subprocess.Popen([sys.executable, "-c", SNIPPET.format(requests=requests)], cwd=ROOT, env=env,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stdout, stderr = process.communicate()
+    result_line = next((line for line in stderr.decode().splitlines() if line.startswith("RESULT ")), None)
+    if result_line is None:
+        raise RuntimeError(stderr.decode()[-2000:])
+    result = json.loads(result_line[7:])
+    times = sorted(result["times"][requests // 10:])  # skip warm-up requests
+    return {
+        "mean_ms": round(statistics.mean(times) * 1000, 3),
+        "p95_ms": round(times[int(len(times) * 0.95) - 1] * 1000, 3),
+        "log_lines": stdout.count(b"\n"),
+        "log_bytes": len(stdout),
+        "dropped": result["dropped"],
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=600)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    results = {}
+    for _ in range(args.rounds):
+        for mode, env in MODES.items():
+            result = run_mode(env, args.requests)
+            if mode not in results or result["mean_ms"] < results[mode]["mean_ms"]:
+                results[mode] = result
+    floor = results.pop("off")["mean_ms"]
+    for result in results.values():
+        result["overhead_ms"] = round(result["mean_ms"] - floor, 3)
+    print(json.dumps({"requests": args.requests, "no_logging_mean_ms": floor, "modes": results}, indent=2))
+
+if __name__ == "__main__":
+    main()
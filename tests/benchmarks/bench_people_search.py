@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark: /admin/search prefix index over a synthetic People directory
+
+Builds the people search index from N synthetic People records and reports
+build time, query latency (p50/p95/max) for short prefixes, full names and
+multi-word queries, and incremental re-indexing after a person is updated.
+The previous approach (download everything, substring-scan names) is timed
+for comparison.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app.people_search import PeopleSearchIndex
+
+FIRST = ["David", "Sarah", "Jen", "Mike", "Alex", "Priya", "Chen", "Maria", "Omar", "Lena",
+         "Tom", "Aisha", "Kenji", "Sofia", "Liam", "Noah", "Emma", "Ravi", "Zoe", "Ivan"]
+LAST = ["Smith", "Johnson", "Lee", "Garcia", "Patel", "Kim", "Nguyen", "Brown", "Rossi", "Muller",
+        "Silva", "Cohen", "Khan", "Tanaka", "Novak", "Okafor", "Larsen", "Dubois", "Moreau", "Singh"]
+COMPANIES = ["Acme", "Globex Corporation", "Initech", "Umbrella Research", "Stark Industries",
+             "Wayne Enterprises", "Hooli", "Pied Piper", "Vandelay Industries", "Soylent"]
+ROLES = ["PM", "Senior Software Engineer", "Head of Partnerships", "Founder", "Investor",
+         "Designer", "Data Scientist", "VP Engineering", "Recruiter", "CTO"]
+
+def synthetic_people(count: int):
+    rng = random.Random(23)
+    people = []
+    for i in range(count):
+        first, last = rng.choice(FIRST), rng.choice(LAST)
+        people.append({
+            "id": f"rec{i:08d}",
+            "fields": {
+                "Name": f"{first} {last}{i % 997}",
+                "Email": f"{first.lower()}.{last.lower()}{i}@example.com",
+                "Company": rng.choice(COMPANIES),
+                "Role": rng.choice(ROLES),
+                "Phone": f"+1555{i:07d}",
+            }
+        })
+    return people
+
+def linear_search(people, query):
+    query = query.lower()
+    return [p for p in people if query in p["fields"].get("Name", "").lower()]
+
+def _latency(index, queries):
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, limit=20)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "queries": len(samples),
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3),
+        "max_ms": round(samples[-1], 3),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--people", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--updates", type=int, default=2_000)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    people = synthetic_people(args.people)
+    index = PeopleSearchIndex()
+
+    start = time.perf_counter()
+    index.build(people)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    sample = [rng.choice(people)["fields"] for _ in range(args.queries)]
+    short = [fields["Name"][:2] for fields in sample]
+    full = [fields["Name"] for fields in sample]
+    multi = [f"{fields['Name'].split()[0][:3]} {fields['Company'][:3]}" for fields in sample]
+
+    # Cold: every query after a directory change misses the prefix cache
+    cold = []
+    for query in short[:50]:
+        index._prefix_cache.clear()
+        start = time.perf_counter()
+        index.search(query, limit=20)
+        cold.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    for i in range(args.updates):
+        person = people[rng.randrange(len(people))]
+        person["fields"]["Role"] = rng.choice(ROLES) + f" {i}"
+        index.update(person)
+    update_us = (time.perf_counter() - start) / args.updates * 1e6
+
+    start = time.perf_counter()
+    for query in full[:20]:
+        linear_search(people, query)
+    linear_ms = (time.perf_counter() - start) / 20 * 1000
+
+    print(json.dumps({
+        "people": args.people,
+        "build_ms": round(build_ms, 1),
+        "short_prefix": _latency(index, short),
+        "short_prefix_cold_max_ms": round(max(cold), 3),
+        "full_name": _latency(index, full),
+        "multi_word": _latency(index, multi),
+        "update_us": round(update_us, 1),
+        "linear_scan_ms": round(linear_ms, 3),
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: fetching linked records by ID
+
+Seeds a People table, then resolves a shuffled list of linked person IDs
+(with duplicates and a few deleted records) three ways:
+- one GET per record (measured on a sample and projected to the full list)
+- get_records_by_ids with its chunks fetched one at a time
+- get_records_by_ids with chunks fetched in parallel (AIRTABLE_FETCH_CONCURRENCY)
+and reports wall time, Airtable requests and whether the records came back
+in input order. Both the app's bulk bucket and the Airtable stand-in allow
+--airtable-rps requests per second, so parallel chunks overlap latency but
+never exceed the base's limit: they only help once a page takes longer than
+1/rps seconds to come back, as listing pages of 100 records usually do.
+"""
+
+import argparse
+import json
+import random
+import time
+
+import harness
+
+def timed(fakes, fetch) -> dict:
+    before = fakes.airtable.stats()["requests"]
+    started = time.perf_counter()
+    records = fetch()
+    return {"seconds": round(time.perf_counter() - started, 3),
+            "requests": fakes.airtable.stats()["requests"] - before, "records": records}
+
+def run(args, fakes) -> dict:
+    from app import airtable, tenants
+
+    people = harness.synthetic_people(args.people)
+    fakes.airtable.seed("People", people)
+    rng = random.Random(7)
+    linked = [person["id"] for person in rng.sample(people, args.ids)]
+    missing = [f"recGone{n:010d}" for n in range(args.missing)]
+    record_ids = linked + missing + rng.sample(linked, args.ids // 10)
+    rng.shuffle(record_ids)
+    expected = [record_id for record_id in dict.fromkeys(record_ids) if not record_id.startswith("recGone")]
+    table = tenants.current().people_table
+
+    sample = record_ids[:args.sample]
+    per_record = timed(fakes, lambda: [airtable.get_record(table, record_id) for record_id in sample])
+    scale = len(record_ids) / len(sample)
+    results = {"per_record_get_projected": {"seconds": round(per_record["seconds"] * scale, 3),
+                                            "requests": round(per_record["requests"] * scale)}}
+
+    concurrency = airtable.AIRTABLE_FETCH_CONCURRENCY
+    for name, workers in (("chunks_sequential", 1), ("chunks_parallel", concurrency)):
+        airtable.AIRTABLE_FETCH_CONCURRENCY = workers
+        # Start each run with full buckets (the app's and the stand-in's) so neither pays for earlier requests
+        tenants.current().pop_resource("airtable_bulk_limiter")
+        time.sleep(max(1, int(args.airtable_rps)) / args.airtable_rps)
+        result = timed(fakes, lambda: airtable.get_records_by_ids(table, record_ids, fields=["Name"]))
+        records = result.pop("records")
+        result["found"] = len(records)
+        result["input_order"] = [record["id"] for record in records] == expected
+        results[name] = {"concurrency": workers, **result}
+    airtable.AIRTABLE_FETCH_CONCURRENCY = concurrency
+    return {"ids": len(record_ids), "unique_found": len(expected), **results}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--people", type=int, default=5000)
+    parser.add_argument("--ids", type=int, default=1000, help="Distinct linked IDs to resolve")
+    parser.add_argument("--missing", type=int, default=20, help="IDs of records that no longer exist")
+    parser.add_argument("--sample", type=int, default=20, help="IDs fetched one GET at a time before projecting")
+    parser.add_argument("--airtable-latency-ms", type=float, default=300.0)
+    parser.add_argument("--airtable-rps", type=float, default=5.0, help="Requests per second per base (> 0)")
+    args = parser.parse_args()
+
+    harness.configure_environment(AIRTABLE_MAX_RPS=str(args.airtable_rps))
+    fakes = harness.Fakes(airtable_latency_ms=args.airtable_latency_ms, airtable_rps=args.airtable_rps)
+    harness.install(fakes)
+    results = run(args, fakes)
+    from app import log
+    log.flush()
+    print(json.dumps({"benchmark": "record_fetch", **results}, indent=2))
+
+if __name__ == "__main__":
+    main()
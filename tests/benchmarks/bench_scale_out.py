@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark: scaling out to several worker processes
+
+Starts N worker processes, each running the app in-process against its own
+harness stand-ins, all sharing one coordination backend (the sqlite file
+backend, as workers on one host would). For each worker count it reports:
+- inbound throughput: the same messages split across the workers, each one
+  also redelivered to the next worker, vs the 1-worker run (speedup and
+  efficiency per worker)
+- idempotency: messages processed, redeliveries rejected, and messages
+  processed more than once (must be 0)
+- jobs: every worker triggers /jobs/send-monthly at once; one runs, the
+  rest are skipped
+- cache broadcasts: one worker updates a person and the others' People
+  caches pick it up; reports the slowest propagation
+
+Each worker's Airtable stand-in has no rate limit: the real 5 requests per
+second per base is shared by every worker and caps scale-out for a single
+base, which this benchmark does not model. Workers share this machine's
+CPUs, so efficiency also drops once they saturate them.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+import harness
+
+async def run_worker(index: int, workers: int, args, barrier) -> dict:
+    import httpx
+    from app import airtable, coordination, main, people_cache
+
+    fakes = harness.Fakes(args.airtable_latency_ms, 0, "queue", args.twilio_latency_ms, args.openai_latency_ms)
+    harness.install(fakes)
+    people = harness.synthetic_people(args.people, due=args.due)
+    fakes.airtable.seed("People", people)
+    messages = harness.inbound_messages(people, args.messages, fakes.openai)
+    deliveries = [(n, message) for n, message in enumerate(messages) if n % workers == index]
+    deliveries += [(n, message) for n, message in enumerate(messages) if (n + 1) % workers == index]
+    people_cache.get_cache()
+    coordination.start()
+    outcomes = {}
+
+    async def post(client, n, from_phone, body):
+        response = await client.post("/twilio/inbound", data={"From": from_phone, "Body": body,
+                                                              "MessageSid": f"SMscale{n:08d}"})
+        result = response.json() if response.status_code == 200 else {}
+        if result.get("message") == "Message already processed":
+            outcome = "redelivery_rejected"
+        else:
+            outcome = "processed" if result.get("ok") else f"failed: {result.get('message', response.status_code)}"
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    result = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app),
+                                 base_url=harness.BENCH_APP_URL) as client:
+        await fakes.start_twilio_stub()
+        try:
+            # Warm up (lazy imports, pooled connections) outside the timed run
+            from_phone, body = messages[index % len(messages)]
+            await client.post("/twilio/inbound", data={"From": from_phone, "Body": body,
+                                                       "MessageSid": f"SMwarm{index:08d}"})
+            barrier.wait()
+            result["started"] = time.time()
+            await asyncio.gather(*(post(client, n, from_phone, body) for n, (from_phone, body) in deliveries))
+            result["finished"] = time.time()
+            result["outcomes"] = outcomes
+
+            barrier.wait()
+            response = await client.post("/jobs/send-monthly", timeout=None)
+            result["job"] = "skipped" if response.json().get("skipped") else "ran"
+        finally:
+            await fakes.stop_twilio_stub()
+
+    barrier.wait()
+    person_id, company = people[0]["id"], f"Scale Co {workers}"
+    if index == 0:
+        airtable.update_person(person_id, {"Company": company})
+    updated = time.time()
+    barrier.wait()
+    if index != 0:
+        deadline = time.time() + 10
+        while people_cache.cache.get(person_id)["fields"].get("Company") != company and time.time() < deadline:
+            await asyncio.sleep(0.01)
+        result["broadcast_ms"] = round((time.time() - updated) * 1000, 1)
+    return result
+
+def worker_main(index: int, workers: int, args, coordination_path: str, barrier, results):
+    harness.configure_environment(COORDINATION_PATH=coordination_path, TWILIO_MAX_MPS="1000")
+    results.put((index, asyncio.run(run_worker(index, workers, args, barrier))))
+    from app import log
+    log.flush()
+
+def run(workers: int, args) -> dict:
+    context = multiprocessing.get_context("spawn")
+    barrier, results = context.Barrier(workers), context.Queue()
+    coordination_path = os.path.join(tempfile.mkdtemp(), "coordination.db")
+    processes = [context.Process(target=worker_main, args=(index, workers, args, coordination_path, barrier, results))
+                 for index in range(workers)]
+    for process in processes:
+        process.start()
+    by_worker = dict(results.get(timeout=600) for _ in processes)
+    for process in processes:
+        process.join()
+
+    outcomes, jobs = {}, {}
+    for result in by_worker.values():
+        for outcome, count in result["outcomes"].items():
+            outcomes[outcome] = outcomes.get(outcome, 0) + count
+        jobs[result["job"]] = jobs.get(result["job"], 0) + 1
+    seconds = max(r["finished"] for r in by_worker.values()) - min(r["started"] for r in by_worker.values())
+    broadcasts = [r["broadcast_ms"] for r in by_worker.values() if "broadcast_ms" in r]
+    return {
+        "workers": workers,
+        "seconds": round(seconds, 3),
+        "messages_per_second": round(args.messages / seconds, 2),
+        "outcomes": outcomes,
+        "processed_more_than_once": outcomes.get("processed", 0) - args.messages,
+        "send_monthly_runs": jobs,
+        "broadcast_ms_max": max(broadcasts) if broadcasts else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts")
+    parser.add_argument("--messages", type=int, default=64, help="Inbound messages per run (split across workers)")
+    parser.add_argument("--people", type=int, default=200)
+    parser.add_argument("--due", type=int, default=10, help="People due for the send-monthly job")
+    parser.add_argument("--airtable-latency-ms", type=float, default=20.0)
+    parser.add_argument("--twilio-latency-ms", type=float, default=20.0)
+    parser.add_argument("--openai-latency-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    runs = [run(int(workers), args) for workers in args.workers.split(",")]
+    baseline = runs[0]["messages_per_second"] / runs[0]["workers"]
+    for result in runs:
+        speedup = result["messages_per_second"] / baseline
+        result["speedup"] = round(speedup, 2)
+        result["efficiency"] = round(speedup / result["workers"], 2)
+    print(json.dumps({"benchmark": "scale_out", "messages": args.messages, "cpus": os.cpu_count(), "runs": runs},
+                     indent=2))
+
+if __name__ == "__main__":
+    main()
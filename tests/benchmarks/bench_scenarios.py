@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Benchmark: end-to-end scenarios against the hermetic harness
+
+Drives the FastAPI app in-process (ASGI, no sockets to the app) with
+Airtable, Twilio and OpenAI replaced by the stand-ins in harness.py, so runs
+are repeatable and need no accounts. Scenarios:
+- inbound_burst: N inbound SMS posted to /twilio/inbound at once (mixed intents)
+- monthly_send: /jobs/send-monthly over a People directory with D people due
+- reminder_dispatch: /jobs/check-reminders over R overdue reminders
+- admin_search: /admin/search, the first (cold, loads the directory) query
+  and Q warm prefix queries
+
+Each scenario reports wall time, request latency, outcomes and the calls made
+to each stand-in (Airtable per endpoint, rate-limit waits). Save a run with
+--output and pass it to a later run with --compare to get per-metric changes.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict
+
+import harness
+
+SCENARIOS = ("inbound_burst", "monthly_send", "reminder_dispatch", "admin_search")
+
+# =============================================================================
+# SCENARIOS
+# =============================================================================
+
+def _client():
+    import httpx
+    from app import main
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url=harness.BENCH_APP_URL)
+
+async def inbound_burst(fakes: harness.Fakes, args) -> Dict[str, Any]:
+    people = harness.synthetic_people(args.people)
+    fakes.airtable.seed("People", people)
+    messages = harness.inbound_messages(people, args.messages, fakes.openai)
+    await fakes.start_twilio_stub()
+    latencies, outcomes = [], {}
+
+    async def post(client, n, from_phone, body):
+        started = time.perf_counter()
+        response = await client.post("/twilio/inbound", data={"From": from_phone, "Body": body,
+                                                              "MessageSid": f"SMbench{n:08d}"})
+        latencies.append((time.perf_counter() - started) * 1000)
+        result = response.json() if response.status_code == 200 else {}
+        outcome = "ok" if result.get("ok") else f"failed: {result.get('message', response.status_code)}"
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    try:
+        async with _client() as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(post(client, n, from_phone, body)
+                                   for n, (from_phone, body) in enumerate(messages)))
+            seconds = time.perf_counter() - started
+    finally:
+        await fakes.stop_twilio_stub()
+    return {"requests": len(messages), "seconds": round(seconds, 3),
+            "requests_per_second": round(len(messages) / seconds, 2),
+            "latency_ms": harness.percentiles(latencies), "outcomes": outcomes}
+
+async def monthly_send(fakes: harness.Fakes, args) -> Dict[str, Any]:
+    fakes.airtable.seed("People", harness.synthetic_people(args.people, due=args.due))
+    await fakes.start_twilio_stub()
+    try:
+        async with _client() as client:
+            started = time.perf_counter()
+            response = await client.post("/jobs/send-monthly", timeout=None)
+            seconds = time.perf_counter() - started
+    finally:
+        await fakes.stop_twilio_stub()
+    result = response.json()
+    sent = result.get("sent", 0)
+    return {"due": args.due, "seconds": round(seconds, 3),
+            "sent": sent, "failed": result.get("failed", 0),
+            "ms_per_send": round(seconds * 1000 / sent, 2) if sent else None}
+
+async def reminder_dispatch(fakes: harness.Fakes, args) -> Dict[str, Any]:
+    people = harness.synthetic_people(args.people)
+    fakes.airtable.seed("People", people)
+    fakes.airtable.seed("Reminders", harness.synthetic_reminders(args.reminders, people))
+    async with _client() as client:
+        started = time.perf_counter()
+        response = await client.post("/jobs/check-reminders", timeout=None)
+        seconds = time.perf_counter() - started
+    result = response.json()
+    return {"reminders": args.reminders, "seconds": round(seconds, 3),
+            "sent": result.get("sent", 0), "failed": result.get("failed", 0),
+            "lag_seconds": result.get("lag_seconds", {})}
+
+async def admin_search(fakes: harness.Fakes, args) -> Dict[str, Any]:
+    people = harness.synthetic_people(args.people)
+    fakes.airtable.seed("People", people)
+    rng = random.Random(11)
+    queries = []
+    for _ in range(args.queries):
+        name = rng.choice(people)["fields"]["Name"]
+        queries.append(name[:rng.randint(2, len(name))])
+    async with _client() as client:
+        started = time.perf_counter()
+        await client.get("/admin/search", params={"query": queries[0]})
+        cold_ms = (time.perf_counter() - started) * 1000
+        latencies, matched = [], 0
+        for query in queries:
+            started = time.perf_counter()
+            response = await client.get("/admin/search", params={"query": query})
+            latencies.append((time.perf_counter() - started) * 1000)
+            matched += response.json().get("total", 0) > 0
+    return {"queries": len(queries), "cold_ms": round(cold_ms, 2),
+            "latency_ms": harness.percentiles(latencies), "queries_with_matches": matched}
+
+# =============================================================================
+# COMPARISON
+# =============================================================================
+
+def _flatten(value: Any, prefix: str = "") -> Dict[str, float]:
+    if isinstance(value, dict):
+        flat = {}
+        for key, item in value.items():
+            flat.update(_flatten(item, f"{prefix}.{key}" if prefix else key))
+        return flat
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {prefix: value}
+    return {}
+
+def compare(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Numeric metrics of two runs' scenarios that changed: before, after and change in percent"""
+    old, new = _flatten(before.get("scenarios", {})), _flatten(after.get("scenarios", {}))
+    changes = {}
+    for key in sorted(old.keys() & new.keys()):
+        if old[key] != new[key]:
+            change = round((new[key] - old[key]) * 100 / old[key], 1) if old[key] else None
+            changes[key] = {"before": old[key], "after": new[key], "change_pct": change}
+    return changes
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"Comma-separated subset of {', '.join(SCENARIOS)}")
+    parser.add_argument("--people", type=int, default=500, help="People in the synthetic directory")
+    parser.add_argument("--messages", type=int, default=10, help="inbound_burst: messages posted at once")
+    parser.add_argument("--due", type=int, default=20, help="monthly_send: people due for a check-in")
+    parser.add_argument("--reminders", type=int, default=50, help="reminder_dispatch: overdue reminders")
+    parser.add_argument("--queries", type=int, default=200, help="admin_search: warm queries")
+    parser.add_argument("--airtable-latency-ms", type=float, default=100.0)
+    parser.add_argument("--airtable-rps", type=float, default=5.0,
+                        help="Requests per second per base (0 disables the limit)")
+    parser.add_argument("--airtable-limit", choices=("queue", "reject"), default="queue",
+                        help="Over the limit, wait for a slot or answer 429 like Airtable")
+    parser.add_argument("--twilio-latency-ms", type=float, default=80.0)
+    parser.add_argument("--twilio-mps", type=float, default=10.0,
+                        help="TWILIO_MAX_MPS for the run (the app's default of 1 suits a single long code)")
+    parser.add_argument("--openai-latency-ms", type=float, default=400.0)
+    parser.add_argument("--output", help="Also write the result JSON to this file")
+    parser.add_argument("--compare", help="Result JSON of an earlier run to compare against")
+    args = parser.parse_args()
+
+    harness.configure_environment(TWILIO_MAX_MPS=str(args.twilio_mps))
+    from app import log
+
+    selected = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(selected) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    results = {}
+    for name in selected:
+        fakes = harness.Fakes(args.airtable_latency_ms, args.airtable_rps, args.airtable_limit,
+                              args.twilio_latency_ms, args.openai_latency_ms)
+        harness.install(fakes)
+        result = asyncio.run(globals()[name](fakes, args))
+        result["calls"] = fakes.stats()
+        results[name] = result
+
+    output = {
+        "benchmark": "scenarios",
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "scenarios": results,
+    }
+    if args.compare:
+        with open(args.compare) as f:
+            output["comparison"] = compare(json.load(f), output)
+    log.flush()
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=2)
+    print(json.dumps(output, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark: async SMS send queue against the local Twilio stub
+
+Submits a burst of messages (several per recipient) through SmsSendQueue and
+reports achieved throughput versus the configured messages-per-second limit,
+retries, TCP connections opened, and any per-recipient ordering violations.
+With --replies, priority sends (inbound replies) are submitted while the burst
+drains; their latency shows whether a reply waits behind the bulk backlog.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.dirname(__file__))
+from app.sms_queue import SmsSendQueue
+from twilio_stub import TwilioStub
+
+async def run(args) -> dict:
+    stub = await TwilioStub(latency_ms=args.latency_ms, error_rate=args.error_rate).start()
+    queue = SmsSendQueue(
+        account_sid="ACbench", auth_token="token", from_number="+15550000000",
+        messages_per_second=args.mps, max_pending=args.max_pending,
+        workers=args.workers, base_url=stub.base_url
+    )
+
+    reply_latencies = []
+
+    async def reply(n: int):
+        await asyncio.sleep(n * args.reply_interval_ms / 1000)
+        started = time.perf_counter()
+        await queue.send(f"+1666{n:07d}", "reply", priority=True)
+        reply_latencies.append((time.perf_counter() - started) * 1000)
+
+    async def burst():
+        futures = []
+        for i in range(args.messages):
+            to = f"+1555{i % args.recipients:07d}"
+            futures.append(await queue.submit(to, f"seq={i // args.recipients}"))
+        return await asyncio.gather(*futures)
+
+    start = time.perf_counter()
+    sids, *_ = await asyncio.gather(burst(), *(reply(n) for n in range(args.replies)))
+    elapsed = time.perf_counter() - start
+    await queue.close()
+    await stub.stop()
+
+    last_seq = {}
+    violations = 0
+    for form in stub.received:
+        if form["Body"] == "reply":
+            continue
+        seq = int(form["Body"].split("=")[1])
+        if seq < last_seq.get(form["To"], -1):
+            violations += 1
+        last_seq[form["To"]] = seq
+
+    return {
+        "benchmark": "sms_queue",
+        "messages": args.messages,
+        "configured_mps": args.mps,
+        "achieved_mps": round(args.messages / elapsed, 1),
+        "seconds": round(elapsed, 3),
+        "delivered": sum(1 for sid in sids if sid),
+        "failed": sum(1 for sid in sids if not sid),
+        "retries": queue.stats["retries"],
+        "errors_injected": stub.errors_injected,
+        "connections_opened": stub.connections,
+        "ordering_violations": violations,
+        "replies": len(reply_latencies),
+        "reply_latency_ms": {"p50": round(sorted(reply_latencies)[len(reply_latencies) // 2], 1),
+                             "max": round(max(reply_latencies), 1)} if reply_latencies else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--recipients", type=int, default=500)
+    parser.add_argument("--mps", type=float, default=500.0)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--max-pending", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--replies", type=int, default=0, help="Priority replies sent while the burst drains")
+    parser.add_argument("--reply-interval-ms", type=float, default=500.0)
+    args = parser.parse_args()
+    # The queue logs every send; keep the benchmark output to the JSON result
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = asyncio.run(run(args))
+    print(json.dumps(result, indent=2))
+
+if __name__ == "__main__":
+    main()
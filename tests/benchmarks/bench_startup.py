@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold-start latency of the web app
+
+Measures, each in a fresh interpreter:
+- Import time of app.main (median of N runs) and the slowest top-level
+  imports from `python -X importtime`
+- Time from app startup to the first /health response and to warm-up
+  ready, with Airtable replaced by an in-process fake (a People table of
+  --people records served in 100-record pages with --latency-ms per page)
+
+Exits non-zero if the median import time exceeds --max-import-ms, so it can
+run as part of the test suite (tests/run_tests.py).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import app.main
+print((time.perf_counter() - start) * 1000)
+"""
+
+STARTUP_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+from fastapi.testclient import TestClient
+from app import airtable, main, warmup
+imported = time.perf_counter()
+
+PEOPLE, LATENCY = {people}, {latency}
+def fake_request(method, endpoint, data=None, base_url=None, params=None):
+    time.sleep(LATENCY)
+    offset = int((params or {{}}).get("offset", 0))
+    records = [{{"id": f"rec{{i:08d}}", "fields": {{"Name": f"Person {{i}}", "Phone": f"+1555{{i:07d}}",
+                "Consent": True, "Check-in Frequency": "Monthly"}}}}
+               for i in range(offset, min(offset + 100, PEOPLE))]
+    page = {{"records": records}}
+    if offset + 100 < PEOPLE:
+        page["offset"] = str(offset + 100)
+    return page
+airtable._make_request = fake_request
+
+with TestClient(main.app) as client:
+    client.get("/health")
+    first_health = time.perf_counter()
+    warmup.warmup.wait(120)
+    ready = time.perf_counter()
+    # One write call, so log lines from the writer thread cannot split it
+    sys.stdout.write("RESULT " + json.dumps({{
+        "import_ms": round((imported - start) * 1000, 1),
+        "first_health_ms": round((first_health - start) * 1000, 1),
+        "ready_ms": round((ready - start) * 1000, 1),
+        "warmup": warmup.warmup.status()
+    }}) + "\\n")
+"""
+
+def _python(code: str, env=None, extra_args=()) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *extra_args, "-c", code], cwd=ROOT, env=env,
+                          capture_output=True, text=True)
+
+def import_profile(env, top: int):
+    """Slowest imports below app.main by cumulative time (from -X importtime)"""
+    result = _python("import app.main", env, ("-X", "importtime"))
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth == 1:
+            rows.append((int(cumulative) / 1000, name.strip()))
+    rows.sort(reverse=True)
+    return [{"module": name, "ms": round(ms, 1)} for ms, name in rows[:top]]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--people", type=int, default=5_000)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-import-ms", type=float, default=1500)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env["LOCAL_STORE_PATH"] = os.path.join(tempfile.mkdtemp(), "bench_startup.db")
+
+    imports = []
+    for _ in range(args.runs):
+        result = _python(IMPORT_SNIPPET, env)
+        if result.returncode != 0:
+            print(result.stderr)
+            return 1
+        imports.append(float(result.stdout.strip().splitlines()[-1]))
+
+    result = _python(STARTUP_SNIPPET.format(people=args.people, latency=args.latency_ms / 1000), env)
+    if result.returncode != 0:
+        print(result.stderr)
+        return 1
+    startup = json.loads(next(line for line in result.stdout.splitlines() if line.startswith("RESULT "))[7:])
+
+    median_import = statistics.median(imports)
+    print(json.dumps({
+        "import_ms": {"median": round(median_import, 1), "min": round(min(imports), 1), "max": round(max(imports), 1)},
+        "startup": startup,
+        "slowest_imports": import_profile(env, args.top),
+        "max_import_ms": args.max_import_ms,
+        "passed": median_import <= args.max_import_ms
+    }, indent=2))
+    return 0 if median_import <= args.max_import_ms else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
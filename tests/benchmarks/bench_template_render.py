@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark: monthly check-in rendering throughput
+
+Renders the check-in SMS for N synthetic people three ways: one message at a
+time without the snapshot cache, in one bulk pass with a cold snapshot cache,
+and in one bulk pass again after a small fraction of people changed their
+snapshot fields (the next month's send).
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(os.path.dirname(__file__))
+
+from app import compose, message_templates
+from segment_report import synthetic_people
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--people", type=int, default=20_000)
+    parser.add_argument("--changed", type=float, default=0.05, help="Fraction of people whose snapshot changes")
+    args = parser.parse_args()
+
+    people = synthetic_people(args.people)
+    records = [(p["id"], p["fields"]) for p in people]
+    cache = message_templates.snapshot_cache
+    cache.clear()
+
+    single, single_s = _timed(lambda: [compose.compose_checkin_message(fields) for _, fields in records])
+    cold, cold_s = _timed(lambda: compose.compose_checkin_messages(records))
+
+    rng = random.Random(5)
+    for _, fields in rng.sample(records, int(len(records) * args.changed)):
+        fields["City"] = rng.choice(["Austin", "Lisbon", "Berlin"])
+    hits_before = cache.stats["hits"]
+    warm, warm_s = _timed(lambda: compose.compose_checkin_messages(records))
+
+    assert single == cold
+    print(json.dumps({
+        "people": args.people,
+        "single_per_second": round(args.people / single_s),
+        "bulk_cold_per_second": round(args.people / cold_s),
+        "bulk_warm_per_second": round(args.people / warm_s),
+        "warm_cache_hits": cache.stats["hits"] - hits_before,
+        "speedup_warm_vs_single": round(single_s / warm_s, 2)
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: two tenants served by one process
+
+Configures a second tenant ("acme", its own Airtable base and Twilio number)
+next to the default one and posts inbound SMS from the same phone numbers to
+both Twilio numbers. Reports, per tenant: the records written to each base,
+the replies sent from each number, records that leaked into the other
+tenant's base, and the per-tenant resources (Airtable pool, People cache,
+bulk bucket) the requests created. A burst to one tenant alone is then
+timed against the same burst while the other tenant takes an equal burst,
+which shows whether one tenant's load slows the other (inbound runs its
+blocking calls in the tenant's share of the threadpool, paced by the tenant's
+own Airtable bucket, so it should not).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+import harness
+
+ACME_BASE_ID = "appAcme"
+ACME_NUMBER = "+15550000100"
+
+def write_tenants_file() -> str:
+    path = os.path.join(tempfile.mkdtemp(), "tenants.json")
+    with open(path, "w") as f:
+        json.dump([{"id": "acme", "numbers": [ACME_NUMBER], "settings": {"AIRTABLE_BASE_ID": ACME_BASE_ID}}], f)
+    return path
+
+async def burst(client, messages, to_number: str, first_sid: int):
+    latencies, failed = [], 0
+
+    async def post(n, from_phone, body):
+        nonlocal failed
+        started = time.perf_counter()
+        response = await client.post("/twilio/inbound", data={"From": from_phone, "Body": body, "To": to_number,
+                                                              "MessageSid": f"SMtenant{first_sid + n:08d}"})
+        latencies.append((time.perf_counter() - started) * 1000)
+        failed += response.status_code != 200 or not response.json().get("ok")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(post(n, from_phone, body) for n, (from_phone, body) in enumerate(messages)))
+    return {"seconds": round(time.perf_counter() - started, 3), "failed": failed,
+            "latency_ms": harness.percentiles(latencies)}
+
+def replies_from(fakes: harness.Fakes, number: str) -> int:
+    sent = [message.get("from_") for message in fakes.twilio.sent]
+    if fakes.twilio_stub is not None:
+        sent += [message.get("From") for message in fakes.twilio_stub.received]
+    return sum(sender == number for sender in sent)
+
+async def run(args, fakes):
+    import httpx
+    from app import airtable, main, people_cache, tenants
+
+    people = harness.synthetic_people(args.people)
+    for base_id in (harness.BENCH_BASE_ID, ACME_BASE_ID):
+        fakes.airtable.seed("People", people, base_id=base_id)
+    messages = harness.inbound_messages(people, args.messages, fakes.openai)
+    acme = tenants.get_registry().get("acme")
+
+    results = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url=harness.BENCH_APP_URL) as client:
+        await fakes.start_twilio_stub()
+        try:
+            results["default_alone"] = await burst(client, messages, harness.BENCH_TWILIO_NUMBER, 0)
+            default_run, acme_run = await asyncio.gather(
+                burst(client, messages, harness.BENCH_TWILIO_NUMBER, 10_000),
+                burst(client, messages, ACME_NUMBER, 20_000))
+            results["default_with_acme_burst"] = default_run
+            results["acme_with_default_burst"] = acme_run
+        finally:
+            replies = {"default": replies_from(fakes, harness.BENCH_TWILIO_NUMBER),
+                       "acme": replies_from(fakes, ACME_NUMBER)}
+            await fakes.stop_twilio_stub()
+
+    def logged_from(base_id: str, number: str) -> int:
+        return sum(record["fields"].get("From") == number for record in fakes.airtable.records("Messages", base_id))
+
+    results["routing"] = {
+        "messages_logged": {"default": len(fakes.airtable.records("Messages", harness.BENCH_BASE_ID)),
+                            "acme": len(fakes.airtable.records("Messages", ACME_BASE_ID))},
+        "replies_logged": {"default": logged_from(harness.BENCH_BASE_ID, harness.BENCH_TWILIO_NUMBER),
+                           "acme": logged_from(ACME_BASE_ID, ACME_NUMBER)},
+        "leaked_to_other_base": logged_from(harness.BENCH_BASE_ID, ACME_NUMBER)
+                                + logged_from(ACME_BASE_ID, harness.BENCH_TWILIO_NUMBER),
+        "replies_sent_from": replies,
+    }
+    with tenants.use(acme):
+        acme_pool, acme_cache, acme_bucket = (airtable._get_http_client(), people_cache.current_cache(),
+                                              airtable.bulk_limiter())
+    results["isolation"] = {
+        "separate_airtable_pools": acme_pool is not airtable._get_http_client(),
+        "separate_people_caches": acme_cache is not people_cache.cache,
+        "separate_bulk_buckets": acme_bucket is not airtable.bulk_limiter(),
+    }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--people", type=int, default=100)
+    parser.add_argument("--messages", type=int, default=10, help="Messages per burst")
+    parser.add_argument("--airtable-latency-ms", type=float, default=20.0)
+    parser.add_argument("--airtable-rps", type=float, default=5.0, help="Requests per second per base")
+    args = parser.parse_args()
+
+    harness.configure_environment(TENANTS_FILE=write_tenants_file())
+    fakes = harness.Fakes(airtable_latency_ms=args.airtable_latency_ms, airtable_rps=args.airtable_rps)
+    harness.install(fakes)
+    results = asyncio.run(run(args, fakes))
+    from app import log
+    log.flush()
+    print(json.dumps({"benchmark": "tenants", "messages_per_burst": args.messages, **results,
+                      "calls": fakes.stats()}, indent=2))
+
+if __name__ == "__main__":
+    main()
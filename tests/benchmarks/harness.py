@@ -0,0 +1,659 @@
+#!/usr/bin/env python3
+"""
+Hermetic benchmark harness
+
+In-process stand-ins for the Airtable REST API, Twilio Messages and OpenAI
+chat completions, plus synthetic data generators, so the app can be driven
+end to end without network access or accounts. It includes:
+- FakeAirtable: an httpx transport holding tables per base, with 100-record
+  pages and offset cursors, fields[] projection, the filterByFormula subset
+  the app builds, 10-record write batches and the 5 requests/second/base
+  limit (requests wait for a slot, or get Airtable's 429 in "reject" mode)
+- FakeTwilio: an SDK-shaped client for synchronous sends; async sends go
+  through the real SmsSendQueue to twilio_stub.TwilioStub
+- FakeOpenAI: canned intent classifications (registered per message) and
+  name matches
+- Synthetic People, Reminders and inbound message mixes
+
+Every fake has a configurable latency and counts the calls it served.
+configure_environment() must run before anything from app is imported, since
+app settings are read at import time; install() then points the app at a
+fresh set of fakes.
+"""
+
+import itertools
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+BENCH_BASE_ID = "appBench"
+BENCH_TWILIO_NUMBER = "+15550000000"
+BENCH_APP_URL = "http://testserver"
+
+# Settings pointing the app at the fakes; anything else comes from the environment
+BENCH_ENVIRONMENT = {
+    "AIRTABLE_API_KEY": "bench",
+    "AIRTABLE_BASE_ID": BENCH_BASE_ID,
+    "AIRTABLE_CHECKINS_BASE_ID": BENCH_BASE_ID,
+    "AIRTABLE_REMINDERS_BASE_ID": BENCH_BASE_ID,
+    "AIRTABLE_NOTES_BASE_ID": BENCH_BASE_ID,
+    "AIRTABLE_CHECKINS_PEOPLE_TABLE": "",
+    "TWILIO_ACCOUNT_SID": "ACbench",
+    "TWILIO_AUTH_TOKEN": "bench",
+    "TWILIO_PHONE_NUMBER": BENCH_TWILIO_NUMBER,
+    "TWILIO_MESSAGING_SERVICE_SID": "",
+    "OPENAI_API_KEY": "bench",
+    "WARMUP_ENABLED": "false",
+    "APP_BASE_URL": BENCH_APP_URL,
+    "TWILIO_VALIDATE_SIGNATURES": "false",
+    "CALL_BUDGET_MODE": "off",
+    "TENANTS_FILE": "",
+}
+
+def configure_environment(**overrides: str):
+    """Set the bench settings (before importing app); overrides win, e.g. TWILIO_MAX_MPS="10" """
+    os.environ.update(BENCH_ENVIRONMENT)
+    os.environ.setdefault("LOG_LEVEL", "CRITICAL")
+    os.environ.setdefault("LOCAL_STORE_PATH", os.path.join(tempfile.mkdtemp(), "bench.db"))
+    os.environ.setdefault("COORDINATION_PATH", os.path.join(tempfile.mkdtemp(), "coordination.db"))
+    os.environ.update(overrides)
+
+def percentiles(samples_ms: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/max of latency samples in milliseconds"""
+    if not samples_ms:
+        return {}
+    ordered = sorted(samples_ms)
+
+    def _pct(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 2)
+
+    return {"p50": _pct(0.50), "p95": _pct(0.95), "p99": _pct(0.99), "max": round(ordered[-1], 2)}
+
+# =============================================================================
+# FILTER FORMULAS
+# =============================================================================
+
+class FormulaError(ValueError):
+    """A formula outside the supported subset (answered with a 422, like Airtable)"""
+    pass
+
+_TOKEN = re.compile(
+    r"\s*(?:(?P<field>\{[^}]*\})|(?P<string>'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\")"
+    r"|(?P<number>\d+(?:\.\d+)?)|(?P<op><=|>=|!=|=|<|>|&)|(?P<name>[A-Z_][A-Z_0-9]*)|(?P<punct>[(),]))"
+)
+
+def _tokenize(formula: str) -> List[Tuple[str, str]]:
+    tokens, position = [], 0
+    formula = formula.rstrip()
+    while position < len(formula):
+        match = _TOKEN.match(formula, position)
+        if not match:
+            raise FormulaError(f"Unexpected input at {position}: {formula[position:position + 20]!r}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+def _scalar(value: Any) -> Any:
+    """Airtable's view of a cell in a scalar context: lists join, checkboxes are 1/0, blanks empty"""
+    if isinstance(value, list):
+        return ", ".join(str(item) for item in value)
+    if isinstance(value, bool):
+        return int(value)
+    return "" if value is None else value
+
+def _compare(op: str, left: Any, right: Any) -> bool:
+    if isinstance(left, list):
+        matches = [_compare(op, item, right) for item in left] or [_compare(op, None, right)]
+        return all(matches) if op == "!=" else any(matches)
+    left, right = _scalar(left), _scalar(right)
+    if isinstance(left, (int, float)) or isinstance(right, (int, float)):
+        try:
+            left, right = float(left or 0), float(right or 0)
+        except ValueError:
+            left, right = str(left), str(right)
+    return {
+        "=": left == right, "!=": left != right, "<": left < right,
+        ">": left > right, "<=": left <= right, ">=": left >= right,
+    }[op]
+
+def _find(needle: Any, haystack: Any) -> int:
+    return str(_scalar(haystack)).find(str(_scalar(needle))) + 1
+
+# Functions the app uses in its formulas
+FORMULA_FUNCTIONS: Dict[str, Callable[..., Any]] = {
+    "AND": lambda *args: int(all(_scalar(arg) for arg in args)),
+    "OR": lambda *args: int(any(_scalar(arg) for arg in args)),
+    "NOT": lambda arg: int(not _scalar(arg)),
+    "LOWER": lambda arg: str(_scalar(arg)).lower(),
+    "UPPER": lambda arg: str(_scalar(arg)).upper(),
+    "LEN": lambda arg: len(str(_scalar(arg))),
+    "FIND": _find,
+    "SEARCH": _find,
+    "TRUE": lambda: 1,
+    "FALSE": lambda: 0,
+    "DATETIME_PARSE": lambda value, *_: str(_scalar(value)),
+    "IS_AFTER": lambda left, right: int(str(left) > str(right)),
+}
+
+# Functions of the record itself rather than of their arguments
+_RECORD_FUNCTIONS = {"RECORD_ID": lambda record: record["id"],
+                     "LAST_MODIFIED_TIME": lambda record: record.get("_modified", "")}
+
+# OR(RECORD_ID()='rec...', ...) lookups, matched against record IDs directly (as Airtable's
+# index would) rather than parsing and evaluating every clause for every record
+_RECORD_ID_LOOKUP = re.compile(r"OR\((?:RECORD_ID\(\)='[^']*',?)+\)")
+_RECORD_ID_CLAUSE = re.compile(r"RECORD_ID\(\)='([^']*)'")
+
+class _FormulaParser:
+    """Recursive-descent parser turning a formula into a predicate over records"""
+
+    def __init__(self, formula: str):
+        self.tokens = _tokenize(formula)
+        self.position = 0
+
+    def parse(self) -> Callable[[Dict[str, Any]], Any]:
+        expression = self._comparison()
+        if self.position != len(self.tokens):
+            raise FormulaError(f"Unexpected {self.tokens[self.position][1]!r}")
+        return expression
+
+    def _peek(self) -> Tuple[Optional[str], Optional[str]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def _take(self, value: Optional[str] = None) -> Tuple[str, str]:
+        token = self._peek()
+        if token[0] is None or (value is not None and token[1] != value):
+            raise FormulaError(f"Expected {value or 'a value'}, got {token[1]!r}")
+        self.position += 1
+        return token
+
+    def _comparison(self):
+        left = self._concat()
+        kind, value = self._peek()
+        if kind == "op" and value != "&":
+            self._take()
+            right = self._concat()
+            return lambda record, op=value: int(_compare(op, left(record), right(record)))
+        return left
+
+    def _concat(self):
+        parts = [self._atom()]
+        while self._peek() == ("op", "&"):
+            self._take()
+            parts.append(self._atom())
+        if len(parts) == 1:
+            return parts[0]
+        return lambda record: "".join(str(_scalar(part(record))) for part in parts)
+
+    def _atom(self):
+        kind, value = self._take()
+        if kind == "field":
+            name = value[1:-1]
+            return lambda record: record["fields"].get(name)
+        if kind == "string":
+            text = value[1:-1].replace("\\" + value[0], value[0])
+            return lambda record: text
+        if kind == "number":
+            number = float(value) if "." in value else int(value)
+            return lambda record: number
+        if kind == "punct" and value == "(":
+            expression = self._comparison()
+            self._take(")")
+            return expression
+        if kind == "name":
+            self._take("(")
+            args = []
+            while self._peek() != ("punct", ")"):
+                args.append(self._comparison())
+                if self._peek() == ("punct", ","):
+                    self._take()
+            self._take(")")
+            if value in _RECORD_FUNCTIONS:
+                return _RECORD_FUNCTIONS[value]
+            function = FORMULA_FUNCTIONS.get(value)
+            if function is None:
+                raise FormulaError(f"Unsupported function {value}")
+            return lambda record: function(*(arg(record) for arg in args))
+        raise FormulaError(f"Unexpected {value!r}")
+
+def compile_formula(formula: str) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Compile a filterByFormula expression into a record predicate
+
+    Supports field references, string and number literals, comparisons, `&`
+    and FORMULA_FUNCTIONS. Linked-record fields compare against record IDs,
+    as the app's {Person} = 'rec...' formulas assume.
+
+    Raises:
+        FormulaError: On syntax outside the subset
+    """
+    predicate = _FormulaParser(formula).parse()
+    return lambda record: bool(_scalar(predicate(record)))
+
+# =============================================================================
+# AIRTABLE
+# =============================================================================
+
+AIRTABLE_PAGE_SIZE = 100
+AIRTABLE_BATCH_LIMIT = 10
+
+class FakeAirtable:
+    """
+    In-memory Airtable REST API served through an httpx transport
+
+    Usage:
+        fake = FakeAirtable(latency_ms=100, rps=5)
+        fake.seed("People", people)
+        airtable._http_client = httpx.Client(transport=fake.transport())
+    """
+
+    def __init__(self, latency_ms: float = 0.0, rps: float = 5.0, limit_mode: str = "queue"):
+        from app.rate_limit import RateLimiter
+        self.latency_ms = latency_ms
+        self.limit_mode = limit_mode
+        self._limiter_factory = (lambda: RateLimiter(rps)) if rps > 0 else None
+        self._limiters: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._tables: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {}
+        self._ids = itertools.count(1)
+        self.requests: Dict[str, int] = {}
+        self.throttled = 0
+        self.wait_seconds = 0.0
+
+    def seed(self, table: str, records: List[Dict[str, Any]], base_id: str = BENCH_BASE_ID):
+        """Load records (with their IDs) into a table, replacing any with the same ID"""
+        now = datetime.now().isoformat()
+        rows = self._table(base_id, table)
+        for record in records:
+            rows[record["id"]] = {"id": record["id"], "createdTime": now, "_modified": now,
+                                  "fields": dict(record["fields"])}
+
+    def records(self, table: str, base_id: str = BENCH_BASE_ID) -> List[Dict[str, Any]]:
+        return list(self._table(base_id, table).values())
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"requests": sum(self.requests.values()), "by_endpoint": dict(sorted(self.requests.items())),
+                "throttled": self.throttled, "rate_limit_wait_seconds": round(self.wait_seconds, 3)}
+
+    def _table(self, base_id: str, table: str) -> Dict[str, Dict[str, Any]]:
+        return self._tables.setdefault((base_id, table), {})
+
+    def _new_id(self) -> str:
+        return f"recN{next(self._ids):013d}"
+
+    # -------------------------------------------------------------------------
+    # Request handling
+    # -------------------------------------------------------------------------
+
+    def _rate_limit(self, base_id: str) -> Optional[httpx.Response]:
+        if self._limiter_factory is None:
+            return None
+        with self._lock:
+            limiter = self._limiters.setdefault(base_id, self._limiter_factory())
+        wait = limiter.try_acquire()
+        if wait == 0.0:
+            return None
+        self.throttled += 1
+        if self.limit_mode == "reject":
+            return httpx.Response(429, json={"errors": [{"error": "RATE_LIMIT_REACHED",
+                                                         "message": "Rate limit exceeded. Please try again later"}]})
+        started = time.perf_counter()
+        limiter.acquire()
+        self.wait_seconds += time.perf_counter() - started
+        return None
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        parts = request.url.path.strip("/").split("/")
+        if len(parts) < 3 or parts[0] != "v0":
+            return _airtable_error(404, "NOT_FOUND", "Could not find what you are looking for")
+        base_id, table = parts[1], parts[2]
+        record_id = parts[3] if len(parts) > 3 else None
+        key = f"{request.method} {table}" + ("/{id}" if record_id else "")
+        with self._lock:
+            self.requests[key] = self.requests.get(key, 0) + 1
+
+        rejected = self._rate_limit(base_id)
+        if rejected is not None:
+            return rejected
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        try:
+            with self._lock:
+                if request.method == "GET":
+                    return self._get(base_id, table, record_id, request.url.params)
+                body = json.loads(request.content or b"{}")
+                if request.method == "POST":
+                    return self._create(base_id, table, body)
+                if request.method == "PATCH":
+                    return self._update(base_id, table, record_id, body)
+        except FormulaError as e:
+            return _airtable_error(422, "INVALID_FILTER_BY_FORMULA", str(e))
+        return _airtable_error(405, "METHOD_NOT_ALLOWED", request.method)
+
+    def _get(self, base_id: str, table: str, record_id: Optional[str], params: httpx.QueryParams) -> httpx.Response:
+        rows = self._table(base_id, table)
+        if record_id:
+            record = rows.get(record_id)
+            if record is None:
+                return _airtable_error(404, "NOT_FOUND", "Could not find what you are looking for")
+            return httpx.Response(200, json=_public(record))
+
+        records = list(rows.values())
+        formula = params.get("filterByFormula")
+        if formula and _RECORD_ID_LOOKUP.fullmatch(formula):
+            wanted = set(_RECORD_ID_CLAUSE.findall(formula))
+            records = [record for record in records if record["id"] in wanted]
+        elif formula:
+            predicate = compile_formula(formula)
+            records = [record for record in records if predicate(record)]
+        if params.get("maxRecords"):
+            records = records[:int(params["maxRecords"])]
+        page_size = min(int(params.get("pageSize") or AIRTABLE_PAGE_SIZE), AIRTABLE_PAGE_SIZE)
+        start = int(params.get("offset") or 0)
+        page = records[start:start + page_size]
+        fields = params.get_list("fields[]")
+        payload: Dict[str, Any] = {"records": [_public(record, fields) for record in page]}
+        if start + page_size < len(records):
+            payload["offset"] = str(start + page_size)
+        return httpx.Response(200, json=payload)
+
+    def _create(self, base_id: str, table: str, body: Dict[str, Any]) -> httpx.Response:
+        rows = self._table(base_id, table)
+        batch = body.get("records", [body])
+        if len(batch) > AIRTABLE_BATCH_LIMIT:
+            return _airtable_error(422, "INVALID_RECORDS", "Too many records in one request")
+        now = datetime.now().isoformat()
+        created = []
+        for item in batch:
+            record = {"id": self._new_id(), "createdTime": now, "_modified": now,
+                      "fields": dict(item.get("fields", {}))}
+            rows[record["id"]] = record
+            created.append(_public(record))
+        return httpx.Response(200, json={"records": created} if "records" in body else created[0])
+
+    def _update(self, base_id: str, table: str, record_id: Optional[str], body: Dict[str, Any]) -> httpx.Response:
+        rows = self._table(base_id, table)
+        batch = [{"id": record_id, "fields": body.get("fields", {})}] if record_id else body.get("records", [])
+        if len(batch) > AIRTABLE_BATCH_LIMIT:
+            return _airtable_error(422, "INVALID_RECORDS", "Too many records in one request")
+        if any(item.get("id") not in rows for item in batch):
+            return _airtable_error(404, "NOT_FOUND", "Could not find a record to update")
+        now = datetime.now().isoformat()
+        updated = []
+        for item in batch:
+            record = rows[item["id"]]
+            record["fields"].update(item.get("fields", {}))
+            record["_modified"] = now
+            updated.append(_public(record))
+        return httpx.Response(200, json={"records": updated} if not record_id else updated[0])
+
+def _public(record: Dict[str, Any], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    values = record["fields"]
+    if fields:
+        values = {name: value for name, value in values.items() if name in fields}
+    return {"id": record["id"], "createdTime": record["createdTime"], "fields": dict(values)}
+
+def _airtable_error(status: int, error: str, message: str) -> httpx.Response:
+    return httpx.Response(status, json={"error": {"type": error, "message": message}})
+
+# =============================================================================
+# TWILIO AND OPENAI
+# =============================================================================
+
+class FakeTwilio:
+    """Twilio SDK client stand-in: client.messages.create(...) returns an object with a sid"""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.messages = self
+        self.sent: List[Dict[str, Any]] = []
+        self._sids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def create(self, to: str, body: str, **params) -> Any:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        with self._lock:
+            self.sent.append({"to": to, "body": body, **params})
+            sid = f"SM{next(self._sids):032x}"
+        return type("Message", (), {"sid": sid, "status": "queued"})
+
+class _FakeCompletions:
+    def __init__(self, owner: "FakeOpenAI"):
+        self.owner = owner
+
+    def create(self, messages, **kwargs):
+        content = self.owner.answer(messages[0]["content"])
+        message = type("Message", (), {"content": content})
+        return type("Response", (), {"choices": [type("Choice", (), {"message": message})]})
+
+class FakeOpenAI:
+    """
+    Stand-in for the openai module as the app uses it (OpenAI().chat.completions.create)
+
+    Intent classification answers with the result registered for the message
+    (unclear otherwise); name matching answers with the first listed name
+    containing the query.
+    """
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.classifications: Dict[str, Dict[str, Any]] = {}
+        self.calls = 0
+        self._lock = threading.Lock()
+        fake = self
+
+        class OpenAI:
+            def __init__(self, api_key=None, **kwargs):
+                self.chat = type("Chat", (), {"completions": _FakeCompletions(fake)})
+
+        class APIError(Exception):
+            pass
+
+        self.OpenAI = OpenAI
+        self.APIError = APIError
+
+    def classify(self, message: str, intent: str, extracted_data: Dict[str, Any]):
+        """Register the classification returned for a message"""
+        self.classifications[message] = {"intent": intent, "confidence": 0.9, "target_table": "None",
+                                         "extracted_data": extracted_data}
+
+    def answer(self, prompt: str) -> str:
+        with self._lock:
+            self.calls += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        if "intent classifier" in prompt:
+            message = re.search(r'from this message: "(.*?)"\n', prompt, re.S)
+            unclear = {"intent": "unclear", "confidence": 0.3, "target_table": "None", "extracted_data": {}}
+            return json.dumps(self.classifications.get(message.group(1) if message else "", unclear))
+        query = re.search(r'Query name: "(.*?)"', prompt)
+        names = re.search(r"Available person names: (\[.*?\])\n", prompt, re.S)
+        match = None
+        if query and names:
+            match = next((name for name in json.loads(names.group(1))
+                          if query.group(1).lower() in name.lower()), None)
+        return json.dumps({"match": match, "confidence": 0.9 if match else 0.0, "reason": "bench"})
+
+# =============================================================================
+# SYNTHETIC DATA
+# =============================================================================
+
+def synthetic_people(count: int, due: int = 0, seed: int = 23) -> List[Dict[str, Any]]:
+    """
+    People records in the shape the app reads (check-in fields included)
+
+    Args:
+        count: Number of people
+        due: How many of them (spread evenly) are due for a check-in today;
+            the rest confirmed within the last week
+        seed: Random seed
+    """
+    from bench_people_search import COMPANIES, FIRST, LAST, ROLES
+    rng = random.Random(seed)
+    today = date.today()
+    step = count / due if due else 0
+    due_positions = {int(i * step) for i in range(due)}
+    people = []
+    for i in range(count):
+        first, last = rng.choice(FIRST), rng.choice(LAST)
+        confirmed = today - timedelta(days=rng.randint(100, 300) if i in due_positions else rng.randint(0, 7))
+        people.append({
+            "id": f"rec{i:08d}",
+            "fields": {
+                "Name": f"{first} {last}{i % 997}",
+                "Email": f"{first.lower()}.{last.lower()}{i}@example.com",
+                "Company": rng.choice(COMPANIES),
+                "Role": rng.choice(ROLES),
+                "City": rng.choice(["NYC", "SF", "London", "Austin", "Berlin"]),
+                "Tags": rng.sample(["friend", "mentor", "investor", "founder", "climbing"], 2),
+                "Phone": f"+1555{i:07d}",
+                "Check-in Frequency": "Monthly" if i % 4 else "Quarterly",
+                "Consent": True,
+                "Opt-out": False,
+                "Last Confirmed": confirmed.isoformat(),
+            }
+        })
+    return people
+
+def synthetic_reminders(count: int, people: List[Dict[str, Any]], spread_seconds: int = 240,
+                        seed: int = 42) -> List[Dict[str, Any]]:
+    """Pending reminders already overdue by up to `spread_seconds`, each linked to a person"""
+    from app.reminder_engine import DUE_DATE_FORMAT
+    rng = random.Random(seed)
+    now = datetime.now()
+    return [{
+        "id": f"recR{i:07d}",
+        "fields": {
+            "Reminder": f"Follow up #{i}",
+            "Due date": (now - timedelta(seconds=rng.uniform(0, spread_seconds))).strftime(DUE_DATE_FORMAT),
+            "Reminders Main View": [rng.choice(people)["id"]],
+            "Status": "Pending",
+        }
+    } for i in range(count)]
+
+# (weight, body template, intent, extracted data template); None intents are fixed commands
+INBOUND_MIX = [
+    (3, "no change", None, None),
+    (1, "help", None, None),
+    (1, "yes", None, None),
+    (2, "{target} moved to Acme as CTO", "update_person_info",
+     {"target_person_name": "{target}", "field_updates": {"company": "Acme", "role": "CTO"}}),
+    (2, "tag {target} with mentor", "manage_tags", {"target_person_name": "{target}", "tags_to_add": ["mentor"]}),
+    (2, "remind me to call {target} tomorrow", "create_reminder",
+     {"reminder_action": "call {target}", "target_person_name": "{target}", "reminder_timeline": "tomorrow"}),
+    (1, "add a note to {target} about climbing", "create_note",
+     {"target_person_name": "{target}", "note_content": "climbing"}),
+    (1, "is {target} in here?", "query_data", {"query_type": "people", "query_terms": ["{target}"]}),
+    (1, "asdf {n}", "unclear", {}),
+]
+
+def _fill(template: Any, **values: str) -> Any:
+    if isinstance(template, str):
+        return template.format(**values)
+    if isinstance(template, dict):
+        return {key: _fill(value, **values) for key, value in template.items()}
+    if isinstance(template, list):
+        return [_fill(value, **values) for value in template]
+    return template
+
+def inbound_messages(people: List[Dict[str, Any]], count: int, openai_fake: FakeOpenAI,
+                     seed: int = 5) -> List[Tuple[str, str]]:
+    """
+    A mix of inbound (From, Body) pairs, registering each classified body with the OpenAI fake
+
+    Texters and the people they mention are drawn from the first Airtable page
+    of People: the phone lookup and name search read only that page.
+    """
+    rng = random.Random(seed)
+    page = people[:AIRTABLE_PAGE_SIZE]
+    weights = [weight for weight, *_ in INBOUND_MIX]
+    messages = []
+    for n in range(count):
+        _, body, intent, data = rng.choices(INBOUND_MIX, weights)[0]
+        texter, target = rng.sample(page, 2)
+        values = {"target": target["fields"]["Name"], "n": str(n)}
+        body = _fill(body, **values)
+        if intent is not None:
+            openai_fake.classify(body, intent, _fill(data, **values))
+        messages.append((texter["fields"]["Phone"], body))
+    return messages
+
+# =============================================================================
+# INSTALLATION
+# =============================================================================
+
+class Fakes:
+    """One set of stand-ins, installed into the app by install()"""
+
+    def __init__(self, airtable_latency_ms: float = 0.0, airtable_rps: float = 5.0,
+                 airtable_limit_mode: str = "queue", twilio_latency_ms: float = 0.0,
+                 openai_latency_ms: float = 0.0):
+        self.airtable = FakeAirtable(airtable_latency_ms, airtable_rps, airtable_limit_mode)
+        self.twilio = FakeTwilio(twilio_latency_ms)
+        self.twilio_latency_ms = twilio_latency_ms
+        self.openai = FakeOpenAI(openai_latency_ms)
+        self.twilio_stub = None
+
+    async def start_twilio_stub(self):
+        """Serve async sends (the SmsSendQueue) from a local Twilio stub; call inside the event loop"""
+        from app import sms_queue
+        from twilio_stub import TwilioStub
+        self.twilio_stub = await TwilioStub(self.twilio_latency_ms).start()
+        await sms_queue.close_queue()
+        sms_queue._queue = sms_queue.SmsSendQueue(base_url=self.twilio_stub.base_url)
+        for tenant in _other_tenants():
+            tenant.resource("sms_queue", lambda: sms_queue.SmsSendQueue(
+                base_url=self.twilio_stub.base_url, from_number=tenant.twilio_phone_number or ""))
+
+    async def stop_twilio_stub(self):
+        from app import sms_queue
+        await sms_queue.close_queue()
+        if self.twilio_stub is not None:
+            await self.twilio_stub.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        stub_sent = len(self.twilio_stub.received) if self.twilio_stub is not None else 0
+        return {"airtable": self.airtable.stats(), "twilio": len(self.twilio.sent) + stub_sent,
+                "openai": self.openai.calls}
+
+def _other_tenants():
+    from app import tenants
+    return [tenant for tenant in tenants.all_tenants() if not tenant.is_default]
+
+def install(fakes: Fakes):
+    """Point the app at a set of fakes and drop every cache built from earlier data"""
+    from app import (airtable, checkin_cache, coordination, due_index, intent_classifier, llm, people_cache,
+                     reminder_engine, twilio_utils)
+    airtable.close_http_client()
+    airtable._http_client = httpx.Client(transport=fakes.airtable.transport())
+    twilio_utils.twilio_client = fakes.twilio
+    intent_classifier.openai = fakes.openai
+    llm.openai = fakes.openai
+    people_cache.cache.loaded_at = 0.0
+    due_index.index.invalidate()
+    checkin_cache.cache = checkin_cache.CheckinCache()
+    reminder_engine._engine = None
+    coordination.get_backend().reset()
+    for tenant in _other_tenants():
+        for name in ("people_cache", "due_index", "checkin_cache", "reminder_engine", "airtable_bulk_limiter"):
+            tenant.pop_resource(name)
+        tenant.pop_resource("twilio_client")
+        tenant.resource("airtable_http_client", lambda: httpx.Client(transport=fakes.airtable.transport()))
+        tenant.resource("twilio_client", lambda: fakes.twilio)
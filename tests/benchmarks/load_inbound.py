@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Load generator: replay inbound SMS against /twilio/inbound
+
+Replays a corpus of inbound messages as Twilio webhook form posts (full
+payload, optionally signed with X-Twilio-Signature) on an open-loop arrival
+schedule, so slow responses do not slow the offered load. Checks how
+main.inbound behaves under real traffic shapes: concurrency, and
+idempotency when Twilio redelivers a MessageSid.
+
+Targets:
+- in-process (default): the app over ASGI with the hermetic harness
+  stand-ins; duplicate processing is also counted server side, from the
+  inbound Messages rows logged per MessageSid
+- --url http://host:8000: a running app over HTTP (use a corpus of numbers
+  that exist in its base)
+
+Arrivals:
+- poisson: exponential gaps at --rate messages per second
+- burst: replies to a monthly send, each arriving an exponential delay
+  (mean --burst-mean-seconds) after the send at t=0
+
+Duplicates: with probability --duplicate-rate a message is delivered again
+with the same MessageSid after --duplicate-delay-ms (0 = concurrently).
+
+Corpus: JSONL with {"From": "+1...", "Body": "..."} per line (other Twilio
+fields pass through); synthetic messages from the harness when omitted.
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+import harness
+
+INBOUND_PATH = "/twilio/inbound"
+DUPLICATE_MESSAGE = "Message already processed"
+
+# =============================================================================
+# PAYLOADS
+# =============================================================================
+
+def twilio_form(message: Dict[str, str], message_sid: str, to: str, account_sid: str) -> Dict[str, str]:
+    """The form Twilio posts for an inbound SMS"""
+    form = {
+        "ToCountry": "US", "ToState": "NY", "ToCity": "", "ToZip": "",
+        "FromCountry": "US", "FromState": "NY", "FromCity": "", "FromZip": "",
+        "SmsMessageSid": message_sid, "SmsSid": message_sid, "MessageSid": message_sid,
+        "SmsStatus": "received", "NumMedia": "0", "NumSegments": "1",
+        "AccountSid": account_sid, "To": to, "ApiVersion": "2010-04-01",
+    }
+    form.update(message)
+    return form
+
+def twilio_signature(auth_token: str, url: str, form: Dict[str, str]) -> str:
+    """X-Twilio-Signature: base64 HMAC-SHA1 of the URL followed by the sorted form keys and values"""
+    payload = url + "".join(key + form[key] for key in sorted(form))
+    digest = hmac.new(auth_token.encode(), payload.encode(), hashlib.sha1).digest()
+    return base64.b64encode(digest).decode()
+
+def load_corpus(path: str) -> List[Dict[str, str]]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+# =============================================================================
+# SCHEDULE
+# =============================================================================
+
+def arrival_times(count: int, args, rng: random.Random) -> List[float]:
+    """Seconds after the start at which each message arrives, ascending"""
+    if args.arrival == "burst":
+        if args.burst_mean_seconds <= 0:
+            return [0.0] * count
+        return sorted(rng.expovariate(1 / args.burst_mean_seconds) for _ in range(count))
+    times, now = [], 0.0
+    for _ in range(count):
+        now += rng.expovariate(args.rate)
+        times.append(now)
+    return times
+
+def build_schedule(corpus: List[Dict[str, str]], args, rng: random.Random) -> List[Dict[str, Any]]:
+    """Deliveries in arrival order, duplicates included: (at, message sid, message, duplicate)"""
+    messages = [corpus[i % len(corpus)] for i in range(args.messages)]
+    deliveries = []
+    for n, (at, message) in enumerate(zip(arrival_times(len(messages), args, rng), messages)):
+        sid = f"SM{n:032x}"
+        deliveries.append({"at": at, "sid": sid, "message": message, "duplicate": False})
+        if rng.random() < args.duplicate_rate:
+            deliveries.append({"at": at + args.duplicate_delay_ms / 1000, "sid": sid,
+                               "message": message, "duplicate": True})
+    return sorted(deliveries, key=lambda delivery: delivery["at"])
+
+# =============================================================================
+# REPLAY
+# =============================================================================
+
+class Replay:
+    """Open-loop replay of a schedule, collecting per-delivery results"""
+
+    def __init__(self, client: httpx.AsyncClient, url: str, args):
+        self.client = client
+        self.url = url
+        self.args = args
+        self.results: List[Dict[str, Any]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def deliver(self, delivery: Dict[str, Any]):
+        form = twilio_form(delivery["message"], delivery["sid"], self.args.to, self.args.account_sid)
+        headers = {}
+        if self.args.auth_token:
+            headers["X-Twilio-Signature"] = twilio_signature(self.args.auth_token, self.url, form)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        started = time.perf_counter()
+        try:
+            response = await self.client.post(INBOUND_PATH, data=form, headers=headers,
+                                              timeout=self.args.timeout)
+            status = response.status_code
+            try:
+                body = response.json()
+            except ValueError:
+                body = {}
+        except httpx.HTTPError as e:
+            status, body = type(e).__name__, {}
+        finally:
+            self.in_flight -= 1
+        self.results.append({"sid": delivery["sid"], "duplicate": delivery["duplicate"], "status": status,
+                             "ok": isinstance(body, dict) and bool(body.get("ok")),
+                             "message": body.get("message") if isinstance(body, dict) else None,
+                             "ms": (time.perf_counter() - started) * 1000})
+
+    async def run(self, schedule: List[Dict[str, Any]]) -> float:
+        started = time.perf_counter()
+        tasks = []
+        for delivery in schedule:
+            wait = delivery["at"] - (time.perf_counter() - started)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            tasks.append(asyncio.create_task(self.deliver(delivery)))
+        await asyncio.gather(*tasks)
+        return time.perf_counter() - started
+
+def report(replay: Replay, seconds: float, processed_per_sid: Optional[Dict[str, int]]) -> Dict[str, Any]:
+    results = replay.results
+    statuses: Dict[str, int] = {}
+    messages: Dict[str, int] = {}
+    for result in results:
+        statuses[str(result["status"])] = statuses.get(str(result["status"]), 0) + 1
+        label = (result["message"] or "-").split(":")[0]
+        messages[label] = messages.get(label, 0) + 1
+    errors = sum(1 for result in results if not isinstance(result["status"], int) or result["status"] >= 500)
+    deliveries_per_sid: Dict[str, int] = {}
+    for result in results:
+        deliveries_per_sid[result["sid"]] = deliveries_per_sid.get(result["sid"], 0) + 1
+    redelivered = [sid for sid, count in deliveries_per_sid.items() if count > 1]
+    rejected = sum(1 for result in results if result["message"] == DUPLICATE_MESSAGE)
+    duplicates = {
+        "deliveries": sum(1 for result in results if result["duplicate"]),
+        "rejected_as_duplicate": rejected,
+        # Redeliveries the app answered as new work rather than as a duplicate
+        "processed_again": sum(deliveries_per_sid[sid] - 1 for sid in redelivered) - rejected,
+    }
+    if processed_per_sid is not None:
+        duplicates["logged_more_than_once"] = sum(1 for count in processed_per_sid.values() if count > 1)
+    return {
+        "deliveries": len(results),
+        "seconds": round(seconds, 3),
+        "throughput_per_second": round(len(results) / seconds, 2) if seconds else None,
+        "max_in_flight": replay.max_in_flight,
+        "latency_ms": harness.percentiles([result["ms"] for result in results]),
+        "error_rate": round(errors / len(results), 4) if results else 0.0,
+        "status_codes": statuses,
+        "responses": messages,
+        "duplicates": duplicates,
+    }
+
+async def replay_in_process(schedule: List[Dict[str, Any]], args, fakes: "harness.Fakes") -> Dict[str, Any]:
+    from app import main
+    await fakes.start_twilio_stub()
+    try:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url=harness.BENCH_APP_URL) as client:
+            replay = Replay(client, harness.BENCH_APP_URL + INBOUND_PATH, args)
+            seconds = await replay.run(schedule)
+    finally:
+        await fakes.stop_twilio_stub()
+    processed: Dict[str, int] = {}
+    for record in fakes.airtable.records("Messages"):
+        if record["fields"].get("Direction") == "Inbound":
+            sid = record["fields"].get("Twilio SID")
+            processed[sid] = processed.get(sid, 0) + 1
+    result = report(replay, seconds, processed)
+    result["calls"] = fakes.stats()
+    return result
+
+async def replay_over_http(schedule: List[Dict[str, Any]], args) -> Dict[str, Any]:
+    async with httpx.AsyncClient(base_url=args.url) as client:
+        replay = Replay(client, args.signature_url or args.url.rstrip("/") + INBOUND_PATH, args)
+        seconds = await replay.run(schedule)
+    return report(replay, seconds, None)
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Base URL of a running app (default: in-process over ASGI)")
+    parser.add_argument("--corpus", help="JSONL corpus of inbound messages")
+    parser.add_argument("--messages", type=int, default=100, help="Messages to send (the corpus is cycled)")
+    parser.add_argument("--arrival", choices=("poisson", "burst"), default="poisson")
+    parser.add_argument("--rate", type=float, default=5.0, help="poisson: mean messages per second")
+    parser.add_argument("--burst-mean-seconds", type=float, default=10.0,
+                        help="burst: mean reply delay after the send (0 = all at once)")
+    parser.add_argument("--duplicate-rate", type=float, default=0.1,
+                        help="Share of messages Twilio delivers a second time")
+    parser.add_argument("--duplicate-delay-ms", type=float, default=0.0,
+                        help="Delay of the second delivery (0 = concurrent with the first)")
+    parser.add_argument("--auth-token", default="",
+                        help="Sign requests with this Twilio auth token (in-process runs sign with a bench token)")
+    parser.add_argument("--signature-url", help="URL to sign (the public webhook URL behind a proxy)")
+    parser.add_argument("--to", default=harness.BENCH_TWILIO_NUMBER, help="The Twilio number messaged")
+    parser.add_argument("--account-sid", default="ACbench")
+    parser.add_argument("--timeout", type=float, default=15.0, help="Per-request timeout (Twilio waits 15 s)")
+    parser.add_argument("--people", type=int, default=500, help="In-process: people in the synthetic directory")
+    parser.add_argument("--airtable-latency-ms", type=float, default=0.0)
+    parser.add_argument("--airtable-rps", type=float, default=0.0,
+                        help="In-process: Airtable requests per second per base (0 disables the limit)")
+    parser.add_argument("--openai-latency-ms", type=float, default=0.0)
+    parser.add_argument("--twilio-latency-ms", type=float, default=0.0)
+    parser.add_argument("--twilio-mps", type=float, default=10.0,
+                        help="In-process: TWILIO_MAX_MPS of the reply send queue")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    fakes = None
+    if not args.url:
+        # In-process requests are always signed, so the webhook middleware runs as in production
+        args.auth_token = args.auth_token or "bench"
+        harness.configure_environment(TWILIO_AUTH_TOKEN=args.auth_token, TWILIO_VALIDATE_SIGNATURES="true",
+                                      TWILIO_MAX_MPS=str(args.twilio_mps))
+        fakes = harness.Fakes(args.airtable_latency_ms, args.airtable_rps, "queue",
+                              args.twilio_latency_ms, args.openai_latency_ms)
+        harness.install(fakes)
+        people = harness.synthetic_people(args.people)
+        fakes.airtable.seed("People", people)
+    if args.corpus:
+        corpus = load_corpus(args.corpus)
+    elif fakes is not None:
+        corpus = [{"From": from_phone, "Body": body}
+                  for from_phone, body in harness.inbound_messages(people, args.messages, fakes.openai)]
+    else:
+        parser.error("--corpus is required with --url")
+
+    schedule = build_schedule(corpus, args, rng)
+    if fakes is not None:
+        result = asyncio.run(replay_in_process(schedule, args, fakes))
+        from app import log
+        log.flush()
+    else:
+        result = asyncio.run(replay_over_http(schedule, args))
+
+    config = {key: value for key, value in vars(args).items() if key != "auth_token"}
+    config["signed"] = bool(args.auth_token)
+    print(json.dumps({"benchmark": "load_inbound", "config": config, **result}, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Report: SMS segments billed per message type, before and after the
+segment-aware composer
+
+"Before" is the message as previously sent in one piece. "After" is what the
+composer sends: the GSM-7-normalized, budget-fitted check-in, or the first
+page of a paged reply (remaining pages are only sent if the user replies MORE).
+"""
+
+import json
+import os
+import random
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from app import airtable, compose, intent_classifier
+from app.intent_handlers import IntentHandlers
+from app.main import get_help_message
+
+def synthetic_people(count: int):
+    rng = random.Random(11)
+    companies = ["Acme", "Globex Corporation", "Initech", "Umbrella Research & Development Holdings"]
+    roles = ["PM", "Senior Software Engineer", "Head of Partnerships and Strategic Alliances, EMEA"]
+    cities = ["NYC", "San Francisco", "Rio de Janeiro"]
+    tags = ["mentor", "investor", "open to advising", "remote only", "climate"]
+    first = ["David", "Sarah", "Jen", "Mike", "Alex"]
+    return [{
+        "id": f"recP{i:05d}",
+        "fields": {
+            "Name": f"{rng.choice(first)} Person{i}",
+            "Email": f"person{i}@example.com",
+            "Company": rng.choice(companies),
+            "Role": rng.choice(roles),
+            "City": rng.choice(cities),
+            "Tags": rng.sample(tags, rng.randint(0, 4)),
+            "Last Confirmed": "2024-05-01" if rng.random() < 0.7 else None
+        }
+    } for i in range(count)]
+
+def summarize(before, after):
+    return {
+        "messages": len(before),
+        "segments_before": sum(compose.count_segments(m) for m in before),
+        "segments_after": sum(compose.count_segments(m) for m in after),
+        "ucs2_before": sum(1 for m in before if not compose.is_gsm7(m)),
+        "ucs2_after": sum(1 for m in after if not compose.is_gsm7(m)),
+    }
+
+def main():
+    people = synthetic_people(500)
+    report = {}
+
+    before = [compose.compose_outbound(p["fields"]["Name"], compose.compose_snapshot(p["fields"]),
+                                       p["fields"].get("Last Confirmed")) for p in people]
+    after = [compose.compose_checkin_message(p["fields"]) for p in people]
+    report["monthly_checkin"] = summarize(before, after)
+
+    help_text = get_help_message()
+    report["help"] = summarize([help_text], [compose.paginate(help_text, compose.REPLY_MAX_SEGMENTS)[0]])
+    report["help"]["pages"] = len(compose.paginate(help_text, compose.REPLY_MAX_SEGMENTS))
+
+    # Multi-match people query, produced by the real handler against synthetic data
+    airtable.get_all_people = lambda: people
+    intent_classifier.match_name_to_person = lambda term, names: None
+    replies = [IntentHandlers._query_people([name])[1] for name in ("David", "Sarah", "Jen")]
+    report["query_people_multi_match"] = summarize(
+        replies, [compose.paginate(r, compose.REPLY_MAX_SEGMENTS)[0] for r in replies]
+    )
+
+    totals_before = sum(r["segments_before"] for r in report.values())
+    totals_after = sum(r["segments_after"] for r in report.values())
+    report["total"] = {"segments_before": totals_before, "segments_after": totals_after}
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
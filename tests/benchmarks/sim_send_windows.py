@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Simulation: inbound reply load with and without planned send windows
+
+Simulates one month's check-in send to N synthetic people across US
+timezones. "burst" sends everyone as fast as Twilio allows when the cron
+fires; "planned" uses the send planner (quiet hours, hourly cap derived from
+inbound capacity). Replies arrive after delays drawn from the planner's
+reply-delay distribution and are processed by a fixed number of workers.
+Reports peak inbound per hour, peak in-flight concurrency and reply wait
+times, plus the planner's predicted peak.
+"""
+
+import argparse
+import heapq
+import json
+import os
+import random
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from app import send_planner
+
+TIMEZONES = [("America/New_York", 0.5), ("America/Chicago", 0.2), ("America/Denver", 0.1), ("America/Los_Angeles", 0.2)]
+
+def synthetic_people(count: int, rng: random.Random):
+    zones, weights = zip(*TIMEZONES)
+    return [{"id": f"rec{i:07d}", "fields": {"Timezone": rng.choices(zones, weights)[0]}} for i in range(count)]
+
+def sample_delay_seconds(rng: random.Random) -> float:
+    r = rng.random()
+    for low, high, share in send_planner.REPLY_DELAY_BUCKETS:
+        if r < share:
+            return rng.uniform(low, high) * 60
+        r -= share
+    return send_planner.REPLY_DELAY_BUCKETS[-1][1] * 60
+
+def simulate(send_times, args, rng: random.Random):
+    arrivals = sorted(t + sample_delay_seconds(rng) for t in send_times if rng.random() < args.reply_rate)
+    per_hour = Counter(int(t // 3600) for t in arrivals)
+
+    # Replies are processed by a fixed worker pool (first come, first served)
+    free_at = [arrivals[0] if arrivals else 0.0] * args.workers
+    heapq.heapify(free_at)
+    waits, events = [], []
+    for arrival in arrivals:
+        start = max(arrival, heapq.heappop(free_at))
+        finish = start + rng.expovariate(1 / args.service_seconds)
+        heapq.heappush(free_at, finish)
+        waits.append(start - arrival)
+        events.append((arrival, 1))
+        events.append((finish, -1))
+
+    in_flight = peak = 0
+    for _, delta in sorted(events):
+        in_flight += delta
+        peak = max(peak, in_flight)
+
+    waits.sort()
+    return {
+        "sends": len(send_times),
+        "send_span_hours": round((max(send_times) - min(send_times)) / 3600, 1),
+        "replies": len(arrivals),
+        "peak_inbound_per_hour": max(per_hour.values()) if per_hour else 0,
+        "predicted_peak_per_hour": send_planner.predict_reply_load(send_times, args.reply_rate)["peak_per_hour"],
+        "peak_in_flight": peak,
+        "p95_wait_seconds": round(waits[int(len(waits) * 0.95)], 1) if waits else 0,
+        "max_wait_seconds": round(waits[-1], 1) if waits else 0
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--people", type=int, default=10_000)
+    parser.add_argument("--mps", type=float, default=10, help="Twilio send rate for the burst")
+    parser.add_argument("--reply-rate", type=float, default=send_planner.REPLY_RATE)
+    parser.add_argument("--service-seconds", type=float, default=6.0, help="Mean inbound processing time")
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(29)
+    people = synthetic_people(args.people, rng)
+    # Cron fires at 13:00 UTC (09:00 New York) on the 1st
+    start = datetime(2025, 6, 1, 13, 0, tzinfo=timezone.utc).timestamp()
+
+    burst = [start + i / args.mps for i in range(len(people))]
+
+    capacity = args.workers * 3600 / args.service_seconds
+    planner = send_planner.SendPlanner(max_per_hour=send_planner.max_sends_per_hour(capacity, args.reply_rate))
+    assignments, unplaced = planner.plan(people, start)
+    planned = [send_at for _, send_at in assignments]
+
+    print(json.dumps({
+        "people": args.people,
+        "inbound_capacity_per_hour": round(capacity),
+        "max_sends_per_hour": planner.max_per_hour,
+        "unplaced": len(unplaced),
+        "burst": simulate(burst, args, random.Random(31)),
+        "planned": simulate(planned, args, random.Random(31))
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
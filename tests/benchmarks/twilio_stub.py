@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Local Twilio Messages API stub
+
+A minimal HTTP/1.1 server (keep-alive aware) that accepts
+POST /2010-04-01/Accounts/{sid}/Messages.json and answers with a fake SID.
+Latency and the share of 429/503 responses are configurable so the send
+queue's throttling and retries can be exercised without a Twilio account.
+
+Run standalone with: python tests/benchmarks/twilio_stub.py --port 8765
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+from typing import Dict, List
+from urllib.parse import parse_qs
+
+class TwilioStub:
+    """In-process Twilio stub; start() binds a port, received holds accepted messages"""
+
+    def __init__(self, latency_ms: float = 0.0, error_rate: float = 0.0, seed: int = 7):
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.received: List[Dict[str, str]] = []
+        self.connections = 0
+        self.requests = 0
+        self.errors_injected = 0
+        self._sids = itertools.count(1)
+        self._server = None
+        self.port = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0):
+        self._server = await asyncio.start_server(self._handle, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+                status, payload = await self._respond(request_line.decode("latin-1"), body)
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\nConnection: keep-alive\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, request_line: str, body: bytes):
+        self.requests += 1
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        if not request_line.startswith("POST") or "/Messages.json" not in request_line:
+            return "404 Not Found", {"message": "not found"}
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.errors_injected += 1
+            return self.rng.choice(["429 Too Many Requests", "503 Service Unavailable"]), {"code": 20429}
+        form = {key: values[0] for key, values in parse_qs(body.decode()).items()}
+        self.received.append(form)
+        return "201 Created", {"sid": f"SM{next(self._sids):032x}", "status": "queued", "to": form.get("To")}
+
+async def _serve(port: int, latency_ms: float, error_rate: float):
+    stub = await TwilioStub(latency_ms, error_rate).start(port=port)
+    print(f"Twilio stub listening on {stub.base_url}")
+    await asyncio.Event().wait()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    asyncio.run(_serve(args.port, args.latency_ms, args.error_rate))
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Regression test for outbound call counts per intent
+
+Runs every intent handler, and the whole /twilio/inbound pipeline for every
+intent, against in-process fakes of Airtable, OpenAI and Twilio, and asserts
+the exact number of calls each one makes. An N+1 regression (e.g. a lookup
+per tag or per search result) changes a count and fails here; an intended
+change updates the expected counts below and, if needed, the budgets in
+app/call_budget.py. Also checks that every pipeline stays within its budget
+and that enforce mode refuses calls past the budget without making them.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+os.environ.setdefault("LOCAL_STORE_PATH", os.path.join(tempfile.mkdtemp(), "test_call_budgets.db"))
+os.environ.setdefault("COORDINATION_PATH", os.path.join(tempfile.mkdtemp(), "test_coordination.db"))
+os.environ.setdefault("WARMUP_ENABLED", "false")
+
+import httpx
+
+from app import airtable, call_budget, intent_classifier, main, sms_queue
+from app.intent_handlers import IntentHandlers
+
+PHONE = "5551234567"
+PERSON = {"id": "recTexter", "fields": {"Name": "Texter", "Phone": PHONE}}
+FRIEND = {"id": "recFriend", "fields": {"Name": "Jane Doe", "Phone": "5559876543", "Tags": ["friend"]}}
+
+# =============================================================================
+# FAKES
+# =============================================================================
+
+def fake_airtable(request: httpx.Request) -> httpx.Response:
+    """Every table lists the texter and Jane Doe (name formulas filter them); writes echo a record"""
+    if request.method == "GET":
+        if request.url.path.count("/") > 3:
+            return httpx.Response(200, json={"id": "recCheckin", "fields": {"Transcript": ""}})
+        records = [PERSON, FRIEND]
+        name = re.search(r"LOWER\('([^']*)'\)", request.url.params.get("filterByFormula", ""))
+        if name:
+            records = [r for r in records if name.group(1) in r["fields"]["Name"].lower()]
+        return httpx.Response(200, json={"records": records})
+    body = json.loads(request.content or b"{}")
+    if "records" in body:
+        return httpx.Response(200, json={"records": [{"id": "recNew", "fields": r.get("fields", {})}
+                                                     for r in body["records"]]})
+    return httpx.Response(200, json={"id": "recNew", "fields": body.get("fields", {})})
+
+class FakeCompletions:
+    """Answers intent classification with the next canned result and name matching with Jane Doe"""
+
+    def __init__(self):
+        self.classification = {}
+
+    def create(self, messages, **kwargs):
+        if "intent classifier" in messages[0]["content"]:
+            content = json.dumps(self.classification)
+        else:
+            content = json.dumps({"match": "Jane Doe", "confidence": 0.9, "reason": "test"})
+        message = type("Message", (), {"content": content})
+        return type("Response", (), {"choices": [type("Choice", (), {"message": message})]})
+
+completions = FakeCompletions()
+
+class FakeOpenAI:
+    def __init__(self, api_key=None):
+        self.chat = type("Chat", (), {"completions": completions})
+
+class FakeQueue:
+    async def send(self, to, body, status_callback_url=None, priority=False, call=None):
+        return "SMtest"
+
+def install_fakes():
+    airtable._http_client = httpx.Client(transport=httpx.MockTransport(fake_airtable))
+    intent_classifier.openai = type("FakeOpenAIModule", (), {"OpenAI": FakeOpenAI})
+    intent_classifier.OPENAI_API_KEY = "test"
+    sms_queue.get_queue = lambda: FakeQueue()
+
+# =============================================================================
+# EXPECTED CALL COUNTS
+# =============================================================================
+
+# intent -> (extracted_data, calls made by the handler alone)
+HANDLER_CASES = {
+    "update_person_info": ({"target_person_name": "Jane", "field_updates": {"company": "Acme"}},
+                           {"airtable": 2}),
+    "manage_tags": ({"target_person_name": "Jane Doe", "tags_to_add": ["mentor", "investor"]},
+                    {"airtable": 2}),
+    "create_reminder": ({"reminder_action": "call Jane Doe", "target_person_name": "Jane Doe",
+                         "reminder_timeline": "tomorrow"}, {"airtable": 2}),
+    "create_note": ({"target_person_name": "Jane Doe", "note_content": "likes climbing"},
+                    {"airtable": 2}),
+    "schedule_followup": ({"target_person_name": "Jane Doe", "followup_timeline": "next week"},
+                          {"airtable": 2}),
+    "new_friend": ({"friend_name": "John Smith"}, {"airtable": 2}),
+    "query_data": ({"query_type": "people", "query_terms": ["Jane"]}, {"airtable": 1, "openai": 1}),
+}
+
+# Fixed-command messages -> intent
+COMMAND_CASES = {"help": "help", "stop": "opt_out", "no change": "no_change", "yes": "confirm_changes"}
+
+# Calls of the whole inbound pipeline (phone lookup, check-in upsert, logging,
+# transcripts, classification and reply) per intent, once the texter has a
+# check-in this month (the upsert is then a single PATCH)
+PIPELINE_CALLS = {
+    "help": {"airtable": 1, "twilio": 1},
+    "opt_out": {"airtable": 8, "twilio": 1},
+    "no_change": {"airtable": 8, "twilio": 1},
+    "confirm_changes": {"airtable": 7, "twilio": 1},
+    "unclear": {"airtable": 8, "openai": 1, "twilio": 1},
+    "update_person_info": {"airtable": 10, "openai": 1, "twilio": 1},
+    "manage_tags": {"airtable": 10, "openai": 1, "twilio": 1},
+    "create_reminder": {"airtable": 10, "openai": 1, "twilio": 1},
+    "create_note": {"airtable": 10, "openai": 1, "twilio": 1},
+    "schedule_followup": {"airtable": 10, "openai": 1, "twilio": 1},
+    "new_friend": {"airtable": 10, "openai": 1, "twilio": 1},
+    "query_data": {"airtable": 9, "openai": 2, "twilio": 1},
+}
+
+# The month's first check-in upsert lists the month's check-ins, then creates one
+FIRST_UPSERT_CALLS = {"airtable": 2}
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+_message_sids = itertools.count()
+
+def run_inbound(body: str) -> call_budget.CallLedger:
+    with call_budget.request_ledger("inbound") as ledger:
+        asyncio.run(main._process_inbound(f"+1{PHONE}", body, f"SMtest{next(_message_sids)}"))
+    return ledger
+
+def classify_as(intent: str, extracted_data: dict):
+    completions.classification = {"intent": intent, "confidence": 0.9, "target_table": "None",
+                                  "extracted_data": extracted_data}
+
+def check(label: str, actual: dict, expected: dict) -> bool:
+    if actual == expected:
+        print(f"   ✅ {label}: {actual}")
+        return True
+    print(f"   ❌ {label}: expected {expected}, got {actual}")
+    return False
+
+def test_handler_calls() -> bool:
+    print("\n🧪 Calls per intent handler")
+    ok = True
+    for intent, (extracted_data, expected) in HANDLER_CASES.items():
+        handler = getattr(IntentHandlers, f"handle_{intent}")
+        with call_budget.request_ledger("test") as ledger:
+            handler(extracted_data, PERSON["id"], PERSON["fields"])
+        ok &= check(intent, ledger.counts, expected)
+    return ok
+
+def test_pipeline_calls() -> bool:
+    print("\n🧪 Calls per inbound request, by intent")
+    with call_budget.request_ledger("test") as ledger:
+        airtable.upsert_checkin(PERSON["id"], datetime.now().strftime("%Y-%m"))
+    ok = check("first check-in upsert of the month", ledger.counts, FIRST_UPSERT_CALLS)
+    cases = [(message, intent, None) for message, intent in COMMAND_CASES.items()]
+    cases.append(("gibberish", "unclear", {}))
+    cases += [(f"message for {intent}", intent, data) for intent, (data, _) in HANDLER_CASES.items()]
+    for message, intent, extracted_data in cases:
+        if extracted_data is not None:
+            classify_as(intent, extracted_data)
+        ledger = run_inbound(message)
+        ok &= check(intent, ledger.counts, PIPELINE_CALLS[intent])
+        ok &= ledger.intent == intent and not ledger.exceeded
+        if ledger.exceeded:
+            print(f"   ❌ {intent} exceeded its budget: {ledger.exceeded}")
+    return ok
+
+def test_enforce_mode() -> bool:
+    print("\n🧪 Enforce mode refuses calls past the budget")
+    attempted = []
+    def counting_transport(request):
+        attempted.append(request.url.path)
+        return fake_airtable(request)
+    airtable._http_client = httpx.Client(transport=httpx.MockTransport(counting_transport))
+    with call_budget.request_ledger("test", mode="enforce") as ledger:
+        ledger.set_intent("new_friend")
+        ledger.budget["airtable"] = 1
+        first = airtable.create_person({"Name": "One"})
+        second = airtable.create_person({"Name": "Two"})
+    install_fakes()
+    ok = first == "recNew" and second is None and len(attempted) == 1 and ledger.exceeded == {"airtable": 2}
+    print(f"   {'✅' if ok else '❌'} made {len(attempted)} call(s), second create returned {second!r}, "
+          f"exceeded {ledger.exceeded}")
+    return ok
+
+def main_test() -> int:
+    install_fakes()
+    results = [test_handler_calls(), test_pipeline_calls(), test_enforce_mode()]
+    print("\n" + "=" * 50)
+    if all(results):
+        print("✅ Call counts match")
+        return 0
+    print("❌ Call counts changed")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main_test())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Regression test for staggered monthly sends
+
+Runs the staggered selection (send-monthly?staggered=true) once a day for a
+whole month against an in-process fake of Airtable, creating a Sent check-in
+for everyone selected as the job does. A person's send day stays in the past
+until they confirm, so without the check-in filter every daily run selects
+again everyone whose day has passed. Asserts each due person is selected
+exactly once, and that each day a fresh process (empty check-in cache) still
+sees the earlier days' check-ins in Airtable.
+"""
+
+import os
+import sys
+import tempfile
+import json
+from datetime import date, timedelta
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+os.environ.setdefault("LOCAL_STORE_PATH", os.path.join(tempfile.mkdtemp(), "test_staggered_sends.db"))
+os.environ.setdefault("COORDINATION_PATH", os.path.join(tempfile.mkdtemp(), "test_coordination.db"))
+os.environ.setdefault("SEND_WINDOW_DAYS", "20")
+
+import httpx
+
+from app import airtable, checkin_cache, cohort_scheduler, due_index, scheduler, tenants
+
+MONTH_START = date(2026, 10, 1)
+DAYS = 31
+
+# 50 monthly people: half due between Sep 20 and Oct 1 (sent on their October slot day
+# or, if that is before their due date, at the start of the month), half long overdue
+PEOPLE = [
+    {"id": f"recStagger{n:03d}", "fields": {
+        "Name": f"Person {n}", "Phone": f"555000{n:04d}", "Check-in Frequency": "Monthly",
+        "Consent": True,
+        "Last Confirmed": (date(2026, 8, 20) + timedelta(days=n % 13)).isoformat() if n % 2 else "2026-06-15"}}
+    for n in range(50)
+]
+
+# =============================================================================
+# FAKE
+# =============================================================================
+
+checkins = []
+
+def fake_airtable(request: httpx.Request) -> httpx.Response:
+    """People lists everyone; Check-ins lists and stores created check-ins"""
+    table = request.url.path.split("/")[3]
+    if request.method == "GET":
+        return httpx.Response(200, json={"records": PEOPLE if table == tenants.current().people_table else checkins})
+    body = json.loads(request.content or b"{}")
+    if request.method == "POST":
+        created = []
+        for item in body.get("records", [body]):
+            created.append({"id": f"recCheckin{len(checkins):04d}", "fields": item.get("fields", {}),
+                            "createdTime": f"{MONTH_START.isoformat()}T09:00:00.000Z"})
+            checkins.append(created[-1])
+        return httpx.Response(200, json={"records": created} if "records" in body else created[0])
+    return httpx.Response(200, json={"records": body.get("records", [])})
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+def test_each_person_selected_once() -> bool:
+    month = MONTH_START.strftime("%Y-%m")
+    selections = {}
+    for offset in range(DAYS):
+        today = MONTH_START + timedelta(days=offset)
+        # Each daily run starts with fresh caches, as a new process would
+        checkin_cache.cache = checkin_cache.CheckinCache()
+        due_index.index.invalidate()
+        for person in scheduler.get_people_scheduled_for_checkin(today):
+            selections.setdefault(person["id"], []).append(today.isoformat())
+            airtable.upsert_checkin(person["id"], month, "Sent")
+
+    due = {person["id"] for person in due_index.get_index().due(MONTH_START + timedelta(days=DAYS - 1))}
+    repeated = {person_id: days for person_id, days in selections.items() if len(days) > 1}
+    missed = due - set(selections)
+    ok = not repeated and not missed and len(checkins) == len(selections)
+    print(f"{'✅' if ok else '❌'} {len(selections)}/{len(due)} due people selected once over {DAYS} days, "
+          f"{len(repeated)} selected again, {len(missed)} never selected, {len(checkins)} check-ins created")
+    return ok
+
+def main() -> int:
+    if not cohort_scheduler.NUMPY_AVAILABLE:
+        print("⚠️ NumPy not installed; staggered selection falls back to all due people")
+    airtable._http_client = httpx.Client(transport=httpx.MockTransport(fake_airtable))
+    ok = test_each_person_selected_once()
+    print("=" * 50)
+    print("✅ Staggered sends select each person once" if ok else "❌ Staggered sends repeat people")
+    print("=" * 50)
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -39,7 +39,10 @@ def main():
     # List of tests to run in order
     tests = [
         "test_airtable.py",
-        "simple_table_test.py"
+        "simple_table_test.py",
+        "core/test_call_budgets.py",
+        "core/test_staggered_sends.py",
+        "benchmarks/bench_startup.py"
     ]
     
     passed = 0